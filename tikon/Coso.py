@@ -1,20 +1,24 @@
 import copy as copiar
 import json
 import math as mat
+import multiprocessing as mp
 import os
 import random
-import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime as ft
 from warnings import warn as avisar
 
 import numpy as np
+from scipy import sparse as dispersa
 
 from tikon.Matemáticas.Variables import VarSciPy, VarCalib
 from tikon import __correo__
 from tikon.Controles import directorio_base, dir_proyectos
+from tikon.Instrumentación import Instrumentación, SumideroMemoria
 from tikon.Matemáticas import Arte, Incert
 from tikon.Matemáticas.Calib import ModBayes, ModGLUE, ModCalib
 from tikon.Matemáticas.Experimentos import Experimento
+from tikon.Matemáticas.Registro import RegistroParáms
 from tikon.Matemáticas.Sensib import prep_anal_sensib
 
 
@@ -585,6 +589,17 @@ class Simulable(Coso):
     Parcela, pero NO un Insecto.
     """
 
+    # El número automático de repeticiones paramétricas en cada pedazo, para simulaciones en paralelo
+    tamaño_pedazo = 10
+
+    # Los tipos de datos de las matrices de predicciones para cada precisión de simulación posible: el tipo de las
+    # matrices de cálculo (poblaciones, etc.) y el tipo de los registros de conteos (muertes, etc.) para cada paso.
+    precisiones = {
+        'doble': (np.float64, np.float64),
+        'simple': (np.float32, np.float32),
+        'conteos': (np.float32, np.int32)
+    }
+
     def __init__(símismo, nombre, proyecto):
         """
         Un simulable se inicia como Coso.
@@ -618,6 +633,9 @@ class Simulable(Coso):
         símismo.coefs_act = {}
         símismo.coefs_act_númzds = {}
 
+        # El registro de parámetros que contiene los valores de los coeficientes numerizados (ver `_numerizar_coefs()`)
+        símismo.registro_paráms = None  # type: RegistroParáms
+
         #
         # NUNCA recrear este diccionario. Lo puedes borrar con .clear() en vez.
         símismo.dic_simul = {
@@ -634,13 +652,58 @@ class Simulable(Coso):
             'l_m_preds_todas': [],
             'l_ubics_m_preds': [],
             'd_calib': {},
-            'inic_d_predics_exps': {}
+            'estado_inic': {},
+            'predics_apiladas': {},
+            'exps_apilados': [],
+            'd_pasos_obs_valid': {}
         }
         símismo.predics_exps = símismo.dic_simul['d_predics_exps']  # Simplificación del código
 
         # Predicciones de datos (para simulaciones normales)
         símismo.predics = {}
 
+        # La precisión numérica de las matrices de predicciones de la simulación actual (ver `precisiones`)
+        símismo.precisión = 'doble'
+
+        # Si la simulación actual apila todos los experimentos en una única simulación
+        símismo.apilar_exps = False
+
+        # Si la simulación actual guarda únicamente estadísticas resumidas de las predicciones (ver `Resumen`)
+        símismo.resumir = False
+
+        # El directorio donde se guardan las matrices de predicciones de la simulación actual, si se guardan en disco
+        símismo.dir_predics = None
+
+        # Los egresos detallados que registra la simulación actual, si no son todos (ver `simular()`)
+        símismo.registros = None
+
+        # Los pedazos (de repeticiones paramétricas) en los cuales se divide la simulación actual, si hay, y el número
+        # de procesos paralelos para simularlos
+        símismo.pedazos = None
+        símismo.n_procesos = 1
+
+        # El número de repeticiones paramétricas de la simulación actual
+        símismo.n_rep_parám = None
+
+        # Las secuencias de semillas aleatorias de la simulación actual (ver `_sembrar()`), y los generadores
+        # aleatorios de las repeticiones paramétricas que se están simulando
+        símismo.sec_semillas = {}
+        símismo.generadores = []
+
+        # Los pasos en los cuales la simulación actual guarda puntos de control y el directorio donde se guardan, si
+        # hay, y los puntos de control desde los cuales se reanuda cada simulación de experimento (ver `simular()`)
+        símismo.puntos_control = None
+        símismo.reanudar = {}
+
+        # Los puntos de control generados por la simulación (o el pedazo) actual, antes de guardarse, y los archivos
+        # de los puntos de control guardados por la última simulación, por simulación de experimento y por paso
+        símismo.controles_simul = []
+        símismo.archivos_control = {}
+
+        # La instrumentación de las simulaciones (tiempos de cada fase, ganchos de pasos, etc.). Se puede reemplazar
+        # por otra con otros sumideros (ver `Instrumentación`).
+        símismo.instrumentación = Instrumentación()
+
     def info_clima(símismo):
 
         raise NotImplementedError
@@ -676,12 +739,14 @@ class Simulable(Coso):
         # Dejamos la implementación del incremento del modelo a las subclases individuales.
         raise NotImplementedError
 
-    def _incrementar_depurar(símismo, paso, i, detalles, extrn, d_tiempo):
+    def _incrementar_depurar(símismo, paso, i, detalles, extrn):
         raise NotImplementedError
 
     def simular(símismo, exper=None, nombre=None, paso=1, tiempo_final=None, n_rep_parám=100, n_rep_estoc=100,
                 calibs='Todos', usar_especificadas=False, detalles=True, dibujar=True, directorio_dib=None,
-                mostrar=True, opciones_dib=None, dib_dists=True, valid=False, depurar=False):
+                mostrar=True, opciones_dib=None, dib_dists=True, valid=False, depurar=False, precisión='doble',
+                apilar_exps=False, n_procesos=1, tamaño_pedazo=None, resumir=False, en_disco=False, registros=None,
+                semilla=None, puntos_control=None, reanudar=None):
         """
         Esta función corre una simulación del Simulable.
 
@@ -730,6 +795,62 @@ class Simulable(Coso):
         :param dib_dists: Si hay que dibujar las distribuciones utilizadas para la simulación.
         :type dib_dists: bool
 
+        :param precisión: La precisión numérica de las matrices de predicciones. Puede ser `doble` (float64),
+        `simple` (float32) o `conteos` (float32, con los registros de muertes, depredación, etc. de cada paso en
+        números enteros). Las precisiones reducidas ahorran memoria para simulaciones con muchas repeticiones.
+        :type precisión: str
+
+        :param apilar_exps: Si hay que simular todos los experimentos juntos, apilando sus parcelas en una única
+        simulación, en vez de simularlos uno por uno. Ahorra el costo (fijo) de cada paso de simulación cuando hay
+        muchos experimentos.
+        :type apilar_exps: bool
+
+        :param n_procesos: El número de procesos paralelos para la simulación. Si es más que 1, las repeticiones
+        paramétricas se dividen en pedazos que se simulan en paralelo.
+        :type n_procesos: int
+
+        :param tamaño_pedazo: El número de repeticiones paramétricas en cada pedazo. Los resultados no dependen del
+        tamaño de los pedazos (ver `semilla`). Si es `None` y `n_procesos` es más que 1, se usa
+        `Simulable.tamaño_pedazo`.
+        :type tamaño_pedazo: int
+
+        :param resumir: Si hay que guardar únicamente estadísticas resumidas (promedio, varianza, percentiles) de las
+        predicciones de cada paso, en vez de las predicciones de todas las repeticiones. La memoria necesaria ya no
+        depende del número de repeticiones. No se guardan los egresos detallados (`detalles` no tiene efecto).
+        :type resumir: bool
+
+        :param en_disco: Si hay que guardar las matrices de predicciones con eje de tiempo en archivos `.npy` (con
+        `np.memmap`) en el directorio de la simulación, en vez de en la memoria, para simulaciones más grandes que la
+        memoria disponible. Los archivos quedan como resultados de la simulación (se pueden leer con
+        `np.load(..., mmap_mode='r')`).
+        :type en_disco: bool
+
+        :param registros: Los egresos detallados que hay que registrar, si no se quieren todos. Es un diccionario de
+        egresos, cada uno con, opcionalmente, las `etapas` que registrar (nombres de organismos o tuplas de organismo y
+        etapa; todas si no se especifican) y `cada` cuántos pasos (1 si no se especifica). Por ejemplo,
+        `{'Depredación': {'etapas': ['Parasitoide larvas'], 'cada': 7}}`. Los egresos que no se especifican no se
+        registran. Las poblaciones siempre se registran completas. Implica `detalles=True`.
+        :type registros: dict
+
+        :param semilla: La semilla aleatoria de la simulación. Cada repetición paramétrica tiene su propio generador
+        aleatorio, derivado de esta semilla, así que los resultados no dependen ni de `tamaño_pedazo` ni de
+        `n_procesos`. Si es `None`, se deriva del generador aleatorio global (así que `np.random.seed()` sigue
+        controlando los resultados).
+        :type semilla: int
+
+        :param puntos_control: Los pasos en los cuales guardar un punto de control de la simulación (el estado completo
+        del modelo, los valores de los parámetros y el estado de los generadores aleatorios), en un archivo `.npz` en
+        el directorio de la simulación. Los archivos de la última simulación quedan en `Simulable.archivos_control`.
+        :type puntos_control: int | list[int]
+
+        :param reanudar: El archivo de un punto de control desde el cual reanudar la simulación, en vez de empezarla
+        desde el principio. Se puede cambiar el tiempo final o los experimentos (p. ej., su clima), pero no el número
+        de repeticiones, el paso ni los egresos detallados registrados (`detalles` y `registros`). Los valores de los
+        parámetros son los del punto de control. Si hay varias simulaciones de experimentos, debe ser un diccionario
+        con el nombre de cada simulación (el nombre del experimento, o los nombres de los experimentos apilados
+        separados por comas) que se reanuda.
+        :type reanudar: str | dict[str, str]
+
         """
 
         # Validar el nombre de la simulaión
@@ -747,6 +868,9 @@ class Simulable(Coso):
         # Actualizar el objeto
         símismo.actualizar()
 
+        # Preparar los generadores aleatorios de la simulación
+        símismo._sembrar(semilla)
+
         # Permitir que se use el experimento intrínsico de la Red si no se especificó otra cosa.
         if exper is None:
             exper = símismo.Experimento
@@ -770,16 +894,52 @@ class Simulable(Coso):
         # Generar los vectores de coeficientes. Si es una simulación de análisis de sensibilidad, no tendrá impacto,
         # porque no cambiará el orden de los vectores de valores de parámetros ya establecido.
         Incert.trazas_a_dists(id_simul=nombre, l_d_pm=lista_paráms, l_trazas=lista_calibs, formato='valid',
-                              comunes=(calibs == 'Comunes'), n_rep_parám=n_rep_parám)
+                              comunes=(calibs == 'Comunes'), n_rep_parám=n_rep_parám,
+                              generador=np.random.default_rng(símismo.sec_semillas['trazas']))
 
         # Llenar las matrices internas de coeficientes
         símismo._llenar_coefs(nombre_simul=nombre, n_rep_parám=n_rep_parám, ubics_paráms=ubics_paráms,
                               dib_dists=dib_dists, calibs=lista_calibs)
 
+        # Dividir las repeticiones paramétricas en pedazos, si hay que simularlas por pedazos
+        if tamaño_pedazo is None and n_procesos > 1:
+            tamaño_pedazo = símismo.tamaño_pedazo
+        símismo.n_procesos = n_procesos
+        símismo.pedazos = gen_pedazos(n_rep_parám, tamaño_pedazo) if tamaño_pedazo is not None else None
+
+        # Las simulaciones resumidas no guardan los egresos detallados de cada paso, y si se especificaron los
+        # egresos para registrar, la simulación es detallada
+        if resumir:
+            detalles = False
+        elif registros is not None:
+            detalles = True
+
+        # El directorio para las matrices de predicciones, si se guardan en disco
+        if en_disco:
+            dir_predics = símismo._prep_directorio(
+                directorio=os.path.join(símismo.proyecto, símismo.nombre, nombre, 'Predics')
+            )
+        else:
+            dir_predics = None
+
+        # El directorio para los puntos de control, si hay que guardarlos
+        if puntos_control is not None:
+            if isinstance(puntos_control, int):
+                puntos_control = [puntos_control]
+            puntos_control = {
+                'pasos': set(puntos_control),
+                'directorio': símismo._prep_directorio(
+                    directorio=os.path.join(símismo.proyecto, símismo.nombre, nombre, 'Control')
+                )
+            }
+
         # Simular los experimentos
         dic_argums = símismo._prep_args_simul_exps(exper=exper, paso=paso, tiempo_final=tiempo_final)
         símismo._prep_dic_simul(exper=exper, n_rep_estoc=n_rep_estoc, n_rep_paráms=n_rep_parám, paso=paso,
-                                n_pasos=dic_argums['n_pasos'], detalles=detalles, tipo='valid' if valid else 'simul')
+                                n_pasos=dic_argums['n_pasos'], detalles=detalles, tipo='valid' if valid else 'simul',
+                                precisión=precisión, apilar_exps=apilar_exps, resumir=resumir,
+                                dir_predics=dir_predics, registros=registros, puntos_control=puntos_control,
+                                reanudar=reanudar)
         símismo._simul_exps(**dic_argums, paso=paso, detalles=detalles, devolver_calib=False, depurar=depurar)
 
         # Borrar los vectores de coeficientes temporarios
@@ -791,7 +951,8 @@ class Simulable(Coso):
 
     def calibrar(símismo, nombre=None, aprioris=None, exper=None, paso=1, n_rep_estoc=10, tiempo_final=None,
                  n_iter=10000, quema=100, extraer=10, método='Metrópolis adaptivo', pedazitos=None,
-                 usar_especificadas=True, dibujar=False, depurar=False):
+                 usar_especificadas=True, dibujar=False, depurar=False, precisión='doble', apilar_exps=False,
+                 semilla=None):
         """
         Esta función calibra un Simulable. Para calibrar un modelo, hay algunas cosas que hacer:
           1. Estar seguro de el el nombre de la calibración sea válido
@@ -832,14 +993,32 @@ class Simulable(Coso):
           extraer = 1 lleva al uso de todas las iteraciones.
         :type extraer: int
 
+        :param pedazitos: El número de pedazitos en los cuales dividir el tiempo de la calibración. Cada pedazito
+          calibra hasta una fracción más del tiempo final, usando la calibración del pedazito anterior como a priori.
+          Notar que los puntos de control de `Simulable.simular()` (`puntos_control` y `reanudar`) no se usan aquí: los
+          parámetros cambian con cada iteración de la calibración, así que no hay un estado común desde el cual
+          reanudar. Por lo tanto, cada iteración de cada pedazito vuelve a simular desde el paso 0 (el tiempo total
+          de simulación crece más o menos con `pedazitos / 2`), y una calibración interrumpida no se puede reanudar.
+        :type pedazitos: int
+
         :param dibujar: Si queremos dibujar los resultados de las calibraciones (cambios en distribuciones de
           parámetros) o no.
         :type dibujar: bool
 
+        :param precisión: La precisión numérica de las matrices de predicciones. Ver `Simulable.simular()`.
+        :type precisión: str
+
+        :param apilar_exps: Si hay que simular todos los experimentos juntos. Ver `Simulable.simular()`.
+        :type apilar_exps: bool
+
+        :param semilla: La semilla aleatoria de la calibración. Ver `Simulable.simular()`.
+        :type semilla: int
+
         """
 
         # 0. Actualizar
         símismo.actualizar()
+        símismo._sembrar(semilla)
 
         # 1. Primero, validamos el nombre y, si necesario, lo creamos.
         nombre = símismo._valid_nombre_simul(nombre=nombre)
@@ -864,7 +1043,8 @@ class Simulable(Coso):
                                  tiempo_final={exp: int(tiempo_final[exp] * f / pedazitos) for exp in tiempo_final},
                                  pedazitos=None,  # Queremos cada subcalibración sin sus propias pedazitos
                                  usar_especificadas=usar_especificadas if f == 1 else False,
-                                 dibujar=False, depurar=depurar)
+                                 dibujar=False, depurar=depurar, precisión=precisión, apilar_exps=apilar_exps,
+                                 semilla=semilla)
                 símismo.guardar_calib(descrip='Pedazito {} de calib {}'.format(f, nombre),
                                       utilizador='Interno a Tiko\'n. Nunca debería de ver esta calibración.',
                                       contacto=__correo__)
@@ -884,7 +1064,8 @@ class Simulable(Coso):
         dic_argums['depurar'] = depurar
 
         símismo._prep_dic_simul(exper=exper, n_rep_estoc=n_rep_estoc, n_rep_paráms=1, paso=paso,
-                                n_pasos=dic_argums['n_pasos'], detalles=False, tipo='calib')
+                                n_pasos=dic_argums['n_pasos'], detalles=False, tipo='calib', precisión=precisión,
+                                apilar_exps=apilar_exps)
 
         # 2. Creamos la lista de parámetros que hay que calibrar
         lista_paráms, lista_líms, nombres = símismo._gen_lista_coefs_interés_todos()
@@ -1009,7 +1190,9 @@ class Simulable(Coso):
 
     def validar(símismo, exper, nombre=None, calibs=None, paso=1, n_rep_parám=20, n_rep_estoc=20,
                 usar_especificadas=False, detalles=False, guardar=True,
-                dibujar=True, mostrar=False, opciones_dib=None, dib_dists=True, depurar=False):
+                dibujar=True, mostrar=False, opciones_dib=None, dib_dists=True, depurar=False, precisión='doble',
+                apilar_exps=False, n_procesos=1, tamaño_pedazo=None, resumir=False, en_disco=False, registros=None,
+                semilla=None):
         """
         Esta función valida el modelo con datos de observaciones de experimentos.
 
@@ -1057,6 +1240,31 @@ class Simulable(Coso):
         :param dib_dists: Si hay que dibujar las distribuciones utilizadas para la simulación.
         :type dib_dists: bool
 
+        :param precisión: La precisión numérica de las matrices de predicciones. Ver `Simulable.simular()`.
+        :type precisión: str
+
+        :param apilar_exps: Si hay que simular todos los experimentos juntos. Ver `Simulable.simular()`.
+        :type apilar_exps: bool
+
+        :param n_procesos: El número de procesos paralelos. Ver `Simulable.simular()`.
+        :type n_procesos: int
+
+        :param tamaño_pedazo: El número de repeticiones paramétricas en cada pedazo. Ver `Simulable.simular()`.
+        :type tamaño_pedazo: int
+
+        :param resumir: Si hay que guardar únicamente estadísticas resumidas de las predicciones. Ver
+        `Simulable.simular()`.
+        :type resumir: bool
+
+        :param en_disco: Si hay que guardar las matrices de predicciones en disco. Ver `Simulable.simular()`.
+        :type en_disco: bool
+
+        :param registros: Los egresos detallados que hay que registrar. Ver `Simulable.simular()`.
+        :type registros: dict
+
+        :param semilla: La semilla aleatoria de la validación. Ver `Simulable.simular()`.
+        :type semilla: int
+
         :return: Un diccionario con los resultados de la validación.
         :rtype: dict
         """
@@ -1075,7 +1283,10 @@ class Simulable(Coso):
         símismo.simular(nombre=nombre, exper=exper, paso=paso, n_rep_parám=n_rep_parám, n_rep_estoc=n_rep_estoc,
                         calibs=calibs, usar_especificadas=usar_especificadas, detalles=detalles,
                         dibujar=dibujar, mostrar=mostrar,
-                        opciones_dib=opciones_dib, dib_dists=dib_dists, valid=True, depurar=depurar)
+                        opciones_dib=opciones_dib, dib_dists=dib_dists, valid=True, depurar=depurar,
+                        precisión=precisión, apilar_exps=apilar_exps, n_procesos=n_procesos,
+                        tamaño_pedazo=tamaño_pedazo, resumir=resumir, en_disco=en_disco, registros=registros,
+                        semilla=semilla)
 
         # Procesar los datos de la validación
         símismo._procesar_valid()
@@ -1309,7 +1520,7 @@ class Simulable(Coso):
 
         raise NotImplementedError
 
-    def _calc_simul(símismo, paso, n_pasos, detalles, extrn=None, depurar=False):
+    def _calc_simul(símismo, paso, n_pasos, detalles, extrn=None, depurar=False, numerizar=True, control=None):
         """
         Esta función aumenta el modelo para cada paso en la simulación. Se usa en simulaciones normales, tanto como en
           simulaciones de experimentos.
@@ -1323,28 +1534,86 @@ class Simulable(Coso):
         :param extrn: Un diccionario externo, si necesario, con información para la simulación.
         :type extrn: dict
 
+        :param numerizar: Si hay que numerizar los coeficientes. Se pone `False` si ya se numerizaron (por ejemplo,
+        para simular un pedazo de las repeticiones paramétricas).
+        :type numerizar: bool
+
+        :param control: El punto de control desde el cual reanudar la simulación, si hay (ver `cargar_punto_control()`).
+        Si `numerizar` es `False`, los coeficientes ya deben de ser los del punto de control.
+        :type control: dict
+
         """
 
         # Cosas que hay que hacer justo antes de simular
-        símismo._numerizar_coefs()
+        if numerizar:
+            símismo._numerizar_coefs()
+            if control is not None:
+                símismo._restaurar_coefs_control(control['coefs'])
         símismo._justo_antes_de_simular()
+        símismo._prep_forzantes(extrn=extrn)
+
+        # Los puntos de control que guarda esta simulación
+        símismo.controles_simul = []
+        pasos_control = símismo.puntos_control['pasos'] if símismo.puntos_control is not None else set()
+
+        # El paso desde el cual se simula
+        i_inic = 0
+        if control is not None:
+            i_inic = símismo._restaurar_punto_control(control, paso=paso, n_pasos=n_pasos)
+
+        # En simulaciones resumidas, cada paso se agrega a las estadísticas resumidas justo después de calcularse
+        resumir = símismo.resumir
+        if resumir:
+            símismo._resumir_paso(i=0)
+
+        instr = símismo.instrumentación
+        fase_paso = instr.fase('Paso')
 
         if not depurar:
             # Para cada paso de tiempo, incrementar el modelo
-            for i in range(1, n_pasos):  # para hacer: ¿n_pasos o n_pasos+1?
-                símismo.incrementar(paso, i=i, detalles=detalles, extrn=extrn)
+            for i in range(i_inic + 1, n_pasos):  # para hacer: ¿n_pasos o n_pasos+1?
+                instr.i = i
+                with fase_paso:
+                    símismo.incrementar(paso, i=i, detalles=detalles, extrn=extrn)
+                if resumir:
+                    símismo._resumir_paso(i=i)
+                if i in pasos_control:
+                    símismo.controles_simul.append(símismo._gen_punto_control(i=i, paso=paso))
+                instr.paso(símismo, i)
         else:
-            # Para cada paso de tiempo, incrementar el modelo
-            d_tiempo = {}
-            for i in range(1, n_pasos):  # para hacer: ¿n_pasos o n_pasos+1?
-                d_tiempo = símismo._incrementar_depurar(paso, i=i, detalles=detalles, extrn=extrn, d_tiempo=d_tiempo)
-
-            t_total_interno = sum(v for v in d_tiempo.values())
+            # Las estadísticas de las fases de esta simulación, para imprimirlas al final
+            estads = SumideroMemoria()
+            instr.sumideros.append(estads)
+            try:
+                # Para cada paso de tiempo, incrementar el modelo
+                for i in range(i_inic + 1, n_pasos):  # para hacer: ¿n_pasos o n_pasos+1?
+                    instr.i = i
+                    with fase_paso:
+                        símismo._incrementar_depurar(paso, i=i, detalles=detalles, extrn=extrn)
+                    if resumir:
+                        símismo._resumir_paso(i=i)
+                    if i in pasos_control:
+                        símismo.controles_simul.append(símismo._gen_punto_control(i=i, paso=paso))
+                    instr.paso(símismo, i)
+            finally:
+                instr.sumideros.remove(estads)
 
             print('Descomposición de tiempo de simulación\n')
-            print('\t{:<13}{:>12}{:>14}'.format('Cálculo', 'Segundos', '% del total'))
-            for ll, v in d_tiempo.items():
-                print('\t{:<13}{:12.2f}{:12.2f} %'.format(ll, v, v / t_total_interno * 100))
+            print(estads.tabla(referencia='Paso'))
+
+        instr.i = None
+        instr.contar('Pasos', n_pasos - 1 - i_inic)
+
+    def _resumir_paso(símismo, i):
+        """
+        Agrega las predicciones de un paso a las estadísticas resumidas de la simulación actual. Se implementa en las
+        subclases que se pueden simular en modo resumido.
+
+        :param i: El número del paso.
+        :type i: int
+        """
+
+        raise NotImplementedError
 
     def _gen_lista_coefs_interés_todos(símismo):
 
@@ -1474,9 +1743,10 @@ class Simulable(Coso):
 
             n_pasos = mat.ceil(tiempo_final[exp] / paso) + 1
 
-            # También guardamos el número de pasos y las superficies de las parcelas.
+            # También guardamos el número de pasos, las superficies de las parcelas y el clima de cada paso.
             dic_args['n_pasos'][exp] = n_pasos
-            dic_args['extrn'][exp] = {'superficies': tamaño_parcelas}
+            dic_args['extrn'][exp] = {'superficies': tamaño_parcelas,
+                                      **obj_exp.obt_clima(parc=parc, n_pasos=n_pasos, paso=paso)}
 
         return dic_args
 
@@ -1494,7 +1764,26 @@ class Simulable(Coso):
         else:
             return {exp: tiempo_final for exp in exper}
 
-    def _prep_dic_simul(símismo, exper, n_rep_estoc, n_rep_paráms, paso, n_pasos, detalles, tipo):
+    def _sembrar(símismo, semilla):
+        """
+        Prepara las secuencias de semillas aleatorias (`np.random.SeedSequence`) independientes de una simulación: una
+        para escoger los valores de los parámetros (`trazas`), una para las condiciones iniciales (`inic`) y una para
+        la simulación sí misma (`simul`), de la cual cada simulación de experimento deriva una semilla para cada
+        repetición paramétrica.
+
+        :param semilla: La semilla. Si es `None`, se deriva del generador aleatorio global.
+        :type semilla: int
+
+        """
+
+        if semilla is None:
+            semilla = np.random.randint(2 ** 31)
+
+        símismo.sec_semillas = dict(zip(['trazas', 'inic', 'simul'], np.random.SeedSequence(semilla).spawn(3)))
+
+    def _prep_dic_simul(símismo, exper, n_rep_estoc, n_rep_paráms, paso, n_pasos, detalles, tipo, precisión='doble',
+                        apilar_exps=False, resumir=False, dir_predics=None, registros=None, puntos_control=None,
+                        reanudar=None):
         """
 
         :param exper:
@@ -1511,10 +1800,56 @@ class Simulable(Coso):
         :type detalles: bool
         :param tipo:
         :type tipo: str
+        :param precisión: La precisión numérica de las matrices de predicciones.
+        :type precisión: str
+        :param apilar_exps: Si hay que apilar los experimentos en una única simulación.
+        :type apilar_exps: bool
+        :param resumir: Si hay que guardar únicamente estadísticas resumidas de las predicciones.
+        :type resumir: bool
+        :param dir_predics: El directorio donde guardar las matrices de predicciones en disco, si hay.
+        :type dir_predics: str
+        :param registros: Los egresos detallados que hay que registrar, si no son todos.
+        :type registros: dict
+        :param puntos_control: Los pasos en los cuales guardar puntos de control (`pasos`) y el directorio donde
+        guardarlos (`directorio`), si hay.
+        :type puntos_control: dict
+        :param reanudar: El archivo del punto de control desde el cual reanudar la simulación, o un diccionario de
+        archivos por simulación de experimento.
+        :type reanudar: str | dict[str, str]
         :return:
         :rtype:
         """
 
+        if precisión not in símismo.precisiones:
+            raise ValueError('Precisión "{}" no reconocida. Debe ser una de: {}.'
+                             .format(precisión, ', '.join(símismo.precisiones)))
+        if resumir and apilar_exps:
+            raise ValueError('No se pueden apilar los experimentos en una simulación resumida.')
+        if dir_predics is not None and (resumir or apilar_exps):
+            raise ValueError('Las predicciones de simulaciones resumidas o con experimentos apilados no se pueden '
+                             'guardar en disco.')
+        if resumir and (puntos_control is not None or reanudar is not None):
+            raise ValueError('Las simulaciones resumidas no pueden guardar ni reanudar puntos de control.')
+        símismo.precisión = precisión
+        símismo.apilar_exps = apilar_exps
+        símismo.resumir = resumir
+        símismo.dir_predics = dir_predics
+        símismo.registros = registros
+        símismo.n_rep_parám = n_rep_paráms
+        símismo.puntos_control = puntos_control
+        símismo.archivos_control = {}
+
+        # Los puntos de control para reanudar, por simulación de experimento
+        if reanudar is None:
+            reanudar = {}
+        elif isinstance(reanudar, str):
+            n_simuls = 1 if apilar_exps else len(exper)
+            if n_simuls != 1:
+                raise ValueError('Con varias simulaciones de experimentos, hay que especificar el punto de control '
+                                 'de cada simulación que se reanuda en un diccionario.')
+            reanudar = {None: reanudar}
+        símismo.reanudar = reanudar
+
         #
         dic_simul = símismo.dic_simul
 
@@ -1565,39 +1900,416 @@ class Simulable(Coso):
 
         """
 
-        # Hacer una copia de los datos iniciales (así que, en la calibración del modelo, una iteración no borará los
-        # datos iniciales para las próximas).
-        llenar_copia_dic_matr(d_f=símismo.dic_simul['inic_d_predics_exps'], d_r=símismo.predics_exps)
-
-        # Para cada experimento...
-        for exp in símismo.predics_exps:
-            # Apuntar el diccionario de predicciones del Simulable al diccionario apropiado en símismo.predics_exps.
-            símismo.predics = símismo.predics_exps[exp]
+        # Reinicializar las predicciones con los datos iniciales (así que, en la calibración del modelo, una iteración
+        # no borará los datos iniciales para las próximas).
+        restaurar_estado_inic(símismo.dic_simul['estado_inic'])
 
-            # Simular el modelo
-            antes = time.time()
-            símismo._calc_simul(paso=paso, n_pasos=n_pasos[exp], detalles=detalles, extrn=extrn[exp], depurar=depurar)
-            print('Simulación (%s) calculada en: ' % exp, time.time() - antes)
+        exps_apilados = símismo.dic_simul['exps_apilados']
+        if len(exps_apilados):
+            # Si los experimentos están apilados, simularlos todos juntos. Las matrices de predicciones de cada
+            # experimento son vistas de las matrices apiladas, así que no hay que separar los resultados después.
+            simuls = [(', '.join(exps_apilados), símismo.dic_simul['predics_apiladas'],
+                       max(n_pasos[exp] for exp in exps_apilados),
+                       símismo._apilar_extrn(extrn=extrn, exps=exps_apilados))]
+        else:
+            # Si no, simular cada experimento por separado.
+            simuls = [(exp, símismo.predics_exps[exp], n_pasos[exp], extrn[exp]) for exp in símismo.predics_exps]
+
+        # Cada simulación tiene su secuencia de semillas, con una semilla para cada repetición paramétrica. Como se
+        # derivan de la secuencia de la simulación actual, cada llamada (por ejemplo, cada iteración de una
+        # calibración) tiene semillas distintas.
+        l_sec_semillas = símismo.sec_semillas['simul'].spawn(len(simuls))
+
+        no_encontrados = set(símismo.reanudar) - {None} - {nombre for nombre, *_ in simuls}
+        if no_encontrados:
+            raise ValueError('No hay simulaciones de experimentos {} para reanudar.'
+                             .format(', '.join('"{}"'.format(n) for n in no_encontrados)))
+
+        instr = símismo.instrumentación
+        instr.empezar()
+
+        for (nombre, predics, n_pasos_simul, extrn_simul), sec_semillas in zip(simuls, l_sec_semillas):
+            instr.simul = nombre
+            with instr.fase('Simulación'):
+                símismo._simul_un_exp(nombre=nombre, predics=predics, paso=paso, n_pasos=n_pasos_simul,
+                                      detalles=detalles, extrn=extrn_simul, sec_semillas=sec_semillas,
+                                      devolver_calib=devolver_calib, depurar=depurar)
+        instr.simul = None
 
         # Procesar los egresos de la simulación.
-        antes = time.time()
-        símismo._procesar_simul()
-        dif_p_s = time.time() - antes
+        with instr.fase('Procesar simulación'):
+            símismo._procesar_simul()
 
         if devolver_calib:
             # Convertir los diccionarios de predicciones en un vector numpy.
-            antes = time.time()
-            símismo._procesar_valid()
-            dif_p_v = time.time() - antes
-            antes = time.time()
-            símismo._procesar_calib()
-            dif_p_c = time.time() - antes
-            print('Procesando predicciones: \n\tSimul: {}\n\tValid: {}\n\tCalib: {}\n\tTotal: {}'
-                  .format(dif_p_s, dif_p_v, dif_p_c, dif_p_s + dif_p_v + dif_p_c))
+            with instr.fase('Procesar validación'):
+                símismo._procesar_valid()
+            with instr.fase('Procesar calibración'):
+                símismo._procesar_calib()
+
+        instr.terminar()
 
+        if devolver_calib:
             # Devolver las predicciones.
             return símismo.dic_simul['d_calib']
 
+    def _simul_un_exp(símismo, nombre, predics, paso, n_pasos, detalles, extrn, sec_semillas, devolver_calib,
+                      depurar=False):
+        """
+        Simula una simulación de experimento (o de experimentos apilados) de `_simul_exps()`, y guarda sus puntos de
+        control, si hay.
+
+        :param nombre: El nombre de la simulación.
+        :type nombre: str
+
+        :param predics: El diccionario de predicciones de la simulación.
+        :type predics: dict
+
+        :param paso: El paso de la simulación.
+        :type paso: int
+
+        :param n_pasos: El número de pasos.
+        :type n_pasos: int
+
+        :param detalles: Si hay que guardar los egresos detallados de cada paso.
+        :type detalles: bool
+
+        :param extrn: Los valores externos para la simulación.
+        :type extrn: dict
+
+        :param sec_semillas: La secuencia de semillas de la simulación.
+        :type sec_semillas: np.random.SeedSequence
+
+        :param devolver_calib: Si la simulación es parte de una calibración (que no se simula por pedazos).
+        :type devolver_calib: bool
+
+        :param depurar: Si hay que verificar el estado del modelo a cada paso.
+        :type depurar: bool
+        """
+
+        semillas_reps = sec_semillas.spawn(símismo.n_rep_parám)
+
+        # El punto de control desde el cual reanudar la simulación, si hay
+        archivo_control = símismo.reanudar.get(nombre, símismo.reanudar.get(None))
+        control = cargar_punto_control(archivo_control) if archivo_control is not None else None
+
+        if símismo.pedazos is not None and not devolver_calib:
+            # Simular por pedazos de repeticiones paramétricas
+            símismo._simul_pedazos(predics=predics, paso=paso, n_pasos=n_pasos, detalles=detalles,
+                                   extrn=extrn, semillas_reps=semillas_reps, control=control)
+        else:
+            # Apuntar el diccionario de predicciones del Simulable al diccionario apropiado y simular el modelo
+            símismo.predics = predics
+            símismo.generadores = [np.random.default_rng(s) for s in semillas_reps]
+            símismo._calc_simul(paso=paso, n_pasos=n_pasos, detalles=detalles, extrn=extrn,
+                                depurar=depurar, control=control)
+
+        # Guardar los puntos de control de la simulación
+        if símismo.puntos_control is not None:
+            símismo.archivos_control[nombre] = {}
+            for ctrl in símismo.controles_simul:
+                archivo = os.path.join(símismo.puntos_control['directorio'],
+                                       '{}_{}.npz'.format(nombre, ctrl['i']))
+                guardar_punto_control(ctrl, archivo)
+                símismo.archivos_control[nombre][ctrl['i']] = archivo
+        símismo.controles_simul = []
+
+    def _simul_pedazos(símismo, predics, paso, n_pasos, detalles, extrn, semillas_reps, control=None):
+        """
+        Simula un diccionario de predicciones por pedazos de repeticiones paramétricas (`símismo.pedazos`), en
+        paralelo si `símismo.n_procesos` es más que 1. Los procesos paralelos heredan el Simulable (con `fork`), así que
+        únicamente se mandan los índices de cada pedazo y se devuelven sus resultados. Si el sistema no permite `fork`,
+        se simulan los pedazos uno por uno en este proceso, con los mismos resultados.
+
+        :param predics: El diccionario de predicciones, con sus valores iniciales.
+        :type predics: dict
+
+        :param paso: El paso de la simulación.
+        :type paso: int
+
+        :param n_pasos: El número de pasos.
+        :type n_pasos: int
+
+        :param detalles: Si hay que guardar los egresos detallados de cada paso.
+        :type detalles: bool
+
+        :param extrn: Los valores externos para la simulación.
+        :type extrn: dict
+
+        :param semillas_reps: La semilla (`np.random.SeedSequence`) de cada repetición paramétrica. Cada pedazo
+        toma las de sus repeticiones, así que los resultados no dependen ni del tamaño de los pedazos ni del número
+        de procesos.
+        :type semillas_reps: list[np.random.SeedSequence]
+
+        :param control: El punto de control desde el cual reanudar la simulación, si hay. Cada pedazo toma las
+        repeticiones paramétricas que le corresponden.
+        :type control: dict
+
+        """
+
+        # Numerizar los coeficientes una única vez; cada pedazo toma después sus repeticiones paramétricas.
+        símismo._numerizar_coefs()
+        if control is not None:
+            símismo._restaurar_coefs_control(control['coefs'])
+
+        _simul_paralela.update(sim=símismo, predics=predics, paso=paso, n_pasos=n_pasos, detalles=detalles,
+                               extrn=extrn, semillas_reps=semillas_reps, control=control)
+        try:
+            n_procesos = min(símismo.n_procesos, len(símismo.pedazos))
+            if n_procesos > 1 and 'fork' in mp.get_all_start_methods():
+                with ProcessPoolExecutor(max_workers=n_procesos, mp_context=mp.get_context('fork')) as ejec:
+                    res = list(ejec.map(_simul_pedazo, símismo.pedazos))
+            else:
+                res = [_simul_pedazo(pedazo) for pedazo in símismo.pedazos]
+        finally:
+            _simul_paralela.clear()
+
+        # Guardar los resultados de cada pedazo en el diccionario de predicciones, y mandar sus eventos de
+        # instrumentación a los sumideros
+        for pedazo, (res_pedazo, _, eventos) in zip(símismo.pedazos, res):
+            símismo._guardar_predics_pedazo(predics=predics, res_pedazo=res_pedazo, rep_parám=pedazo)
+            símismo.instrumentación.reproducir(eventos)
+
+        # Juntar los puntos de control de los pedazos, paso por paso
+        símismo.controles_simul = [juntar_puntos_control(l_ctrl) for l_ctrl in zip(*(ctrls for _, ctrls, _ in res))]
+
+        símismo.predics = predics
+
+    def _simul_un_pedazo(símismo, predics, rep_parám, semillas_reps, paso, n_pasos, detalles, extrn, control=None):
+        """
+        Simula un pedazo de repeticiones paramétricas.
+
+        :param predics: El diccionario de predicciones completo, con sus valores iniciales.
+        :type predics: dict
+
+        :param rep_parám: Las repeticiones paramétricas del pedazo.
+        :type rep_parám: slice
+
+        :param semillas_reps: Las semillas de todas las repeticiones paramétricas de la simulación.
+        :type semillas_reps: list[np.random.SeedSequence]
+
+        :param paso: El paso de la simulación.
+        :type paso: int
+
+        :param n_pasos: El número de pasos.
+        :type n_pasos: int
+
+        :param detalles: Si hay que guardar los egresos detallados de cada paso.
+        :type detalles: bool
+
+        :param extrn: Los valores externos para la simulación.
+        :type extrn: dict
+
+        :param control: El punto de control (de todas las repeticiones paramétricas) desde el cual reanudar la
+        simulación, si hay.
+        :type control: dict
+
+        :return: Las matrices de predicciones del pedazo (sin las matrices de trabajo), los puntos de control del
+        pedazo y sus eventos de instrumentación (que se graban en vez de mandarse a los sumideros, porque el pedazo
+        puede estar en otro proceso).
+        :rtype: (dict, list[dict], list[dict])
+        """
+
+        símismo.generadores = [np.random.default_rng(s) for s in semillas_reps[rep_parám]]
+
+        # Tomar los coeficientes de las repeticiones paramétricas del pedazo
+        coefs_completos = copiar.copy(símismo.coefs_act_númzds)
+        símismo.coefs_act_númzds.clear()
+        símismo.coefs_act_númzds.update(pedazo_dic_matr(d=coefs_completos, índs=rep_parám))
+
+        try:
+            símismo.predics = símismo._gen_predics_pedazo(predics=predics, rep_parám=rep_parám, detalles=detalles)
+            with símismo.instrumentación.grabar() as eventos:
+                símismo._calc_simul(paso=paso, n_pasos=n_pasos, detalles=detalles, extrn=extrn, numerizar=False,
+                                    control=pedazo_punto_control(control, rep_parám) if control is not None else None)
+        finally:
+            símismo.coefs_act_númzds.clear()
+            símismo.coefs_act_númzds.update(coefs_completos)
+
+        controles = símismo.controles_simul
+        símismo.controles_simul = []
+
+        return {ll: v for ll, v in símismo.predics.items() if ll != 'Matrices'}, controles, eventos
+
+    def _gen_predics_pedazo(símismo, predics, rep_parám, detalles):
+        """
+        Genera un diccionario de predicciones para un pedazo de repeticiones paramétricas, con los valores iniciales
+        del diccionario completo. Se implementa en las subclases que se pueden simular por pedazos.
+
+        :param predics: El diccionario de predicciones completo.
+        :type predics: dict
+
+        :param rep_parám: Las repeticiones paramétricas del pedazo.
+        :type rep_parám: slice
+
+        :param detalles: Si hay que guardar los egresos detallados de cada paso.
+        :type detalles: bool
+
+        :return: El diccionario de predicciones del pedazo.
+        :rtype: dict
+        """
+
+        raise NotImplementedError
+
+    def _guardar_predics_pedazo(símismo, predics, res_pedazo, rep_parám):
+        """
+        Guarda los resultados de un pedazo de repeticiones paramétricas en el diccionario de predicciones completo.
+        Se implementa en las subclases que se pueden simular por pedazos.
+
+        :param predics: El diccionario de predicciones completo.
+        :type predics: dict
+
+        :param res_pedazo: Los resultados del pedazo.
+        :type res_pedazo: dict
+
+        :param rep_parám: Las repeticiones paramétricas del pedazo.
+        :type rep_parám: slice
+        """
+
+        raise NotImplementedError
+
+    def _gen_punto_control(símismo, i, paso):
+        """
+        Genera un punto de control de la simulación actual, justo después del paso `i`: el estado del modelo (ver
+        `_estado_control()`), los valores de los parámetros y el estado de los generadores aleatorios. Todas las
+        matrices tienen el eje de repeticiones paramétricas primero, así que un punto de control se puede dividir
+        (`pedazo_punto_control()`) y juntar (`juntar_puntos_control()`) por repeticiones paramétricas.
+
+        :param i: El número del paso.
+        :type i: int
+
+        :param paso: El paso de la simulación.
+        :type paso: int
+
+        :return: El punto de control.
+        :rtype: dict
+        """
+
+        return {
+            'i': i,
+            'paso': paso,
+            'generadores': [gen.bit_generator.state for gen in símismo.generadores],
+            'coefs': copiar.deepcopy(símismo.coefs_act_númzds),
+            'estado': símismo._estado_control(i=i)
+        }
+
+    def _restaurar_punto_control(símismo, control, paso, n_pasos):
+        """
+        Restaura el estado del modelo y de los generadores aleatorios de un punto de control en la simulación actual.
+        Los coeficientes se restauran aparte (`_restaurar_coefs_control()`), porque se tienen que restaurar antes de
+        `_justo_antes_de_simular()`.
+
+        :param control: El punto de control.
+        :type control: dict
+
+        :param paso: El paso de la simulación.
+        :type paso: int
+
+        :param n_pasos: El número de pasos de la simulación.
+        :type n_pasos: int
+
+        :return: El número del paso del punto de control.
+        :rtype: int
+        """
+
+        if control['paso'] != paso:
+            raise ValueError('El punto de control se generó con un paso de {}, y no de {}.'
+                             .format(control['paso'], paso))
+        if control['i'] >= n_pasos:
+            raise ValueError('El punto de control (paso {}) está después del final de la simulación ({} pasos).'
+                             .format(control['i'], n_pasos))
+        if len(control['generadores']) != len(símismo.generadores):
+            raise ValueError('El punto de control tiene {} repeticiones paramétricas, y no {}.'
+                             .format(len(control['generadores']), len(símismo.generadores)))
+
+        for gen, estado in zip(símismo.generadores, control['generadores']):
+            gen.bit_generator.state = estado
+
+        símismo._restaurar_estado_control(estado=control['estado'], i=control['i'])
+
+        return control['i']
+
+    def _restaurar_coefs_control(símismo, coefs):
+        """
+        Reemplaza los coeficientes numerizados de la simulación actual por los de un punto de control. Los valores se
+        escriben en el registro de parámetros hasta la próxima numerización de los coeficientes.
+
+        :param coefs: Los coeficientes numerizados del punto de control.
+        :type coefs: dict
+        """
+
+        l_ubics = []
+        l_vals = dic_a_lista(coefs, l_u=l_ubics)
+
+        for ubic, val in zip(l_ubics, l_vals):
+            try:
+                forma = símismo.registro_paráms.vista(ubic).shape
+            except KeyError:
+                raise ValueError('El coeficiente {} del punto de control no existe en esta simulación.'.format(ubic))
+            if forma != np.shape(val):
+                raise ValueError('El coeficiente {} del punto de control tiene la forma {}, y no {}.'
+                                 .format(ubic, val.shape, forma))
+            símismo.registro_paráms.escribir(ubic, val)
+
+    def _estado_control(símismo, i):
+        """
+        Devuelve el estado del modelo justo después del paso `i`, para un punto de control. Se implementa en las
+        subclases que pueden guardar puntos de control.
+
+        :param i: El número del paso.
+        :type i: int
+
+        :return: Un diccionario de matrices, cada una con el eje de repeticiones paramétricas primero.
+        :rtype: dict
+        """
+
+        raise NotImplementedError
+
+    def _restaurar_estado_control(símismo, estado, i):
+        """
+        Restaura el estado del modelo de un punto de control (ver `_estado_control()`) en las predicciones de la
+        simulación actual. Se implementa en las subclases que pueden guardar puntos de control.
+
+        :param estado: El estado del punto de control.
+        :type estado: dict
+
+        :param i: El número del paso del punto de control.
+        :type i: int
+        """
+
+        raise NotImplementedError
+
+    @staticmethod
+    def _apilar_extrn(extrn, exps):
+        """
+        Junta los valores externos de varios experimentos para una simulación apilada. Por defecto, se concatenan las
+        matrices de cada experimento según su primer eje (parcela), en el mismo orden que los experimentos apilados.
+        Las matrices por paso (p. ej., el clima, de forma (parcela, paso)) se extienden primero con su último valor
+        hasta el número de pasos del experimento más largo.
+
+        :param extrn: El diccionario de valores externos de cada experimento.
+        :type extrn: dict
+
+        :param exps: Los experimentos apilados, en orden.
+        :type exps: list
+
+        :return: El diccionario de valores externos para la simulación apilada.
+        :rtype: dict
+        """
+
+        if any(extrn[exp].keys() != extrn[exps[0]].keys() for exp in exps):
+            raise ValueError('Los experimentos apilados deben tener los mismos datos externos (p. ej., de clima).')
+
+        apilado = {}
+        for ll in extrn[exps[0]]:
+            matrs = [extrn[exp][ll] for exp in exps]
+            n_pasos = max(m.shape[1] if m.ndim > 1 else 0 for m in matrs)
+            apilado[ll] = np.concatenate([
+                np.pad(m, [(0, 0), (0, n_pasos - m.shape[1])], mode='edge') if m.ndim > 1 else m for m in matrs
+            ])
+
+        return apilado
+
     def _procesar_simul(símismo):
         """
         Esta función procesa las predicciones del modelo después de una simulación, si necesario.
@@ -1618,20 +2330,23 @@ class Simulable(Coso):
 
         for t_dist, l_matr in d_l_m_valid.items():
             for i, m_v in enumerate(l_matr):
-                # Días que corresponden exactamente
-                días_v_e, días_p_e = info[t_dist][i]['exactos']
-                if len(días_v_e):
-                    m_p = d_l_m_predics[t_dist][i]
-                    m_v[..., días_v_e] = m_p[..., días_p_e]
-
-                # Días que hay que interpolar
-                días_v_i, *días_p_i = info[t_dist][i]['interpol']
-                if len(días_v_i):
-                    # Pienso que este sería más rápido.
-                    m_v[..., días_v_i] = días_p_i[1]  # El valor superior
-                    m_v[..., días_v_i] -= días_p_i[0]  # La diferencia...
-                    m_v[..., días_v_i] *= días_p_i[2]  # ...Multiplicada por la distancia relativa...
-                    m_v[..., días_v_i] += días_p_i[0]  # ...Agragada al valor inferior
+                # El operador de observación (ver `gen_oper_obs()`)
+                oper = info[t_dist][i]
+
+                # Vistas bidimensionales (repeticiones x tiempo) de las predicciones y de la matriz de validación
+                m_p = d_l_m_predics[t_dist][i].reshape((-1, oper.shape[0]))
+                m_v_2d = m_v.reshape((-1, oper.shape[1]))
+
+                # Proyectar las predicciones en los días de observación con un único producto de matrices, escrito
+                # directamente en la matriz de validación.
+                with np.errstate(invalid='ignore'):
+                    np.matmul(m_p, oper, out=m_v_2d)
+
+                # Pero una población infinita (o NaN) en cualquier paso volvería NaN todas las observaciones (0 * inf).
+                # En este caso (raro), se recalcula con el operador disperso, que únicamente multiplica los pesos no
+                # nulos.
+                if not np.isfinite(np.sum(m_v_2d)):
+                    m_v_2d[:] = m_p @ dispersa.csr_matrix(oper)
 
     def _analizar_valid(símismo):
         """
@@ -1959,16 +2674,31 @@ class Simulable(Coso):
     def _numerizar_coefs(símismo):
         """
         Esta función numeriza los coeficientes de un Simulable (convierte variables PyMC a matrices NumPy).
+
+        La primera vez después de `_llenar_coefs()`, se genera el registro de parámetros, y los coeficientes
+        numerizados se vuelven vistas de su matriz de valores. Después, basta con actualizar los valores del registro.
         """
 
-        # Numerizar el diccionario de coeficientes.
-        numerizados = Incert.numerizar(f=símismo.coefs_act)
+        if símismo.registro_paráms is None:
+            símismo.registro_paráms = RegistroParáms(símismo.coefs_act)
 
-        # Vaciar el diccionario existente.
-        símismo.coefs_act_númzds.clear()
+            símismo.coefs_act_númzds.clear()
+            símismo.coefs_act_númzds.update(símismo.registro_paráms.coefs)
 
-        # Llenar el diccionario con los coeficientes numerizados.
-        símismo.coefs_act_númzds.update(numerizados)
+        else:
+            símismo.registro_paráms.numerizar()
+
+    def _prep_forzantes(símismo, extrn):
+        """
+        Esta función, aplicada en las subclases de Simulable que lo necesitan, precalcula una vez antes de cada
+        simulación los valores que dependen únicamente de los datos externos por paso (p. ej., el clima) y de los
+        parámetros, para que cada paso de la simulación solamente tenga que consultarlos.
+
+        :param extrn: El diccionario de datos externos de la simulación.
+        :type extrn: dict | None
+        """
+
+        pass
 
     def _justo_antes_de_simular(símismo):
         """
@@ -2147,6 +2877,8 @@ def dic_a_lista(d, l=None, ll_f=None, l_u=None, u=None):
             if l_u is not None:
                 u.append(ll)
             dic_a_lista(v, l=l, ll_f=ll_f, l_u=l_u, u=u)
+            if l_u is not None:
+                u.pop(-1)
         else:
             l.append(v)
             if l_u is not None:
@@ -2157,29 +2889,297 @@ def dic_a_lista(d, l=None, ll_f=None, l_u=None, u=None):
     return l
 
 
-def llenar_copia_dic_matr(d_f, d_r):
+def gen_matr_predic(forma, tipo, archivo=None):
     """
-    Llena una copia ya formada de un diccionario de matrices con los valores en un diccionario de la misma estructura.
-    No recrea las matrices, lo cual ahorra tiempo.
+    Genera una matriz de predicciones (llena de ceros), en la memoria o, si se especifica un archivo, en un archivo
+    `.npy` en disco (con `np.memmap`). En el segundo caso, el sistema operativo lee y escribe las partes de la matriz
+    según se necesitan, así que la matriz puede ser más grande que la memoria disponible.
+
+    :param forma: La forma de la matriz.
+    :type forma: tuple
 
-    :param d_f: El diccionario fuente.
-    :type d_f: dict
-    :param d_r: El diccionario recipiente.
-    :type d_r: dict
+    :param tipo: El tipo de datos de la matriz.
+    :type tipo: type
 
+    :param archivo: El archivo `.npy` para la matriz, si hay.
+    :type archivo: str
+
+    :return: La matriz.
+    :rtype: np.ndarray
     """
 
-    for ll, v in d_f.items():
-        if isinstance(v, dict):
-            llenar_copia_dic_matr(d_f=v, d_r=d_r[ll])
-        elif isinstance(v, np.ndarray):
-            if d_r[ll].shape == v.shape:
-                d_r[ll][:] = v
-            else:
-                # Para unas matrices, copiar el primer día de datos solamente.
-                d_r[ll][..., 0] = v
-        else:
-            pass
+    if archivo is None:
+        return np.zeros(shape=forma, dtype=tipo)
+
+    # Un archivo nuevo ya está lleno de ceros
+    return np.lib.format.open_memmap(archivo, mode='w+', dtype=tipo, shape=forma)
+
+
+def gen_oper_obs(días, paso, n_pasos, tipo=float):
+    """
+    Genera el operador de observación que proyecta el eje de tiempo de una matriz de predicciones sobre los días de
+    observación. Los días que no caen exactamente en un paso de la simulación se interpolan linealmente entre los dos
+    pasos que los rodean.
+
+    El operador cubre todo el eje de tiempo de las predicciones, así que se puede multiplicar directamente con una
+    vista de la matriz de predicciones (sin copiar los pasos necesarios) y escribir el resultado en una matriz ya
+    existente (ver `Simulable._procesar_valid()`).
+
+    :param días: Los días de las observaciones.
+    :type días: np.ndarray | list
+
+    :param paso: El paso de la simulación.
+    :type paso: int
+
+    :param n_pasos: El número de pasos (incluso el paso inicial) en el eje de tiempo de las predicciones.
+    :type n_pasos: int
+
+    :param tipo: El tipo de datos de las predicciones.
+    :type tipo: type
+
+    :return: La matriz (pasos x días de observación) que hay que multiplicar con las predicciones.
+    :rtype: np.ndarray
+    """
+
+    días = np.asarray(días)
+    n_días = días.size
+
+    í_inf = np.floor_divide(días, paso).astype(int)  # Los pasos inferiores (o exactos)
+    pesos = np.remainder(días, paso) / paso  # La distancia relativa de la interpolación
+    inter = pesos != 0  # Los días que hay que interpolar
+
+    oper = np.zeros((n_pasos, n_días), dtype=tipo)
+    oper[í_inf, np.arange(n_días)] = 1 - pesos
+    oper[í_inf[inter] + 1, np.arange(n_días)[inter]] = pesos[inter]
+
+    return oper
+
+
+def gen_pedazos(n_rep, tamaño):
+    """
+    Divide un número de repeticiones en pedazos de un tamaño dado (el último puede ser más pequeño).
+
+    :param n_rep: El número de repeticiones.
+    :type n_rep: int
+
+    :param tamaño: El tamaño de cada pedazo.
+    :type tamaño: int
+
+    :return: Los índices de cada pedazo.
+    :rtype: list[slice]
+    """
+
+    if tamaño < 1:
+        raise ValueError('El tamaño de los pedazos debe ser por lo menos 1.')
+
+    return [slice(i, min(i + tamaño, n_rep)) for i in range(0, n_rep, tamaño)]
+
+
+def pedazo_dic_matr(d, índs):
+    """
+    Genera una copia de un diccionario (o lista) de matrices con únicamente los índices dados del primer eje de cada
+    matriz.
+
+    :param d: El diccionario o lista de matrices.
+    :type d: dict | list
+
+    :param índs: Los índices del primer eje.
+    :type índs: slice
+
+    :return: El diccionario o lista con matrices cortadas.
+    :rtype: dict | list
+    """
+
+    if isinstance(d, dict):
+        return {ll: pedazo_dic_matr(v, índs) for ll, v in d.items()}
+    elif isinstance(d, list):
+        return [pedazo_dic_matr(v, índs) for v in d]
+    elif isinstance(d, np.ndarray) and d.ndim > 0:
+        return d[índs]
+    else:
+        return d
+
+
+def juntar_dic_matr(l_d):
+    """
+    Junta una lista de diccionarios de matrices de la misma estructura según el primer eje de cada matriz. Es el
+    opuesto de `pedazo_dic_matr()`.
+
+    :param l_d: La lista de diccionarios (o de matrices).
+    :type l_d: list[dict] | list[np.ndarray]
+
+    :return: El diccionario con las matrices juntadas.
+    :rtype: dict | np.ndarray
+    """
+
+    if isinstance(l_d[0], dict):
+        return {ll: juntar_dic_matr([d[ll] for d in l_d]) for ll in l_d[0]}
+    elif isinstance(l_d[0], np.ndarray) and l_d[0].ndim > 0:
+        return np.concatenate(l_d)
+    else:
+        return l_d[0]
+
+
+def pedazo_punto_control(control, índs):
+    """
+    Genera un punto de control con únicamente unas repeticiones paramétricas.
+
+    :param control: El punto de control.
+    :type control: dict
+
+    :param índs: Las repeticiones paramétricas.
+    :type índs: slice
+
+    :return: El punto de control de las repeticiones paramétricas.
+    :rtype: dict
+    """
+
+    return {
+        'i': control['i'],
+        'paso': control['paso'],
+        'generadores': control['generadores'][índs],
+        'coefs': pedazo_dic_matr(control['coefs'], índs),
+        'estado': pedazo_dic_matr(control['estado'], índs)
+    }
+
+
+def juntar_puntos_control(l_controles):
+    """
+    Junta los puntos de control de pedazos de repeticiones paramétricas (en orden) en un único punto de control.
+
+    :param l_controles: Los puntos de control de cada pedazo, para el mismo paso.
+    :type l_controles: list[dict] | tuple[dict]
+
+    :return: El punto de control de todas las repeticiones paramétricas.
+    :rtype: dict
+    """
+
+    return {
+        'i': l_controles[0]['i'],
+        'paso': l_controles[0]['paso'],
+        'generadores': [estado for ctrl in l_controles for estado in ctrl['generadores']],
+        'coefs': juntar_dic_matr([ctrl['coefs'] for ctrl in l_controles]),
+        'estado': juntar_dic_matr([ctrl['estado'] for ctrl in l_controles])
+    }
+
+
+def guardar_punto_control(control, archivo):
+    """
+    Guarda un punto de control en un archivo `.npz` comprimido. Las matrices se guardan en formato binario de NumPy,
+    y el resto (paso, estado de los generadores aleatorios y ubicación de cada matriz) en JSON.
+
+    :param control: El punto de control.
+    :type control: dict
+
+    :param archivo: El archivo.
+    :type archivo: str
+    """
+
+    ubics_coefs = []
+    coefs = dic_a_lista(control['coefs'], l_u=ubics_coefs)
+    ubics_estado = []
+    estado = dic_a_lista(control['estado'], l_u=ubics_estado)
+
+    info = {'i': control['i'], 'paso': control['paso'], 'generadores': control['generadores'],
+            'ubics_coefs': ubics_coefs, 'ubics_estado': ubics_estado}
+
+    np.savez_compressed(
+        archivo, info=json.dumps(info, ensure_ascii=False),
+        **{'coef_{}'.format(n): v for n, v in enumerate(coefs)},
+        **{'estado_{}'.format(n): v for n, v in enumerate(estado)}
+    )
+
+
+def cargar_punto_control(archivo):
+    """
+    Carga un punto de control guardado con `guardar_punto_control()`.
+
+    :param archivo: El archivo.
+    :type archivo: str
+
+    :return: El punto de control.
+    :rtype: dict
+    """
+
+    with np.load(archivo) as d:
+        info = json.loads(str(d['info']))
+        coefs = [d['coef_{}'.format(n)] for n in range(len(info['ubics_coefs']))]
+        estado = [d['estado_{}'.format(n)] for n in range(len(info['ubics_estado']))]
+
+    return {
+        'i': info['i'],
+        'paso': info['paso'],
+        'generadores': info['generadores'],
+        'coefs': llaves_a_dic(info['ubics_coefs'], coefs),
+        'estado': llaves_a_dic(info['ubics_estado'], estado)
+    }
+
+
+# La información de la simulación por pedazos actual. Los procesos paralelos la heredan (por `fork`) en vez de
+# recibirla por serialización.
+_simul_paralela = {}
+
+
+def _simul_pedazo(rep_parám):
+    """
+    Simula un pedazo de repeticiones paramétricas de la simulación por pedazos actual. Se llama en los procesos
+    paralelos.
+
+    :param rep_parám: Las repeticiones paramétricas del pedazo.
+    :type rep_parám: slice
+
+    :return: Las matrices de predicciones del pedazo, sus puntos de control y sus eventos de instrumentación.
+    :rtype: (dict, list[dict], list[dict])
+    """
+
+    d = _simul_paralela
+    return d['sim']._simul_un_pedazo(predics=d['predics'], rep_parám=rep_parám, semillas_reps=d['semillas_reps'],
+                                     paso=d['paso'], n_pasos=d['n_pasos'], detalles=d['detalles'], extrn=d['extrn'],
+                                     control=d['control'])
+
+
+def gen_estado_inic(matrs):
+    """
+    Guarda los valores actuales de una lista de matrices (posiblemente vistas de matrices de predicciones) como estado
+    inicial, en un único búfer contiguo para cada tipo de datos. Los bloques del búfer que corresponden a cada matriz
+    se calculan aquí, así que `restaurar_estado_inic()` no tiene que recorrer diccionarios.
+
+    :param matrs: Las matrices recipientes.
+    :type matrs: list[np.ndarray]
+
+    :return: Un diccionario con los búferes y la lista de bloques (matriz recipiente, vista del búfer).
+    :rtype: dict
+    """
+
+    búferes = {}
+    bloques = []
+
+    for tipo in {m.dtype for m in matrs}:
+        matrs_tipo = [m for m in matrs if m.dtype == tipo]
+
+        # Los desplazamientos de cada bloque en el búfer
+        desplz = np.cumsum([0] + [m.size for m in matrs_tipo])
+        búferes[tipo] = búfer = np.empty(desplz[-1], dtype=tipo)
+
+        for m, a, b in zip(matrs_tipo, desplz[:-1], desplz[1:]):
+            vista = búfer[a:b].reshape(m.shape)
+            vista[:] = m
+            bloques.append((m, vista))
+
+    return {'búferes': búferes, 'bloques': bloques}
+
+
+def restaurar_estado_inic(estado):
+    """
+    Restaura un estado inicial generado por `gen_estado_inic()` en sus matrices recipientes, con una única copia por
+    bloque.
+
+    :param estado: El estado inicial.
+    :type estado: dict
+    """
+
+    for recip, vista in estado.get('bloques', []):
+        np.copyto(recip, vista)
 
 
 def llaves_a_dic(l_ubics, vals):
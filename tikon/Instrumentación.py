@@ -0,0 +1,503 @@
+import json
+import os
+import time
+import tracemalloc
+from functools import wraps
+
+# `tracemalloc.reset_peak()` no existe antes de Python 3.9
+_reiniciar_pico = getattr(tracemalloc, 'reset_peak', None)
+
+
+class Instrumentación(object):
+    """
+    Mide el tiempo (y, opcionalmente, la memoria) de cada fase de las simulaciones de un `Simulable`, y manda cada
+    medida (un evento) a sus sumideros. Las fases se miden con `fase()` (o con el decorador `medir()` en los métodos
+    de cálculo) y pueden ser anidadas (por ejemplo, las operaciones de cohortes dentro de las transiciones); el tiempo
+    de una fase incluye el de sus fases internas.
+
+    Cada medida cuesta dos llamadas a `time.perf_counter()` y un diccionario de evento, así que se puede dejar activada
+    en simulaciones normales. El registro de la memoria usa `tracemalloc`, que frena bastante los cálculos, y por eso
+    no se activa automáticamente.
+
+    Cada evento es un diccionario con su `tipo` ('fase' o 'contador'), su `nombre`, su `inicio` (en segundos de
+    `time.perf_counter()`), el paso (`i`) y la simulación (`simul`) actuales, el proceso (`pid`) y, para las fases, su
+    `duración` (en segundos) y, si se registra la memoria, la memoria neta asignada (`memoria`) y el pico de memoria
+    temporaria (`pico`) durante la fase, en bytes; para los contadores, su `valor`. El pico necesita
+    `tracemalloc.reset_peak()` (Python 3.9 o más reciente); en versiones anteriores de Python, los eventos no lo
+    incluyen.
+    """
+
+    def __init__(símismo, sumideros=None, memoria=False, activa=True):
+        """
+
+        :param sumideros: Los sumideros a los cuales mandar los eventos. Si es `None`, se mandan a un
+        `SumideroMemoria` y a un `SumideroConsola`.
+        :type sumideros: list[Sumidero]
+
+        :param memoria: Si hay que registrar la memoria de cada fase (con `tracemalloc`).
+        :type memoria: bool
+
+        :param activa: Si hay que medir las fases. Si es `False`, `fase()` no hace nada (pero los ganchos de pasos
+        se siguen llamando).
+        :type activa: bool
+        """
+
+        if sumideros is None:
+            sumideros = [SumideroMemoria(), SumideroConsola()]
+
+        símismo.sumideros = list(sumideros)
+        símismo.memoria = memoria
+        símismo.activa = activa
+
+        # Las funciones que se llaman después de cada paso de simulación (ver `agregar_gancho()`)
+        símismo.ganchos = []
+
+        # El paso y la simulación actuales, para los eventos
+        símismo.i = None
+        símismo.simul = None
+
+        # Los inicios de las fases abiertas: (inicio, memoria al inicio, pico de memoria hasta ahora)
+        símismo._pila = []
+
+        # Si empezamos `tracemalloc` nosotros (y lo tenemos que parar al final de la simulación)
+        símismo._tracemalloc_propio = False
+
+        # Los objetos de fase, reutilizados para cada nombre de fase
+        símismo._fases = {}
+        símismo._nula = _FaseNula()
+
+    def fase(símismo, nombre):
+        """
+        Devuelve un contexto que mide una fase.
+
+            with instr.fase('Depredación'):
+                ...
+
+        :param nombre: El nombre de la fase.
+        :type nombre: str
+
+        :return: El contexto.
+        :rtype: _Fase | _FaseNula
+        """
+
+        if not símismo.activa:
+            return símismo._nula
+        try:
+            return símismo._fases[nombre]
+        except KeyError:
+            f = símismo._fases[nombre] = _Fase(símismo, nombre)
+            return f
+
+    def contar(símismo, nombre, valor=1):
+        """
+        Manda un contador a los sumideros (por ejemplo, el número de pasos de una simulación).
+
+        :param nombre: El nombre del contador.
+        :type nombre: str
+
+        :param valor: El valor.
+        :type valor: int | float
+        """
+
+        if símismo.activa:
+            símismo._mandar({'tipo': 'contador', 'nombre': nombre, 'inicio': time.perf_counter(), 'valor': valor,
+                             'i': símismo.i, 'simul': símismo.simul, 'pid': os.getpid()})
+
+    def agregar_gancho(símismo, f):
+        """
+        Agrega una función que se llama después de cada paso de simulación con el Simulable y el número del paso,
+        `f(simulable, i)`. En simulaciones por pedazos en paralelo, se llama en los procesos paralelos (y sus efectos
+        sobre el Simulable no regresan al proceso principal).
+
+        :param f: La función.
+        :type f: callable
+        """
+
+        símismo.ganchos.append(f)
+
+    def quitar_gancho(símismo, f):
+        """
+        Quita una función de los ganchos de pasos.
+
+        :param f: La función.
+        :type f: callable
+        """
+
+        símismo.ganchos.remove(f)
+
+    def paso(símismo, sim, i):
+        """
+        Llama los ganchos después de un paso de simulación.
+
+        :param sim: El Simulable.
+        :type sim: tikon.Coso.Simulable
+
+        :param i: El número del paso.
+        :type i: int
+        """
+
+        for f in símismo.ganchos:
+            f(sim, i)
+
+    def empezar(símismo):
+        """
+        Empieza el registro de la memoria, si aplica. Se llama al principio de cada simulación.
+        """
+
+        símismo._pila.clear()
+        if símismo.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            símismo._tracemalloc_propio = True
+
+    def terminar(símismo):
+        """
+        Termina el registro de la memoria y cierra los sumideros. Se llama al final de cada simulación.
+        """
+
+        if símismo._tracemalloc_propio:
+            tracemalloc.stop()
+            símismo._tracemalloc_propio = False
+        símismo.i = None
+        for s in símismo.sumideros:
+            s.cerrar()
+
+    def grabar(símismo):
+        """
+        Devuelve un contexto que guarda los eventos en una lista en vez de mandarlos a los sumideros, para mandarlos
+        después con `reproducir()` (por ejemplo, desde un proceso paralelo).
+
+            with instr.grabar() as eventos:
+                ...
+
+        :return: El contexto.
+        :rtype: _Grabación
+        """
+
+        return _Grabación(símismo)
+
+    def reproducir(símismo, eventos):
+        """
+        Manda a los sumideros eventos grabados con `grabar()`.
+
+        :param eventos: Los eventos.
+        :type eventos: list[dict]
+        """
+
+        for ev in eventos:
+            símismo._mandar(ev)
+
+    def _mandar(símismo, evento):
+        for s in símismo.sumideros:
+            s.registrar(evento)
+
+    def _abrir(símismo):
+        if símismo.memoria and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            if símismo._pila:
+                # El pico hasta ahora pertenece también a la fase que contiene esta
+                símismo._pila[-1][2] = max(símismo._pila[-1][2], pico)
+            if _reiniciar_pico is not None:
+                _reiniciar_pico()
+            símismo._pila.append([time.perf_counter(), actual, actual])
+        else:
+            símismo._pila.append([time.perf_counter(), None, None])
+
+    def _cerrar(símismo, nombre):
+        fin = time.perf_counter()
+        inicio, mem_inic, pico_prev = símismo._pila.pop()
+        evento = {'tipo': 'fase', 'nombre': nombre, 'inicio': inicio, 'duración': fin - inicio, 'i': símismo.i,
+                  'simul': símismo.simul, 'pid': os.getpid()}
+
+        if mem_inic is not None and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            pico = max(pico, pico_prev)
+            evento['memoria'] = actual - mem_inic
+            if _reiniciar_pico is not None:
+                # Sin `reset_peak()`, el pico de `tracemalloc` es el de toda la simulación, y no el de la fase
+                evento['pico'] = pico - mem_inic
+                if símismo._pila:
+                    símismo._pila[-1][2] = max(símismo._pila[-1][2], pico)
+                _reiniciar_pico()
+
+        símismo._mandar(evento)
+
+
+class _Fase(object):
+    """
+    El contexto de una fase (ver `Instrumentación.fase()`).
+    """
+
+    __slots__ = ('instr', 'nombre')
+
+    def __init__(símismo, instr, nombre):
+        símismo.instr = instr
+        símismo.nombre = nombre
+
+    def __enter__(símismo):
+        símismo.instr._abrir()
+
+    def __exit__(símismo, *args):
+        símismo.instr._cerrar(símismo.nombre)
+
+
+class _FaseNula(object):
+    """
+    El contexto de una fase cuando la instrumentación no está activa.
+    """
+
+    __slots__ = ()
+
+    def __enter__(símismo):
+        pass
+
+    def __exit__(símismo, *args):
+        pass
+
+
+class _Grabación(object):
+    """
+    El contexto de una grabación de eventos (ver `Instrumentación.grabar()`).
+    """
+
+    def __init__(símismo, instr):
+        símismo.instr = instr
+        símismo.eventos = SumideroLista()
+        símismo._sumideros = None
+
+    def __enter__(símismo):
+        símismo._sumideros = símismo.instr.sumideros
+        símismo.instr.sumideros = [símismo.eventos]
+        return símismo.eventos.eventos
+
+    def __exit__(símismo, *args):
+        símismo.instr.sumideros = símismo._sumideros
+
+
+def medir(nombre):
+    """
+    Decorador que mide un método de un `Simulable` como una fase de su instrumentación.
+
+    :param nombre: El nombre de la fase.
+    :type nombre: str
+
+    :return: El decorador.
+    :rtype: callable
+    """
+
+    def decorador(f):
+        @wraps(f)
+        def envoltura(símismo, *args, **kwargs):
+            with símismo.instrumentación.fase(nombre):
+                return f(símismo, *args, **kwargs)
+
+        return envoltura
+
+    return decorador
+
+
+class Sumidero(object):
+    """
+    La clase pariente de los sumideros de eventos de instrumentación.
+    """
+
+    def registrar(símismo, evento):
+        """
+        Recibe un evento.
+
+        :param evento: El evento (ver `Instrumentación`).
+        :type evento: dict
+        """
+
+        raise NotImplementedError
+
+    def cerrar(símismo):
+        """
+        Se llama al final de cada simulación. Los sumideros que escriben archivos los escriben aquí.
+        """
+
+        pass
+
+
+class SumideroLista(Sumidero):
+    """
+    Guarda todos los eventos en una lista.
+    """
+
+    def __init__(símismo):
+        símismo.eventos = []
+
+    def registrar(símismo, evento):
+        símismo.eventos.append(evento)
+
+
+class SumideroMemoria(Sumidero):
+    """
+    Guarda estadísticas de cada fase: número de llamadas, tiempo total, mínimo y máximo y, si se registra, memoria neta
+    total y pico de memoria máximo. Los contadores se suman.
+    """
+
+    def __init__(símismo):
+        símismo.fases = {}
+        símismo.contadores = {}
+
+    def registrar(símismo, evento):
+        nombre = evento['nombre']
+        if evento['tipo'] == 'contador':
+            símismo.contadores[nombre] = símismo.contadores.get(nombre, 0) + evento['valor']
+            return
+
+        dur = evento['duración']
+        try:
+            est = símismo.fases[nombre]
+        except KeyError:
+            est = símismo.fases[nombre] = {'n': 0, 'total': 0, 'mín': dur, 'máx': dur}
+        est['n'] += 1
+        est['total'] += dur
+        if dur < est['mín']:
+            est['mín'] = dur
+        if dur > est['máx']:
+            est['máx'] = dur
+        if 'memoria' in evento:
+            est['memoria'] = est.get('memoria', 0) + evento['memoria']
+        if 'pico' in evento:
+            est['pico'] = max(est.get('pico', 0), evento['pico'])
+
+    def reiniciar(símismo):
+        """
+        Borra las estadísticas.
+        """
+
+        símismo.fases.clear()
+        símismo.contadores.clear()
+
+    def tabla(símismo, fases=None, referencia=None):
+        """
+        Devuelve una tabla de las estadísticas de las fases.
+
+        :param fases: Las fases que incluir, en orden. Si es `None`, se incluyen todas.
+        :type fases: list[str]
+
+        :param referencia: La fase relativa a la cual se calcula el porcentaje del total de cada fase (por ejemplo,
+        'Paso'). Si es `None`, se usa la suma de las fases incluidas (que no tiene sentido si hay fases anidadas).
+        :type referencia: str
+
+        :return: La tabla.
+        :rtype: str
+        """
+
+        if fases is None:
+            fases = list(símismo.fases)
+        fases = [f for f in fases if f in símismo.fases]
+        if referencia is not None and referencia in símismo.fases:
+            total = símismo.fases[referencia]['total'] or 1
+        else:
+            total = sum(símismo.fases[f]['total'] for f in fases) or 1
+        memoria = any('memoria' in símismo.fases[f] for f in fases)
+
+        líneas = ['\t{:<26}{:>10}{:>12}{:>14}{:>14}'.format('Fase', 'Llamadas', 'Segundos', '% del total', 'ms/llamada')
+                  + ('{:>14}{:>12}'.format('Memoria (Mb)', 'Pico (Mb)') if memoria else '')]
+        for f in fases:
+            est = símismo.fases[f]
+            línea = '\t{:<26}{:>10}{:12.3f}{:12.2f} %{:14.4f}'.format(
+                f, est['n'], est['total'], est['total'] / total * 100, est['total'] / est['n'] * 1000)
+            if memoria:
+                línea += '{:14.2f}{:12.2f}'.format(est.get('memoria', 0) / 1e6, est.get('pico', 0) / 1e6)
+            líneas.append(línea)
+
+        return '\n'.join(líneas)
+
+
+class SumideroConsola(Sumidero):
+    """
+    Imprime la duración de las fases de nivel de simulación (por ejemplo, 'Simulación' y 'Procesar simulación'),
+    pero no la de las fases de cada paso.
+    """
+
+    def __init__(símismo, fases=('Simulación', 'Procesar simulación', 'Procesar validación', 'Procesar calibración')):
+        """
+
+        :param fases: Las fases que imprimir.
+        :type fases: tuple[str] | list[str]
+        """
+
+        símismo.fases = set(fases)
+
+    def registrar(símismo, evento):
+        if evento['tipo'] == 'fase' and evento['nombre'] in símismo.fases:
+            if evento['simul'] is not None:
+                print('{} ({}) calculada en: {:.3f} s'.format(evento['nombre'], evento['simul'], evento['duración']))
+            else:
+                print('{}: {:.3f} s'.format(evento['nombre'], evento['duración']))
+
+
+class SumideroJSONL(Sumidero):
+    """
+    Escribe cada evento en una línea JSON de un archivo. Los eventos se guardan en memoria y se escriben (al final del
+    archivo) cada `n_búfer` eventos y al final de cada simulación.
+    """
+
+    def __init__(símismo, archivo, n_búfer=10000):
+        """
+
+        :param archivo: El archivo.
+        :type archivo: str
+
+        :param n_búfer: El número de eventos que guardar antes de escribirlos.
+        :type n_búfer: int
+        """
+
+        símismo.archivo = archivo
+        símismo.n_búfer = n_búfer
+        símismo.búfer = []
+
+    def registrar(símismo, evento):
+        símismo.búfer.append(evento)
+        if len(símismo.búfer) >= símismo.n_búfer:
+            símismo.escribir()
+
+    def escribir(símismo):
+        """
+        Escribe los eventos guardados.
+        """
+
+        if not símismo.búfer:
+            return
+        with open(símismo.archivo, 'a', encoding='utf8') as d:
+            for ev in símismo.búfer:
+                d.write(json.dumps(ev, ensure_ascii=False))
+                d.write('\n')
+        símismo.búfer.clear()
+
+    def cerrar(símismo):
+        símismo.escribir()
+
+
+class SumideroChrome(Sumidero):
+    """
+    Escribe los eventos en el formato de trazas de Chrome (`chrome://tracing` o https://ui.perfetto.dev). Cada
+    fase es un evento completo ('X') y cada contador un evento de contador ('C'), por proceso. El archivo se
+    (re)escribe al final de cada simulación con todos los eventos recibidos hasta ahora.
+    """
+
+    def __init__(símismo, archivo):
+        """
+
+        :param archivo: El archivo.
+        :type archivo: str
+        """
+
+        símismo.archivo = archivo
+        símismo.eventos = []
+
+    def registrar(símismo, evento):
+        args = {ll: evento[ll] for ll in ('i', 'simul', 'memoria', 'pico', 'valor') if evento.get(ll) is not None}
+        ev = {'name': evento['nombre'], 'cat': 'tikon', 'ts': evento['inicio'] * 1e6, 'pid': evento['pid'], 'tid': 0}
+        if evento['tipo'] == 'fase':
+            ev.update(ph='X', dur=evento['duración'] * 1e6, args=args)
+        else:
+            ev.update(ph='C', args={evento['nombre']: evento['valor']})
+        símismo.eventos.append(ev)
+
+    def cerrar(símismo):
+        with open(símismo.archivo, 'w', encoding='utf8') as d:
+            json.dump({'traceEvents': símismo.eventos, 'displayTimeUnit': 'ms'}, d, ensure_ascii=False)
@@ -4,6 +4,7 @@ import numpy as np
 from matplotlib.backends.backend_agg import FigureCanvasAgg as TelaFigura
 from matplotlib.figure import Figure as Figura
 
+from tikon.Matemáticas.Resumen import VistaResumen, EstadísticasMatr
 from tikon.Matemáticas.Variables import VarSciPy, VarCalib
 from tikon.Controles import valid_archivo
 
@@ -67,8 +68,9 @@ def graficar_pred(matr_predic, título, vector_obs=None, tiempos_obs=None, etiq_
     Esta función genera un gráfico, dato una matriz de predicciones y un vector de observaciones temporales.
 
     :param matr_predic: La matriz de predicciones. Eje 0 = incertidumbre estocástico, eje 1 = incertidumbre
-    paramétrico, eje 2 = día.
-    :type matr_predic: np.ndarray
+    paramétrico, eje 2 = día. También puede ser las estadísticas resumidas de una simulación resumida (en este caso,
+    no se pueden mostrar líneas de repeticiones individuales).
+    :type matr_predic: np.ndarray | VistaResumen
 
     :param vector_obs: El vector de las observaciones. Eje 0 = tiempo.
     :type vector_obs: np.ndarray | None
@@ -113,15 +115,22 @@ def graficar_pred(matr_predic, título, vector_obs=None, tiempos_obs=None, etiq_
     elif not os.path.isdir(directorio):
         os.makedirs(directorio)
 
+    # Las estadísticas de las predicciones, de la matriz completa o de las estadísticas resumidas
+    if isinstance(matr_predic, VistaResumen):
+        stats = matr_predic
+        n_líneas = 0
+    else:
+        stats = EstadísticasMatr(matr_predic)
+
     fig = Figura()
     TelaFigura(fig)
     ejes = fig.add_subplot(111)
 
     # El vector de días
-    x = np.arange(matr_predic.shape[2])
+    x = np.arange(stats.n_días)
 
     # Si necesario, incluir el promedio de todas las repeticiones (estocásticas y paramétricas)
-    prom_predic = matr_predic.mean(axis=(0, 1))
+    prom_predic = stats.promedio()
     if promedio:
         ejes.plot(x, prom_predic, lw=2, color=color)
 
@@ -155,8 +164,8 @@ def graficar_pred(matr_predic, título, vector_obs=None, tiempos_obs=None, etiq_
         # Para cada percentil...
         for n, p in enumerate(percentiles):
             # Percentiles máximos y mínimos
-            máx_perc = np.percentile(matr_predic, 50 + p / 2, axis=(0, 1))
-            mín_perc = np.percentile(matr_predic, (100 - p) / 2, axis=(0, 1))
+            máx_perc = stats.percentil(50 + p / 2)
+            mín_perc = stats.percentil((100 - p) / 2)
 
             # Calcular el % de opacidad y dibujar
             op_máx = 0.5
@@ -176,15 +185,15 @@ def graficar_pred(matr_predic, título, vector_obs=None, tiempos_obs=None, etiq_
         # Mostrar la incertidumbre descompuesta por sus fuentes
 
         # El rango total de las simulaciones
-        máx_total = matr_predic.max(axis=(0, 1))
-        mín_total = matr_predic.min(axis=(0, 1))
+        máx_total = stats.máx()
+        mín_total = stats.mín()
         rango_total = np.subtract(máx_total, mín_total)
 
         # La desviación estándar de todas las simulaciones (incertidumbre total)
-        des_est_total = np.std(matr_predic, axis=(0, 1))
+        des_est_total = stats.desv_est()
 
         # El incertidumbre estocástico promedio
-        des_est_estóc = np.mean(np.std(matr_predic, axis=0), axis=0)
+        des_est_estóc = stats.desv_est_estoc()
 
         # Inferir el incertidumbre paramétrico
         des_est_parám = np.subtract(des_est_total, des_est_estóc)
@@ -8,6 +8,7 @@ except ImportError:
     pm3 = None
 
 import scipy.stats as estad
+from scipy import special as especial
 
 # Par asimplificar el código (un poquitísimo)
 inf = np.inf
@@ -527,3 +528,284 @@ dists = {'Alpha': {'scipy': estad.alpha,
                   'tipo': 'discr'
                   }
          }
+
+
+class FDATabulada(object):
+    """
+    La función de distribución acumulada (FDA) de una distribución de SciPy con parámetros en forma de matrices (por
+    ejemplo, eje 0: repetición paramétrica, eje 1: etapa), tabulada una vez para cada combinación de parámetros para
+    que cada evaluación sea una interpolación lineal en vez de una llamada a SciPy. Tiene el mismo método `cdf()` que
+    la distribución de SciPy.
+
+    Las tablas usan una malla uniforme en arctan((x - c) / s), que cubre todo el eje real (incluso las colas largas de
+    las distribuciones Cauchy o T) con un número finito de puntos. La malla de cada tabla se centra en la mediana c de
+    su distribución, con s la mitad de su rango intercuartil, así que los puntos se concentran donde cambia la FDA,
+    incluso para distribuciones muy estrechas en comparación con su escala (p. ej., una Gamma con un parámetro de
+    forma grande). Si el soporte de la distribución tiene límites, la malla empieza y termina en ellos, donde la FDA
+    puede tener un quiebre. Se dobla el número de puntos de cada tabla hasta que el error de interpolación (estimado
+    en los centros de los intervalos) no pase de `tol`. Las pocas tablas que no llegan a `tol` con `n_máx` intervalos
+    no se usan: para sus parámetros, `cdf()` llama la distribución de SciPy. Cada tabla depende únicamente de sus
+    propios parámetros, así que los resultados no dependen de las otras repeticiones simuladas al mismo tiempo.
+    """
+
+    def __init__(símismo, dist, tol=1e-4, n_máx=2 ** 12):
+        """
+
+        :param dist: La distribución de SciPy (con sus parámetros).
+        :type dist: estad._distn_infrastructure.rv_frozen
+
+        :param tol: El error absoluto máximo de la FDA tabulada.
+        :type tol: float
+
+        :param n_máx: El número máximo de intervalos de cada tabla. Si no basta para llegar a `tol` para unos
+        parámetros, su FDA se calcula con SciPy.
+        :type n_máx: int
+
+        """
+
+        kwds = dict(dist.kwds)
+        ubic = np.asarray(kwds.pop('loc', 0), dtype=float)
+        escl = np.asarray(kwds.pop('scale', 1), dtype=float)
+        forma = np.broadcast(ubic, escl, *dist.args, *kwds.values()).shape
+        n_tablas = int(np.prod(forma))
+
+        # Los parámetros de forma, aplanados. Las tablas se calculan con la distribución estandarizada (loc = 0,
+        # scale = 1).
+        args = [np.broadcast_to(a, forma).ravel() for a in dist.args]
+        kwds = {ll: np.broadcast_to(v, forma).ravel() for ll, v in kwds.items()}
+
+        # El centro y la escala de la malla de cada tabla, según los cuartiles de su distribución estandarizada, y los
+        # límites de la malla (en arctan), según los límites de su soporte.
+        with np.errstate(invalid='ignore'):
+            mín, q1, mediana, q3, máx = [
+                np.broadcast_to(dist.dist.ppf(q, *args, **kwds), n_tablas) for q in (0, 0.25, 0.5, 0.75, 1)
+            ]
+        centro = np.where(np.isfinite(mediana), mediana, 0)
+        ancho = (q3 - q1) / 2
+        ancho = np.where(np.isfinite(ancho) & (ancho > 0), ancho, 1)
+        with np.errstate(invalid='ignore'):
+            θ_inf = np.where(mín < centro, np.arctan((mín - centro) / ancho), -mat.pi / 2)
+            θ_sup = np.where(máx > centro, np.arctan((máx - centro) / ancho), mat.pi / 2)
+
+        símismo.ubic = ubic + escl * centro.reshape(forma)
+        símismo.escl = escl * ancho.reshape(forma)
+        símismo.θ_inf = θ_inf.reshape(forma)
+
+        # El número de intervalos de cada tabla, y sus valores para cada número de intervalos
+        n_intrv = np.zeros(n_tablas, dtype=np.intp)
+        tablas = []
+
+        # Las tablas que no llegaron a `tol`
+        exactas = np.zeros(n_tablas, dtype=bool)
+
+        n = 32
+        while True:
+            # Evaluar la FDA de las tablas que faltan en una malla de 2n intervalos; los puntos impares son los centros
+            # de los intervalos de la malla de n intervalos, donde el error de interpolación es máximo.
+            faltan = np.flatnonzero(n_intrv == 0)
+            u = np.linspace(0, 1, 2 * n + 1)
+            θ = θ_inf[faltan, np.newaxis] + np.multiply.outer(θ_sup[faltan] - θ_inf[faltan], u)
+            args_f = [a[faltan, np.newaxis] for a in args]
+            kwds_f = {ll: v[faltan, np.newaxis] for ll, v in kwds.items()}
+            x = centro[faltan, np.newaxis] + ancho[faltan, np.newaxis] * np.tan(θ)
+            with np.errstate(invalid='ignore', over='ignore'):
+                vals = dist.dist.cdf(x, *args_f, **kwds_f)
+            vals = np.broadcast_to(vals, θ.shape).copy()
+            vals[:, 0] = 0
+            vals[:, -1] = 1
+
+            error = np.max(np.abs(vals[:, 1::2] - (vals[:, :-1:2] + vals[:, 2::2]) / 2), axis=1)
+            listos = np.logical_or(error <= tol, 2 * n >= n_máx)
+            exactas[faltan[listos & ~(error <= tol)]] = True
+
+            # Guardar la malla fina, que es aún más precisa que la que se verificó
+            n_intrv[faltan[listos]] = 2 * n
+            tablas.append((faltan[listos], vals[listos]))
+
+            if np.all(n_intrv):
+                break
+            n *= 2
+
+        # Las tablas se guardan una tras otra en una única matriz
+        desplaz = np.zeros_like(n_intrv)
+        np.cumsum(n_intrv[:-1] + 1, out=desplaz[1:])
+        tabla = np.empty(desplaz[-1] + n_intrv[-1] + 1)
+        for cuáles, vals in tablas:
+            tabla[desplaz[cuáles, np.newaxis] + np.arange(vals.shape[1])] = vals
+
+        # Las pendientes de cada intervalo, para la interpolación
+        símismo.tabla = tabla
+        símismo.pendientes = np.append(np.diff(tabla), 0)
+
+        # Para convertir un valor a su posición (en unidades de intervalos) en su tabla, y la posición del principio
+        # de cada tabla en la matriz de tablas.
+        símismo.n_intrv = n_intrv.reshape(forma)
+        símismo.factor = símismo.n_intrv / (θ_sup - θ_inf).reshape(forma)
+        símismo.desplaz = desplaz.reshape(forma)
+
+        # Para las tablas que no llegaron a `tol`, guardar lo necesario para calcular su FDA con SciPy
+        símismo.exactas = None
+        if np.any(exactas):
+            símismo.exactas = exactas.reshape(forma)
+            símismo.dist_exacta = dist.dist
+            kwds_exactas = {ll: v[exactas] for ll, v in kwds.items()}
+            kwds_exactas['loc'] = np.broadcast_to(ubic, forma).ravel()[exactas]
+            kwds_exactas['scale'] = np.broadcast_to(escl, forma).ravel()[exactas]
+            símismo.paráms_exactas = ([a[exactas] for a in args], kwds_exactas)
+
+    def cdf(símismo, x, out=None, trabajo=None):
+        """
+        Evalúa la FDA tabulada.
+
+        :param x: Los valores. Los últimos ejes deben coincidir con la forma de los parámetros de la distribución.
+        :type x: np.ndarray
+
+        :param out: Una matriz opcional, de la forma de `x`, en la cual guardar los resultados.
+        :type out: np.ndarray
+
+        :param trabajo: Matrices de trabajo opcionales, de la forma de `x`: una de enteros (`np.intp`) para los índices
+        en las tablas, y otra para los valores tomados de las tablas.
+        :type trabajo: (np.ndarray, np.ndarray)
+
+        :return: La FDA en `x`.
+        :rtype: np.ndarray
+        """
+
+        # Calcular primero la FDA exacta de las tablas que no llegaron a `tol`, porque `out` puede ser `x`.
+        if símismo.exactas is not None:
+            args, kwds = símismo.paráms_exactas
+            vals_exactas = símismo.dist_exacta.cdf(x[..., símismo.exactas], *args, **kwds)
+
+        pos = np.subtract(x, símismo.ubic, out=out)
+        np.divide(pos, símismo.escl, out=pos)
+        np.arctan(pos, out=pos)
+        pos -= símismo.θ_inf
+        pos *= símismo.factor
+        np.clip(pos, 0, símismo.n_intrv, out=pos)
+
+        if trabajo is None:
+            í, temp = np.empty(pos.shape, dtype=np.intp), np.empty_like(pos)
+        else:
+            í, temp = trabajo
+        np.copyto(í, pos, casting='unsafe')
+        np.minimum(í, símismo.n_intrv - 1, out=í)
+        pos -= í
+        í += símismo.desplaz
+
+        # Con 'clip', `take()` escribe directamente en `temp` (y los índices de valores NaN, que quedan NaN, no fallan)
+        pos *= np.take(símismo.pendientes, í, out=temp, mode='clip')
+        pos += np.take(símismo.tabla, í, out=temp, mode='clip')
+
+        if símismo.exactas is not None:
+            pos[..., símismo.exactas] = vals_exactas
+
+        return pos
+
+
+class FDAExacta(object):
+    """
+    La función de distribución acumulada (FDA) exacta de una distribución de SciPy con parámetros en forma de matrices,
+    calculada directamente en la matriz de resultados con las funciones especiales de SciPy, así que, al contrario de
+    la distribución de SciPy, no crea matrices temporarias del tamaño de `x` a cada evaluación. Tiene el mismo método
+    `cdf()` que `FDATabulada`, y da los mismos resultados que la distribución de SciPy (hasta el redondeo, para la
+    distribución triangular). Para las distribuciones que no están en `FDAExacta.implementadas`, `cdf()` llama la
+    distribución de SciPy.
+    """
+
+    implementadas = ['norm', 'cauchy', 't', 'gamma', 'triang']
+
+    def __init__(símismo, dist):
+        """
+
+        :param dist: La distribución de SciPy (con sus parámetros).
+        :type dist: estad._distn_infrastructure.rv_frozen
+
+        """
+
+        símismo.dist = dist
+        símismo.nombre = dist.dist.name if dist.dist.name in símismo.implementadas else None
+        if símismo.nombre is None:
+            return
+
+        kwds = dict(dist.kwds)
+        símismo.ubic = np.asarray(kwds.pop('loc', 0), dtype=float)
+        símismo.escl = np.asarray(kwds.pop('scale', 1), dtype=float)
+
+        # Las distribuciones implementadas tienen, a lo más, un parámetro de forma.
+        forma = [np.asarray(a, dtype=float) for a in list(dist.args) + list(kwds.values())]
+        símismo.forma = forma[0] if forma else None
+
+        # Tal como SciPy, la FDA es NaN para parámetros inválidos.
+        if símismo.nombre == 'triang':
+            válidos = (símismo.forma >= 0) & (símismo.forma <= 1)
+        elif símismo.forma is not None:
+            válidos = símismo.forma > 0
+        else:
+            válidos = True
+        inválidos = ~(válidos & (símismo.escl > 0))
+        símismo.inválidos = inválidos if np.any(inválidos) else None
+
+        if símismo.nombre == 'triang':
+            # La FDA es x^2 / c antes del modo c, y 1 - (1 - x)^2 / (1 - c) después (o x^2 si c = 1).
+            with np.errstate(invalid='ignore'):
+                símismo.umbral = np.where(símismo.forma == 1, inf, símismo.forma)
+            símismo.uno_menos_c = 1 - símismo.forma
+
+    def cdf(símismo, x, out=None, trabajo=None):
+        """
+        Evalúa la FDA.
+
+        :param x: Los valores. Los últimos ejes deben coincidir con la forma de los parámetros de la distribución.
+        :type x: np.ndarray
+
+        :param out: Una matriz opcional, de la forma de `x`, en la cual guardar los resultados.
+        :type out: np.ndarray
+
+        :param trabajo: Matrices de trabajo opcionales, de la forma de `x`, para la distribución triangular: una para
+        los valores y otra booleana.
+        :type trabajo: (np.ndarray, np.ndarray)
+
+        :return: La FDA en `x`.
+        :rtype: np.ndarray
+        """
+
+        if símismo.nombre is None:
+            if out is None:
+                return símismo.dist.cdf(x)
+            np.copyto(out, símismo.dist.cdf(x))
+            return out
+
+        # Estandarizar los valores
+        z = np.subtract(x, símismo.ubic, out=out)
+        np.divide(z, símismo.escl, out=z)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if símismo.nombre == 'norm':
+                especial.ndtr(z, out=z)
+            elif símismo.nombre == 'cauchy':
+                np.arctan2(1, np.negative(z, out=z), out=z)
+                np.divide(z, pi, out=z)
+            elif símismo.nombre == 't':
+                especial.stdtr(símismo.forma, z, out=z)
+            elif símismo.nombre == 'gamma':
+                # El soporte empieza en 0
+                especial.gammainc(símismo.forma, np.maximum(z, 0, out=z), out=z)
+            else:
+                if trabajo is None:
+                    temp, másc = np.empty_like(z), np.empty(z.shape, dtype=bool)
+                else:
+                    temp, másc = trabajo
+
+                np.clip(z, 0, 1, out=z)  # El soporte es [0, 1]
+                np.less(z, símismo.umbral, out=másc)
+                np.divide(np.square(z, out=temp), símismo.forma, out=temp)
+                np.subtract(1, z, out=z)
+                np.square(z, out=z)
+                np.divide(z, símismo.uno_menos_c, out=z)
+                np.subtract(1, z, out=z)
+                np.copyto(z, temp, where=másc)
+
+        if símismo.inválidos is not None:
+            np.copyto(z, np.nan, where=símismo.inválidos)
+
+        return z
@@ -11,7 +11,9 @@ ecs_orgs = {
     'Crecimiento': {'Modif': {'Nada': {},
                               'Ninguna': {'r': {'límites': (0, np.inf),
                                                 'inter': None}},
-                              'Log Normal Temperatura': {'t': {'límites': (0, np.inf),
+                              'Log Normal Temperatura': {'r': {'límites': (0, np.inf),
+                                                               'inter': None},
+                                                         't': {'límites': (0, np.inf),
                                                                'inter': None},
                                                          'p': {'límites': (0, np.inf),
                                                                'inter': None}}
@@ -200,7 +202,12 @@ ecs_orgs = {
                               'inter': None},
                        'sigma': {'límites': (0, np.inf),
                                  'inter': None}
-                       }
+                       },
+                 'Erlang': {'mu': {'límites': (0, np.inf),
+                                   'inter': None},
+                            'sigma': {'límites': (0, np.inf),
+                                      'inter': None}
+                            }
                  },
 
         'Mult': {'Nada': {},
@@ -44,6 +44,7 @@ class Experimento(object):
                          'Superficies': None,
                          'Polígonos': None
                          },
+            'Clima': dic_datos_rae.copy(),
             'Cultivos': {},  # Para hacer: Llenar este.
             'Aplicaciones': {}  # Para hacer también
 
@@ -88,8 +89,8 @@ class Experimento(object):
                 # Calcular superficies
                 superficies = símismo.superficies(parc=parc)
 
-                # Convertir a individuos por parcela
-                np.multiply(datos, superficies, out=datos)
+                # Convertir a individuos por parcela (en una nueva matriz, para no cambiar los datos del Experimento)
+                datos = np.multiply(datos, superficies[:, np.newaxis, np.newaxis])
 
                 # No hay nano-zorros en este mundo
                 dic_egr['datos'] = datos.astype(int)
@@ -425,6 +426,87 @@ class Experimento(object):
 
                     dic_parc['Superficies'][í_p] = sup  # Guardar
 
+    def agregar_clima(símismo, archivo, col_tiempo, col_temp_máx, col_temp_mín, col_parc=None, cód_na=None):
+        """
+        Esta función permite agregar datos diarios de clima (temperaturas máximas y mínimas) desde un archivo de datos
+        externo. Estos datos se necesitan para simular ecuaciones de edad que dependen de la temperatura (p. ej., días
+        grados). Si hay datos para una única parcela, se aplican a todas las parcelas del Experimento.
+
+        :param archivo: El archivo con los datos.
+        :type archivo: str
+
+        :param col_tiempo: La columna con datos de tiempo.
+        :type col_tiempo: str
+
+        :param col_temp_máx: La columna con las temperaturas máximas diarias.
+        :type col_temp_máx: str
+
+        :param col_temp_mín: La columna con las temperaturas mínimas diarias.
+        :type col_temp_mín: str
+
+        :param col_parc: La columna (opcional) con datos de parcela.
+        :type col_parc: str
+
+        :param cód_na: El código que representa valores que faltan en la base de datos.
+        :type cód_na: str | float | int
+        """
+
+        dic_datos = símismo.datos['Clima']
+        dic_datos.update(símismo._leer_datos(archivo=archivo, col_tiempo=col_tiempo, col_parc=col_parc,
+                                             cols=[col_temp_máx, col_temp_mín], factor=1, cód_na=cód_na))
+        dic_datos['cols'] = ['temp_máx', 'temp_mín']
+
+    def obt_clima(símismo, parc, n_pasos, paso):
+        """
+        Devuelve las temperaturas de unas parcelas de interés al principio de cada paso de una simulación,
+        interpoladas linealmente entre los días con datos.
+
+        :param parc: Las parcelas de interés.
+        :type parc: list[str]
+
+        :param n_pasos: El número de pasos de la simulación.
+        :type n_pasos: int
+
+        :param paso: El paso de la simulación, en días.
+        :type paso: int | float
+
+        :return: Un diccionario con las matrices de temperaturas máximas ('temp_máx'), mínimas ('temp_mín') y
+        promedias ('temp_prom'), cada una de forma (parcela, paso). Si el Experimento no tiene datos de clima, se
+        devuelve un diccionario vacío.
+        :rtype: dict[np.ndarray]
+        """
+
+        dic_datos = símismo.datos['Clima']
+
+        if dic_datos['días'] is None:
+            return {}
+
+        parc_clima = dic_datos['parc'].tolist()
+        t = np.arange(n_pasos) * paso
+
+        clima = {var: np.empty((len(parc), n_pasos)) for var in dic_datos['cols']}
+        for i, p in enumerate(parc):
+            if p in parc_clima:
+                í_p = parc_clima.index(p)
+            elif len(parc_clima) == 1:
+                # Un clima único para todas las parcelas
+                í_p = 0
+            else:
+                raise ValueError('No hay datos de clima para la parcela "{}" del experimento "{}".'
+                                 .format(p, símismo.nombre))
+
+            for í_var, var in enumerate(dic_datos['cols']):
+                datos = dic_datos['datos'][í_p, í_var]
+                válidos = ~np.isnan(datos)
+                if not np.any(válidos):
+                    raise ValueError('No hay datos de "{}" para la parcela "{}" del experimento "{}".'
+                                     .format(var, p, símismo.nombre))
+                clima[var][i] = np.interp(t, dic_datos['días'][válidos], datos[válidos])
+
+        clima['temp_prom'] = np.divide(np.add(clima['temp_máx'], clima['temp_mín']), 2)
+
+        return clima
+
     def _agregar_datos_rae(símismo, archivo, tipo_egr, col_tiempo, col_parc, cols_etps, factor, cód_na):
         """
         Esta función genérica agrega datos de RAE.
@@ -451,6 +533,38 @@ class Experimento(object):
         :type cód_na: str | int | float
         """
 
+        símismo.datos['RAE'][tipo_egr].update(
+            símismo._leer_datos(archivo=archivo, col_tiempo=col_tiempo, col_parc=col_parc, cols=cols_etps,
+                                factor=factor, cód_na=cód_na)
+        )
+
+    def _leer_datos(símismo, archivo, col_tiempo, col_parc, cols, factor, cód_na):
+        """
+        Esta función genérica lee datos de una base de datos, por parcela y por día.
+
+        :param archivo: El archivo con la base de datos
+        :type archivo: str
+
+        :param col_tiempo: El nombre de la columna de datos.
+        :type col_tiempo: str
+
+        :param col_parc: El nombre de la columna de parcelas.
+        :type col_parc: str
+
+        :param cols: El nombre de las columnas con observaciones.
+        :type cols: str | list[str]
+
+        :param factor: El factor de conversión.
+        :type factor: float | int
+
+        :param cód_na: El código para datos que faltan en la base de datos.
+        :type cód_na: str | int | float
+
+        :return: Un diccionario con los nombres de las columnas ('cols'), los días únicos ('días'), la matriz de datos
+        ('datos', de forma (parcela, columna, día)) y los nombres de las parcelas ('parc').
+        :rtype: dict
+        """
+
         # Crear la base de datos
         archivo = símismo.prep_archivo(archivo)
         bd = gen_bd(archivo)
@@ -464,20 +578,20 @@ class Experimento(object):
         if col_parc is not None and col_parc not in nombres_cols:
             raise ValueError
 
-        if cols_etps is None:
+        if cols is None:
             # Si no se especificó las columnas de interés, tomar todas las posibles.
-            cols_etps = nombres_cols.copy()
+            cols = nombres_cols.copy()
 
             # ... menos las columnas de tiempo y de parcelas
-            cols_etps.remove(col_tiempo)
+            cols.remove(col_tiempo)
             if col_parc is not None:
-                cols_etps.remove(col_parc)
+                cols.remove(col_parc)
         else:
-            # Asegurar formato correcto para las columnas de etapas
-            if not isinstance(cols_etps, list):
-                cols_etps = [cols_etps]
+            # Asegurar formato correcto para las columnas de observaciones
+            if not isinstance(cols, list):
+                cols = [cols]
 
-            for c in cols_etps:
+            for c in cols:
                 # Asegurarse que las columnas de interés existen, si las especificó el usuario
                 if c not in nombres_cols:
                     raise ValueError
@@ -502,13 +616,13 @@ class Experimento(object):
         días_únicos = np.unique(v_días)  # Vector de días únicos
         v_í_días = np.array([np.argwhere(días_únicos == x)[0][0] for x in v_días])
 
-        # El número de parcelas, días y etapas únicas.
+        # El número de parcelas, días y columnas únicas.
         n_parc = parc_únicas.shape[0]
         n_días = días_únicos.shape[0]
-        n_etps = len(cols_etps)
+        n_cols = len(cols)
 
         # La matriz de observaciones
-        m_obs_bd = bd.obt_datos(cols=cols_etps)  # Eje 0: col, eje 1: día/parcela
+        m_obs_bd = bd.obt_datos(cols=cols)  # Eje 0: col, eje 1: día/parcela
         np.multiply(m_obs_bd, factor, out=m_obs_bd)  # Ajustar por el factor
 
         # Si hay código especial para datos que faltan, aplicarlo aquí.
@@ -516,19 +630,15 @@ class Experimento(object):
             m_obs_bd[m_obs_bd == cód_na] = np.nan
 
         # La matriz de datos para el Experimento (vacía por el momento).
-        matr_obs = np.empty((n_parc, n_etps, n_días))
+        matr_obs = np.empty((n_parc, n_cols, n_días))
         matr_obs[:] = np.nan
 
         # Llenar la matriz de datos
         for í_c in range(m_obs_bd.shape[0]):  # Para cada número de columna...
             matr_obs[v_í_parc, [í_c] * n_obs, v_í_días] = m_obs_bd[í_c, :]
 
-        # Llenar el diccionario de datos con todo lo que acabamos de calcular.
-        dic_datos = símismo.datos['RAE'][tipo_egr]
-        dic_datos['cols'] = cols_etps
-        dic_datos['días'] = días_únicos
-        dic_datos['datos'] = matr_obs
-        dic_datos['parc'] = parc_únicas
+        # Devolver el diccionario de datos con todo lo que acabamos de calcular.
+        return {'cols': cols, 'días': días_únicos, 'datos': matr_obs, 'parc': parc_únicas}
 
     def agregar_cultivos(símismo, archivo):
         """
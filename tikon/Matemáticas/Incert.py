@@ -17,7 +17,7 @@ Este código contiene funciones para manejar datos y distribuciones de incertidu
 """
 
 
-def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_rep_parám=None):
+def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_rep_parám=None, generador=None):
     """
     Esta función toma una lista de diccionarios de parámetros y una lista correspondiente de los límites de dichos
     parámetros y genera las distribuciones apriori en formato PyMC, SciPy o NumPy para los parámetros. Devuelve una
@@ -49,6 +49,10 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
     :param n_rep_parám: El número de repeticiones paramétricas. Solamente útil, de verdad, para `formato` = "simul".
     :type n_rep_parám: int
 
+    :param generador: El generador aleatorio para escoger los valores de los parámetros. Si es `None`, se usa el
+    generador aleatorio global.
+    :type generador: np.random.Generator
+
     :return: Una lista de las distribuciones generadas, en el mismo orden que l_pm.
     :rtype: list
 
@@ -73,7 +77,7 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
     lista_dist = []
 
     # Generar la lista de los índices para cada traza de cada parámetro
-    l_í_trazas = gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám=n_rep_parám, comunes=comunes)
+    l_í_trazas = gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám=n_rep_parám, comunes=comunes, generador=generador)
 
     # Para cada parámetro en la lista...
     for n, d_parám in enumerate(l_d_pm):
@@ -103,7 +107,7 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
                 var_sp = VarSciPy.de_texto(texto=d_parám[trzs_texto[0]])
 
                 # Convertir en matriz NumPy
-                dist = var_sp.muestra_alea(n_rep_parám)
+                dist = var_sp.muestra_alea(n_rep_parám, generador=generador)
 
             elif formato == 'sensib':
                 # Si querremos una distribución para una análisis de sensibilidad, devolver la distribución SciPy
@@ -120,7 +124,7 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
                 nombre_pymc = 'parám_%i' % n
 
                 # Un vector numpy de la traza de datos para generar la distribución PyMC.
-                vec_np = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n])
+                vec_np = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n], generador=generador)
 
                 # Generar la distribución PyMC
                 if usar_pymc3:
@@ -130,10 +134,10 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
 
             elif formato == 'valid':
                 # En el caso de validación, simplemente querremos una distribución NumPy
-                dist = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n])
+                dist = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n], generador=generador)
             elif formato == 'sensib':
                 # En el caso de análisis de sensibilidad, querremos una distribución NumPy también
-                dist = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n])
+                dist = gen_vector_coefs(d_parám=d_parám, í_trazas=l_í_trazas[n], generador=generador)
 
         # Guardar la distribución en el diccionario de calibraciones del parámetro
         d_parám[id_simul] = dist
@@ -145,7 +149,7 @@ def trazas_a_dists(id_simul, l_d_pm, l_trazas, formato, comunes, l_lms=None, n_r
     return lista_dist
 
 
-def gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám, comunes):
+def gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám, comunes, generador=None):
     """
     Esta función genera índices de trazas para cada parámetro en una lista de diccionarios de parámetros, tomando
     en cuenta la lista de trazas (calibraciones) que aplican a cada parámetro.
@@ -162,6 +166,9 @@ def gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám, comunes):
     :param comunes:
     :type comunes: bool
 
+    :param generador: El generador aleatorio. Si es `None`, se usa el generador aleatorio global.
+    :type generador: np.random.Generator
+
     :return:
     :rtype: list[dict[np.ndarray]]
     """
@@ -229,7 +236,8 @@ def gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám, comunes):
                     índs = np.arange(tamaño_máx)
                 else:
                     # ...sino, de manera aleatoria.
-                    índs = np.random.choice(range(tamaño_máx), size=rep_per_calib[i], replace=devolv)
+                    alea = np.random if generador is None else generador
+                    índs = alea.choice(tamaño_máx, size=rep_per_calib[i], replace=devolv)
                 d_índs[nombre_trz] = índs
 
             elif isinstance(dist, VarCalib):
@@ -267,7 +275,7 @@ def gen_índ_trazas(l_d_pm, l_trazas, n_rep_parám, comunes):
     return l_í_trazas
 
 
-def gen_vector_coefs(d_parám, í_trazas):
+def gen_vector_coefs(d_parám, í_trazas, generador=None):
     """
     Esta función genera una matríz de valores posibles para un coeficiente, dado los nombres de las calibraciones
     que queremos usar y el número de repeticiones que queremos.
@@ -279,6 +287,10 @@ def gen_vector_coefs(d_parám, í_trazas):
     únicamente especifica el número de muestras que queremos de la distribución.
     :type í_trazas: dict[int | np.ndarray]
 
+    :param generador: El generador aleatorio para las trazas en formato de distribución. Si es `None`, se usa el
+    generador aleatorio global.
+    :type generador: np.random.Generator
+
     :return: Una matriz unidimensional con los valores del parámetro.
     :rtype: np.ndarray
 
@@ -298,7 +310,7 @@ def gen_vector_coefs(d_parám, í_trazas):
             # Si está en formato texto, generar las trazas del tamaño especificado en "índs" por medio de una
             # distribución SciPy
             dist_sp = VarSciPy.de_texto(d_parám[trz])
-            vector.append(dist_sp.muestra_alea(n=índs))
+            vector.append(dist_sp.muestra_alea(n=índs, generador=generador))
 
         elif isinstance(d_parám[trz], VarCalib):
             # Variables de calibraciones activas (PyMC) se agregan directamente
@@ -306,7 +318,7 @@ def gen_vector_coefs(d_parám, í_trazas):
 
         elif isinstance(d_parám[trz], VarSciPy):
             # Para distribuciones en formato SciPy, generar trazas de una vez
-            vector.append(d_parám[trz].muestra_alea(n=índs))
+            vector.append(d_parám[trz].muestra_alea(n=índs, generador=generador))
 
         else:
             # Si la traza era de otro tipo, tenemos un error.
@@ -452,6 +464,62 @@ def validar_matr_pred(matr_predic, vector_obs):
     # Calcular el promedio de todas las repeticiones de predicciones
     vector_predic = matr_predic.mean(axis=0)
 
+    # El percentil de cada observación en las predicciones
+    percs = np.array([estad.percentileofscore(matr_predic[..., n], vector_obs[n]) / 100 for n in range(n_días)])
+
+    return validar_percentiles(vector_predic=vector_predic, vector_obs=vector_obs, percs=percs)
+
+
+def predic_resumen(vista, vector_obs, pasos_obs):
+    """
+    Calcula, a partir de las estadísticas resumidas de una simulación, las predicciones promedias y los percentiles
+    de las observaciones en las predicciones, para `validar_percentiles()`.
+
+    :param vista: Las estadísticas resumidas de las predicciones de una parcela y una etapa.
+    :type vista: tikon.Matemáticas.Resumen.VistaResumen
+
+    :param vector_obs: El vector de las observaciones.
+    :type vector_obs: np.ndarray
+
+    :param pasos_obs: Los pasos (posiblemente fraccionales) de las observaciones.
+    :type pasos_obs: np.ndarray
+
+    :return: Las predicciones promedias, las observaciones (sin valores que faltan) y sus percentiles.
+    :rtype: (np.ndarray, np.ndarray, np.ndarray)
+    """
+
+    # Quitar observaciones que faltan
+    pasos_obs = pasos_obs[~np.isnan(vector_obs)]
+    vector_obs = vector_obs[~np.isnan(vector_obs)]
+
+    # El promedio se interpola entre pasos; los percentiles se toman del paso más cercano.
+    vector_predic = np.interp(pasos_obs, np.arange(vista.n_días), vista.promedio())
+    pasos_cercanos = np.clip(np.round(pasos_obs).astype(int), 0, vista.n_días - 1)
+    percs = vista.percentil_de(vector_obs, pasos=pasos_cercanos)
+
+    return vector_predic, vector_obs, percs
+
+
+def validar_percentiles(vector_predic, vector_obs, percs):
+    """
+    Valida predicciones según los valores observados correspondientes.
+
+    :param vector_predic: Las predicciones promedias. Eje 0 = día.
+    :type vector_predic: np.ndarray
+
+    :param vector_obs: Las observaciones. Eje 0 = día.
+    :type vector_obs: np.ndarray
+
+    :param percs: El percentil (en [0, 1]) de cada observación en las predicciones.
+    :type percs: np.ndarray
+
+    :return: Devuelve los valores de R2, de RCNEP (Raíz cuadrada normalizada del error promedio), y el R2 de la
+    exactitud de los intervalos de confianza (1.0 = exactitud perfecta).
+    :rtype: dict
+    """
+
+    n_días = len(vector_obs)
+
     # Calcular R cuadrado
     r2 = calc_r2(vector_predic, vector_obs)
 
@@ -459,10 +527,7 @@ def validar_matr_pred(matr_predic, vector_obs):
     rcnep = np.divide(np.sqrt(np.square(vector_predic - vector_obs).mean()), np.mean(vector_obs))
 
     # Validar el intervalo de incertidumbre
-    confianza = np.empty_like(vector_obs, dtype=float)
-    for n in range(n_días):
-        perc = estad.percentileofscore(matr_predic[..., n], vector_obs[n]) / 100
-        confianza[n] = abs(0.5 - perc) * 2
+    confianza = np.abs(0.5 - percs) * 2
 
     confianza.sort()
 
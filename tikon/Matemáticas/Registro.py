@@ -0,0 +1,161 @@
+from numbers import Real
+
+import numpy as np
+
+"""
+El registro de parámetros de un Simulable. Los coeficientes de todas las ecuaciones se guardan en una única matriz
+contigua (eje 0: repetición paramétrica, eje 1: parámetro), y cada matriz de coeficientes que usa la simulación es una
+vista de un bloque de esta matriz. Así, numerizar los coeficientes antes de cada simulación no tiene que recorrer ni
+copiar diccionarios: no hay nada que hacer si los coeficientes ya son numéricos, y basta con escribir un único vector
+si vienen de variables de calibración (p. ej., de PyMC). Los diccionarios de coeficientes quedan únicamente como
+formato de importación y exportación.
+"""
+
+
+class RegistroParáms(object):
+    """
+    Una matriz contigua de valores de parámetros, con vistas nombradas para cada matriz de coeficientes.
+    """
+
+    def __init__(símismo, coefs):
+        """
+
+        :param coefs: El diccionario (de estructura arbitraria) de matrices de coeficientes. Cada matriz tiene las
+        repeticiones paramétricas en el eje 0, y puede contener números o variables de calibración (objetos que se
+        pueden convertir en número con `float()`).
+        :type coefs: dict
+
+        """
+
+        # Las vistas de cada bloque, por ubicación, y el diccionario de vistas con la misma estructura que `coefs`
+        símismo.vistas = {}
+        símismo.coefs = {}
+
+        l_ubics = []
+        l_matrs = []
+        _aplanar(coefs, c=símismo.coefs, ubic=[], l_ubics=l_ubics, l_matrs=l_matrs)
+
+        n_rep = l_matrs[0].shape[0] if len(l_matrs) else 0
+
+        # Los desplazamientos de los bloques de cada matriz de coeficientes
+        desplz = np.cumsum([0] + [int(np.prod(m.shape[1:])) for m in l_matrs])
+        n_paráms = desplz[-1]
+
+        # La matriz de valores. Eje 0: repetición paramétrica, eje 1: parámetro
+        símismo.valores = np.empty((n_rep, n_paráms))
+
+        # Las variables de calibración y sus índices en `valores.flat`
+        símismo.vars = []
+        í_vars = []
+
+        for ubic, m, a, b in zip(l_ubics, l_matrs, desplz[:-1], desplz[1:]):
+            vista = símismo.valores[:, a:b].reshape(m.shape)
+
+            símismo.vistas[tuple(ubic)] = vista
+            d = símismo.coefs
+            for ll in ubic[:-1]:
+                d = d[ll]
+            d[ubic[-1]] = vista
+
+            # Los tipos de las variables de calibración en la matriz, si hay (verificamos los tipos, y no cada valor,
+            # porque es mucho más rápido)
+            plano = m.reshape((n_rep, b - a))
+            tipos_vars = set()
+            if m.dtype == object:
+                tipos_vars = {t for t in set(map(type, plano.flat)) if not issubclass(t, Real)}
+
+            if not tipos_vars:
+                vista[:] = m
+                continue
+
+            es_var = np.fromiter((type(x) in tipos_vars for x in plano.flat), dtype=bool, count=plano.size)
+            es_var = es_var.reshape(plano.shape)
+
+            símismo.valores[:, a:b][~es_var] = plano[~es_var]
+            r, j = np.nonzero(es_var)
+            símismo.vars.extend(plano[r, j])
+            í_vars.extend(r * n_paráms + a + j)
+
+        símismo.í_vars = np.array(í_vars, dtype=int)
+
+        # Una copia de los valores, si se escribieron valores temporarios en el registro (ver `escribir()`)
+        símismo._originales = None
+
+        símismo.numerizar()
+
+    def vista(símismo, ubic):
+        """
+        Devuelve la vista de la matriz de coeficientes en una ubicación dada.
+
+        :param ubic: La ubicación (lista de llaves) de la matriz en el diccionario de coeficientes.
+        :type ubic: list | tuple
+
+        :return: La vista.
+        :rtype: np.ndarray
+        """
+
+        return símismo.vistas[tuple(ubic)]
+
+    def escribir(símismo, ubic, val):
+        """
+        Escribe valores temporarios en una matriz de coeficientes (p. ej., los coeficientes de un punto de control). Los
+        valores originales se restauran con la próxima llamada a `numerizar()`.
+
+        :param ubic: La ubicación (lista de llaves) de la matriz en el diccionario de coeficientes.
+        :type ubic: list | tuple
+
+        :param val: Los valores nuevos.
+        :type val: np.ndarray
+
+        """
+
+        vista = símismo.vista(ubic)
+
+        if símismo._originales is None:
+            símismo._originales = símismo.valores.copy()
+
+        vista[:] = val
+
+    def numerizar(símismo):
+        """
+        Actualiza la matriz de valores con los valores actuales de las variables de calibración, y restaura los
+        valores escritos temporariamente con `escribir()`.
+        """
+
+        if símismo._originales is not None:
+            np.copyto(símismo.valores, símismo._originales)
+            símismo._originales = None
+
+        if len(símismo.vars):
+            símismo.valores.flat[símismo.í_vars] = [float(v) for v in símismo.vars]
+
+
+def _aplanar(d, c, ubic, l_ubics, l_matrs):
+    """
+    Genera las listas de ubicaciones y de matrices de un diccionario de matrices de coeficientes, y copia su
+    estructura (sin las matrices).
+
+    :param d: El diccionario.
+    :type d: dict
+
+    :param c: El diccionario vacío donde copiar la estructura.
+    :type c: dict
+
+    :param ubic: La ubicación del diccionario actual (para recursiones).
+    :type ubic: list
+
+    :param l_ubics: La lista de ubicaciones para llenar.
+    :type l_ubics: list
+
+    :param l_matrs: La lista de matrices para llenar.
+    :type l_matrs: list
+
+    """
+
+    for ll, v in d.items():
+        if isinstance(v, dict):
+            c[ll] = {}
+            _aplanar(v, c=c[ll], ubic=ubic + [ll], l_ubics=l_ubics, l_matrs=l_matrs)
+        else:
+            l_ubics.append(ubic + [ll])
+            l_matrs.append(np.asarray(v))
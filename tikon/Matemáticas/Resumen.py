@@ -0,0 +1,418 @@
+import numpy as np
+
+"""
+Estadísticas en línea de las predicciones de una simulación. En vez de guardar la población de cada repetición para
+cada paso, una simulación resumida alimenta a un `Resumen` con las poblaciones de todas las repeticiones de cada paso,
+y el `Resumen` guarda únicamente estadísticas resumidas (promedio, varianza, extremos y un histograma logarítmico para
+los percentiles). Así, la memoria necesaria no depende del número de repeticiones.
+
+Los promedios y varianzas se calculan con el algoritmo de Welford (en su forma por grupos, de Chan et al.), y los
+percentiles con un histograma de casillas de tamaño relativo constante (tal como el "DDSketch" de Masson et al., 2019),
+así que el error relativo de los percentiles no pasa de `precisión`. El histograma de cada parcela, etapa y paso tiene
+un número fijo de casillas (una ventana sobre la escala logarítmica, que se ajusta a los valores); si los valores
+ocupan más casillas, las casillas más bajas se juntan (la versión "collapsing lowest" del DDSketch), así que los
+percentiles altos guardan su precisión y únicamente los percentiles bajos de distribuciones muy anchas la pierden. Dos
+`Resumen` del mismo tamaño se pueden combinar (por ejemplo, los resúmenes de dos pedazos de repeticiones paramétricas
+simulados en paralelo).
+"""
+
+
+class Resumen(object):
+    """
+    Las estadísticas resumidas de las predicciones de una simulación. Eje 0: parcela, eje 1: etapa, eje 2: paso.
+
+    Cada parcela, etapa y paso ocupa 2 * (`n_casillas` + 1) + 64 bytes (322 bytes con los valores por defecto) con
+    menos de 65536 repeticiones en total, y 4 * (`n_casillas` + 1) + 64 bytes con más; la matriz completa de
+    poblaciones ocupa 8 bytes por repetición (800 bytes con 10 repeticiones estocásticas y 10 paramétricas).
+    """
+
+    def __init__(símismo, forma, precisión=0.05, rango=(1e-4, 1e12), n_casillas=128, n_valores=None):
+        """
+
+        :param forma: La forma de las matrices de estadísticas: (parcela, etapa, paso).
+        :type forma: tuple
+
+        :param precisión: El error relativo máximo de los percentiles (en las casillas que no se juntaron).
+        :type precisión: float
+
+        :param rango: Los valores positivos mínimos y máximos que se distinguen en los percentiles. Valores inferiores
+        al mínimo se cuentan como 0, y valores superiores al máximo se cuentan como el máximo.
+        :type rango: tuple
+
+        :param n_casillas: El número de casillas del histograma de cada parcela, etapa y paso. Con `precisión`,
+        determina el rango de valores (un factor de `((1 + precisión) / (1 - precisión)) ** n_casillas`, o más de 5
+        órdenes de magnitud con los valores por defecto) más allá del cual se juntan las casillas más bajas.
+        :type n_casillas: int
+
+        :param n_valores: El número total de valores (repeticiones) de cada parcela, etapa y paso, si se conoce. Con
+        menos de 65536, los conteos se guardan en enteros de 16 bits.
+        :type n_valores: int
+
+        """
+
+        símismo.forma = tuple(forma)
+
+        # El número de valores, promedio y suma de desviaciones cuadradas (para la varianza)
+        símismo.n = np.zeros(forma)
+        símismo.media = np.zeros(forma)
+        símismo.m2 = np.zeros(forma)
+
+        # Los extremos
+        símismo.mín = np.full(forma, np.inf)
+        símismo.máx = np.full(forma, -np.inf)
+
+        # La suma, sobre las repeticiones paramétricas, de la desviación estándar estocástica (para separar las
+        # incertidumbres estocástica y paramétrica), y el número de repeticiones paramétricas correspondiente.
+        símismo.suma_desv_estoc = np.zeros(forma)
+        símismo.n_parám = np.zeros(forma)
+
+        # Las casillas de la escala logarítmica: la casilla k > 0 contiene los valores en (γ^(k - 1 + k_mín),
+        # γ^(k + k_mín)], y los valores 0 (o inferiores al rango) se cuentan aparte, en `ceros`.
+        símismo.log_γ = np.log((1 + precisión) / (1 - precisión))
+        símismo.k_mín = int(np.floor(np.log(rango[0]) / símismo.log_γ))
+        símismo.k_máx = int(np.ceil(np.log(rango[1]) / símismo.log_γ)) - símismo.k_mín
+
+        # El histograma de cada parcela, etapa y paso cubre las casillas `base` a `base + n_casillas - 1`; la primera
+        # incluye también las casillas inferiores que se juntaron. `tope` es la casilla más alta con valores (0 si no
+        # hay valores positivos todavía).
+        tipo_conteos = np.uint16 if n_valores is not None and n_valores < 2 ** 16 else np.int32
+        símismo.ceros = np.zeros(forma, dtype=tipo_conteos)
+        símismo.hist = np.zeros(símismo.forma + (n_casillas,), dtype=tipo_conteos)
+        símismo.base = np.ones(forma, dtype=np.int32)
+        símismo.tope = np.zeros(forma, dtype=np.int32)
+
+    def reiniciar(símismo):
+        """
+        Borra las estadísticas, para una nueva simulación.
+        """
+
+        for matr in [símismo.n, símismo.media, símismo.m2, símismo.suma_desv_estoc, símismo.n_parám, símismo.ceros,
+                     símismo.hist, símismo.tope]:
+            matr[:] = 0
+        símismo.base[:] = 1
+        símismo.mín[:] = np.inf
+        símismo.máx[:] = -np.inf
+
+    def agregar(símismo, matr, i):
+        """
+        Agrega los valores de todas las repeticiones de un paso.
+
+        :param matr: Los valores. Eje 0: parcela, 1: repetición estocástica, 2: repetición paramétrica, 3: etapa.
+        :type matr: np.ndarray
+
+        :param i: El número del paso.
+        :type i: int
+
+        """
+
+        n_b = matr.shape[1] * matr.shape[2]
+        media_b = matr.mean(axis=(1, 2))
+        m2_b = np.square(matr - media_b[:, np.newaxis, np.newaxis]).sum(axis=(1, 2))
+
+        símismo._combinar_momentos(
+            í=(slice(None), slice(None), i), n_b=n_b, media_b=media_b, m2_b=m2_b,
+            mín_b=matr.min(axis=(1, 2)), máx_b=matr.max(axis=(1, 2)),
+            suma_desv_estoc_b=matr.std(axis=1).sum(axis=1), n_parám_b=matr.shape[2]
+        )
+
+        # Las casillas de los valores, con las repeticiones en el último eje (eje 0: parcela, 1: etapa, 2: repetición)
+        n_parc, _, _, n_etps = matr.shape
+        casillas = símismo._casillas(matr).reshape((n_parc, n_b, n_etps)).swapaxes(1, 2)
+        símismo._agregar_casillas(í=(slice(None), slice(None), i), casillas=casillas)
+
+    def combinar(símismo, otro):
+        """
+        Combina otro `Resumen` (de las mismas dimensiones) con este.
+
+        :param otro: El otro `Resumen`.
+        :type otro: Resumen
+        """
+
+        símismo._combinar_momentos(
+            í=..., n_b=otro.n, media_b=otro.media, m2_b=otro.m2, mín_b=otro.mín, máx_b=otro.máx,
+            suma_desv_estoc_b=otro.suma_desv_estoc, n_parám_b=otro.n_parám
+        )
+
+        # Las casillas del otro histograma se agregan como valores con pesos
+        casillas = otro.base[..., np.newaxis] + np.arange(otro.hist.shape[-1])
+        casillas[otro.hist == 0] = 0
+        símismo._agregar_casillas(í=..., casillas=casillas, pesos=otro.hist)
+        símismo.ceros += otro.ceros
+
+    def _combinar_momentos(símismo, í, n_b, media_b, m2_b, mín_b, máx_b, suma_desv_estoc_b, n_parám_b):
+        # Combinación de promedios y varianzas por grupos (Chan et al., 1979)
+        n_a = símismo.n[í]
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = media_b - símismo.media[í]
+            frac_b = np.where(n > 0, np.divide(n_b, n), 0)
+
+        símismo.media[í] += delta * frac_b
+        símismo.m2[í] += m2_b + np.square(delta) * n_a * frac_b
+        símismo.n[í] = n
+
+        np.minimum(símismo.mín[í], mín_b, out=símismo.mín[í])
+        np.maximum(símismo.máx[í], máx_b, out=símismo.máx[í])
+
+        símismo.suma_desv_estoc[í] += suma_desv_estoc_b
+        símismo.n_parám[í] += n_parám_b
+
+    def _agregar_casillas(símismo, í, casillas, pesos=None):
+        """
+        Agrega valores, por sus casillas, a los histogramas, moviendo la ventana de casillas de cada histograma para
+        incluir la casilla más alta, y juntando las casillas que quedan abajo de la ventana.
+
+        :param í: El índice de los histogramas en las matrices de estadísticas.
+        :type í: tuple
+
+        :param casillas: Las casillas de los valores (0 para los ceros). Los valores de cada histograma en el último
+        eje.
+        :type casillas: np.ndarray
+
+        :param pesos: El número de valores de cada casilla, si no es 1.
+        :type pesos: np.ndarray
+
+        """
+
+        hist = símismo.hist[í]
+        base = símismo.base[í]
+        tope = símismo.tope[í]
+        n_casillas = hist.shape[-1]
+
+        # Los ceros no ocupan casillas del histograma
+        positivos = casillas > 0
+        if pesos is None:
+            símismo.ceros[í] += np.sum(~positivos, axis=-1, dtype=símismo.ceros.dtype)
+
+        # La nueva ventana: tan baja como posible, pero incluyendo la casilla más alta
+        nuevo_tope = np.maximum(tope, np.max(casillas, axis=-1, initial=0))
+        mín_b = np.min(np.where(positivos, casillas, símismo.k_máx), axis=-1)
+        abajo = np.where(tope > 0, np.minimum(base, mín_b), mín_b)
+        nueva_base = np.maximum(np.maximum(nuevo_tope - n_casillas + 1, abajo), 1).astype(np.int32)
+
+        # Las casillas viejas y las nuevas, en la nueva ventana
+        celdas = np.arange(base.size).reshape(base.shape + (1,)) * n_casillas
+        j_viejas = np.clip(base[..., np.newaxis] + np.arange(n_casillas) - nueva_base[..., np.newaxis], 0,
+                           n_casillas - 1)
+        j_nuevas = np.maximum(casillas - nueva_base[..., np.newaxis], 0)
+
+        conteos = np.bincount((celdas + j_viejas).ravel(), weights=hist.ravel(), minlength=hist.size)
+        if pesos is None:
+            pesos = positivos
+        else:
+            pesos = np.where(positivos, pesos, 0)
+        conteos += np.bincount((celdas + j_nuevas).ravel(), weights=pesos.ravel(), minlength=hist.size)
+
+        símismo.hist[í] = conteos.reshape(hist.shape)
+        símismo.base[í] = nueva_base
+        símismo.tope[í] = nuevo_tope
+
+    def _casillas(símismo, matr):
+        """
+        Calcula la casilla de cada valor (0 para los ceros y los valores inferiores al rango).
+
+        :param matr: Los valores.
+        :type matr: np.ndarray
+
+        :return: Las casillas.
+        :rtype: np.ndarray
+        """
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = np.ceil(np.log(matr) / símismo.log_γ) - símismo.k_mín
+        k[~np.isfinite(k) | (k < 1)] = 0
+        return np.minimum(k, símismo.k_máx).astype(int)
+
+    def _valores_casillas(símismo, casillas):
+        """
+        Devuelve el valor representativo de casillas (0 para la casilla de los ceros).
+
+        :param casillas: Las casillas.
+        :type casillas: np.ndarray
+
+        :return: Los valores.
+        :rtype: np.ndarray
+        """
+
+        γ = np.exp(símismo.log_γ)
+        return np.where(casillas > 0, 2 * np.exp((casillas + símismo.k_mín) * símismo.log_γ) / (γ + 1), 0)
+
+    @property
+    def varianza(símismo):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.divide(símismo.m2, símismo.n)
+
+    def vista(símismo, i_parc, i_etp):
+        """
+        Devuelve las estadísticas de una parcela y de una etapa.
+
+        :param i_parc: El índice de la parcela.
+        :type i_parc: int
+
+        :param i_etp: El índice de la etapa.
+        :type i_etp: int
+
+        :return: Las estadísticas.
+        :rtype: VistaResumen
+        """
+
+        return VistaResumen(símismo, i_parc=i_parc, i_etp=i_etp)
+
+
+class VistaResumen(object):
+    """
+    Las estadísticas de un `Resumen` para una parcela y una etapa, para cada paso. Tiene la misma interfaz que
+    `EstadísticasMatr`, así que se puede dibujar y validar de la misma manera que una matriz de predicciones.
+    """
+
+    def __init__(símismo, resumen, i_parc, i_etp):
+        """
+
+        :param resumen: El `Resumen`.
+        :type resumen: Resumen
+
+        :param i_parc: El índice de la parcela.
+        :type i_parc: int
+
+        :param i_etp: El índice de la etapa.
+        :type i_etp: int
+
+        """
+
+        símismo.resumen = resumen
+        símismo.í = (i_parc, i_etp)
+
+    @property
+    def n_días(símismo):
+        return símismo.resumen.forma[2]
+
+    def promedio(símismo):
+        return símismo.resumen.media[símismo.í]
+
+    def desv_est(símismo):
+        return np.sqrt(símismo.resumen.varianza[símismo.í])
+
+    def desv_est_estoc(símismo):
+        return np.divide(símismo.resumen.suma_desv_estoc[símismo.í], símismo.resumen.n_parám[símismo.í])
+
+    def mín(símismo):
+        return símismo.resumen.mín[símismo.í]
+
+    def máx(símismo):
+        return símismo.resumen.máx[símismo.í]
+
+    def percentil(símismo, p):
+        """
+        Calcula un percentil de las predicciones para cada paso.
+
+        :param p: El percentil, en [0, 100].
+        :type p: float
+
+        :return: El percentil para cada paso.
+        :rtype: np.ndarray
+        """
+
+        hist, casillas = símismo._histograma()
+        cum = np.cumsum(hist, axis=-1)
+        n = cum[:, -1]
+
+        # Interpolar entre los dos valores ordenados más cercanos (tal como `np.percentile`)
+        rango = p / 100 * (n - 1)
+        rango_inf = np.floor(rango)
+        rango_sup = np.minimum(rango_inf + 1, n - 1)
+
+        # Los extremos se conocen exactamente
+        í = np.arange(len(n))
+        valores = [
+            np.clip(
+                símismo.resumen._valores_casillas(casillas[í, np.argmax(cum > r[:, np.newaxis], axis=-1)]),
+                símismo.mín(), símismo.máx()
+            ) for r in [rango_inf, rango_sup]
+        ]
+
+        return valores[0] + (rango - rango_inf) * (valores[1] - valores[0])
+
+    def percentil_de(símismo, valores, pasos):
+        """
+        Calcula el percentil, en [0, 1], de valores en la distribución de las predicciones (tal como
+        `scipy.stats.percentileofscore` con `kind='mean'`).
+
+        :param valores: Los valores.
+        :type valores: np.ndarray
+
+        :param pasos: El índice del paso de cada valor.
+        :type pasos: np.ndarray
+
+        :return: El percentil de cada valor.
+        :rtype: np.ndarray
+        """
+
+        hist, casillas_hist = símismo._histograma()
+        hist = hist[pasos]  # Eje 0: valor, 1: casilla
+        n = hist.sum(axis=-1)
+
+        # La columna del histograma de cada valor. Los valores abajo de la ventana de casillas caen en la primera
+        # casilla (donde se juntaron las casillas inferiores), y los que están arriba, en la columna vacía final.
+        casillas = símismo.resumen._casillas(np.asarray(valores, dtype=float))
+        base = casillas_hist[pasos, 1]
+        col = np.where(casillas > 0, np.clip(casillas - base + 1, 1, hist.shape[-1] - 1), 0)
+
+        cum = np.cumsum(hist, axis=-1)
+        í = np.arange(len(col))
+        debajo = cum[í, col] - hist[í, col]
+
+        return (debajo + hist[í, col] / 2) / n
+
+    def _histograma(símismo):
+        """
+        Devuelve el histograma completo de cada paso: los ceros, las casillas de la ventana y una columna vacía (para
+        los valores superiores a la ventana), con la casilla de cada columna.
+
+        :return: Los conteos y las casillas. Eje 0: paso, 1: columna.
+        :rtype: (np.ndarray, np.ndarray)
+        """
+
+        res = símismo.resumen
+        hist = res.hist[símismo.í]
+        n_pasos, n_casillas = hist.shape
+
+        conteos = np.zeros((n_pasos, n_casillas + 2), dtype=hist.dtype)
+        conteos[:, 0] = res.ceros[símismo.í]
+        conteos[:, 1:-1] = hist
+
+        casillas = np.zeros((n_pasos, n_casillas + 2), dtype=int)
+        casillas[:, 1:] = res.base[símismo.í][:, np.newaxis] + np.arange(n_casillas + 1)
+
+        return conteos, casillas
+
+
+class EstadísticasMatr(object):
+    """
+    Las estadísticas de una matriz de predicciones completa (eje 0: repetición estocástica, eje 1: repetición
+    paramétrica, eje 2: día), con la misma interfaz que `VistaResumen`.
+    """
+
+    def __init__(símismo, matr):
+        símismo.matr = matr
+
+    @property
+    def n_días(símismo):
+        return símismo.matr.shape[2]
+
+    def promedio(símismo):
+        return símismo.matr.mean(axis=(0, 1))
+
+    def desv_est(símismo):
+        return np.std(símismo.matr, axis=(0, 1))
+
+    def desv_est_estoc(símismo):
+        return np.mean(np.std(símismo.matr, axis=0), axis=0)
+
+    def mín(símismo):
+        return símismo.matr.min(axis=(0, 1))
+
+    def máx(símismo):
+        return símismo.matr.max(axis=(0, 1))
+
+    def percentil(símismo, p):
+        return np.percentile(símismo.matr, p, axis=(0, 1))
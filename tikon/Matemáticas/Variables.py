@@ -227,8 +227,8 @@ class VarSciPy(VarAlea):
     def percentiles(símismo, q):
         return símismo.var.ppf(q * símismo.mult)
 
-    def muestra_alea(símismo, n):
-        return símismo.var.rvs(n) * símismo.mult + símismo.suma
+    def muestra_alea(símismo, n, generador=None):
+        return símismo.var.rvs(n, random_state=generador) * símismo.mult + símismo.suma
 
     def fdp(símismo, x):
         return símismo.var.pdf(x / símismo.mult)
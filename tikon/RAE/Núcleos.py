@@ -0,0 +1,944 @@
+import math as mat
+from functools import partial
+
+import numpy as np
+
+"""
+Este módulo contiene los núcleos (funciones vectorizadas) que implementan cada tipo de ecuación de las Redes
+AgroEcológicas. La Red escoge el núcleo apropiado para cada tipo de ecuación una única vez (en `Red.actualizar()`), así
+que el bucle de simulación no tiene que comparar nombres de ecuaciones a cada paso.
+
+Todos los núcleos de una misma categoría tienen la misma firma, y todos escriben sus resultados en la matriz `out`.
+Los ejes de las matrices son los mismos que en la Red:
+    Eje 0: Parcela, 1: Repetición estocástica, 2: Repetición paramétrica, 3: Etapa, [4: Etapa víctima]
+"""
+
+
+# Depredación
+# Firma: f(pobs, dens, dens_depred, cf, out, conj, trabajo)
+#   pobs: Poblaciones de las presas, con la misma forma que `dens`.
+#   dens: Densidades de las presas. En matrices densas, eje 3: 1, eje 4: etapa víctima.
+#   dens_depred: Densidades de los depredadores. En matrices densas, eje 3: depredador, eje 4: 1.
+#   cf: Diccionario de los coeficientes numerizados de este tipo de ecuación.
+#   out: La matriz de depredación para llenar. En matrices densas, eje 3: depredador, eje 4: víctima.
+#   conj: Función que ajusta `out` por la presencia de presas múltiples, con firma
+#       f(matr, pesos, máx, trabajo, trabajo_eje) (ver `conj_presas_densa()`).
+#   trabajo: Una matriz de trabajo para los resultados intermediarios y una máscara, de la forma de `out`, y las
+#       matrices de trabajo de `conj` (`trabajo` y `trabajo_eje`), que pueden incluir la primera.
+# Con la representación por aristas de la Red, el eje 3 de todas las matrices representa, al contrario, las aristas
+# (interacciones depredador-presa) de la red trófica, y los coeficientes tienen un valor por arista.
+# Los cálculos se hacen en `out` y en las matrices de trabajo, en el mismo orden que las expresiones en los comentarios.
+def _depred_tipo_i_presa(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo I con dependencia en la población de la presa.
+    np.multiply(pobs, cf['a'], out=out)
+
+
+def _depred_tipo_ii_presa(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo II con dependencia en la población de la presa.
+    # dens * (a / (dens + b))
+    np.add(dens, cf['b'], out=out)
+    np.divide(cf['a'], out, out=out)
+    np.multiply(dens, out, out=out)
+
+
+def _depred_tipo_iii_presa(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo III con dependencia en la población de la presa.
+    # dens^2 * (a / (dens^2 + b))
+    cuad = np.square(dens, out=trabajo[0])
+    np.add(cuad, cf['b'], out=out)
+    np.divide(cf['a'], out, out=out)
+    np.multiply(cuad, out, out=out)
+
+
+def _depred_tipo_i_ratio(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo I con dependencia en el ratio de presa a depredador.
+    # (dens / dens_depred) * a
+    np.divide(dens, dens_depred, out=out)
+    np.multiply(out, cf['a'], out=out)
+
+
+def _depred_tipo_ii_ratio(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo II con dependencia en el ratio de presa a depredador.
+    # r * (a / (r + b)), con r = dens / dens_depred
+    ratio = np.divide(dens, dens_depred, out=trabajo[0])
+    np.add(ratio, cf['b'], out=out)
+    np.divide(cf['a'], out, out=out)
+    np.multiply(ratio, out, out=out)
+
+
+def _depred_tipo_iii_ratio(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional tipo III con dependencia en el ratio de presa a depredador.
+    # r^2 * (a / (r^2 + b)), con r = dens / dens_depred
+    cuad = np.square(np.divide(dens, dens_depred, out=trabajo[0]), out=trabajo[0])
+    np.add(cuad, cf['b'], out=out)
+    np.divide(cf['a'], out, out=out)
+    np.multiply(cuad, out, out=out)
+
+
+def _depred_beddington_deangelis(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional Beddington-DeAngelis. Incluye dependencia en el depredador.
+    # dens * (a / (b + dens + c * dens_depred))
+    np.add(cf['b'], dens, out=out)
+    out += np.multiply(cf['c'], dens_depred, out=trabajo[0])
+    np.divide(cf['a'], out, out=out)
+    np.multiply(dens, out, out=out)
+
+
+def _depred_tipo_i_hassell_varley(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional Tipo I con dependencia Hassell-Varley.
+    # (dens / dens_depred^m) * a
+    np.power(dens_depred, cf['m'], out=out)
+    np.divide(dens, out, out=out)
+    np.multiply(out, cf['a'], out=out)
+
+
+def _depred_tipo_ii_hassell_varley(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional Tipo II con dependencia Hassell-Varley.
+    # r * (a / (r + b)), con r = dens / dens_depred^m
+    ratio = np.divide(dens, np.power(dens_depred, cf['m'], out=trabajo[0]), out=trabajo[0])
+    np.add(ratio, cf['b'], out=out)
+    np.divide(cf['a'], out, out=out)
+    np.multiply(ratio, out, out=out)
+
+
+def _depred_kovai(pobs, dens, dens_depred, cf, out, conj, trabajo):
+    # Depredación de respuesta funcional de asíntota doble (ecuación Kovai).
+    # a * (1 - exp(-r / a)), con r = (dens + b * (exp(-dens / b) - 1)) / dens_depred (y 0 donde r es infinito)
+    temp, másc, trabajo_conj, trabajo_conj_eje = trabajo
+
+    # La presa efectiva, y su ratio a los depredadores
+    np.negative(dens, out=temp)
+    np.divide(temp, cf['b'], out=temp)
+    np.exp(temp, out=temp)
+    np.subtract(temp, 1, out=temp)
+    np.multiply(cf['b'], temp, out=temp)
+    np.add(dens, temp, out=temp)
+    ratio = np.divide(temp, dens_depred, out=temp)
+    np.copyto(ratio, 0, where=np.equal(ratio, np.inf, out=másc))
+
+    np.negative(ratio, out=out)
+    np.divide(out, cf['a'], out=out)
+    np.exp(out, out=out)
+    np.subtract(1, out, out=out)
+    np.multiply(cf['a'], out, out=out)
+
+    # Ajustar por la presencia de múltiples presas. La razón en `temp` ya no sirve.
+    conj(out, pesos=cf['a'], máx=1, trabajo=trabajo_conj, trabajo_eje=trabajo_conj_eje)
+
+
+núcleos_depred = {
+    'Tipo I_Dependiente presa': _depred_tipo_i_presa,
+    'Tipo II_Dependiente presa': _depred_tipo_ii_presa,
+    'Tipo III_Dependiente presa': _depred_tipo_iii_presa,
+    'Tipo I_Dependiente ratio': _depred_tipo_i_ratio,
+    'Tipo II_Dependiente ratio': _depred_tipo_ii_ratio,
+    'Tipo III_Dependiente ratio': _depred_tipo_iii_ratio,
+    'Beddington-DeAngelis': _depred_beddington_deangelis,
+    'Tipo I_Hassell-Varley': _depred_tipo_i_hassell_varley,
+    'Tipo II_Hassell-Varley': _depred_tipo_ii_hassell_varley,
+    'Tipo III_Hassell-Varley': _depred_tipo_ii_hassell_varley,  # Igual que el Tipo II, tal como antes
+    'Kovai': _depred_kovai
+}
+
+
+# Modificaciones a la taza de crecimiento intrínsica
+# Firma: f(cf, paso, extrn, out)
+#   Los núcleos en `núcleos_crec_modif_clima` tienen la firma f(cf, extrn) -> taza de crecimiento diaria modificada.
+def _crec_mod_ninguna(cf, paso, extrn, out):
+    # Sin modificación a r.
+    np.multiply(cf['r'], paso, out=out)
+
+
+def _crec_mod_log_normal_temp(cf, extrn):
+    # r responde a la temperatura con una ecuación log normal.
+    return cf['r'] * np.exp(-0.5 * (np.log(extrn['temp_máx'] / cf['t']) / cf['p']) ** 2)
+
+
+núcleos_crec_modif = {
+    'Ninguna': _crec_mod_ninguna,
+    'Log Normal Temperatura': _crec_mod_log_normal_temp
+}
+
+# Los núcleos de modificación de crecimiento que dependen únicamente del clima y de los coeficientes. La Red los calcula
+# para todos los pasos de la simulación antes de simular (`Red._prep_forzantes()`).
+núcleos_crec_modif_clima = {_crec_mod_log_normal_temp}
+
+
+# Crecimiento
+# Firma: f(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo)
+#   `depred_etps` es la depredación por las etapas de este tipo de ecuación (eje 3: etapa, eje 4: presa), únicamente
+#   para los núcleos en `núcleos_con_depred` (y sino, `None`). Es una copia, que el núcleo puede modificar.
+#   `out` contiene la taza de crecimiento (modificada) al entrar, y el crecimiento de la población al salir.
+#   `trabajo` son las matrices de trabajo del núcleo (ver `matrs_trabajo()`), o `None` si no necesita.
+def _crec_exponencial(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    # Crecimiento exponencial
+    np.multiply(pobs_etps, out, out=out)
+
+
+def _logístico(pobs_etps, k, out, temp):
+    # Ecuación logística sencilla: out * (pobs_etps * (1 - pobs_etps / k)), con el resultado intermediario en `temp`
+    # (que puede ser `k`).
+    np.divide(pobs_etps, k, out=temp)
+    np.subtract(1, temp, out=temp)
+    np.multiply(pobs_etps, temp, out=temp)
+    np.multiply(out, temp, out=out)
+
+
+def _suma_sin_nan(matr, másc, out):
+    # Igual que `np.nansum(matr, axis=-1, out=out)`, pero sin copiar `matr` (cuyos valores NaN se vuelven 0).
+    np.copyto(matr, 0, where=np.isnan(matr, out=másc))
+    np.sum(matr, axis=-1, out=out)
+
+
+def _crec_logístico(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    # Ecuación logística sencilla
+    _logístico(pobs_etps, cf['K'], out, temp=trabajo[0])
+
+
+def _crec_logístico_presa(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    # Crecimiento logístico. 'K' es un parámetro repetido para cada presa de la etapa y indica
+    # la contribución individual de cada presa a la capacidad de carga de esta etapa (el depredador).
+    contrib, másc, k = trabajo
+    np.multiply(pobs[..., np.newaxis, :], cf['K'], out=contrib)
+    _suma_sin_nan(contrib, másc, out=k)  # Calcular la capacidad de carga
+    _logístico(pobs_etps, k, out, temp=k)
+
+    # Evitar péridadas de poblaciones superiores a la población.
+    np.maximum(out, np.negative(pobs_etps, out=k), out=out)
+
+
+def _crec_logístico_depred(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    # Crecimiento proporcional a la cantidad de presas que se consumió el depredador.
+    másc, k = trabajo
+    np.multiply(depred_etps, cf['K'], out=depred_etps)
+    _suma_sin_nan(depred_etps, másc, out=k)  # Calcular la capacidad de carga
+    _logístico(pobs_etps, k, out, temp=k)
+
+    # Evitar péridadas de poblaciones superiores a la población.
+    np.maximum(out, np.negative(pobs_etps, out=k), out=out)
+
+
+def _crec_constante(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    np.subtract(cf['n'], pobs_etps, out=out)
+
+
+def _crec_externo_cultivo(pobs, pobs_etps, depred_etps, cf, extrn, out, trabajo):
+    # Esta ecuación guarda la población del organismo a un nivel constante, no importe qué esté pasando
+    # en el resto de la red. Puede ser útil para representar plantas donde los herbívoros están bien
+    # abajo de sus capacidades de carga.
+    try:
+        np.subtract(extrn['Plantas'], pobs_etps, out=out)
+    except (KeyError, TypeError):
+        # Si la planta no ha sido conectada a través de una parcela, no hacemos nada. Esto dejará un valor
+        # de 0 para la población de la planta.
+        pass
+
+
+núcleos_crec = {
+    'Exponencial': _crec_exponencial,
+    'Logístico': _crec_logístico,
+    'Logístico Presa': _crec_logístico_presa,
+    'Logístico Depredación': _crec_logístico_depred,
+    'Constante': _crec_constante,
+    'Externo Cultivo': _crec_externo_cultivo
+}
+
+
+# Muertes
+# Firma: f(pob_etp, cf, extrn, out)
+#   Los núcleos en `núcleos_muertes_clima` tienen la firma f(cf, extrn) -> fracción de la población que muere.
+def _muertes_constante(pob_etp, cf, extrn, out):
+    # Muertes en proporción al tamaño de la población. Sin crecimiento, esto da una decomposición exponencial.
+    np.multiply(pob_etp, cf['q'], out=out)
+
+
+def _muertes_log_normal_temp(cf, extrn):
+    # Muertes dependientes en la temperatura, calculadas con la ecuación mencionada en:
+    #
+    # Sunghoon Baek, Youngsoo Son, Yong-Lak Park. 2014. Temperature-dependent development and survival of
+    #   Podisus maculiventris (Hemiptera: Pentatomidae): implications for mass rearing and biological
+    #   control. Journal of Pest Science 87(2): 331-340.
+    sobrevivencia = np.exp(-0.5 * (np.log(extrn['temp_máx'] / cf['t']) / cf['p']) ** 2)
+    return 1 - sobrevivencia
+
+
+def _muertes_asimptótico_humedad(cf, extrn):
+    # M. P. Lepage, G. Bourgeois, J. Brodeur, G. Boivin. 2012. Effect of Soil Temperature and Moisture on
+    #   Survival of Eggs and First-Instar Larvae of Delia radicum. Environmental Entomology 41(1): 159-165.
+    sobrevivencia = np.maximum(0, np.subtract(1, np.exp(-cf['a'] * (extrn['humedad'] - cf['b']))))
+    return 1 - sobrevivencia
+
+
+def _muertes_sigmoidal_temp(cf, extrn):
+    sobrevivencia = 1 / (1 + np.exp((extrn['temp_máx'] - cf['a']) / cf['b']))
+    return 1 - sobrevivencia
+
+
+núcleos_muertes = {
+    'Constante': _muertes_constante,
+    'Log Normal Temperatura': _muertes_log_normal_temp,
+    'Asimptótico Humedad': _muertes_asimptótico_humedad,
+    'Sigmoidal Temperatura': _muertes_sigmoidal_temp
+}
+
+# Los núcleos de muertes que dependen únicamente del clima y de los coeficientes. La Red los calcula para todos los
+# pasos de la simulación antes de simular (`Red._prep_forzantes()`).
+núcleos_muertes_clima = {_muertes_log_normal_temp, _muertes_asimptótico_humedad, _muertes_sigmoidal_temp}
+
+
+# Edad
+# Firma: f(cf, extrn) -> cambio de edad (número o matriz) para las etapas de este tipo de ecuación.
+def _edad_días(cf, extrn):
+    # Edad calculada en días.
+    return 1
+
+
+def _edad_días_grados(cf, extrn):
+    # Edad calculada por días grados.
+    return días_grados(extrn['temp_mín'], extrn['temp_máx'], umbrales=(cf['mín'], cf['máx']))
+
+
+def _edad_brière(cf, extrn):
+    # Edad calculada con la taza de desarrollo de la ecuación de temperatura Briere. En esta ecuación,
+    # tal como en las otras con taza de desarrollo, quitamos el parámetro típicamente multiplicado por
+    # toda la ecuación, porque eso duplicaría el propósito del parámetro de ubicación de las distribuciones
+    # de probabilidad empleadas después.
+    #
+    # Mokhtar, Abrul Monim y Salem Saif al Nabhani. 2010. Temperature-dependent development of dubas bug,
+    #   Ommatissus lybicus (Hemiptera: Tropiduchidae), an endemic pest of date palm, Phoenix dactylifera.
+    #   Eur. J. Entomol. 107: 681–685
+    t = extrn['temp_prom']
+    return t * (t - cf['t_dev_mín']) * np.sqrt(cf['t_letal'] - t)
+
+
+def _edad_brière_no_linear(cf, extrn):
+    # Edad calculada con la taza de desarrollo de la ecuación de temperatura no linear de Briere.
+    #
+    # Youngsoo Son et al. 2012. Estimation of developmental parameters for adult emergence of Gonatocerus
+    #   morgani, a novel egg parasitoid of the glassy-winged sharpshooter, and development of a degree-day
+    #   model. Biological Control 60(3): 233-260.
+    t = extrn['temp_prom']
+    return t * (t - cf['t_dev_mín']) * np.power(cf['t_letal'] - t, 1 / cf['m'])
+
+
+def _edad_logan(cf, extrn):
+    # Edad calculada con la taza de desarrollo de la ecuación de temperatura Logan:
+    #
+    # Youngsoo Son y Lewis, Edwin E. 2005. Modelling temperature-dependent development and survival of
+    #   Otiorhynchus sulcatus (Coleoptera: Curculionidae). Agricultural and Forest Entomology 7(3): 201–209.
+    t = extrn['temp_prom']
+    return np.exp(cf['rho'] * t) - np.exp(cf['rho'] * cf['t_letal'] - (cf['t_letal'] - t) / cf['delta'])
+
+
+núcleos_edad = {
+    'Días': _edad_días,
+    'Días grados': _edad_días_grados,
+    'Días Grados': _edad_días_grados,
+    'Brière Temperatura': _edad_brière,
+    'Brière No Linear Temperatura': _edad_brière_no_linear,
+    'Logan Temperatura': _edad_logan
+}
+
+# Los núcleos de edad que dependen únicamente del clima y de los coeficientes. La Red los calcula para todos los pasos
+# de la simulación antes de simular (`Red._prep_forzantes()`).
+núcleos_edad_clima = {_edad_días_grados, _edad_brière, _edad_brière_no_linear, _edad_logan}
+
+
+# Transiciones (probabilidades que no dependen de cohortes)
+# Firma: f(pob_etp, cf, paso, out)
+def _trans_constante(pob_etp, cf, paso, out):
+    # Transiciones en proporción al tamaño de la población. Sin crecimiento, esto da una decomposición
+    # exponencial. Tomamos el paso en cuenta según las regals de probabilidad:
+    #   p(x sucede n veces) = (1 - (1- p(x))^n)
+    np.multiply(pob_etp, (1 - (1 - cf['q']) ** paso), out=out)
+
+
+# Transiciones por retraso distribuido, que se calculan a través de los cohortes de la Red (ver `núcleos_por_cohortes`)
+# Firma: f(cohs, í_coh, cambio_edad, cf, out, trabajo)
+#   cohs: Las poblaciones de los cohortes de la Red (eje 0: cohorte, 1: parcela, 2: rep estoc, 3: rep parám, 4: etapa
+#       con cohortes). Los cohortes de estas etapas son los compartimientos del retraso, en orden.
+#   í_coh: Los índices de las etapas en la matriz de cohortes.
+#   cambio_edad: El cambio de edad (según su ecuación de edad) de las etapas en este paso.
+#   trabajo: Las matrices de trabajo del núcleo (ver `matrs_trabajo_cohortes()`).
+def _trans_erlang(cohs, í_coh, cambio_edad, cf, out, trabajo):
+    # Retraso distribuido (Manetsch, 1976; Vansickle, 1977). La etapa se divide en k compartimientos y, a cada paso,
+    # una fracción k * cambio_edad / mu de cada compartimiento pasa al siguiente (o, para el último, a la etapa
+    # siguiente). Así, el tiempo de desarrollo sigue una distribución Erlang de promedio mu, con
+    # k = (mu / sigma)^2 compartimientos (hasta el número de cohortes disponibles; ver `compartimientos_erlang()`).
+    #
+    # Manetsch, T. J. 1976. Time-varying distributed delays and their use in aggregative models of large systems.
+    #   IEEE Transactions on Systems, Man, and Cybernetics 6(8): 547-553.
+    # Vansickle, J. 1977. Attrition in distributed delay models. IEEE Transactions on Systems, Man, and Cybernetics
+    #   7(9): 635-638.
+    pobs, flujo, tasa, salen = trabajo
+    np.take(cohs, í_coh, axis=4, out=pobs, mode='clip')  # Con 'clip', `take()` no copia la matriz
+    n_comp = pobs.shape[0]
+
+    k = np.clip(compartimientos_erlang(cf), 1, n_comp)
+    comps = np.arange(n_comp).reshape((-1, 1, 1, 1, 1))
+    último = comps >= k - 1  # Individuos en compartimientos finales
+
+    # La fracción de cada compartimiento que avanza. Se divide el paso en subpasos para que esta no pase de 1, lo
+    # cual es necesario para la estabilidad de la recurrencia.
+    np.multiply(k, cambio_edad, out=tasa)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(tasa, cf['mu'], out=tasa)
+    np.nan_to_num(tasa, copy=False)
+    np.clip(tasa, 0, n_comp, out=tasa)
+    n_sub = max(int(np.ceil(tasa.max())), 1)
+    tasa /= n_sub
+
+    out.fill(0)
+    for _ in range(n_sub):
+        np.multiply(pobs, tasa, out=flujo)
+        pobs -= flujo
+        out += np.sum(flujo, axis=0, where=último, out=salen)
+        np.copyto(flujo, 0, where=último)
+        pobs[1:] += flujo[:-1]
+
+    # Únicamente transicionan individuos enteros; las fracciones quedan en el último compartimiento.
+    fracción = np.subtract(out, np.floor(out, out=salen), out=salen)
+    out -= fracción
+    np.add(pobs, fracción, out=pobs, where=comps == k - 1)
+
+    cohs[..., í_coh] = pobs
+
+
+núcleos_trans = {
+    'Constante': _trans_constante,
+    'Erlang': _trans_erlang
+}
+
+
+# Multiplicaciones de transiciones
+# Firma: f(trans, í_etps, cf, trabajo)
+#   trabajo: Una matriz de trabajo de la forma de las transiciones de las etapas `í_etps`.
+def _trans_mult_linear(trans, í_etps, cf, trabajo):
+    mult = np.take(trans, í_etps, axis=3, out=trabajo, mode='clip')
+    np.multiply(mult, cf['a'], out=mult)
+    trans[..., í_etps] = mult
+    np.round(trans, out=trans)
+
+
+núcleos_trans_mult = {
+    'Linear': _trans_mult_linear
+}
+
+
+# Reproducción (probabilidades que no dependen de cohortes)
+# Firma: f(pob_etp, depred_etps, cf, paso, out, trabajo)
+#   `depred_etps` y `trabajo` tal como para el crecimiento. `pob_etp` también es una copia.
+def _repr_constante(pob_etp, depred_etps, cf, paso, out, trabajo):
+    # Reproducciones en proporción al tamaño de la población.
+    np.multiply(cf['a'], np.multiply(pob_etp, paso, out=pob_etp), out=out)
+
+
+def _repr_depred(pob_etp, depred_etps, cf, paso, out, trabajo):
+    # Reproducciones en función de la depredación (útil para avispas esfécidas). Los coeficientes de las etapas que
+    # no son presas quedan en NaN.
+    másc, = trabajo
+    _suma_sin_nan(np.multiply(cf['n'], depred_etps, out=depred_etps), másc, out=out)
+
+
+núcleos_repr = {
+    'Constante': _repr_constante,
+    'Depredación': _repr_depred
+}
+
+
+# Ruido
+# Firma: f(cf, paso) -> la desviación estándar relativa del ruido para las etapas de este tipo.
+def _ruido_normal(cf, paso):
+    # Error distribuido de manera normal, ajustando por el paso
+    return cf['sigma'] * paso
+
+
+núcleos_ruido = {
+    'Normal': _ruido_normal
+}
+
+
+# Los núcleos de crecimiento y de reproducción que necesitan la depredación de sus etapas
+núcleos_con_depred = (_crec_logístico_depred, _repr_depred)
+
+# Los núcleos de transiciones que se calculan a través de los cohortes de sus etapas
+núcleos_por_cohortes = (_trans_erlang,)
+
+
+def compartimientos_erlang(cf):
+    """
+    Calcula el número de compartimientos de etapas con transiciones por retraso distribuido ("Erlang"), antes de
+    limitarlo al número de cohortes disponibles.
+
+    :param cf: Los coeficientes de las etapas.
+    :type cf: dict
+
+    :return: El número de compartimientos, k = (mu / sigma)^2.
+    :rtype: np.ndarray
+    """
+
+    return np.round(np.square(cf['mu'] / cf['sigma']))
+
+
+def matrs_trabajo_cohortes(tmñ_cohs, tipo):
+    """
+    Genera las matrices de trabajo de los núcleos de `núcleos_por_cohortes`, para que no tengan que crear nuevas
+    matrices del tamaño de los cohortes a cada paso.
+
+    :param tmñ_cohs: El tamaño de la matriz de cohortes de las etapas del núcleo (eje 0: cohorte, 1: parcela, 2: rep
+    estoc, 3: rep parám, 4: etapa).
+    :type tmñ_cohs: tuple
+
+    :param tipo: El tipo de las matrices.
+    :type tipo: np.dtype
+
+    :return: Las poblaciones de los compartimientos, el flujo entre compartimientos, la tasa de avance y los
+    individuos que salen de la etapa.
+    :rtype: (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+    """
+
+    return (np.zeros(tmñ_cohs, dtype=tipo), np.zeros(tmñ_cohs, dtype=tipo), np.zeros(tmñ_cohs[1:], dtype=tipo),
+            np.zeros(tmñ_cohs[1:], dtype=tipo))
+
+
+def matrs_trabajo(núcleo, tmñ_etps, n_etps, tipo):
+    """
+    Genera las matrices de trabajo de los núcleos de crecimiento y de reproducción que necesitan resultados
+    intermediarios, para que no tengan que crear nuevas matrices a cada paso.
+
+    :param núcleo: El núcleo.
+    :type núcleo: callable
+
+    :param tmñ_etps: El tamaño de las matrices de las etapas del núcleo (eje 0: parcela, 1: rep estoc, 2: rep parám,
+    3: etapa).
+    :type tmñ_etps: tuple
+
+    :param n_etps: El número de etapas de la Red (para las matrices con un eje de presas).
+    :type n_etps: int
+
+    :param tipo: El tipo de las matrices.
+    :type tipo: np.dtype
+
+    :return: Las matrices de trabajo del núcleo, o `None` si no necesita.
+    :rtype: tuple | None
+    """
+
+    tmñ_presas = tmñ_etps + (n_etps,)
+
+    if núcleo is _crec_logístico:
+        return (np.zeros(tmñ_etps, dtype=tipo),)
+    elif núcleo is _crec_logístico_presa:
+        return np.zeros(tmñ_presas, dtype=tipo), np.zeros(tmñ_presas, dtype=bool), np.zeros(tmñ_etps, dtype=tipo)
+    elif núcleo is _crec_logístico_depred:
+        return np.zeros(tmñ_presas, dtype=bool), np.zeros(tmñ_etps, dtype=tipo)
+    elif núcleo is _repr_depred:
+        return (np.zeros(tmñ_presas, dtype=bool),)
+
+    return None
+
+
+# Las distribuciones de probabilidad que implementan transiciones y reproducciones a través de los cohortes.
+dists_cohortes = ['Normal', 'Triang', 'Cauchy', 'Gamma', 'T']
+
+# Para cada categoría y subcategoría de ecuaciones, el diccionario de núcleos correspondiente, tanto como el mensaje de
+# error si un tipo de ecuación no está reconocido.
+núcleos = {
+    'Depredación': {'Ecuación': (núcleos_depred,
+                                 'Tipo de ecuación "{}" no reconodico para cálculos de depradación.')},
+    'Crecimiento': {'Modif': (núcleos_crec_modif, 'Modificación de crecimiento "{}" no reconocida.'),
+                    'Ecuación': (núcleos_crec, 'Ecuación de crecimiento "{}" no reconocida.')},
+    'Muertes': {'Ecuación': (núcleos_muertes, 'Ecuación de muertes "{}" no reconocida.')},
+    'Edad': {'Ecuación': (núcleos_edad, 'No reconozco el tipo de ecuación "{}" para la edad.')},
+    'Transiciones': {'Prob': (núcleos_trans, 'La distribución "{}" no tiene definición.'),
+                     'Mult': (núcleos_trans_mult, 'Tipo de multiplicación "{}" no reconocida.')},
+    'Reproducción': {'Prob': (núcleos_repr, 'La distribución "{}" no tiene definición.')},
+    'Estoc': {'Dist': (núcleos_ruido, 'Tipo de ruido "{}" no reconocido por Tiko\'n.')}
+}
+
+
+def escoger_núcleo(categ, subcateg, tipo_ec):
+    """
+    Devuelve el núcleo que implementa un tipo de ecuación. Para transiciones y reproducciones basadas en
+    distribuciones de probabilidad de edades, devuelve `None`, porque estas se calculan a través de los cohortes de la
+    Red.
+
+    :param categ: La categoría de la ecuación (p. ej., 'Depredación').
+    :type categ: str
+
+    :param subcateg: La subcategoría de la ecuación (p. ej., 'Ecuación').
+    :type subcateg: str
+
+    :param tipo_ec: El tipo de ecuación.
+    :type tipo_ec: str
+
+    :return: La función del núcleo.
+    :rtype: callable | None
+    """
+
+    dic_núcleos, mnsj_error = núcleos[categ][subcateg]
+
+    try:
+        return dic_núcleos[tipo_ec]
+    except KeyError:
+        if subcateg == 'Prob' and tipo_ec in dists_cohortes:
+            return None
+        raise ValueError(mnsj_error.format(tipo_ec))
+
+
+def días_grados(mín, máx, umbrales, método='Triangular', corte='Horizontal'):
+    """
+    Esta función calcula los días grados basados en temperaturas mínimas y máximas diarias. Todos los argumentos
+    pueden ser matrices (p. ej., temperaturas de forma (día, parcela, 1, 1, 1) y umbrales de forma (repetición
+    paramétrica, etapa)), y el cálculo se hace para todos a la vez, según las reglas de difusión de NumPy.
+    Información sobre los métodos utilizados aquí se puede encontrar en:
+    http://www.ipm.ucdavis.edu/WEATHER/ddconcepts.html
+
+    Los días grados arriba de un umbral u son la superficie A(u) de la curva de temperatura del día arriba de u; los
+    cortes se expresan en términos de esta superficie y de la fracción del día F(u) arriba de u. Con umbrales inferior
+    i y superior s:
+        Horizontal: A(i) - A(s)
+        Intermediario: A(i) - 2 * A(s)
+        Vertical: A(i) - A(s) - (s - i) * F(s)
+        Ninguno: A(i)
+
+    :param mín: Las temperaturas mínimas.
+    :type mín: float | np.ndarray
+    :param máx: Las temperaturas máximas.
+    :type máx: float | np.ndarray
+    :param umbrales: Los umbrales inferior y superior de desarrollo.
+    :type umbrales: tuple[float | np.ndarray]
+    :param método: El método de interpolación de temperaturas ('Triangular' o 'Sinusoidal').
+    :type método: str
+    :param corte: El tipo de corte al umbral superior ('Horizontal', 'Intermediario', 'Vertical' o 'Ninguno').
+    :type corte: str
+    :return: Los días grados.
+    :rtype: np.ndarray
+    """
+
+    if corte not in ['Horizontal', 'Intermediario', 'Vertical', 'Ninguno']:
+        raise ValueError('Corte de días grados "{}" no reconocido.'.format(corte))
+
+    umbr_inf, umbr_sup = umbrales
+
+    días_grd = _sup_días_grados(mín, máx, umbr_inf, método)[0]
+    if corte == 'Ninguno':
+        return días_grd
+
+    sup_arriba, frac_arriba = _sup_días_grados(mín, máx, umbr_sup, método)
+    if corte == 'Horizontal':
+        np.subtract(días_grd, sup_arriba, out=días_grd)
+    elif corte == 'Intermediario':
+        np.subtract(días_grd, np.multiply(sup_arriba, 2, out=sup_arriba), out=días_grd)
+        np.maximum(días_grd, 0, out=días_grd)
+    else:
+        np.subtract(días_grd, sup_arriba, out=días_grd)
+        np.subtract(días_grd, np.multiply(frac_arriba, np.subtract(umbr_sup, umbr_inf), out=frac_arriba),
+                    out=días_grd)
+
+    return días_grd
+
+
+def _sup_días_grados(mín, máx, umbral, método):
+    """
+    Calcula la superficie de la curva diaria de temperatura arriba de un umbral (en grados * días), y la fracción del
+    día que pasa arriba del umbral. Días sin variación de temperatura (máx == mín) se manejan aparte.
+
+    :param mín: Las temperaturas mínimas.
+    :type mín: float | np.ndarray
+    :param máx: Las temperaturas máximas.
+    :type máx: float | np.ndarray
+    :param umbral: El umbral.
+    :type umbral: float | np.ndarray
+    :param método: El método de interpolación de temperaturas ('Triangular' o 'Sinusoidal').
+    :type método: str
+    :return: La superficie y la fracción del día arriba del umbral.
+    :rtype: (np.ndarray, np.ndarray)
+    """
+
+    prom = np.divide(np.add(máx, mín), 2)
+    amp = np.divide(np.subtract(máx, mín), 2)
+
+    # Las matrices de la forma final (difundida) se modifican en su lugar, para no generar matrices temporarias
+    # grandes cuando se calcula toda una simulación a la vez.
+    forma = np.broadcast(mín, máx, umbral).shape
+    sup = np.empty(forma)
+    frac = np.empty(forma)
+    trabajo = np.empty(forma)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if método == 'Triangular':
+            # Con un triángulo único, la temperatura se distribuye uniformemente entre la mínima y la máxima, así que
+            # sup = (máx - t)^2 / (4 * amp) + max(mín - umbral, 0), con t el umbral limitado a [mín, máx].
+            np.subtract(máx, np.clip(umbral, mín, máx, out=trabajo), out=sup)
+            np.divide(sup, np.multiply(amp, 2), out=frac)
+            np.multiply(sup, frac, out=sup)
+            np.multiply(sup, 0.5, out=sup)
+            np.maximum(np.subtract(mín, umbral, out=trabajo), 0, out=trabajo)
+            np.add(sup, trabajo, out=sup)
+
+        elif método == 'Sinusoidal':
+            # Con una curva sinusoidal única, la temperatura cruza el umbral al ángulo θ, así que
+            # sup = ((prom - umbral) * (π/2 - θ) + amp * cos(θ)) / π
+            θ = trabajo
+            np.divide(np.subtract(umbral, prom, out=θ), amp, out=θ)
+            np.arcsin(np.clip(θ, -1, 1, out=θ), out=θ)
+            np.divide(np.subtract(mat.pi / 2, θ, out=frac), mat.pi, out=frac)
+            np.multiply(np.subtract(prom, umbral, out=sup), frac, out=sup)
+            np.add(sup, np.multiply(np.cos(θ, out=θ), np.divide(amp, mat.pi), out=θ), out=sup)
+
+        else:
+            raise ValueError('Método de días grados "{}" no reconocido.'.format(método))
+
+    # Sin variación de temperatura, todo el día está arriba o abajo del umbral.
+    constante = amp == 0
+    if np.any(constante):
+        np.copyto(sup, np.maximum(np.subtract(prom, umbral), 0), where=constante)
+        np.copyto(frac, np.greater(prom, umbral), where=constante)
+
+    return sup, frac
+
+
+def probs_conj(matr, eje, pesos=1, máx=1, trabajo=None, trabajo_eje=None):
+    """
+    Esta función utiliza las reglas de probabilidades conjuntas para ajustar depredación con presas o depredadores
+    múltiples cuya suma podría sumar más que el total de presas o la capacidad del depredador. El ajuste se hace en
+    `matr` misma.
+
+    Las probabilidades conjuntas se calculan en espacio logarítmico (1 - prod(1 - r) = -expm1(sum(log1p(-r)))), así
+    que no hay problemas de precisión con muchas interacciones. Las razones r se limitan a [0, 1] (una razón de 1 ya
+    es una captura segura). Valores NaN en `matr` se vuelven 0.
+
+    :param matr: Una matriz con los valores para ajustar.
+    :type matr: np.ndarray
+
+    :param eje: El eje según cual hay que hacer los ajustes
+    :type eje: int
+
+    :param pesos: Un peso inverso opcional para aplicar a la matriz ántes de hacer los cálculos.
+    :type pesos: float | int | np.ndarray
+
+    :param máx: Una matriz o número con los valores máximos para la matriz para ajustar. Si es matriz, debe tener la
+    forma de `matr` sin el eje `eje` (o ser compatible con esta).
+    :type máx: float | int | np.ndarray
+
+    :param trabajo: Una matriz de trabajo opcional, de la misma forma que `matr`.
+    :type trabajo: np.ndarray
+
+    :param trabajo_eje: Una matriz de trabajo opcional, de forma (2, *forma de `matr` con `eje` de tamaño 1).
+    :type trabajo_eje: np.ndarray
+
+    """
+
+    if trabajo is None:
+        trabajo = np.empty_like(matr)
+    if trabajo_eje is None:
+        trabajo_eje = np.empty((2,) + matr.shape[:eje] + (1,) + matr.shape[eje + 1:], dtype=matr.dtype)
+    suma, fracc = trabajo_eje
+
+    if isinstance(máx, np.ndarray) and máx.ndim == matr.ndim - 1:
+        máx = np.expand_dims(máx, eje)
+
+    con_pesos = not (np.isscalar(pesos) and pesos == 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if con_pesos:
+            np.divide(matr, pesos, out=matr)
+        np.fmax(matr, 0, out=matr)
+
+        # Las razones, en [0, 1]
+        ratio = np.divide(matr, máx, out=trabajo)
+        np.fmin(ratio, 1, out=ratio)
+        np.fmax(ratio, 0, out=ratio)
+        np.sum(ratio, axis=eje, keepdims=True, out=suma)
+
+        # La probabilidad conjunta, dividida por la suma de las razones
+        np.log1p(np.negative(ratio, out=ratio), out=ratio)
+        np.sum(ratio, axis=eje, keepdims=True, out=fracc)
+        np.negative(np.expm1(fracc, out=fracc), out=fracc)
+        np.divide(fracc, np.maximum(suma, np.finfo(suma.dtype).tiny, out=suma), out=fracc)
+        np.multiply(matr, fracc, out=matr)
+
+        # Reducir proporcionalmente los grupos que todavía pasan del máximo
+        np.sum(matr, axis=eje, keepdims=True, out=suma)
+        np.fmin(np.divide(máx, suma, out=fracc), 1, out=fracc)
+        np.multiply(matr, fracc, out=matr)
+
+        if con_pesos:
+            np.multiply(matr, pesos, out=matr)
+
+
+def conj_presas_densa(matr, pesos=1, máx=1, trabajo=None, trabajo_eje=None):
+    """
+    Ajusta una matriz densa de depredación (eje 3: depredador, eje 4: presa) por la presencia de presas múltiples.
+
+    :param matr: La matriz de depredación.
+    :type matr: np.ndarray
+
+    :param pesos: Un peso inverso opcional, tal como en `probs_conj()`.
+    :type pesos: float | int | np.ndarray
+
+    :param máx: El máximo, tal como en `probs_conj()`.
+    :type máx: float | int | np.ndarray
+
+    :param trabajo: Una matriz de trabajo opcional, tal como en `probs_conj()`.
+    :type trabajo: np.ndarray
+
+    :param trabajo_eje: Una matriz de trabajo opcional, tal como en `probs_conj()` (con el eje 4 de tamaño 1).
+    :type trabajo_eje: np.ndarray
+
+    """
+
+    probs_conj(matr, eje=4, pesos=pesos, máx=máx, trabajo=trabajo, trabajo_eje=trabajo_eje)
+
+
+def gen_grupos_aristas(claves):
+    """
+    Prepara los índices necesarios para aplicar `probs_conj_aristas()` a un grupo de aristas.
+
+    :param claves: La clave del grupo de cada arista (por ejemplo, el índice de su presa o de su depredador).
+    :type claves: np.ndarray
+
+    :return: El orden que junta las aristas de cada grupo, el índice (en este orden) del inicio de cada grupo, y el
+    número del grupo de cada arista.
+    :rtype: (np.ndarray, np.ndarray, np.ndarray)
+    """
+
+    orden = np.argsort(claves, kind='mergesort')
+    ordenadas = claves[orden]
+
+    nuevo = np.ones(len(claves), dtype=bool)
+    nuevo[1:] = ordenadas[1:] != ordenadas[:-1]
+
+    inicios = np.flatnonzero(nuevo)
+
+    grupo = np.empty(len(claves), dtype=int)
+    grupo[orden] = np.cumsum(nuevo) - 1
+
+    return orden, inicios, grupo
+
+
+def probs_conj_aristas(matr, grupos, pesos=1, máx=1, trabajo=None, trabajo_grupos=None):
+    """
+    Igual que `probs_conj()`, pero para matrices de aristas (interacciones depredador-presa) de una red trófica. El
+    último eje de `matr` representa las aristas, y el ajuste se aplica entre las aristas de un mismo grupo (por
+    ejemplo, todas las aristas de una misma presa). Las probabilidades conjuntas se calculan con el producto de
+    (1 - r), y en espacio logarítmico únicamente si el producto de algún grupo pierde precisión por subdesbordamiento.
+
+    :param matr: Una matriz con los valores para ajustar. Último eje: arista.
+    :type matr: np.ndarray
+
+    :param grupos: Los índices de los grupos de las aristas, tal como generados por `gen_grupos_aristas()`.
+    :type grupos: (np.ndarray, np.ndarray, np.ndarray)
+
+    :param pesos: Un peso inverso opcional para aplicar a la matriz ántes de hacer los cálculos.
+    :type pesos: float | int | np.ndarray
+
+    :param máx: El valor máximo de cada arista (que tiene que ser igual para todas las aristas de un mismo grupo).
+    :type máx: float | int | np.ndarray
+
+    :param trabajo: Una matriz de trabajo opcional, de forma (2, *matr.shape).
+    :type trabajo: np.ndarray
+
+    :param trabajo_grupos: Una matriz de trabajo opcional, de forma (2, *matr.shape[:-1], número de grupos).
+    :type trabajo_grupos: np.ndarray
+
+    """
+
+    orden, inicios, grupo = grupos
+
+    if trabajo is None:
+        trabajo = np.empty((2,) + matr.shape, dtype=matr.dtype)
+    if trabajo_grupos is None:
+        trabajo_grupos = np.empty((2,) + matr.shape[:-1] + (len(inicios),), dtype=matr.dtype)
+    ratio, ordenadas = trabajo
+    suma, fracc = trabajo_grupos
+
+    con_pesos = not (np.isscalar(pesos) and pesos == 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if con_pesos:
+            np.divide(matr, pesos, out=matr)
+        np.fmax(matr, 0, out=matr)
+
+        np.divide(matr, máx, out=ratio)
+        np.fmin(ratio, 1, out=ratio)
+        np.fmax(ratio, 0, out=ratio)
+
+        # Las probabilidades conjuntas, calculadas para cada grupo y después aplicadas a cada arista del grupo. Aquí
+        # el producto de (1 - r) es más rápido que el espacio logarítmico (que necesita un logaritmo por arista), y
+        # sólo se recalcula en espacio logarítmico si el producto de algún grupo es subnormal (un producto nulo
+        # porque una razón es 1 es exacto).
+        np.take(ratio, orden, axis=-1, out=ordenadas, mode='clip')
+        np.add.reduceat(ordenadas, inicios, axis=-1, out=suma)
+        np.subtract(1, ordenadas, out=ordenadas)
+        np.multiply.reduceat(ordenadas, inicios, axis=-1, out=fracc)
+        mín = np.finfo(fracc.dtype).tiny
+        if np.min(fracc) < mín and _hay_subnormales(fracc, mín, trabajo=ordenadas[..., :fracc.shape[-1]]):
+            np.take(ratio, orden, axis=-1, out=ordenadas, mode='clip')
+            np.log1p(np.negative(ordenadas, out=ordenadas), out=ordenadas)
+            np.add.reduceat(ordenadas, inicios, axis=-1, out=fracc)
+            np.negative(np.expm1(fracc, out=fracc), out=fracc)
+        else:
+            np.subtract(1, fracc, out=fracc)
+        np.divide(fracc, np.maximum(suma, np.finfo(suma.dtype).tiny, out=suma), out=fracc)
+        np.multiply(matr, np.take(fracc, grupo, axis=-1, out=ratio, mode='clip'), out=matr)
+
+        # Reducir proporcionalmente los grupos que todavía pasan del máximo. `take()` copiaría una matriz no contigua
+        # (por ejemplo, un bloque de aristas), así que se copia primero en `ratio`.
+        if matr.flags.c_contiguous:
+            np.take(matr, orden, axis=-1, out=ordenadas, mode='clip')
+        else:
+            np.copyto(ratio, matr)
+            np.take(ratio, orden, axis=-1, out=ordenadas, mode='clip')
+        np.add.reduceat(ordenadas, inicios, axis=-1, out=suma)
+        np.take(suma, grupo, axis=-1, out=ratio, mode='clip')
+        np.fmin(np.divide(máx, ratio, out=ratio), 1, out=ratio)
+        np.multiply(matr, ratio, out=matr)
+
+        if con_pesos:
+            np.multiply(matr, pesos, out=matr)
+
+
+def _hay_subnormales(matr, mín, trabajo):
+    """
+    Verifica si una matriz de valores no negativos tiene valores subnormales (positivos, pero inferiores a `mín`),
+    sin crear matrices temporarias: sign(x) * mín - x es positivo únicamente para éstos.
+
+    :param matr: La matriz.
+    :type matr: np.ndarray
+
+    :param mín: El valor normal mínimo.
+    :type mín: float
+
+    :param trabajo: Una matriz de trabajo de la forma de `matr`.
+    :type trabajo: np.ndarray
+
+    :return: Si hay valores subnormales.
+    :rtype: bool
+    """
+
+    np.sign(matr, out=trabajo)
+    np.multiply(trabajo, mín, out=trabajo)
+    np.subtract(trabajo, matr, out=trabajo)
+    return np.max(trabajo) > 0
+
+
+def gen_conj_presas_aristas(í_depred):
+    """
+    Genera una función que ajusta una matriz de aristas por la presencia de presas múltiples, para usar con los
+    núcleos de depredación.
+
+    :param í_depred: El índice del depredador de cada arista.
+    :type í_depred: np.ndarray
+
+    :return: La función, con la misma firma que `conj_presas_densa()`. Sus matrices de trabajo son las de
+    `probs_conj_aristas()`, con `trabajo_eje` para `trabajo_grupos`.
+    :rtype: callable
+    """
+
+    return partial(_conj_presas_aristas, grupos=gen_grupos_aristas(í_depred))
+
+
+def _conj_presas_aristas(matr, grupos, pesos=1, máx=1, trabajo=None, trabajo_eje=None):
+    # `probs_conj_aristas()` con la firma de `conj_presas_densa()` (más los grupos), para `gen_conj_presas_aristas()`.
+    probs_conj_aristas(matr, grupos=grupos, pesos=pesos, máx=máx, trabajo=trabajo, trabajo_grupos=trabajo_eje)
@@ -53,6 +53,10 @@ class Organismo(Coso):
         # vez que se crea el objeto del organismo). Ejemplo: presas y huéspedes de cada etapa del organismo.
         símismo.config = {}
 
+        # El número de cambios a la estructura del organismo (etapas, ecuaciones activas, presas y huéspedes). Las
+        # Redes lo usan para saber si tienen que reconstruir sus etapas (ver `Red.actualizar()`).
+        símismo.n_cambios = 0
+
         # Actualizar el organismo
         símismo.actualizar()
 
@@ -62,13 +66,31 @@ class Organismo(Coso):
         actual en la receta. Si hay cualquier atributo del organismo que depiende de valore(s) en la receta,
         aquí es el lugar par actualizarlos.
 
-        Esta función se llama automáticamente después de funciones tales como "secome()" y "quitar_etapa()".
+        Esta función se llama automáticamente después de funciones tales como "secome()" y "quitar_etapa()". Si
+        modificas la receta o la configuración del organismo directamente, hay que llamarla después para que las Redes
+        que contienen el organismo noten el cambio.
 
         """
 
         # Actualizar la lista de etapas según el orden cronológico de dichas etapas.
         símismo.etapas = sorted([x for x in símismo.receta['estr'].values()], key=lambda d: d['posición'])
 
+        # Notar el cambio de estructura
+        símismo.n_cambios += 1
+
+    def cargar(símismo, fuente):
+        """
+        Ver la documentación de `Coso`. Después de cargar la receta, se actualiza el organismo.
+
+        :param fuente: Dónde se ubica el archivo.
+        :type fuente: str
+
+        """
+
+        super().cargar(fuente)
+
+        símismo.actualizar()
+
     def añadir_etapa(símismo, nombre, posición, ecuaciones, lím_error=0.10, cert_error=0.90):
         """
         Esta función añade una etapa al organismo.
@@ -186,6 +208,9 @@ class Organismo(Coso):
             for sub_categ, opción_ec in dic_categ.items():
                 símismo.receta['estr'][etapa]['ecs'][categ][sub_categ] = opción_ec
 
+        # Actualizar el organismo
+        símismo.actualizar()
+
     def victimiza(símismo, víctima, etps_símismo=None, etps_víctima=None, método='presa', etp_sale=None):
         """
         Esta función establece relaciones de  entre organismos.
@@ -328,7 +353,11 @@ class Organismo(Coso):
         # Quitar la relación de deprededor y presa en la configuración del organismo
         for e_depred in etps_símismo:  # Para cada etapa especificada del depredador...
 
-            dic_víc = símismo.receta['estr'][e_depred][método]
+            dic_víc = símismo.config[e_depred][método]
+
+            # Si la víctima no estaba en la lista para empezar, no hay nada que quitar
+            if víctima.nombre not in dic_víc:
+                continue
 
             # Guardar una referencia a la lista de etapas que caen víctima
             if método == 'huésped':
@@ -342,15 +371,16 @@ class Organismo(Coso):
                 # Vamos a ignorar etapas que no estaban en la lista de víctimas para empezar (posiblemente por error del
                 # usuario o por uso de 'etps_víctima = None' para referenciar todas las etapas de la víctima.
                 try:
-                    l_etps_víc.pop(e_víc)
-                except KeyError:
+                    l_etps_víc.remove(e_víc)
+                except ValueError:
                     pass
 
             # Si ya no quedan etapas del organismo como presas, quitar su nombre del diccionario de presas
             if len(l_etps_víc) == 0:
                 dic_víc.pop(víctima.nombre)
 
-        # No se reactualiza el organismo.
+        # Reactualizar el organismo para que las Redes que lo contienen noten el cambio de estructura
+        símismo.actualizar()
 
         # Los parámetros de interacciones con la antigua presa se quedan la receta del organismo para uso futuro
         # potencial.
@@ -1,22 +1,25 @@
-import math as mat
+import json
 import os
 from copy import deepcopy as copiar_profundo
-from datetime import datetime as ft
 from warnings import warn as avisar
 
 import numpy as np
+from scipy import sparse as dispersa
 
 from . import Insecto as Ins
+from . import Núcleos as Nc
 from .Gen_organismos import generar_org
+from .Núcleos import probs_conj, días_grados
 from .Organismo import Organismo
-from ..Coso import Simulable, dic_a_lista
+from ..Coso import Simulable, dic_a_lista, gen_matr_predic, gen_oper_obs, gen_estado_inic
+from ..Instrumentación import medir
 from ..Matemáticas import Distribuciones as Ds, Ecuaciones as Ec, Arte
-from ..Matemáticas.Incert import validar_matr_pred
+from ..Matemáticas.Incert import validar_matr_pred, validar_percentiles, predic_resumen
+from ..Matemáticas.Resumen import Resumen
 from ..Paisaje.Geog import Lugar
 from . import Insecto as Ins
 from .Gen_organismos import generar_org
 from .Organismo import Organismo
-from datetime import datetime as ft
 
 
 class Red(Simulable):
@@ -36,7 +39,21 @@ class Red(Simulable):
     # Una Red tiene ni ecuaciones, ni parámetros propios.
     dic_info_ecs = None
 
-    def __init__(símismo, nombre, proyecto, organismos=None):
+    # Los egresos que son conteos de individuos a cada paso (y que por tanto se pueden guardar en números enteros).
+    egresos_conteos = ('Depredación', 'Reproducción', 'Muertes', 'Transiciones')
+
+    # Los egresos (aparte de las poblaciones) que se pueden registrar a cada paso en simulaciones detalladas.
+    egresos_registros = ('Depredación', 'Crecimiento', 'Reproducción', 'Muertes', 'Transiciones', 'Movimiento')
+
+    # El número de cohortes de cada etapa con cohortes. Para las etapas con transiciones por retraso distribuido
+    # ("Erlang"), es el número máximo de compartimientos.
+    n_grupos_coh = 10
+
+    # El tamaño (en bytes) de los bloques de predicciones en los cuales se agregan las etapas fantasmas y combinadas
+    # (ver `_sumar_etps_combinadas()`), para que cada bloque quede en la memoria caché.
+    bytes_bloque_agreg = 2 ** 18
+
+    def __init__(símismo, nombre, proyecto, organismos=None, depred_dispersa=False, tol_fda=None):
 
         """
         :param nombre: El nombre de la red.
@@ -46,6 +63,17 @@ class Red(Simulable):
         de un tal objeto.
         :type organismos: list[Organismo]
 
+        :param depred_dispersa: Si hay que representar la depredación por una lista de aristas (interacciones
+        depredador-presa) en vez de una matriz densa de todas las etapas contra todas las etapas. Para redes grandes
+        (donde la mayoría de las etapas no se comen entre sí), ahorra mucha memoria y tiempo de cálculo.
+        :type depred_dispersa: bool
+
+        :param tol_fda: Si no es `None`, las funciones de distribución acumulada de las transiciones y reproducciones
+        por cohortes se tabulan al principio de cada simulación, con este error absoluto máximo, y se evalúan por
+        interpolación en vez de con SciPy a cada paso (ver `Distribuciones.FDATabulada`). Si es `None`, se calculan
+        exactamente, pero también en las matrices de trabajo de la Red (ver `Distribuciones.FDAExacta`).
+        :type tol_fda: float
+
         """
 
         super().__init__(nombre=nombre, proyecto=proyecto)
@@ -59,8 +87,10 @@ class Red(Simulable):
         símismo.núms_etapas = {}
         símismo.lugar = None
 
-        # Un diccionario para las distribuciones de transiciones y de reproducción
+        # Un diccionario para las distribuciones de transiciones y de reproducción, y el error máximo de sus
+        # funciones de distribución acumulada, si se tabulan
         símismo.dists = {'Trans': {}, 'Repr': {}}
+        símismo.tol_fda = tol_fda
 
         # Para guardar los tipos de ecuaciones de los organismos en la red
         símismo.ecs = {}
@@ -68,9 +98,32 @@ class Red(Simulable):
         # Para guardar el orden relativo de transiciones y de reproducciones entre etapas
         símismo.orden = {}
 
+        # El plan de cálculo de cada paso de la simulación. Se genera en `actualizar()` y se vincula con los
+        # coeficientes numerizados justo antes de cada simulación. Tendrá la forma siguiente:
+        # {categ: {subcateg: [[tipo_ec, núcleo, índices de etapas, coeficientes, índices adicionales], ...]}, ...}
+        símismo.plan = {}
+
+        # Los valores precalculados para todos los pasos de la simulación de las ecuaciones del plan que dependen
+        # únicamente del clima: los cambios de edad ('Edad'), las tazas de crecimiento modificadas ('Crecimiento') y las
+        # fracciones de muertes ('Muertes'). Para cada categoría, una lista paralela a las ecuaciones del plan, con
+        # `None` para las ecuaciones que no dependen del clima. Se generan en `_prep_forzantes()`.
+        símismo.tablas_clima = {'Edad': [], 'Crecimiento': [], 'Muertes': []}
+
+        # La representación de la depredación, y las aristas (interacciones depredador-presa) de la red trófica. Las
+        # aristas se generan en `actualizar()`.
+        símismo.depred_dispersa = depred_dispersa
+        símismo.aristas = {}
+
+        # La firma de la estructura de la red en su última actualización (ver `_gen_firma_estr()`)
+        símismo.firma_estr = None
+
         # Para guardar los índices de las etapas con cohortes
         símismo.índices_cohortes = []
 
+        # Los índices (en la matriz de cohortes) de las etapas con transiciones por retraso distribuido, cuyos cohortes
+        # son los compartimientos del retraso
+        símismo.cohortes_retraso = []
+
         # Para guardar etapas que siempre se deben combinar antes de reportar resultados (por ejemplo, etapas fantasmas)
         # Tendrá la forma siguiente:
         # {núm_etp_víctima : {'Parasitoide 1': núm_etp_fantasma,
@@ -80,7 +133,10 @@ class Red(Simulable):
         símismo.fantasmas = {}
 
         # Información de parasitoides:
-        símismo.parasitoides = {'índices': (), 'adultos': {}, 'juvs': {}}
+        símismo.parasitoides = {'índices': (), 'másc': None, 'adultos': {}, 'juvs': {}}
+
+        # Los egresos registrados en la simulación actual (ver `_prep_registros()`)
+        símismo.info_registros = {}
 
         # La matriz de datos de las simulaciones (incluso los datos de poblaciones)
         símismo.predics = {'Pobs': np.array([]),
@@ -97,7 +153,7 @@ class Red(Simulable):
         # Un diccionario para guardar información específica a cada experimento asociado para poder procesar
         # las predicciones de la red en función a cada experimento.
         símismo.info_exps = {'etps_interés': {}, 'combin_etps': {}, 'combin_etps_obs': {}, 'parcelas': {},
-                             'superficies': {}, 'egrs': {}}
+                             'superficies': {}, 'egrs': {}, 'agreg_etps': {}}
 
         # La lista de egresos potencialmente incluidos como observaciones
         símismo.l_egresos = ['Pobs', 'Crecimiento', 'Reproducción', 'Transiciones', 'Muertes']
@@ -187,8 +243,16 @@ class Red(Simulable):
         """
         Actualiza la lista de etapas y las matrices de coeficientes de la red y de sus objetos.
 
+        Si la estructura de la red y de sus organismos no cambió desde la última actualización (ver
+        `_gen_firma_estr()`), se guardan las etapas, ecuaciones y el plan de cálculo existentes, y únicamente se
+        actualizan los vínculos con los experimentos. Para forzar una actualización completa, poner `listo = False`.
+
         """
 
+        if símismo.listo and símismo._gen_firma_estr() == símismo.firma_estr:
+            símismo._actualizar_vínculos_exps()
+            return
+
         # Verificar que todos los organismos en la receta, y únicamente los organismos en la receta, estén en la
         # lista de organismos activos de la red.
         for nombre, dic_org in símismo.receta['estr']['Organismos'].items():
@@ -483,12 +547,553 @@ class Red(Simulable):
             if req_cohs:
                 í_cohs.append(n_etp)
 
+        # Para la matriz densa de depredación, una máscara de las interacciones de infección (parasitoide, víctima), y
+        # para cada parasitoide, los índices de sus infecciones de las etapas con cohortes y de las etapas víctimas en
+        # la matriz de depredación con los ejes de depredador y de presa juntos (ver `_calc_depred()`).
+        n_etps = len(símismo.etapas)
+        másc_infec = símismo.parasitoides['másc'] = np.zeros((n_etps, n_etps), dtype=bool)
+        másc_infec[símismo.parasitoides['índices']] = True
+        for n_parás, d_parás in símismo.parasitoides['adultos'].items():
+            d_parás['í_infec'] = (n_parás * n_etps + np.array(í_cohs, dtype=int),
+                                  n_parás * n_etps + np.array(d_parás['n_entra'], dtype=int))
+
+        # Las etapas con transiciones por retraso distribuido guardan sus compartimientos en la matriz de cohortes, así
+        # que necesitan una ecuación de edad. Sus cohortes no tienen edades, así que tampoco pueden tener
+        # reproducciones por distribuciones de edades.
+        símismo.cohortes_retraso.clear()
+        for n_etp in símismo.ecs['Transiciones']['Prob'].get('Erlang', []):
+            d_etp = símismo.etapas[n_etp]
+            if n_etp not in í_cohs:
+                raise ValueError('La etapa "{}" del organismo "{}" necesita una ecuación de edad para sus transiciones '
+                                 '"Erlang".'.format(d_etp['nombre'], d_etp['org']))
+            if d_etp['dic']['ecs']['Reproducción']['Prob'] in Nc.dists_cohortes:
+                raise ValueError('La etapa "{}" del organismo "{}" no puede tener transiciones "Erlang" y '
+                                 'reproducciones por distribución de edades.'.format(d_etp['nombre'], d_etp['org']))
+            símismo.cohortes_retraso.append(í_cohs.index(n_etp))
+
+        # Generar el plan de cálculo para los pasos de la simulación
+        símismo._gen_plan()
+
         # Actualizar los vínculos con los experimentos
         símismo._actualizar_vínculos_exps()
 
         # La Red ya está lista para simular
+        símismo.firma_estr = símismo._gen_firma_estr()
         símismo.listo = True
 
+    def _gen_firma_estr(símismo):
+        """
+        Genera la firma de la estructura de la red: los organismos de su receta, los objetos de sus organismos activos
+        con sus números de cambios (ver `Organismo.actualizar()`) y un hash del contenido de su estructura y
+        configuración, y la representación de la depredación. El hash detecta cambios hechos directamente a la receta
+        o a la configuración de un organismo sin llamar `Organismo.actualizar()`. Si la firma no cambió, no hace falta
+        reconstruir las etapas de la red.
+
+        :return: La firma.
+        :rtype: tuple
+        """
+
+        return (
+            tuple(sorted(símismo.receta['estr']['Organismos'])),
+            tuple((nombre, id(org), org.n_cambios, hash_contenido(org.receta['estr']), hash_contenido(org.config))
+                  for nombre, org in sorted(símismo.organismos.items())),
+            símismo.depred_dispersa
+        )
+
+    def _gen_plan(símismo):
+        """
+        Genera el plan de cálculo de los pasos de la simulación. Para cada categoría y subcategoría de ecuación,
+        el plan contiene una lista ordenada de los tipos de ecuaciones activos, con el núcleo (función vectorizada)
+        que implementa cada tipo, los índices de las etapas que lo usan (en forma de matriz) y otros índices
+        necesarios para el cálculo. Así, el bucle de simulación únicamente tiene que llamar los núcleos, sin
+        comparar los nombres de las ecuaciones a cada paso.
+
+        Los coeficientes se vinculan al plan más tarde, con `_vincular_plan()`, porque cambian con cada simulación.
+        """
+
+        símismo.plan.clear()
+
+        # Primero, generar las aristas de la red trófica
+        símismo._gen_aristas()
+
+        for categ, d_categ in Nc.núcleos.items():
+            símismo.plan[categ] = {}
+
+            for subcateg in d_categ:
+                l_plan = símismo.plan[categ][subcateg] = []
+
+                for tipo_ec, í_etps in símismo.ecs[categ][subcateg].items():
+                    núcleo = Nc.escoger_núcleo(categ=categ, subcateg=subcateg, tipo_ec=tipo_ec)
+
+                    # Índices adicionales para ciertos cálculos
+                    if núcleo is None or núcleo in Nc.núcleos_por_cohortes:
+                        # Los índices de las etapas en la matriz de cohortes, para transiciones por cohortes
+                        í_coh = np.array([símismo.índices_cohortes.index(x) for x in í_etps], dtype=int)
+                    else:
+                        í_coh = None
+
+                    # Las aristas de estas etapas, para los núcleos que necesitan la depredación
+                    if núcleo in Nc.núcleos_con_depred:
+                        í_aristas = símismo._selec_aristas(í_etps)
+                    else:
+                        í_aristas = None
+
+                    if categ == 'Depredación':
+                        # El bloque de aristas de este tipo de ecuación, y la función para ajustar la depredación por
+                        # la presencia de presas múltiples.
+                        bloque = símismo.aristas['tipos'][tipo_ec]
+                        if símismo.depred_dispersa:
+                            conj = Nc.gen_conj_presas_aristas(símismo.aristas['depred'][bloque])
+                        else:
+                            conj = Nc.conj_presas_densa
+                        í_extra = (conj, bloque)
+                    elif categ == 'Reproducción':
+                        # Los índices de las etapas recipientes de las reproducciones
+                        í_extra = (símismo.orden['repr'][í_etps], í_coh, í_aristas)
+                    elif categ == 'Crecimiento':
+                        í_extra = í_aristas
+                    else:
+                        í_extra = í_coh
+
+                    l_plan.append([tipo_ec, núcleo, np.array(í_etps, dtype=int), None, í_extra])
+
+        # Los índices de las etapas donantes y recipientes de transiciones, para poder aplicar todas las transiciones
+        # de una vez.
+        í_don = np.where(símismo.orden['trans'] != -1)[0]
+        í_recip = símismo.orden['trans'][í_don]
+        símismo.plan['índs_trans'] = (í_don, í_recip, len(np.unique(í_recip)) == len(í_recip))
+
+    def _presas_etapa(símismo, n_etp):
+        """
+        Devuelve los índices de las etapas víctimas (presas o huéspedes) de una etapa de la Red. Sigue las mismas
+        reglas que los coeficientes de depredación (ver `_llenar_coefs()`): las etapas fantasmas de una presa también
+        son presas, excepto para los parasitoides.
+
+        :param n_etp: El índice de la etapa depredadora.
+        :type n_etp: int
+
+        :return: Los índices de las víctimas, en orden.
+        :rtype: list[int]
+        """
+
+        d_etp = símismo.etapas[n_etp]
+        obj_org = símismo.organismos[d_etp['org']]
+
+        presas = set()
+
+        for tipo_inter in ['presa', 'huésped']:
+            # Para cada víctima del organismo...
+            for org_víc, v in d_etp['conf'][tipo_inter].items():
+
+                # Buscar la lista de etapas que caen víctima
+                l_etps_víc = v if tipo_inter == 'presa' else v['entra']
+
+                for etp_víc in l_etps_víc:
+                    try:
+                        n_etp_víc = símismo.núms_etapas[org_víc][etp_víc]
+                    except KeyError:
+                        # Seguir si esta etapa o organismo no existe en la Red.
+                        continue
+
+                    presas.add(n_etp_víc)
+
+                    # Incluir etapas fantasmas, pero NO para parasitoides
+                    if n_etp_víc in símismo.fantasmas and not isinstance(obj_org, Ins.Parasitoide):
+                        presas.update(símismo.fantasmas[n_etp_víc].values())
+
+        return sorted(presas)
+
+    def _gen_aristas(símismo):
+        """
+        Genera la lista de aristas (interacciones depredador-presa) de la red trófica a partir de las presas y de los
+        huéspedes de cada etapa con ecuación de depredación. Las aristas se ordenan por tipo de ecuación de
+        depredación (en el mismo orden que el plan de cálculo), y después por depredador y por presa, así que las
+        aristas de cada tipo de ecuación forman un bloque contiguo.
+
+        Se usan las aristas para calcular la depredación cuando `símismo.depred_dispersa` es verdad.
+
+        """
+
+        n_etps = len(símismo.etapas)
+
+        l_depred = []
+        l_presa = []
+        tipos = {}
+
+        for tipo_ec, í_etps in símismo.ecs['Depredación']['Ecuación'].items():
+            inic = len(l_depred)
+
+            for n_etp in í_etps:
+                for n_presa in símismo._presas_etapa(n_etp):
+                    l_depred.append(n_etp)
+                    l_presa.append(n_presa)
+
+            tipos[tipo_ec] = slice(inic, len(l_depred))
+
+        í_depred = np.array(l_depred, dtype=int)
+        í_presa = np.array(l_presa, dtype=int)
+        n_aristas = len(l_depred)
+
+        # Las aristas de infección (de parasitoides a sus víctimas). Para cada parasitoide, guardamos los índices de
+        # sus aristas de infección, de las etapas víctimas correspondientes y de las etapas fantasmas recipientes.
+        í_arista = {par: i for i, par in enumerate(zip(l_depred, l_presa))}
+        infec = {}
+        for n_parás, d_parás in símismo.parasitoides['adultos'].items():
+            l_infec = [(í_arista[(n_parás, v)], v, f) for v, f in zip(d_parás['n_entra'], d_parás['n_fants'])
+                       if (n_parás, v) in í_arista]
+            if len(l_infec):
+                í_arist, víc, fants = (np.array(x, dtype=int) for x in zip(*l_infec))
+                # Los índices de las víctimas en la matriz de cohortes
+                víc_coh = np.searchsorted(símismo.índices_cohortes, víc)
+                infec[n_parás] = (í_arist, víc, fants, víc_coh)
+            else:
+                infec[n_parás] = None
+
+        # Matrices de incidencia (eje 0: arista, eje 1: etapa presa) para sumar la depredación por presa con un
+        # producto de matrices.
+        incid_presa = np.zeros((n_aristas, n_etps))
+        incid_presa[np.arange(n_aristas), í_presa] = 1
+
+        incid_presa_sin_infec = incid_presa.copy()
+        for d_infec in infec.values():
+            if d_infec is not None:
+                incid_presa_sin_infec[d_infec[0]] = 0
+
+        símismo.aristas.clear()
+        símismo.aristas.update({
+            'depred': í_depred,
+            'presa': í_presa,
+            'tipos': tipos,
+            'infec': infec,
+            'incid_presa': incid_presa,
+            'incid_presa_sin_infec': incid_presa_sin_infec,
+            'grupos_presa': Nc.gen_grupos_aristas(í_presa) if n_aristas else None
+        })
+
+    def _selec_aristas(símismo, í_etps):
+        """
+        Selecciona las aristas de la red trófica cuyos depredadores son las etapas especificadas, para copiar su
+        depredación en una matriz densa (ver `_depred_etps()`).
+
+        :param í_etps: Los índices de las etapas depredadoras, en orden.
+        :type í_etps: list[int]
+
+        :return: Para cada elemento de la matriz densa con sus ejes de depredador y de presa aplanados, el índice de
+        su arista, y una máscara de los elementos sin arista.
+        :rtype: (np.ndarray, np.ndarray)
+        """
+
+        n_etps = len(símismo.etapas)
+        í_depred = símismo.aristas['depred']
+        í_aristas = np.flatnonzero(np.isin(í_depred, í_etps))
+        í_planos = np.searchsorted(í_etps, í_depred[í_aristas]) * n_etps + símismo.aristas['presa'][í_aristas]
+
+        í_arista_elem = np.zeros(len(í_etps) * n_etps, dtype=int)
+        í_arista_elem[í_planos] = í_aristas
+        sin_arista = np.ones(len(í_etps) * n_etps, dtype=bool)
+        sin_arista[í_planos] = False
+
+        return í_arista_elem, sin_arista
+
+    def _depred_etps(símismo, depred, í_etps, í_aristas, out):
+        """
+        Copia la depredación por unas etapas (eje 3: etapa depredadora, eje 4: presa) en una matriz de trabajo,
+        para las ecuaciones de crecimiento y de reproducción que dependen en la depredación.
+
+        :param depred: La matriz de depredación de la Red (densa o por aristas).
+        :type depred: np.ndarray
+
+        :param í_etps: Los índices de las etapas depredadoras.
+        :type í_etps: np.ndarray
+
+        :param í_aristas: Las aristas de estas etapas, tal como generadas por `_selec_aristas()`.
+        :type í_aristas: (np.ndarray, np.ndarray)
+
+        :param out: La matriz de trabajo.
+        :type out: np.ndarray
+
+        :return: La matriz de trabajo.
+        :rtype: np.ndarray
+        """
+
+        if not símismo.depred_dispersa:
+            return np.take(depred, í_etps, axis=3, out=out, mode='clip')
+
+        í_arista_elem, sin_arista = í_aristas
+
+        # Se toma un valor para cada elemento (y no únicamente para cada arista) para no crear matrices temporarias.
+        if depred.shape[3]:
+            plana = out.reshape(out.shape[:3] + (-1,))
+            np.take(depred, í_arista_elem, axis=3, out=plana, mode='clip')
+            np.copyto(plana, 0, where=sin_arista)
+        else:
+            out.fill(0)
+
+        return out
+
+    def _vincular_plan(símismo):
+        """
+        Vincula el plan de cálculo con los coeficientes numerizados (y con las distribuciones de transiciones y de
+        reproducciones) de la simulación actual. Se debe llamar después de `_prep_dists()`.
+        """
+
+        dists = {'Transiciones': símismo.dists['Trans'], 'Reproducción': símismo.dists['Repr']}
+
+        # Los coeficientes se convierten al tipo de las matrices de cálculo, para que los núcleos no generen matrices
+        # temporarias de mayor precisión.
+        tipo = símismo.precisiones[símismo.precisión][0]
+
+        for categ, d_categ in símismo.plan.items():
+            if categ == 'índs_trans':
+                continue
+            for subcateg, l_plan in d_categ.items():
+                for paso_plan in l_plan:
+                    tipo_ec, núcleo = paso_plan[:2]
+                    if núcleo is None:
+                        # Para transiciones por cohortes, el "coeficiente" es la distribución SciPy...
+                        paso_plan[3] = (dists[categ][tipo_ec], símismo.coefs_act_númzds[categ][subcateg][tipo_ec])
+                    elif categ == 'Depredación' and símismo.depred_dispersa:
+                        # ...para la depredación por aristas, el valor de cada coeficiente para cada arista...
+                        bloque = paso_plan[4][1]
+                        í_depred = np.searchsorted(paso_plan[2], símismo.aristas['depred'][bloque])
+                        í_presa = símismo.aristas['presa'][bloque]
+                        paso_plan[3] = {parám: v[:, í_depred, í_presa].astype(tipo, copy=False)
+                                        for parám, v in símismo.coefs_act_númzds[categ][subcateg][tipo_ec].items()}
+                    else:
+                        # ...y sino, el diccionario de coeficientes numerizados.
+                        paso_plan[3] = {parám: v.astype(tipo, copy=False)
+                                        for parám, v in símismo.coefs_act_númzds[categ][subcateg][tipo_ec].items()}
+
+                    if núcleo is Nc.núcleos_trans['Erlang']:
+                        símismo._verificar_compartimientos(í_etps=paso_plan[2], cf=paso_plan[3])
+
+    def _verificar_compartimientos(símismo, í_etps, cf):
+        """
+        Avisa si unas etapas con transiciones por retraso distribuido ("Erlang") necesitan más compartimientos que
+        el número de cohortes disponibles (`n_grupos_coh`). Sus compartimientos se limitan a este número, así que su
+        tiempo de desarrollo tiene una varianza mayor que la especificada por sus coeficientes.
+
+        :param í_etps: Los índices de las etapas.
+        :type í_etps: np.ndarray
+
+        :param cf: Los coeficientes numerizados de las etapas.
+        :type cf: dict
+
+        """
+
+        k = Nc.compartimientos_erlang(cf)
+        demasiados = np.any(k > símismo.n_grupos_coh, axis=0)
+        if np.any(demasiados):
+            etps = ', '.join('"{}" de "{}" (k = {:.0f})'.format(
+                símismo.etapas[n]['nombre'], símismo.etapas[n]['org'], np.max(k[:, j]))
+                for j, n in enumerate(í_etps) if demasiados[j])
+            avisar('Las etapas {} necesitan más compartimientos, según (mu / sigma)^2, que los {} disponibles '
+                   '(`Red.n_grupos_coh`). Se usarán {} compartimientos, así que sus tiempos de desarrollo serán más '
+                   'variables que lo especificado.'.format(etps, símismo.n_grupos_coh, símismo.n_grupos_coh))
+
+    def _gen_matrs_trabajo(símismo, dic_predic):
+        """
+        Genera las matrices de trabajo (temporarias) que usan los cálculos de los pasos de la simulación, y las guarda
+        en `dic_predic['Matrices']`. Se generan una única vez, según los tamaños de las matrices de predicciones
+        generadas por `_gen_dic_matr_predic()`, y después se reutilizan a cada paso (con `out=`), así que la
+        simulación no tiene que crear nuevas matrices del tamaño de la población a cada paso.
+
+        Se debe llamar después de `actualizar()`, porque las matrices de cada paso del plan de cálculo dependen del
+        número de etapas que usan cada tipo de ecuación.
+
+        :param dic_predic: El diccionario de predicciones, tal como generado por `_gen_dic_matr_predic()`.
+        :type dic_predic: dict
+
+        """
+
+        matrs = dic_predic['Matrices']
+
+        # Eje 0: Parcela, 1: Repetición estocástica, 2: Repetición paramétrica, 3: Etapa
+        tmñ = dic_predic['Edades'].shape
+
+        # Las matrices de trabajo tienen el mismo tipo que las poblaciones (según la precisión de la simulación)
+        tipo = dic_predic['Pobs'].dtype
+
+        # La matriz de depredación de un paso. Eje 3: depredador, eje 4: presa; o, por aristas, eje 3: arista.
+        if símismo.depred_dispersa:
+            tmñ_depr = tmñ[:3] + (len(símismo.aristas['depred']),)
+        else:
+            tmñ_depr = tmñ + (tmñ[3],)
+
+        # Los cálculos de cada paso de los egresos registrados se hacen en matrices de trabajo contiguas que se copian
+        # en los registros al fin del paso. El paso de un registro (`registro[..., i]`) no es contiguo, y `np.take()`
+        # copiaría sus datos cada vez que un núcleo lo lee.
+        matrs['regs'] = {
+            egr: np.zeros(tmñ_depr if egr == 'Depredación' else tmñ, dtype=tipo)
+            for egr in símismo.info_registros
+        }
+        # Para los registros de únicamente unas etapas, la selección de las etapas registradas de cada paso.
+        matrs['regs_índs'] = {
+            egr: np.zeros(tmñ[:3] + (len(reg['índs']),) + matrs['regs'][egr].shape[4:], dtype=tipo)
+            for egr, reg in símismo.info_registros.items() if reg['índs'] is not None
+        }
+
+        matrs.update({
+            'pobs': np.zeros(tmñ, dtype=tipo),  # Poblaciones del paso actual, contiguas (ver `incrementar()`)
+            'dens': np.zeros(tmñ[:3] + (1, tmñ[3]), dtype=tipo),  # Densidades de poblaciones, con eje para depredador
+            'másc_depred': np.zeros(tmñ_depr, dtype=bool),
+            'depred_presa': np.zeros(tmñ, dtype=tipo),  # Depredación total por presa
+            'infec_presa': np.zeros(tmñ, dtype=tipo),  # Infecciones totales por presa
+            'nuevos': np.zeros(tmñ, dtype=tipo),  # Recipientes de transiciones
+            'ruido': np.zeros(tmñ, dtype=tipo),
+            'normales': np.zeros((tmñ[2], tmñ[0], tmñ[1], tmñ[3]), dtype=tipo),  # Eje 0: repetición paramétrica
+            'temp': np.zeros(tmñ, dtype=tipo),
+            'másc': np.zeros(tmñ, dtype=bool)
+        })
+
+        if símismo.depred_dispersa:
+            # Las densidades y poblaciones de las presas y de los depredadores de cada arista
+            matrs.update({
+                'dens_presa': np.zeros(tmñ_depr, dtype=tipo),
+                'dens_depred': np.zeros(tmñ_depr, dtype=tipo),
+                'pobs_presa': np.zeros(tmñ_depr, dtype=tipo),
+                'pobs_depred': np.zeros(tmñ_depr, dtype=tipo)
+            })
+
+            # Para el ajuste por depredadores múltiples (ver `Nc.probs_conj_aristas()`)
+            grupos_presa = símismo.aristas['grupos_presa']
+            n_grupos = len(grupos_presa[1]) if grupos_presa is not None else 0
+            matrs.update({
+                'conj': np.zeros((2,) + tmñ_depr, dtype=tipo),
+                'conj_grupos': np.zeros((2,) + tmñ[:3] + (n_grupos,), dtype=tipo)
+            })
+        else:
+            matrs['depred_infec'] = np.zeros(tmñ_depr, dtype=tipo)  # Depredación por infección (parasitoides)
+
+            # Para el ajuste por depredadores múltiples (ver `Nc.probs_conj()`)
+            matrs.update({
+                'conj': np.zeros(tmñ_depr, dtype=tipo),
+                'conj_grupos': np.zeros((2,) + tmñ[:3] + (1, tmñ[3]), dtype=tipo)
+            })
+
+        # Para cada paso del plan de cálculo, una matriz para los resultados de sus etapas, otra para sus poblaciones
+        # (o densidades, para la depredación; o cambios de edad, para las transiciones por cohortes) y, si su ecuación
+        # las necesita, otra para la depredación por sus etapas y las matrices de trabajo de su núcleo. Se guardan en
+        # listas en el mismo orden que el plan.
+        matrs['plan'] = {}
+        for categ, d_categ in símismo.plan.items():
+            if categ == 'índs_trans':
+                continue
+
+            matrs['plan'][categ] = {}
+            for subcateg, l_plan in d_categ.items():
+                l_matrs = matrs['plan'][categ][subcateg] = []
+
+                for paso_plan in l_plan:
+                    tmñ_etps = tmñ[:3] + (len(paso_plan[2]),)
+
+                    if categ == 'Depredación':
+                        # Los núcleos de depredación usan como matrices de trabajo las del ajuste por depredadores
+                        # múltiples y la máscara de depredación, que todavía no sirven cuando se llaman, más una para
+                        # los ejes de su propio ajuste por presas múltiples (ver `Nc.conj_presas_densa()`).
+                        if símismo.depred_dispersa:
+                            # Con aristas, la depredación se calcula directamente en la matriz de depredación. El
+                            # ajuste por presas múltiples usa una vista contigua (`np.take()` copiaría un bloque).
+                            bloque = paso_plan[4][1]
+                            n_grupos = len(np.unique(símismo.aristas['depred'][bloque]))
+                            trabajo_conj = vista_trabajo(
+                                matrs['conj'], (2,) + tmñ[:3] + (len(símismo.aristas['depred'][bloque]),)
+                            )
+                            trabajo = (
+                                matrs['conj'][0][..., bloque], matrs['másc_depred'][..., bloque],
+                                trabajo_conj, np.zeros((2,) + tmñ[:3] + (n_grupos,), dtype=tipo)
+                            )
+                            l_matrs.append((None, None, None, trabajo))
+                        else:
+                            n = len(paso_plan[2])
+                            temp = matrs['conj'][..., :n, :]
+                            trabajo = (temp, matrs['másc_depred'][..., :n, :], temp,
+                                       np.zeros((2,) + tmñ_etps + (1,), dtype=tipo))
+                            l_matrs.append(
+                                (np.zeros(tmñ_etps + (tmñ[3],), dtype=tipo), np.zeros(tmñ_etps, dtype=tipo), None,
+                                 trabajo)
+                            )
+                    else:
+                        if paso_plan[1] in Nc.núcleos_con_depred:
+                            depred_etps = np.zeros(tmñ_etps + (tmñ[3],), dtype=tipo)
+                        else:
+                            depred_etps = None
+                        if paso_plan[1] in Nc.núcleos_por_cohortes:
+                            tmñ_cohs = dic_predic['Cohortes']['Pobs'].shape[:1] + tmñ_etps
+                            trabajo = Nc.matrs_trabajo_cohortes(tmñ_cohs, tipo=tipo)
+                        else:
+                            trabajo = Nc.matrs_trabajo(paso_plan[1], tmñ_etps, n_etps=tmñ[3], tipo=tipo)
+                        l_matrs.append(
+                            (np.zeros(tmñ_etps, dtype=tipo), np.zeros(tmñ_etps, dtype=tipo), depred_etps, trabajo)
+                        )
+
+        # Matrices para los cálculos de cohortes
+        if len(dic_predic['Cohortes']):
+            matrs.update(símismo._gen_matrs_cohortes(dic_predic['Cohortes']['Pobs'].shape, tipo=tipo))
+
+    @staticmethod
+    def _gen_matrs_cohortes(tmñ_cohs, tipo):
+        """
+        Genera las matrices de trabajo de los cálculos de cohortes. Las funciones que trabajan con únicamente unas
+        etapas de los cohortes usan vistas del principio de estas matrices (ver `vista_trabajo()`).
+
+        :param tmñ_cohs: El tamaño de la matriz de cohortes (eje 0: cohorte, 1: parcela, 2: rep estoc, 3: rep parám,
+        4: etapa con cohortes).
+        :type tmñ_cohs: tuple
+
+        :param tipo: El tipo de las matrices.
+        :type tipo: np.dtype
+
+        :return: El diccionario de matrices de trabajo.
+        :rtype: dict
+        """
+
+        return {
+            'egr_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),  # Egresos de las etapas con cohortes
+            'pos_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'neg_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'muertes_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'tot_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'quitar_cohs': np.zeros(tmñ_cohs, dtype=tipo),
+            'cum_cohs': np.zeros(tmñ_cohs, dtype=tipo),
+            'másc_cohs': np.zeros(tmñ_cohs, dtype=bool),
+            'másc_cohs_2': np.zeros(tmñ_cohs, dtype=bool),
+            'infec_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),  # Infecciones por parasitoide, con aristas
+
+            # Para las edades, poblaciones y probabilidades de las etapas que transicionan (o reciben individuos)
+            'trab_cohs': np.zeros((5,) + tmñ_cohs, dtype=tipo),
+            'í_cohs': np.zeros(tmñ_cohs, dtype=np.intp),  # Índices en las tablas de FDA tabuladas
+
+            # Para añadir individuos a los cohortes más jóvenes de cada etapa
+            'nuevos_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'edad_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'eds_mín_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'pobs_mín_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'peso_cohs': np.zeros(tmñ_cohs[1:], dtype=tipo),
+            'mín_cohs': np.zeros(tmñ_cohs[1:], dtype=np.intp),
+            'base_cohs': np.arange(int(np.prod(tmñ_cohs[1:])), dtype=np.intp).reshape(tmñ_cohs[1:]),
+            'ejes_cohs': np.arange(tmñ_cohs[0], dtype=np.intp).reshape((-1,) + (1,) * (len(tmñ_cohs) - 1)),
+
+            # Para transferir individuos entre cohortes de etapas (ver `_transferir_cohortes()`)
+            'trans_cohs': np.zeros(tmñ_cohs[1:], dtype=np.intp),
+            'activos_cohs': np.zeros(tmñ_cohs[1:], dtype=bool)
+        }
+
+    def _egr_cohortes(símismo, matr):
+        """
+        Copia las etapas con cohortes de una matriz de egresos (de la forma de la matriz de poblaciones) en la matriz
+        de trabajo de egresos de cohortes.
+
+        :param matr: La matriz de egresos. Eje 3: Etapa.
+        :type matr: np.ndarray
+
+        :return: La matriz de trabajo, con únicamente las etapas con cohortes.
+        :rtype: np.ndarray
+        """
+
+        return np.take(matr, símismo.índices_cohortes, axis=3, out=símismo.predics['Matrices']['egr_cohs'],
+                       mode='clip')
+
     def dibujar(símismo, mostrar=True, directorio=None, exper=None, n_líneas=0, incert='componentes'):
         """
         Ver la documentación de `Simulable`.
@@ -517,7 +1122,9 @@ class Red(Simulable):
         l_días_obs_todas = símismo.dic_simul['l_días_obs_todas']
 
         for i, m in enumerate(l_m_preds):  # Eje 0: parc, 1: estoc, 2: parám, 3: etp, [4: etp víctima], -1: día
-            n_parc = m.shape[0]
+            # Las simulaciones resumidas tienen un `Resumen` de las poblaciones en vez de su matriz
+            resumido = isinstance(m, Resumen)
+            n_parc = m.forma[0] if resumido else m.shape[0]
             n_etp = len(símismo.etapas)
             ubic = l_ubic_m_preds[i]  # Lista de exper, egreso
             exp = ubic[0]
@@ -537,7 +1144,7 @@ class Red(Simulable):
                     etp = d_etp['nombre']
                     org = d_etp['org']
 
-                    if len(m.shape) == 5:
+                    if resumido or len(m.shape) == 5:
                         # Si no es una matriz de depredación...
 
                         try:
@@ -549,7 +1156,7 @@ class Red(Simulable):
                         except IndexError:
                             vec_obs = días_obs = None
 
-                        matr_pred = m[i_parc, :, :, i_etp, :]
+                        matr_pred = m.vista(i_parc, i_etp) if resumido else m[i_parc, :, :, i_etp, :]
 
                         # Generar el titulo del gráfico. Incluir el nombre de la parcela, si necesario:
                         if egr == 'Transiciones':
@@ -602,6 +1209,7 @@ class Red(Simulable):
                             Arte.graficar_pred(matr_predic=matr_pred, título=título, etiq_y='Depredación',
                                                incert=incert, n_líneas=n_líneas, directorio=dir_img)
 
+    @medir('Depredación')
     def _calc_depred(símismo, pobs, depred, extrn, paso):
         """
         Calcula la depredación entre los varios organismos de la red. Aquí se implementan todas las ecuaciones
@@ -665,276 +1273,264 @@ class Red(Simulable):
         # Calcular cuántas presas cada especie de depredador podría comerse
 
         # A este punto, depred representa la depredación potencial per cápita de depredador
-        tipos_ec = símismo.ecs['Depredación']['Ecuación']  # type: dict
+        plan = símismo.plan['Depredación']['Ecuación']
 
         # Si no hay nada que hacer, devolver ahora
-        if not len(tipos_ec):
+        if not len(plan):
             return
 
-        # La lista de los coeficientes de cada etapa para la depredación
-        coefs = símismo.coefs_act_númzds['Depredación']['Ecuación']
-
-        # Densidades de poblaciones
-        dens = np.divide(pobs, extrn['superficies'].reshape(pobs.shape[0], 1, 1, 1))[..., np.newaxis, :]
-
-        for tp_ec, í_etps in tipos_ec.items():  # Para cada tipo de ecuación...
-
-            # Los coeficientes para las etapas con este tipo de ecuación
-            cf = coefs[tp_ec]  # type: dict
-
-            # Una COPIA de la parte de la matriz que representa la depredación por estas etapas
-            depred_etp = np.take(depred, í_etps, axis=3)
-
-            # Calcular la depredación según la ecuación de esta etapa.
-            if tp_ec == 'Tipo I_Dependiente presa':
-                # Depredación de respuesta funcional tipo I con dependencia en la población de la presa.
-                np.multiply(pobs, cf['a'], out=depred_etp)
-
-            elif tp_ec == 'Tipo II_Dependiente presa':
-                # Depredación de respuesta funcional tipo II con dependencia en la población de la presa.
-                np.multiply(dens, cf['a'] / (dens + cf['b']), out=depred_etp)
-
-            elif tp_ec == 'Tipo III_Dependiente presa':
-                # Depredación de respuesta funcional tipo III con dependencia en la población de la presa.
-                np.multiply(np.square(dens), cf['a'] / (np.square(dens) + cf['b']), out=depred_etp)
-
-            elif tp_ec == 'Tipo I_Dependiente ratio':
-                # Depredación de respuesta funcional tipo I con dependencia en el ratio de presa a depredador.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens / dens_depred, cf['a'], out=depred_etp)
-
-            elif tp_ec == 'Tipo II_Dependiente ratio':
-                # Depredación de respuesta funcional tipo II con dependencia en el ratio de presa a depredador.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens / dens_depred, cf['a'] / (dens / dens_depred + cf['b']), out=depred_etp)
-
-            elif tp_ec == 'Tipo III_Dependiente ratio':
-                # Depredación de respuesta funcional tipo III con dependencia en el ratio de presa a depredador.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(np.square(dens / dens_depred), cf['a'] / (np.square(dens / dens_depred) + cf['b']),
-                            out=depred_etp)
-
-            elif tp_ec == 'Beddington-DeAngelis':
-                # Depredación de respuesta funcional Beddington-DeAngelis. Incluye dependencia en el depredador.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens, cf['a'] / (cf['b'] + dens + cf['c'] * dens_depred), out=depred_etp)
-
-            elif tp_ec == 'Tipo I_Hassell-Varley':
-                # Depredación de respuesta funcional Tipo I con dependencia Hassell-Varley.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens / dens_depred ** cf['m'], cf['a'], out=depred_etp)
-
-            elif tp_ec == 'Tipo II_Hassell-Varley':
-                # Depredación de respuesta funcional Tipo II con dependencia Hassell-Varley.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens / dens_depred ** cf['m'], cf['a'] / (dens / dens_depred ** cf['m'] + cf['b']),
-                            out=depred_etp)
-
-            elif tp_ec == 'Tipo III_Hassell-Varley':
-                # Depredación de respuesta funcional Tipo III con dependencia Hassell-Varley.
-                dens_depred = dens[:, :, :, í_etps]  # La población de esta etapa
-                np.multiply(dens / dens_depred ** cf['m'], cf['a'] / (dens / dens_depred ** cf['m'] + cf['b']),
-                            out=depred_etp)
-
-            elif tp_ec == 'Kovai':
-                # Depredación de respuesta funcional de asíntota doble (ecuación Kovai).
-                dens_depred = dens[:, :, :, 0, í_etps, np.newaxis]  # La población de esta etapa (depredador)
-
-                presa_efec = np.add(dens,
-                                    np.multiply(cf['b'], np.subtract(np.exp(
-                                        np.divide(-dens, cf['b'])
-                                    ), 1)),
-                                    )
-                ratio = presa_efec / dens_depred
-
-                np.multiply(cf['a'],
-                            np.subtract(1,
-                                        np.exp(
-                                            np.divide(
-                                                -np.where(ratio == np.inf, [0], ratio),
-                                                cf['a'])
-                                        )
-                                        ),
-                            out=depred_etp)
-
-                # Ajustar por la presencia de múltiples presas (eje 4 = presas)
-                probs_conj(depred_etp, pesos=cf['a'], máx=1, eje=4)
+        # Con la representación por aristas, calcular la depredación únicamente para las interacciones existentes.
+        if símismo.depred_dispersa:
+            return símismo._calc_depred_aristas(pobs=pobs, depred=depred, extrn=extrn, paso=paso)
 
-            else:
-                # Si el tipo de ecuación no estaba definida arriba, hay un error.
-                raise ValueError('Tipo de ecuación "%s" no reconodico para cálculos de depradación.' % tp_ec)
+        # Las matrices de trabajo de la simulación actual
+        matrs = símismo.predics['Matrices']
+        másc = matrs['másc_depred']
+
+        # Las superficies de las parcelas
+        superficies = extrn['superficies'].reshape(pobs.shape[0], 1, 1, 1)
+
+        # Densidades de poblaciones. Eje 3: (vacío), eje 4: etapa
+        dens = matrs['dens']
+        np.divide(pobs, superficies, out=dens[..., 0, :])
+
+        matrs_plan = matrs['plan']['Depredación']['Ecuación']
+
+        for (tp_ec, núcleo, í_etps, cf, í_extra), (depred_etp, dens_depred, _, trabajo) in zip(plan, matrs_plan):
+            # Para cada tipo de ecuación...
+
+            # Las densidades de las etapas depredadoras. Eje 3: depredador
+            np.take(dens[..., 0, :], í_etps, axis=3, out=dens_depred, mode='clip')
+
+            # Calcular la depredación según la ecuación de esta etapa. Para las densidades de los depredadores, eje 4:
+            # (vacío)
+            núcleo(pobs[..., np.newaxis, :], dens, dens_depred[..., np.newaxis], cf, depred_etp, í_extra[0], trabajo)
 
             depred[:, :, :, í_etps, :] = depred_etp
 
         # Reemplazar valores NaN con 0.
-        depred[np.isnan(depred)] = 0
+        np.isnan(depred, out=másc)
+        np.copyto(depred, 0, where=másc)
 
         # Arreglar errores de redondeo en la computación
-        depred[depred < 0] = 0
+        np.maximum(depred, 0, out=depred)
 
         # Ajustar por superficies
-        np.multiply(depred, extrn['superficies'].reshape(depred.shape[0], 1, 1, 1, 1), out=depred)
+        np.multiply(depred, superficies[..., np.newaxis], out=depred)
 
         # Convertir depredación potencial por depredador a depredación potencial total (multiplicar por la población
         # de cada depredador). También multiplicamos por el paso de la simulación. 'depred' ahora está en unidades
         # del número total de presas comidas por cada tipo de depredador por unidad de tiempo.
-        np.multiply(depred, np.multiply(pobs, paso)[..., np.newaxis], out=depred)
+        np.multiply(depred, pobs[..., np.newaxis], out=depred)
+        np.multiply(depred, paso, out=depred)
 
         # Ajustar por la presencia de varios depredadores (eje 3 = depredadores)
-        probs_conj(depred, pesos=1, máx=pobs, eje=3)
-
-        depred[np.isnan(depred)] = 0
+        probs_conj(depred, pesos=1, máx=pobs, eje=3, trabajo=matrs['conj'], trabajo_eje=matrs['conj_grupos'])
 
         # Redondear (para evitar de comer, por ejemplo, 2 * 10^-5 moscas). NO usamos la función "np.round()", porque
         # esta podría darnos valores superiores a los límites establecidos por probs_conj() arriba.
         np.floor(depred, out=depred)
 
         # Depredación únicamente por presa (todos los depredadores juntos)
-        depred_por_presa = np.sum(depred, axis=3)
+        depred_por_presa = np.sum(depred, axis=3, out=matrs['depred_presa'])
 
         # Actualizar la matriz de poblaciones
         np.subtract(pobs, depred_por_presa, out=pobs)
 
-        # Dividir las depredaciones entre las de depredación normal y las de infecciones
-        depred_infec = np.zeros_like(depred)
-        índs_parás, índs_víc = símismo.parasitoides['índices']
-        depred_infec[..., índs_parás, índs_víc] = depred[..., índs_parás, índs_víc]
-        depred_por_presa_sin_infec = np.subtract(depred_por_presa, np.sum(depred_infec, axis=3))
+        # Dividir las depredaciones entre las de depredación normal y las de infecciones. Como los índices de los
+        # parasitoides no cambian, el resto de la matriz de infecciones siempre queda en 0.
+        depred_infec = matrs['depred_infec']
+        np.copyto(depred_infec, depred, where=símismo.parasitoides['másc'])
+        depred_por_presa_sin_infec = np.sum(depred_infec, axis=3, out=matrs['infec_presa'])
+        np.subtract(depred_por_presa, depred_por_presa_sin_infec, out=depred_por_presa_sin_infec)
 
         # Para las depredaciones normales, es fácul quitarlas de los cohortes
-        símismo._quitar_de_cohortes(muertes=depred_por_presa_sin_infec[..., símismo.índices_cohortes])
+        if len(símismo.índices_cohortes):
+            símismo._quitar_de_cohortes(muertes=símismo._egr_cohortes(depred_por_presa_sin_infec))
 
-        # Para cada parasitoide...
+        # Para cada parasitoide... Las infecciones se toman de la matriz con los ejes de depredador y de presa juntos,
+        # que es contigua, para que `take()` no la copie.
+        infec_plana = depred_infec.reshape(depred_infec.shape[:3] + (-1,))
         for n_parás, d_parás in símismo.parasitoides['adultos'].items():
             índ_entra = d_parás['n_entra']
             índ_recip = d_parás['n_fants'][:len(índ_entra)]
-            símismo._quitar_de_cohortes(muertes=depred_infec[..., n_parás, símismo.índices_cohortes],
-                                        í_don=índ_entra, í_recip=índ_recip)
+            í_infec_cohs, í_infec_entra = d_parás['í_infec']
+            infec_cohs = np.take(infec_plana, í_infec_cohs, axis=3, out=matrs['infec_cohs'], mode='clip')
+            símismo._quitar_de_cohortes(muertes=infec_cohs, í_don=índ_entra, í_recip=índ_recip)
 
             # Agregar las adiciones a las etapas fantasmas a la matriz de poblaciones general
-            pobs[..., índ_recip] += depred_infec[..., n_parás, índ_entra]
+            infec = np.take(infec_plana, í_infec_entra, axis=3, mode='clip',
+                            out=vista_trabajo(matrs['temp'], pobs.shape[:3] + (len(í_infec_entra),)))
+            np.add.at(pobs, (Ellipsis, índ_recip), infec)
 
-    def _calc_crec(símismo, pobs, crec, extrn, paso):
+    def _calc_depred_aristas(símismo, pobs, depred, extrn, paso):
         """
-        Calcula las reproducciones y las transiciones de etapas de crecimiento
+        Calcula la depredación con la representación por aristas de la red trófica. Los cálculos son iguales a los de
+        `_calc_depred()`, pero se hacen únicamente para las interacciones depredador-presa que existen. El eje 3 de
+        `depred` representa las aristas (ver `_gen_aristas()`).
 
-        :param pobs: Matriz numpy de poblaciones actuales. Eje 0 =
+        :param pobs: matriz numpy de poblaciones actuales.
         :type pobs: np.ndarray
 
-        :param extrn: Diccionario de factores externos a la red (plantas, clima, etc.)
+        :param depred: La matriz de depredación por arista.
+        :type depred: np.ndarray
+
+        :param extrn: Un diccionario con datos externos
         :type extrn: dict
 
-        :param paso: El paso para la simulación.
+        :param paso: El paso de tiempo de la simulación.
         :type paso: int
 
         """
 
-        tipos_ec = símismo.ecs['Crecimiento']['Ecuación']  # type: dict
-        modifs = símismo.ecs['Crecimiento']['Modif']  # type: dict
+        # Para simplificar el código
+        aristas = símismo.aristas
+        í_depred = aristas['depred']
+        í_presa = aristas['presa']
+        matrs = símismo.predics['Matrices']
+        másc = matrs['másc_depred']
 
-        # Si no hay nada que hacer, devolver ahora
-        if not len(tipos_ec):
+        # Si ninguna etapa tiene presas en la Red, no hay nada que hacer
+        if not len(í_depred):
             return
 
-        coefs_ec = símismo.coefs_act_númzds['Crecimiento']['Ecuación']
-        coefs_mod = símismo.coefs_act_númzds['Crecimiento']['Modif']
+        # Las superficies de las parcelas
+        superficies = extrn['superficies'].reshape(pobs.shape[0], 1, 1, 1)
 
-        for mod, í_etps in modifs.items():
+        # Densidades de poblaciones de todas las etapas, y de las presas y depredadores de cada arista.
+        dens = matrs['dens'][..., 0, :]
+        np.divide(pobs, superficies, out=dens)
+        dens_presa = np.take(dens, í_presa, axis=3, out=matrs['dens_presa'], mode='clip')
+        dens_depred = np.take(dens, í_depred, axis=3, out=matrs['dens_depred'], mode='clip')
+        pobs_presa = np.take(pobs, í_presa, axis=3, out=matrs['pobs_presa'], mode='clip')
 
-            # Una COPIA de la matriz de crecimiento para estas etapas
-            r = np.take(crec, í_etps, axis=3)
+        for (tp_ec, núcleo, í_etps, cf, (conj, bloque)), (_, _, _, trabajo) in zip(
+                símismo.plan['Depredación']['Ecuación'], matrs['plan']['Depredación']['Ecuación']):
+            # Para cada tipo de ecuación, calcular la depredación directamente en su bloque de aristas.
+            núcleo(pobs_presa[..., bloque], dens_presa[..., bloque], dens_depred[..., bloque], cf, depred[..., bloque],
+                   conj, trabajo)
 
-            cf = coefs_mod[mod]  # type: dict
+        # Reemplazar valores NaN con 0.
+        np.isnan(depred, out=másc)
+        np.copyto(depred, 0, where=másc)
 
-            # Modificaciones ambientales a la taza de crecimiento intrínsica
-            if mod == 'Ninguna':
-                # Sin modificación a r.
-                np.multiply(cf['r'], paso, out=r)
+        # Arreglar errores de redondeo en la computación
+        np.maximum(depred, 0, out=depred)
 
-            elif mod == 'Log Normal Temperatura':
-                # r responde a la temperatura con una ecuación log normal.
-                np.multiply(cf['r'] * paso, mat.exp(-0.5 * (mat.log(extrn['temp_máx'] / cf['t']) / cf['p']) ** 2),
-                            out=r)
+        # Ajustar por superficies
+        np.multiply(depred, superficies, out=depred)
 
-            else:
-                raise ValueError
+        # Convertir depredación potencial por depredador a depredación potencial total
+        np.multiply(depred, np.take(pobs, í_depred, axis=3, out=matrs['pobs_depred'], mode='clip'), out=depred)
+        np.multiply(depred, paso, out=depred)
 
-            crec[:, :, :, í_etps] = r
+        # Ajustar por la presencia de varios depredadores (para cada presa)
+        Nc.probs_conj_aristas(depred, grupos=aristas['grupos_presa'], pesos=1, máx=pobs_presa, trabajo=matrs['conj'],
+                              trabajo_grupos=matrs['conj_grupos'])
 
-        # Calcular el crecimiento de la población
-        for tp_ec, í_etps in tipos_ec.items():
+        # Redondear (sin "np.round()", tal como en `_calc_depred()`)
+        np.floor(depred, out=depred)
 
-            crec_etp = np.take(crec, í_etps, axis=3)  # COPIA de la parte de la matriz "crec" de esta etapa.
+        # Depredación únicamente por presa (todos los depredadores juntos)
+        depred_por_presa = np.matmul(depred, aristas['incid_presa'], out=matrs['depred_presa'])
 
-            pobs_etps = pobs[:, :, :, í_etps]  # La población de esta etapa
-            cf = coefs_ec[tp_ec]  # type: dict
+        # Actualizar la matriz de poblaciones
+        np.subtract(pobs, depred_por_presa, out=pobs)
 
-            # Densidades de poblaciones
-            dens = np.divide(pobs, extrn['superficies'].reshape(pobs.shape[0], 1, 1, 1))
+        # Para las depredaciones normales (sin infecciones), es fácil quitarlas de los cohortes
+        if len(símismo.índices_cohortes):
+            depred_por_presa_sin_infec = np.matmul(depred, aristas['incid_presa_sin_infec'], out=matrs['infec_presa'])
+            símismo._quitar_de_cohortes(muertes=símismo._egr_cohortes(depred_por_presa_sin_infec))
 
-            if tp_ec == 'Exponencial':
-                # Crecimiento exponencial
+        # Para cada parasitoide...
+        for n_parás, d_infec in aristas['infec'].items():
+            if d_infec is None:
+                continue
 
-                np.multiply(pobs_etps, crec_etp, out=crec_etp)
+            í_arist, índ_entra, índ_recip, víc_coh = d_infec
+            infec = depred[..., í_arist]
 
-            elif tp_ec == 'Logístico':
-                # Crecimiento logístico.
+            if len(símismo.índices_cohortes):
+                infec_cohs = matrs['infec_cohs']
+                infec_cohs.fill(0)
+                infec_cohs[..., víc_coh] = infec
+                símismo._quitar_de_cohortes(muertes=infec_cohs, í_don=índ_entra, í_recip=índ_recip)
 
-                # Ecuación logística sencilla
-                np.multiply(crec_etp, pobs_etps * (1 - pobs_etps / cf['K']), out=crec_etp)
+            # Agregar las adiciones a las etapas fantasmas a la matriz de poblaciones general
+            pobs[..., índ_recip] += infec
 
-            elif tp_ec == 'Logístico Presa':
-                # Crecimiento logístico. 'K' es un parámetro repetido para cada presa de la etapa y indica
-                # la contribución individual de cada presa a la capacidad de carga de esta etapa (el depredador).
+    @medir('Crecimiento')
+    def _calc_crec(símismo, pobs, crec, depred, extrn, paso, i):
+        """
+        Calcula las reproducciones y las transiciones de etapas de crecimiento
 
-                k = np.nansum(np.multiply(pobs[..., np.newaxis, :], cf['K']), axis=-1)  # Calcular la capacidad de carga
-                np.multiply(crec_etp, pobs_etps * (1 - pobs_etps / k), out=crec_etp)  # Ecuación logística sencilla
+        :param pobs: Matriz numpy de poblaciones actuales. Eje 0 =
+        :type pobs: np.ndarray
 
-                # Evitar péridadas de poblaciones superiores a la población.
-                np.maximum(crec_etp, -pobs_etps, out=crec_etp)
+        :param depred: La matriz de depredación de este paso.
+        :type depred: np.ndarray
 
-            elif tp_ec == 'Logístico Depredación':
-                # Crecimiento proporcional a la cantidad de presas que se consumió el depredador.
+        :param extrn: Diccionario de factores externos a la red (plantas, clima, etc.)
+        :type extrn: dict
 
-                depred = símismo.predics['Depred'][..., í_etps, :]  # La depredación por esta etapa
-                k = np.nansum(np.multiply(depred, cf['K']), axis=3)  # Calcular la capacidad de carga
-                np.multiply(crec_etp, pobs_etps * (1 - pobs_etps / k), out=crec_etp)  # Ecuación logística sencilla
+        :param paso: El paso para la simulación.
+        :type paso: int
 
-                # Evitar péridadas de poblaciones superiores a la población.
-                np.maximum(crec_etp, -pobs_etps, out=crec_etp)
+        :param i: El número del paso.
+        :type i: int
+
+        """
 
-            elif tp_ec == 'Constante':
-                nueva_pob = cf['n']
-                np.subtract(nueva_pob, pobs_etps, out=crec_etp)
+        plan_ec = símismo.plan['Crecimiento']['Ecuación']
+        plan_mod = símismo.plan['Crecimiento']['Modif']
+
+        # Si no hay nada que hacer, devolver ahora
+        if not len(plan_ec):
+            return
 
-            elif tp_ec == 'Externo Cultivo':
-                # Esta ecuación guarda la población del organismo a un nivel constante, no importe qué esté pasando
-                # en el resto de la red. Puede ser útil para representar plantas donde los herbívoros están bien
-                # abajo de sus capacidades de carga.
+        # Las matrices de trabajo de la simulación actual
+        matrs = símismo.predics['Matrices']
+        matrs_plan = matrs['plan']['Crecimiento']
 
-                try:
-                    np.subtract(extrn['Plantas'], pobs_etps, out=crec_etp)
-                except (KeyError, TypeError):
-                    # Si la planta no ha sido conectada a través de una parcela, no hacemos nada. Esto dejará un valor
-                    # de 0 para la población de la planta.
-                    pass
+        for (mod, núcleo, í_etps, cf, _), (r, _, _, _), tabla in zip(plan_mod, matrs_plan['Modif'],
+                                                                    símismo.tablas_clima['Crecimiento']):
 
+            # Modificaciones ambientales a la taza de crecimiento intrínsica. Las que dependen del clima ya se
+            # calcularon para toda la simulación.
+            if tabla is not None:
+                np.multiply(tabla[i - 1], paso, out=r)
             else:
-                raise ValueError('Ecuación de crecimiento "%s" no reconocida.' % tp_ec)
+                núcleo(cf, paso, extrn, r)
 
-            crec[:, :, :, í_etps] = crec_etp
+            crec[:, :, :, í_etps] = r
+
+        # Calcular el crecimiento de la población
+        for (tp_ec, núcleo, í_etps, cf, í_aristas), (crec_etp, pobs_etps, depred_etps, trabajo) in \
+                zip(plan_ec, matrs_plan['Ecuación']):
+
+            # COPIA de la parte de la matriz "crec" de esta etapa.
+            np.take(crec, í_etps, axis=3, out=crec_etp, mode='clip')
+            np.take(pobs, í_etps, axis=3, out=pobs_etps, mode='clip')  # La población de esta etapa
+
+            # La depredación por estas etapas, si la ecuación la necesita
+            if depred_etps is not None:
+                símismo._depred_etps(depred, í_etps=í_etps, í_aristas=í_aristas, out=depred_etps)
+
+            núcleo(pobs, pobs_etps, depred_etps, cf, extrn, crec_etp, trabajo)
 
-        crec[np.isnan(crec)] = 0
+            crec[:, :, :, í_etps] = crec_etp
 
-        np.floor(crec)
+        np.isnan(crec, out=matrs['másc'])
+        np.copyto(crec, 0, where=matrs['másc'])
 
         # Asegurarse que no perdimos más que existen
-        np.maximum(-pobs, crec, out=crec)
+        np.maximum(np.negative(pobs, out=matrs['temp']), crec, out=crec)
 
         # Actualizar la matriz de poblaciones
         np.add(pobs, crec, out=pobs)
 
-    def _calc_edad(símismo, extrn, edades, paso):
+    @medir('Edad')
+    def _calc_edad(símismo, extrn, edades, paso, i):
         """
 
         :param extrn:
@@ -943,69 +1539,26 @@ class Red(Simulable):
         :type edades: np.ndarray
         :param paso:
         :type paso: int
+        :param i: El número del paso.
+        :type i: int
 
         """
 
         # Simplificamos el código un poco.
         edad_extra = edades
 
-        tipos_edad = símismo.ecs['Edad']['Ecuación']  # type: dict
-        coefs_ed = símismo.coefs_act_númzds['Edad']['Ecuación']  # type: dict
-
         # Para cada etapa que guarda cuenta de edades (es decir, cohortes)...
-        for tp_ed, í_etps in tipos_edad.items():
-
-            # Si hay que guardar cuenta de cohortes, hacerlo aquí
-            cf_ed = coefs_ed[tp_ed]  # type: dict
-
-            if tp_ed == 'Días':
-                # Edad calculada en días.
-                edad_extra[..., í_etps] = 1
-
-            elif tp_ed == 'Días Grados':
-                # Edad calculada por días grados.
-                edad_extra[..., í_etps] = días_grados(extrn['temp_máx'], extrn['temp_mín'],
-                                                      umbrales=(cf_ed['mín'], cf_ed['máx'])
-                                                      )
-
-            elif tp_ed == 'Brière Temperatura':
-                # Edad calculada con la taza de desarrollo de la ecuación de temperatura Briere. En esta ecuación,
-                # tal como en las otras con taza de desarrollo, quitamos el parámetro típicamente multiplicado por
-                # toda la ecuación, porque eso duplicaría el propósito del parámetro de ubicación de las distribuciones
-                # de probabilidad empleadas después.
-                #
-                # Mokhtar, Abrul Monim y Salem Saif al Nabhani. 2010. Temperature-dependent development of dubas bug,
-                #   Ommatissus lybicus (Hemiptera: Tropiduchidae), an endemic pest of date palm, Phoenix dactylifera.
-                #   Eur. J. Entomol. 107: 681–685
-                edad_extra[..., í_etps] = extrn['temp_prom'] * (extrn['temp_prom'] - cf_ed['t_dev_mín']) * \
-                                          mat.sqrt(cf_ed['t_letal'] - extrn['temp_prom'])
-
-            elif tp_ed == 'Brière No Linear Temperatura':
-                # Edad calculada con la taza de desarrollo de la ecuación de temperatura no linear de Briere.
-                #
-                # Youngsoo Son et al. 2012. Estimation of developmental parameters for adult emergence of Gonatocerus
-                #   morgani, a novel egg parasitoid of the glassy-winged sharpshooter, and development of a degree-day
-                #   model. Biological Control 60(3): 233-260.
-
-                edad_extra[..., í_etps] = extrn['temp_prom'] * (extrn['temp_prom'] - cf_ed['t_dev_mín']) * \
-                                          mat.pow(cf_ed['t_letal'] - extrn['temp_prom'], 1 / cf_ed['m'])
-
-            elif tp_ed == 'Logan Temperatura':
-                # Edad calculada con la taza de desarrollo de la ecuación de temperatura Logan:
-                #
-                # Youngsoo Son y Lewis, Edwin E. 2005. Modelling temperature-dependent development and survival of
-                #   Otiorhynchus sulcatus (Coleoptera: Curculionidae). Agricultural and Forest Entomology 7(3): 201–209.
-
-                edad_extra[..., í_etps] = mat.exp(cf_ed['rho'] * extrn['temp_prom']) - \
-                                          mat.exp(cf_ed['rho'] * cf_ed['t_letal'] - (cf_ed['t_letal'] -
-                                                                                     extrn['temp_prom'])
-                                                  / cf_ed['delta'])
-
+        for (tp_ed, núcleo, í_etps, cf_ed, _), tabla in zip(símismo.plan['Edad']['Ecuación'],
+                                                          símismo.tablas_clima['Edad']):
+            if tabla is not None:
+                # Las ecuaciones que dependen del clima ya se calcularon para toda la simulación.
+                edad_extra[..., í_etps] = tabla[i - 1]
             else:
-                raise ValueError('No reconozco el tipo de ecuación "%s" para la edad.' % tp_ed)
+                edad_extra[..., í_etps] = núcleo(cf_ed, extrn)
 
         np.multiply(edad_extra, paso, out=edad_extra)
 
+    @medir('Reproducción')
     def _calc_reprod(símismo, pobs, paso, reprod, depred):
         """
         Esta función calcula las reproducciones de las etapas.
@@ -1019,41 +1572,38 @@ class Red(Simulable):
         """
 
         # Simplificamos el código un poco.
-        tipos_probs = símismo.ecs['Reproducción']['Prob']  # type: dict
-
-        coefs_pr = símismo.coefs_act_númzds['Reproducción']['Prob']
+        plan = símismo.plan['Reproducción']['Prob']
+        matrs_plan = símismo.predics['Matrices']['plan']['Reproducción']['Prob']
 
         # Iterar a través de los tipos de distribuciones de probabilidad activos
-        for tp_prob, í_etps in tipos_probs.items():
+        for (tp_prob, núcleo, í_etps, cf, í_extra), (repr_etp_recip, pob_etp, depred_etps, trabajo) in \
+                zip(plan, matrs_plan):
 
             # Y ya pasamos a calcular el número de individuos de esta etapa que se reproducen en este paso de tiempo
-            cf = coefs_pr[tp_prob]
-            pob_etp = np.take(pobs, í_etps, axis=3)
 
-            # Una referencia a la parte apriopiada de la matriz de reproducciones
-            n_recip = [símismo.orden['repr'][n] for n in í_etps]  # para hacer: simplificar
-            repr_etp_recip = np.take(reprod, í_etps, axis=3)
+            í_recip, í_coh, í_aristas = í_extra
 
-            if tp_prob == 'Constante':
-                # Reproducciones en proporción al tamaño de la población.
+            if núcleo is not None:
+                # Reproducciones que no dependen de los cohortes.
+                np.take(pobs, í_etps, axis=3, out=pob_etp, mode='clip')
 
-                np.multiply(cf['a'], pob_etp * paso, out=repr_etp_recip)
+                # La depredación por estas etapas, si la ecuación la necesita
+                if depred_etps is not None:
+                    símismo._depred_etps(depred, í_etps=í_etps, í_aristas=í_aristas, out=depred_etps)
 
-            elif tp_prob == 'Depredación':
-                # Reproducciones en función de la depredación (útil para avispas esfécidas)
-                np.sum(np.multiply(cf['n'], depred[..., í_etps, :]), axis=-1, out=repr_etp_recip)
+                núcleo(pob_etp, depred_etps, cf, paso, repr_etp_recip, trabajo)
 
             else:
                 # Aquí tenemos todas las probabilidades de reproducción dependientes en distribuciones de cohortes:
-                edad_extra = símismo.predics['Edades']
+                dist, cf = cf
+                edad_extra = np.take(símismo.predics['Edades'], í_etps, axis=3, out=pob_etp, mode='clip')
 
-                símismo._trans_cohortes(cambio_edad=edad_extra[..., í_etps], etps=í_etps,
-                                        dists=símismo.dists['Repr'][tp_prob],
-                                        matr_egr=repr_etp_recip, quitar=False)
+                símismo._trans_cohortes(cambio_edad=edad_extra, etps=í_etps, í_etps_coh=í_coh,
+                                        dists=dist, matr_egr=repr_etp_recip, quitar=False)
 
                 np.multiply(cf['n'], repr_etp_recip, out=repr_etp_recip)
 
-            reprod[..., n_recip] = repr_etp_recip
+            reprod[..., í_recip] = repr_etp_recip
 
         # Redondear las reproducciones calculadas
         np.round(reprod, out=reprod)
@@ -1063,9 +1613,10 @@ class Red(Simulable):
 
         # Actualizar cohortes ahora, si necesario
         if len(símismo.índices_cohortes):
-            símismo._añadir_a_cohortes(nuevos=reprod[..., símismo.índices_cohortes])
+            símismo._añadir_a_cohortes(nuevos=símismo._egr_cohortes(reprod))
 
-    def _calc_muertes(símismo, pobs, muertes, extrn, paso):
+    @medir('Muertes')
+    def _calc_muertes(símismo, pobs, muertes, extrn, paso, i):
 
         """
         Esta función calcula las muertes de causas ambientales de la etapa.
@@ -1079,53 +1630,29 @@ class Red(Simulable):
         :param paso: El paso para la simulación.
         :type paso: int
 
+        :param i: El número del paso.
+        :type i: int
+
         """
 
         # Simplificamos el código un poco.
-        tipos_ec = símismo.ecs['Muertes']['Ecuación']  # type: dict
+        plan = símismo.plan['Muertes']['Ecuación']
 
-        if not len(tipos_ec):
+        if not len(plan):
             return
 
-        coefs = símismo.coefs_act_númzds['Muertes']['Ecuación']
+        matrs_plan = símismo.predics['Matrices']['plan']['Muertes']['Ecuación']
 
-        for tp_ec, í_etps in tipos_ec.items():
+        for (tp_ec, núcleo, í_etps, cf, _), (muerte_etp, pob_etp, _, _), tabla in \
+                zip(plan, matrs_plan, símismo.tablas_clima['Muertes']):
 
-            cf = coefs[tp_ec]
-            muerte_etp = np.take(muertes, í_etps, axis=3)
-            pob_etp = np.take(pobs, í_etps, axis=3)  # La población de estas etapas
-
-            if tp_ec == 'Constante':
-                # Muertes en proporción al tamaño de la población. Sin crecimiento, esto da una decomposición
-                # exponencial.
-
-                np.multiply(pob_etp, cf['q'], out=muerte_etp)
-
-            elif tp_ec == 'Log Normal Temperatura':
-                # Muertes dependientes en la temperatura, calculadas con la ecuación mencionada en:
-                #
-                # Sunghoon Baek, Youngsoo Son, Yong-Lak Park. 2014. Temperature-dependent development and survival of
-                #   Podisus maculiventris (Hemiptera: Pentatomidae): implications for mass rearing and biological
-                #   control. Journal of Pest Science 87(2): 331-340.
-
-                sobrevivencia = mat.exp(-0.5 * (mat.log(extrn['temp_máx'] / cf['t']) / cf['p']) ** 2)
-                np.multiply(pob_etp, (1 - sobrevivencia), out=muerte_etp)
-
-            elif tp_ec == 'Asimptótico Humedad':
-
-                # M. P. Lepage, G. Bourgeois, J. Brodeur, G. Boivin. 2012. Effect of Soil Temperature and Moisture on
-                #   Survival of Eggs and First-Instar Larvae of Delia radicum. Environmental Entomology 41(1): 159-165.
-
-                sobrevivencia = np.maximum([0], np.subtract(1, mat.exp(-cf['a'] * (extrn['humedad'] - cf['b']))))
-                np.multiply(pob_etp, (1 - sobrevivencia), out=muerte_etp)
-
-            elif tp_ec == 'Sigmoidal Temperatura':
-
-                sobrevivencia = 1 / (1 + mat.exp((extrn['temp_máx'] - cf['a']) / cf['b']))
-                np.multiply(pob_etp, (1 - sobrevivencia), out=muerte_etp)
+            np.take(pobs, í_etps, axis=3, out=pob_etp, mode='clip')  # La población de estas etapas
 
+            if tabla is not None:
+                # Las fracciones de muertes que dependen del clima ya se calcularon para toda la simulación.
+                np.multiply(pob_etp, tabla[i - 1], out=muerte_etp)
             else:
-                raise ValueError
+                núcleo(pob_etp, cf, extrn, muerte_etp)
 
             muertes[:, :, :, í_etps] = muerte_etp
 
@@ -1134,11 +1661,12 @@ class Red(Simulable):
 
         # Actualizar los cohortes ahora, si necesario.
         if len(símismo.índices_cohortes):
-            símismo._quitar_de_cohortes(muertes[..., símismo.índices_cohortes])
+            símismo._quitar_de_cohortes(símismo._egr_cohortes(muertes))
 
         # Actualizar la matriz de predicciones
         np.subtract(pobs, muertes, out=pobs)
 
+    @medir('Transiciones')
     def _calc_trans(símismo, pobs, paso, trans):
         """
         Esta función calcula las transiciones de organismos de una etapa a otra. Esto puede incluir muerte por
@@ -1155,37 +1683,31 @@ class Red(Simulable):
 
         """
 
-        # Simplificamos el código un poco.
-        tipos_probs = símismo.ecs['Transiciones']['Prob']  # type: dict
-        tipos_mult = símismo.ecs['Transiciones']['Mult']  # type: dict
-
-        coefs_pr = símismo.coefs_act_númzds['Transiciones']['Prob']
-        coefs_mt = símismo.coefs_act_númzds['Transiciones']['Mult']
+        # Las matrices de trabajo de la simulación actual
+        matrs = símismo.predics['Matrices']
+        matrs_plan = matrs['plan']['Transiciones']['Prob']
 
-        for tp_prob, í_etps in tipos_probs.items():
+        for (tp_prob, núcleo, í_etps, cf, í_coh), (trans_etp, pob_etp, _, trabajo) in zip(
+                símismo.plan['Transiciones']['Prob'], matrs_plan):
 
             # Y ya pasamos a calcular el número de individuos de esta etapa que se transicionan en este paso de tiempo
-            cf = coefs_pr[tp_prob]
-
-            # Una COPIA de la parte apriopiada de la matriz de transiciones
-            trans_etp = np.take(trans, í_etps, axis=3)
 
-            if tp_prob == 'Constante':
-                # Transiciones en proporción al tamaño de la población. Sin crecimiento, esto da una decomposición
-                # exponencial.
+            if í_coh is None:
+                # Transiciones que no dependen de los cohortes
+                np.take(pobs, í_etps, axis=3, out=pob_etp, mode='clip')
+                núcleo(pob_etp, cf, paso, trans_etp)
 
-                # Tomamos el paso en cuenta según las regals de probabilidad:
-                #   p(x sucede n veces) = (1 - (1- p(x))^n)
+            elif núcleo is None:
+                # Aquí tenemos todas las probabilidades de muerte dependientes en distribuciones de cohortes:
+                edad_extra = np.take(símismo.predics['Edades'], í_etps, axis=3, out=pob_etp, mode='clip')
 
-                np.multiply(pobs, (1 - (1 - cf['q']) ** paso), out=trans_etp)
+                símismo._trans_cohortes(cambio_edad=edad_extra, etps=í_etps, í_etps_coh=í_coh,
+                                        dists=cf[0], matr_egr=trans_etp)
 
             else:
-                # Aquí tenemos todas las probabilidades de muerte dependientes en distribuciones de cohortes:
-                edad_extra = símismo.predics['Edades'][..., í_etps]
-
-                símismo._trans_cohortes(cambio_edad=edad_extra, etps=í_etps,
-                                        dists=símismo.dists['Trans'][tp_prob],
-                                        matr_egr=trans_etp)
+                # Y aquí las transiciones por retraso distribuido, a través de los compartimientos (cohortes)
+                edad_extra = np.take(símismo.predics['Edades'], í_etps, axis=3, out=pob_etp, mode='clip')
+                núcleo(símismo.predics['Cohortes']['Pobs'], í_coh, edad_extra, cf, trans_etp, trabajo)
 
             trans[..., í_etps] = trans_etp
 
@@ -1195,28 +1717,30 @@ class Red(Simulable):
         # Quitar los organismos que transicionaron
         np.subtract(pobs, trans, out=pobs)
 
-        # Si no eran adultos muríendose por viejez, añadirlos a la próxima etapa también
-        orden_recip = símismo.orden['trans']
-        nuevos = np.zeros_like(trans)
+        # Si no eran adultos muríendose por viejez, añadirlos a la próxima etapa también. Las etapas que no son
+        # recipientes de transiciones siempre quedan en 0 en esta matriz.
+        nuevos = matrs['nuevos']
 
         # Posibilidades de transiciones multiplicadoras (por ejemplo, la eclosión de parasitoides)
-        for tp_mult, í_etps in tipos_mult.items():
-            if tp_mult == 'Linear':
-                trans[..., í_etps] *= coefs_mt[tp_mult]['a']
-                np.round(trans, out=trans)
-            else:
-                raise ValueError('Tipo de multiplicación "{}" no reconocida.'.format(tp_mult))
-
-        for i in range(len(símismo.etapas)):
-            i_recip = orden_recip[i]
-            if i_recip != -1:
-                nuevos[..., i_recip] += trans[..., i]
+        for (tp_mult, núcleo, í_etps, cf, _), (trans_etp, _, _, _) in zip(símismo.plan['Transiciones']['Mult'],
+                                                                          matrs['plan']['Transiciones']['Mult']):
+            núcleo(trans, í_etps, cf, trans_etp)
+
+        í_don, í_recip, únicos = símismo.plan['índs_trans']
+        trans_don = np.take(trans, í_don, axis=3, out=vista_trabajo(matrs['temp'], trans.shape[:3] + (len(í_don),)),
+                            mode='clip')
+        if únicos:
+            nuevos[..., í_recip] = trans_don
+        else:
+            nuevos[..., í_recip] = 0
+            np.add.at(nuevos, (Ellipsis, í_recip), trans_don)
 
         np.add(pobs, nuevos, out=pobs)
 
         if len(símismo.índices_cohortes):
-            símismo._añadir_a_cohortes(nuevos=nuevos[..., símismo.índices_cohortes])
+            símismo._añadir_a_cohortes(nuevos=símismo._egr_cohortes(nuevos))
 
+    @medir('Movimiento')
     def _calc_mov(símismo, pobs, paso, extrn):
         """
         Calcula la imigración y emigración de organismos entre parcelas
@@ -1253,6 +1777,7 @@ class Red(Simulable):
         # Actualizar la matriz de predicciones
         pobs += mov
 
+    @medir('Ruido')
     def _calc_ruido(símismo, pobs, paso):
         """
 
@@ -1262,37 +1787,36 @@ class Red(Simulable):
         :type paso: int
         """
 
-        # La
-        ruido = np.empty(pobs.shape)
+        # Las matrices de trabajo de la simulación actual
+        matrs = símismo.predics['Matrices']
 
-        tipos_ruido = símismo.ecs['Estoc']['Dist']  # type: dict
-        coefs_ruido = símismo.coefs_act_númzds['Estoc']['Dist']  # type: dict
+        # La desviación estándar relativa del ruido de cada etapa
+        ruido = matrs['ruido']
+        ruido.fill(0)
 
         # Para cada tipo de ruido...
-        for tp_ruido, í_etps in tipos_ruido.items():
-
-            cf_ruido = coefs_ruido[tp_ruido]  # type: dict
-
-            if tp_ruido == 'Normal':
-                # Error distribuido de manera normal...
-                ruido[..., í_etps] = cf_ruido['sigma'] * paso  # Ajustando por el paso
+        for tp_ruido, núcleo, í_etps, cf_ruido, _ in símismo.plan['Estoc']['Dist']:
+            ruido[..., í_etps] = núcleo(cf_ruido, paso)
 
-            else:
-                raise ValueError('Tipo de ruido "{}" no reconocido por Tiko\'n.'.format(tp_ruido))
-
-        # Una distribución normal
+        # Una distribución normal. Cada repetición paramétrica tiene su propio generador aleatorio, así que los
+        # resultados no dependen de cuáles repeticiones se simulan juntas.
         np.multiply(pobs, ruido, out=ruido)
         np.maximum(1, ruido, out=ruido)
-        np.round(np.random.normal(0, ruido), out=ruido)
+        normales = matrs['normales']
+        for gen, normales_rep in zip(símismo.generadores, normales):
+            gen.standard_normal(out=normales_rep, dtype=normales.dtype)
+        np.multiply(ruido, np.moveaxis(normales, 0, 2), out=ruido)
+        np.round(ruido, out=ruido)
 
         # Verificara que no quitamos más que existen
-        ruido = np.where(-ruido > pobs, -pobs, ruido)
+        np.maximum(ruido, np.negative(pobs, out=matrs['temp']), out=ruido)
 
         # Aplicar el cambio
         np.add(ruido, pobs, out=pobs)
 
         # Actualizar los cohortes
-        símismo._ajustar_cohortes(cambio=ruido[..., símismo.índices_cohortes])
+        if len(símismo.índices_cohortes):
+            símismo._ajustar_cohortes(cambio=símismo._egr_cohortes(ruido))
 
     def _inic_pobs_const(símismo):
 
@@ -1316,24 +1840,20 @@ class Red(Simulable):
 
     def incrementar(símismo, paso, i, detalles, mov=False, extrn=None):
 
-        # Empezar con las poblaciones del paso anterior
-        símismo.predics['Pobs'][..., i] = símismo.predics['Pobs'][..., i - 1]
-        pobs = símismo.predics['Pobs'][..., i]
+        # Empezar con las poblaciones del paso anterior. En simulaciones resumidas, la matriz de poblaciones
+        # únicamente tiene los dos últimos pasos, y sus índices de tiempo dan la vuelta. Los cálculos del paso se
+        # hacen en una matriz de trabajo contigua (las poblaciones de un paso en la matriz de predicciones no lo son,
+        # y `np.take()` las copiaría), que se guarda en la matriz de predicciones al fin del paso.
+        n_t = símismo.predics['Pobs'].shape[-1]
+        pobs = símismo.predics['Matrices']['pobs']
+        np.copyto(pobs, símismo.predics['Pobs'][..., (i - 1) % n_t])
 
         # Especificar las matrices de depredación, crecimiento, etc.
-        if detalles:
-            depred = símismo.predics['Depredación'][..., i]
-            crec = símismo.predics['Crecimiento'][..., i]
-            muertes = símismo.predics['Muertes'][..., i]
-            trans = símismo.predics['Transiciones'][..., i]
-            reprod = símismo.predics['Reproducción'][..., i]
-
-        else:
-            depred = símismo.predics['Depredación']
-            crec = símismo.predics['Crecimiento']
-            muertes = símismo.predics['Muertes']
-            trans = símismo.predics['Transiciones']
-            reprod = símismo.predics['Reproducción']
+        depred = símismo._matr_egr_paso(egr='Depredación')
+        crec = símismo._matr_egr_paso(egr='Crecimiento')
+        muertes = símismo._matr_egr_paso(egr='Muertes')
+        trans = símismo._matr_egr_paso(egr='Transiciones')
+        reprod = símismo._matr_egr_paso(egr='Reproducción')
 
         edades = símismo.predics['Edades']
 
@@ -1345,13 +1865,13 @@ class Red(Simulable):
         símismo._calc_depred(pobs=pobs, paso=paso, depred=depred, extrn=extrn)
 
         # Una población que crece (misma etapa)
-        símismo._calc_crec(pobs=pobs, extrn=extrn, crec=crec, paso=paso)
+        símismo._calc_crec(pobs=pobs, extrn=extrn, crec=crec, depred=depred, paso=paso, i=i)
 
         # Muertes por el ambiente
-        símismo._calc_muertes(pobs=pobs, muertes=muertes, extrn=extrn, paso=paso)
+        símismo._calc_muertes(pobs=pobs, muertes=muertes, extrn=extrn, paso=paso, i=i)
 
         # Calcular cambios de edades
-        símismo._calc_edad(extrn=extrn, paso=paso, edades=edades)
+        símismo._calc_edad(extrn=extrn, paso=paso, edades=edades, i=i)
 
         # Una etapa que cambia a otra, o que se muere por su edad.
         símismo._calc_trans(pobs=pobs, paso=paso, trans=trans)
@@ -1363,8 +1883,126 @@ class Red(Simulable):
             # Movimientos de organismos de una parcela a otra.
             símismo._calc_mov(pobs=pobs, extrn=extrn, paso=paso)
 
-    def _incrementar_depurar(símismo, paso, i, detalles, d_tiempo, mov=False, extrn=None):
+        símismo.predics['Pobs'][..., i % n_t] = pobs
+        símismo._guardar_registros_paso(i=i)
+
+    def _matr_egr_paso(símismo, egr):
+        """
+        Devuelve la matriz en la cual se calcula un egreso para un paso. Si el egreso no se registra (ver
+        `info_registros`), es la matriz del egreso sí misma, que se reutiliza a cada paso. Si no, es una matriz de
+        trabajo que `_guardar_registros_paso()` copia después en el registro.
+
+        :param egr: El nombre del egreso.
+        :type egr: str
+
+        :return: La matriz para los cálculos del paso.
+        :rtype: np.ndarray
+        """
+
+        regs = símismo.predics['Matrices']['regs']
+        if egr in regs:
+            return regs[egr]
+        else:
+            return símismo.predics[egr]
+
+    @medir('Registros')
+    def _guardar_registros_paso(símismo, i):
+        """
+        Copia los egresos calculados en matrices de trabajo en sus registros, si el paso `i` se registra.
+
+        :param i: El número del paso.
+        :type i: int
+        """
+
+        matrs = símismo.predics['Matrices']
+        for egr, matr in matrs['regs'].items():
+            reg = símismo.info_registros[egr]
+            if i % reg['cada']:
+                continue
+
+            if reg['índs'] is not None:
+                matr = np.take(matr, reg['índs'], axis=3, out=matrs['regs_índs'][egr], mode='clip')
+            símismo.predics[egr][..., i // reg['cada']] = matr
+
+    def _prep_registros(símismo, detalles):
         """
+        Prepara la información de los egresos que se registran a cada paso en la simulación actual, según
+        `símismo.registros` (ver `Simulable.simular()`).
+
+        :param detalles: Si la simulación es detallada.
+        :type detalles: bool
+
+        :return: Para cada egreso registrado, los índices (en el eje 3 de su matriz: etapa, depredador o arista) que
+        se registran (`None` para todos) y el número de pasos entre registros.
+        :rtype: dict[str, dict]
+        """
+
+        if not detalles:
+            return {}
+
+        if símismo.registros is None:
+            return {egr: {'índs': None, 'cada': 1} for egr in símismo.egresos_registros}
+
+        info = {}
+        for egr, espec in símismo.registros.items():
+            if egr not in símismo.egresos_registros:
+                raise ValueError('El egreso "{}" no se puede registrar. Debe ser uno de: {}.'
+                                 .format(egr, ', '.join(símismo.egresos_registros)))
+
+            if espec is None:
+                espec = {}
+
+            cada = espec.get('cada', 1)
+            if cada < 1:
+                raise ValueError('El intervalo de registro de "{}" debe ser por lo menos 1.'.format(egr))
+
+            etapas = espec.get('etapas')
+            if etapas is None:
+                índs = None
+            else:
+                # Las etapas se especifican por organismo (todas sus etapas, incluso fantasmas) o por
+                # (organismo, etapa)
+                l_índs = []
+                for etp in etapas:
+                    try:
+                        if isinstance(etp, str):
+                            l_índs += list(símismo.núms_etapas[etp].values())
+                        else:
+                            l_índs.append(símismo.núms_etapas[etp[0]][etp[1]])
+                    except KeyError:
+                        raise ValueError('La etapa "{}" no existe en la Red.'.format(etp))
+
+                índs = np.unique(l_índs)
+
+                # Con aristas, se registran las aristas de los depredadores especificados
+                if egr == 'Depredación' and símismo.depred_dispersa:
+                    índs = np.flatnonzero(np.isin(símismo.aristas['depred'], índs))
+
+            info[egr] = {'índs': índs, 'cada': cada}
+
+        return info
+
+    def _registro_completo(símismo, egr):
+        """
+        Determina si un egreso se registra para todas las etapas y todos los pasos de la simulación actual.
+
+        :param egr: El egreso.
+        :type egr: str
+
+        :return: Si el egreso se registra completo.
+        :rtype: bool
+        """
+
+        if egr == 'Pobs':
+            return True
+
+        reg = símismo.info_registros.get(egr)
+        return reg is not None and reg['índs'] is None and reg['cada'] == 1
+
+    def _incrementar_depurar(símismo, paso, i, detalles, mov=False, extrn=None):
+        """
+        Igual que `incrementar()`, pero verifica la consistencia interna del modelo después de cada cálculo. Los
+        tiempos de los cálculos se miden con la instrumentación de la Red, como en `incrementar()`.
 
         :param paso:
         :type paso: int
@@ -1372,19 +2010,16 @@ class Red(Simulable):
         :type i: int
         :param detalles:
         :type detalles: bool
-        :param d_tiempo:
-        :type d_tiempo: dict
         :param mov:
         :type mov: bool
         :param extrn:
         :type extrn: dict
-        :return:
-        :rtype: dict
         """
 
-        # Empezar con las poblaciones del paso anterior
-        símismo.predics['Pobs'][..., i] = símismo.predics['Pobs'][..., i - 1]
-        pobs = símismo.predics['Pobs'][..., i]
+        # Empezar con las poblaciones del paso anterior, tal como en `incrementar()`.
+        n_t = símismo.predics['Pobs'].shape[-1]
+        pobs = símismo.predics['Matrices']['pobs']
+        np.copyto(pobs, símismo.predics['Pobs'][..., (i - 1) % n_t])
 
         def verificar_estado(punto):
             """
@@ -1419,87 +2054,53 @@ class Red(Simulable):
                     raise ValueError('Población de cohorte no suma a población total justo después de calcular {}.'
                                      .format(punto))
 
-        if not len(d_tiempo):
-            d_tiempo = {'Depredación': 0, 'Crecimiento': 0, 'Muertes': 0, 'Edad': 0, 'Transiciones': 0,
-                        'Reproducción': 0, 'Movimiento': 0, 'Ruido': 0}
-
         # Especificar las matrices de depredación, crecimiento, etc.
-        if detalles:
-            depred = símismo.predics['Depredación'][..., i]
-            crec = símismo.predics['Crecimiento'][..., i]
-            muertes = símismo.predics['Muertes'][..., i]
-            trans = símismo.predics['Transiciones'][..., i]
-            reprod = símismo.predics['Reproducción'][..., i]
-
-        else:
-            depred = símismo.predics['Depredación']
-            crec = símismo.predics['Crecimiento']
-            muertes = símismo.predics['Muertes']
-            trans = símismo.predics['Transiciones']
-            reprod = símismo.predics['Reproducción']
+        depred = símismo._matr_egr_paso(egr='Depredación')
+        crec = símismo._matr_egr_paso(egr='Crecimiento')
+        muertes = símismo._matr_egr_paso(egr='Muertes')
+        trans = símismo._matr_egr_paso(egr='Transiciones')
+        reprod = símismo._matr_egr_paso(egr='Reproducción')
 
         edades = símismo.predics['Edades']
 
         # Calcular la depredación, crecimiento, reproducción, muertes, transiciones, y movimiento entre parcelas
 
         # Ruido aleatorio
-        antes = ft.now()
         símismo._calc_ruido(pobs=pobs, paso=paso)
-        ahora = ft.now()
-        d_tiempo['Ruido'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
         verificar_estado('Ruido')
 
         # Una especie que mata a otra.
         verificar_estado('Inicio')
-        antes = ft.now()
         símismo._calc_depred(pobs=pobs, paso=paso, depred=depred, extrn=extrn)
-        ahora = ft.now()
-        d_tiempo['Depredación'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
         verificar_estado('Depredación')
 
         # Una población que crece (misma etapa)
-        antes = ft.now()
-        símismo._calc_crec(pobs=pobs, extrn=extrn, crec=crec, paso=paso)
-        ahora = ft.now()
-        d_tiempo['Crecimiento'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
+        símismo._calc_crec(pobs=pobs, extrn=extrn, crec=crec, depred=depred, paso=paso, i=i)
         verificar_estado('Crecimiento')
 
         # Muertes por el ambiente
-        antes = ft.now()
-        símismo._calc_muertes(pobs=pobs, muertes=muertes, extrn=extrn, paso=paso)
-        ahora = ft.now()
-        d_tiempo['Muertes'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
+        símismo._calc_muertes(pobs=pobs, muertes=muertes, extrn=extrn, paso=paso, i=i)
         verificar_estado('Muertes')
 
         # Calcular cambios de edades
-        antes = ft.now()
-        símismo._calc_edad(extrn=extrn, paso=paso, edades=edades)
-        ahora = ft.now()
-        d_tiempo['Edad'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
+        símismo._calc_edad(extrn=extrn, paso=paso, edades=edades, i=i)
         verificar_estado('Edad')
 
         # Una etapa que cambia a otra, o que se muere por su edad.
-        antes = ft.now()
         símismo._calc_trans(pobs=pobs, paso=paso, trans=trans)
-        ahora = ft.now()
-        d_tiempo['Transiciones'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
         verificar_estado('Transiciones')
 
         # Una etapa que se reproduce para producir más de otra etapa
-        antes = ft.now()
         símismo._calc_reprod(pobs=pobs, paso=paso, reprod=reprod, depred=depred)
-        ahora = ft.now()
-        d_tiempo['Reproducción'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
         verificar_estado('Reproducción')
 
         if mov:
             # Movimientos de organismos de una parcela a otra.
             símismo._calc_mov(pobs=pobs, extrn=extrn, paso=paso)
-            ahora = ft.now()
-            d_tiempo['Movimiento'] += (ahora - antes).seconds + (ahora - antes).microseconds / 1000000
             verificar_estado('Movimiento')
 
-        return d_tiempo
+        símismo.predics['Pobs'][..., i % n_t] = pobs
+        símismo._guardar_registros_paso(i=i)
 
     def _procesar_simul(símismo):
         """
@@ -1515,31 +2116,108 @@ class Red(Simulable):
             for egr in símismo.info_exps['egrs'][exp]:
                 # Para cada egreso de interés...
 
-                # Convertir poblaciones a unidades de organismos por hectárea
-                np.divide(predic[egr], tamaño_superficies, out=predic[egr])  # Notar que este cambia la matriz inicial
+                # En simulaciones resumidas, las poblaciones ya se procesaron a cada paso (ver `_resumir_paso()`)
+                if símismo.resumir and egr == 'Pobs':
+                    continue
+
+                # Los egresos sin registros completos no se pueden comparar con observaciones
+                if not símismo._registro_completo(egr):
+                    continue
+
+                # Los registros de conteos enteros se convierten al tipo de las matrices de cálculo (en un nuevo
+                # archivo, si están en disco)
+                if not np.issubdtype(predic[egr].dtype, np.floating):
+                    archivo = None
+                    if isinstance(predic[egr], np.memmap):
+                        archivo = os.path.splitext(predic[egr].filename)[0] + ' (real).npy'
+                    matr_real = gen_matr_predic(forma=predic[egr].shape, tipo=predic['Pobs'].dtype, archivo=archivo)
+                    matr_real[:] = predic[egr]
+
+                    # Reemplazar la matriz entera también en las listas de matrices para gráficos y validación
+                    dic_simul = símismo.dic_simul
+                    for l_matrs in [dic_simul['l_m_preds_todas'], *dic_simul['d_l_m_predics_v'].values()]:
+                        for j, m in enumerate(l_matrs):
+                            if m is predic[egr]:
+                                l_matrs[j] = matr_real
+
+                    predic[egr] = matr_real
+
+                # Convertir poblaciones a unidades de organismos por hectárea (eje 0: parcela). Notar que este cambia
+                # la matriz inicial.
+                np.divide(predic[egr], tamaño_superficies.reshape((-1,) + (1,) * (predic[egr].ndim - 1)),
+                          out=predic[egr])
+
+                # Agregar las etapas fantasmas y combinadas. El eje de etapas es el penúltimo (el último es el tiempo).
+                símismo._sumar_etps_combinadas(predic[egr], exp=exp, egr=egr, eje=-2)
+
+            # Escribir en disco las predicciones que están en disco, para que queden como resultados de la simulación
+            for matr in predic.values():
+                if isinstance(matr, np.memmap):
+                    matr.flush()
+
+    def _sumar_etps_combinadas(símismo, matr, exp, egr, eje=-1):
+        """
+        Agrega las poblaciones de las etapas fantasmas a las etapas de sus huéspedes y de los juveniles de sus
+        parasitoides, y las etapas combinadas según los datos disponibles del experimento, con un único producto por
+        la matriz de agregación del egreso (ver `_gen_agreg_etps()`). Cambia la matriz directamente.
+
+        :param matr: La matriz de predicciones.
+        :type matr: np.ndarray
 
-                # Agregamos etapas fantasmas a las etapas originales de los huéspedes
-                for i, fants in símismo.fantasmas.items():
-                    índ_fants = list(fants.values())  # Los índices de las etapas fantasmas
-                    predic[egr][..., i, :] += np.sum(predic[egr][..., índ_fants, :], axis=-2)
+        :param exp: El nombre del experimento.
+        :type exp: str
 
-                # Agregamos etapas fantasmas a la etapa juvenil del parasitoide también
-                for ad, dic in símismo.parasitoides['adultos'].items():
-                    índ_fants = dic['n_fants']  # Los índices de las etapas fantasmas
+        :param egr: El nombre del egreso.
+        :type egr: str
 
-                    d_juvs = símismo.parasitoides['juvs']
-                    índ_juv = next(x for x in d_juvs if d_juvs[x] == ad)
+        :param eje: El eje de las etapas en la matriz.
+        :type eje: int
+
+        """
 
-                    predic[egr][..., índ_juv, :] += np.sum(predic[egr][..., índ_fants, :], axis=-2)
+        agreg = símismo.info_exps['agreg_etps'][exp][egr]
+        if agreg is None:
+            return
+
+        # Con el eje de etapas primero, la agregación es el producto de la matriz dispersa por una matriz de
+        # (etapas que contribuyen, todo lo demás). Se calcula por bloques de los otros ejes (si se pueden juntar sin
+        # copiar la matriz), para no tener que copiar todas las etapas que contribuyen de una vez.
+        filas, cols, matr_agreg = agreg
+        etps_prim = np.moveaxis(matr, eje, 0)
+        juntos = etps_prim.reshape((etps_prim.shape[0], -1, etps_prim.shape[-1]))
+        if np.may_share_memory(juntos, matr):
+            n = max(1, símismo.bytes_bloque_agreg // (filas.size * juntos.shape[-1] * juntos.itemsize))
+            bloques = [juntos[:, i:i + n] for i in range(0, juntos.shape[1], n)]
+        else:
+            bloques = [etps_prim]
 
-                # Combinaciones basadas en los datos disponibles (combinaciones manuales)
-                # Tiene el formato general: {exp: {{1: [3,4, etc.]}, etc...], ...}
-                try:
-                    combin_etps = símismo.info_exps['combin_etps'][exp][egr]
-                    for i in combin_etps:
-                        predic[egr][..., i, :] += np.sum(predic[egr][..., combin_etps[i], :], axis=-2)
-                except KeyError:
-                    pass
+        for bloque in bloques:
+            fuentes = bloque[filas]
+            bloque[cols] = (matr_agreg @ fuentes.reshape((filas.size, -1))).reshape((cols.size,) + fuentes.shape[1:])
+
+    def _resumir_paso(símismo, i):
+        """
+        Ver la documentación de `Simulable`. Las poblaciones del paso se procesan tal como en `_procesar_simul()`
+        (organismos por hectárea, con etapas fantasmas y combinadas) antes de agregarse al `Resumen`.
+        """
+
+        predics = símismo.predics
+        resumen = predics['Resumen']  # type: Resumen
+        exp = predics['Matrices']['exp']
+
+        if i == 0:
+            resumen.reiniciar()
+
+        # Eje 0: parcela, 1: rep estoc, 2: rep parám, 3: etapa
+        pobs = predics['Pobs'][..., i % predics['Pobs'].shape[-1]]
+
+        # Convertir a organismos por hectárea (en doble precisión, para las estadísticas)
+        superficies = símismo.info_exps['superficies'][exp].reshape((-1, 1, 1, 1))
+        pobs_ha = np.divide(pobs, superficies, dtype=np.float64)
+
+        símismo._sumar_etps_combinadas(pobs_ha, exp=exp, egr='Pobs')
+
+        resumen.agregar(pobs_ha, i=i)
 
     def _analizar_valid(símismo):
         """
@@ -1554,6 +2232,9 @@ class Red(Simulable):
         matr_preds_total = None
         vector_obs_total = None
 
+        # Para simulaciones resumidas, las predicciones promedias, observaciones y percentiles de todas las etapas
+        l_resumen_total = []
+
         # El diccionario de validación por etapa
         valids_detalles = {}
 
@@ -1573,6 +2254,10 @@ class Red(Simulable):
             for egr, matr in d_obs_exp.items():
                 n_parc = d_obs_exp[egr].shape[0]
 
+                # Las simulaciones resumidas únicamente se pueden validar con las poblaciones
+                if símismo.resumir and egr not in símismo.dic_simul['d_pasos_obs_valid'][exp]:
+                    continue
+
                 for n_p in range(n_parc):
 
                     parc = símismo.info_exps['parcelas'][exp][n_p]
@@ -1584,8 +2269,6 @@ class Red(Simulable):
                         if np.sum(~np.isnan(vec_obs)) == 0:
                             continue
 
-                        matr_preds = d_matrs_valid[exp][egr][n_p, ..., n_etp, :]  # Eje 0 parc, 1 estoc, 2 parám, 3 día
-
                         org = símismo.etapas[n_etp]['org']
                         etp = símismo.etapas[n_etp]['nombre']
 
@@ -1594,6 +2277,19 @@ class Red(Simulable):
 
                         valids_detalles[exp][org][etp] = {}
 
+                        if símismo.resumir:
+                            # Validar directamente con las estadísticas resumidas
+                            vista = símismo.predics_exps[exp]['Resumen'].vista(n_p, n_etp)
+                            res_etp = predic_resumen(
+                                vista=vista, vector_obs=vec_obs,
+                                pasos_obs=símismo.dic_simul['d_pasos_obs_valid'][exp][egr]
+                            )
+                            valids_detalles[exp][org][etp][parc] = validar_percentiles(*res_etp)
+                            l_resumen_total.append(res_etp)
+                            continue
+
+                        matr_preds = d_matrs_valid[exp][egr][n_p, ..., n_etp, :]  # Eje 0 parc, 1 estoc, 2 parám, 3 día
+
                         valids_detalles[exp][org][etp][parc] = validar_matr_pred(
                             matr_predic=matr_preds,
                             vector_obs=vec_obs
@@ -1606,7 +2302,10 @@ class Red(Simulable):
                             matr_preds_total = np.append(matr_preds_total, matr_preds, axis=-1)
                             vector_obs_total = np.append(vector_obs_total, vec_obs, axis=-1)
 
-        valid = validar_matr_pred(matr_predic=matr_preds_total, vector_obs=vector_obs_total)
+        if símismo.resumir:
+            valid = validar_percentiles(*[np.concatenate(x) for x in zip(*l_resumen_total)])
+        else:
+            valid = validar_matr_pred(matr_predic=matr_preds_total, vector_obs=vector_obs_total)
 
         return {'Valid': valid, 'Valid detallades': valids_detalles}
 
@@ -1892,6 +2591,53 @@ class Red(Simulable):
                             l_etps_cum.append(n_etp)
                             etps_interés_egr[n_etp] = nombres_cols.index(l_cols[0])  # El número de la columna en Exper
 
+            # Las matrices de agregación de etapas fantasmas y combinadas para cada egreso (ver `_gen_agreg_etps()`)
+            símismo.info_exps['agreg_etps'][exp] = {
+                egr: símismo._gen_agreg_etps(combin_etps.get(egr, {})) for egr in símismo.l_egresos
+            }
+
+    def _gen_agreg_etps(símismo, combin_etps):
+        """
+        Genera la matriz de agregación de etapas de `_sumar_etps_combinadas()`. Cada suma de etapas
+        `matr[..., i] += np.sum(matr[..., fuentes], axis=-1)` es una multiplicación (a la derecha) por una matriz
+        de etapas, así que todas las sumas (en orden: etapas fantasmas a sus huéspedes, etapas fantasmas a los juveniles
+        de sus parasitoides y etapas combinadas según los datos) se pueden aplicar con el producto de sus matrices.
+        Únicamente se guardan las columnas de las etapas que cambian y las filas de las etapas que contribuyen a estas,
+        en una matriz dispersa (así que, tal como con las sumas, las poblaciones infinitas de las etapas que no
+        contribuyen a una etapa no la cambian).
+
+        :param combin_etps: Las etapas combinadas según los datos de un egreso, de la forma {n_etp: [n otras etapas]}.
+        :type combin_etps: dict
+
+        :return: Los índices de las etapas que contribuyen, de las etapas que cambian y la matriz de agregación
+          correspondiente (transpuesta: eje 0 = etapa que cambia, eje 1 = etapa que contribuye), o `None` si no hay
+          etapas que agregar.
+        :rtype: (np.ndarray, np.ndarray, dispersa.csr_matrix) | None
+        """
+
+        n_etps = len(símismo.etapas)
+        identidad = np.identity(n_etps)
+        agreg = identidad.copy()
+
+        sumas = [(i, list(fants.values())) for i, fants in símismo.fantasmas.items()]
+
+        d_juvs = símismo.parasitoides['juvs']
+        for ad, dic in símismo.parasitoides['adultos'].items():
+            índ_juv = next(x for x in d_juvs if d_juvs[x] == ad)
+            sumas.append((índ_juv, dic['n_fants']))
+
+        sumas += list(combin_etps.items())
+
+        for i, fuentes in sumas:
+            agreg[:, i] += np.sum(agreg[:, fuentes], axis=1)
+
+        cols = np.flatnonzero(np.any(agreg != identidad, axis=0))
+        if not cols.size:
+            return None
+        filas = np.flatnonzero(np.any(agreg[:, cols] != 0, axis=1))
+
+        return filas, cols, dispersa.csr_matrix(agreg[np.ix_(filas, cols)].T)
+
     def _gen_dic_predics_exps(símismo, exper, n_rep_estoc, n_rep_parám, paso, n_pasos, detalles):
         """
 
@@ -1907,6 +2653,15 @@ class Red(Simulable):
 
         n_cohs = len(símismo.índices_cohortes)
 
+        # Los egresos que se registran a cada paso
+        símismo.info_registros = símismo._prep_registros(detalles=detalles)
+
+        # El número de aristas de la red trófica, si se representa la depredación por aristas
+        n_aristas = len(símismo.aristas['depred']) if símismo.depred_dispersa else None
+
+        # El generador aleatorio para las condiciones iniciales
+        gen_inic = np.random.default_rng(símismo.sec_semillas['inic'])
+
         # Para cada experimento...
         for exp in exper:
 
@@ -1923,9 +2678,15 @@ class Red(Simulable):
             # Generamos el diccionario de predicciones en función de esta simulación
             dic_predics = símismo._gen_dic_matr_predic(
                 n_parc=n_parc, n_rep_estoc=n_rep_estoc, n_rep_parám=n_rep_parám, n_etps=n_etps, n_pasos=n_pasos_exp,
-                n_cohs=n_cohs, detalles=detalles
+                n_cohs=n_cohs, n_grupos_coh=símismo.n_grupos_coh, detalles=detalles, n_aristas=n_aristas,
+                precisión=símismo.precisión, resumir=símismo.resumir, registros=símismo.info_registros,
+                directorio=os.path.join(símismo.dir_predics, exp) if símismo.dir_predics is not None else None
             )
 
+            # Y las matrices de trabajo para los cálculos de cada paso
+            símismo._gen_matrs_trabajo(dic_predic=dic_predics)
+            dic_predics['Matrices']['exp'] = exp  # Para las estadísticas resumidas
+
             # Ahora para los datos de población iniciales (evidentemente, no hay que inicializar datos de
             # muertes, etc.)...
 
@@ -2038,7 +2799,7 @@ class Red(Simulable):
                         p = np.divide(copia_matr, matr_pobs_etps_fant_cum[v])
 
                         # Alocar según una distribución binomial
-                        aloc = np.minimum(np.random.binomial(l_pobs_víc[v], p), copia_matr)
+                        aloc = np.minimum(gen_inic.binomial(l_pobs_víc[v], p), copia_matr)
                         if v < n_etps_víc - 1:
                             aloc = np.maximum(aloc, copia_matr - matr_pobs_etps_fant_cum[v + 1])
                         else:
@@ -2050,13 +2811,13 @@ class Red(Simulable):
                         # Quitar las alocaciones de las poblaciones que quedan a alocar
                         copia_matr -= aloc
 
-                    # Dar las poblaciones iniciales apropiadas
+                    # Dar las poblaciones iniciales apropiadas (de cada parcela a todas sus repeticiones)
                     for n_etp_víc, n_etp_fant, pobs in zip(l_etps_víc, l_etps_fant, matr_pobs_etps_fant):
                         # Agregar a la población de la etapa fantasma
-                        dic_predics['Pobs'][..., n_etp_fant, 0] += pobs
+                        dic_predics['Pobs'][..., n_etp_fant, 0] += pobs[:, np.newaxis, np.newaxis]
 
                         # Quitar de la población de la etapa víctima (no infectada) correspondiente.
-                        dic_predics['Pobs'][..., n_etp_víc, 0] -= pobs
+                        dic_predics['Pobs'][..., n_etp_víc, 0] -= pobs[:, np.newaxis, np.newaxis]
 
             # Ahora, inicializamos los cohortes.
             símismo._añadir_a_cohortes(dic_predic=dic_predics,
@@ -2068,11 +2829,19 @@ class Red(Simulable):
             # Guardar el diccionario creado bajo el nombre de su experimento correspondiente.
             d_predics_exps[exp] = dic_predics
 
+        # Si hay que simular los experimentos juntos, apilarlos
+        if símismo.apilar_exps and len(d_predics_exps) > 1:
+            símismo._apilar_predics_exps(n_rep_estoc=n_rep_estoc, n_rep_parám=n_rep_parám, detalles=detalles)
+
         # Ahora, listas e información de matrices de predicciones (para gráficos y análises de sensibilidad).
 
         # Diccionario de predicciones excluyendo matrices temporarias y de información, etc.
-        if detalles:
-            d_preds = {x: {e: d_x[e] for e in símismo.l_egresos} for x, d_x in d_predics_exps.items()}
+        if símismo.resumir:
+            d_preds = {x: {'Pobs': d_x['Resumen']} for x, d_x in d_predics_exps.items()}
+        elif detalles:
+            # Los egresos registrados para unas etapas o cada unos pasos no se incluyen
+            d_preds = {x: {e: d_x[e] for e in símismo.l_egresos if símismo._registro_completo(e)}
+                       for x, d_x in d_predics_exps.items()}
         else:
             d_preds = {x: {'Pobs': d_x['Pobs']} for x, d_x in d_predics_exps.items()}
 
@@ -2081,13 +2850,162 @@ class Red(Simulable):
         dic_a_lista(d=d_preds, l=l_preds, l_u=símismo.dic_simul['l_ubics_m_preds'])
 
         # Generamos una copia de los datos iniciales, para poder reinicializar corridas. Para Redes, solamente tenemos
-        # que hacer una copia de los cohortes, y del primer día de poblaciones.
-        símismo.dic_simul['inic_d_predics_exps'] = {
-            exp: {'Cohortes': copiar_profundo(d_exp['Cohortes']),
-                  'Pobs': d_exp['Pobs'][..., 0].copy()}
-            for exp, d_exp in símismo.dic_simul['d_predics_exps'].items()
+        # que hacer una copia de los cohortes, y del primer día de poblaciones. Si los experimentos están apilados,
+        # copiamos directamente las matrices apiladas.
+        if len(símismo.dic_simul['exps_apilados']):
+            l_d_predics = [símismo.dic_simul['predics_apiladas']]
+        else:
+            l_d_predics = list(d_predics_exps.values())
+        símismo.dic_simul['estado_inic'].update(gen_estado_inic(
+            [d['Pobs'][..., 0] for d in l_d_predics] + [m for d in l_d_predics for m in d['Cohortes'].values()]
+        ))
+
+    def _apilar_predics_exps(símismo, n_rep_estoc, n_rep_parám, detalles):
+        """
+        Junta las predicciones de todos los experimentos en un único diccionario de predicciones, apilando sus
+        parcelas (y con tantos pasos como el experimento más largo), para simularlos todos con un único ciclo de pasos.
+        Las matrices de predicciones de cada experimento se reemplazan por vistas de las matrices apiladas, así que los
+        resultados de la simulación apilada aparecen directamente en las predicciones de cada experimento. Las
+        parcelas de experimentos más cortos siguen simulándose hasta el fin, pero sus pasos adicionales no aparecen en
+        sus vistas.
+
+        :param n_rep_estoc: El número de repeticiones estocásticas.
+        :type n_rep_estoc: int
+
+        :param n_rep_parám: El número de repeticiones paramétricas.
+        :type n_rep_parám: int
+
+        :param detalles: Si la simulación guarda los egresos detallados de cada paso.
+        :type detalles: bool
+
+        """
+
+        d_predics_exps = símismo.dic_simul['d_predics_exps']
+
+        n_parcs = [d_exp['Pobs'].shape[0] for d_exp in d_predics_exps.values()]
+        n_pasos = max(d_exp['Pobs'].shape[-1] for d_exp in d_predics_exps.values())
+        n_aristas = len(símismo.aristas['depred']) if símismo.depred_dispersa else None
+
+        apiladas = símismo._gen_dic_matr_predic(
+            n_parc=sum(n_parcs), n_rep_estoc=n_rep_estoc, n_rep_parám=n_rep_parám, n_etps=len(símismo.etapas),
+            n_pasos=n_pasos, n_cohs=len(símismo.índices_cohortes), n_grupos_coh=símismo.n_grupos_coh,
+            detalles=detalles, n_aristas=n_aristas, precisión=símismo.precisión, registros=símismo.info_registros
+        )
+        símismo._gen_matrs_trabajo(dic_predic=apiladas)
+
+        # Copiar las predicciones (iniciales) de cada experimento en su lugar en las matrices apiladas, y
+        # reemplazarlas por vistas. El eje de parcelas es el eje 0, salvo para los cohortes (eje 1).
+        inicio = 0
+        for (exp, d_exp), n_parc in zip(d_predics_exps.items(), n_parcs):
+            parcs = slice(inicio, inicio + n_parc)
+
+            for egr, matr in d_exp.items():
+                if isinstance(matr, np.ndarray):
+                    d_exp[egr] = vista_apilada(apiladas[egr], matr=matr, parcs=parcs, eje=0)
+
+            for egr, matr in d_exp['Cohortes'].items():
+                d_exp['Cohortes'][egr] = vista_apilada(apiladas['Cohortes'][egr], matr=matr, parcs=parcs, eje=1)
+
+            # Las matrices de trabajo de cada experimento ya no sirven
+            d_exp['Matrices'] = {}
+
+            inicio += n_parc
+
+        símismo.dic_simul['predics_apiladas'].update(apiladas)
+        símismo.dic_simul['exps_apilados'].extend(d_predics_exps)
+
+    def _gen_predics_pedazo(símismo, predics, rep_parám, detalles):
+        """
+        Ver la documentación de `Simulable`. El eje de repeticiones paramétricas es el eje 2 (eje 3 para los
+        cohortes).
+        """
+
+        n_parc, n_rep_estoc, _, n_etps, n_pasos = predics['Pobs'].shape
+        if símismo.resumir:
+            n_pasos = predics['Resumen'].forma[2]
+        n_rep_parám = rep_parám.stop - rep_parám.start
+        n_aristas = len(símismo.aristas['depred']) if símismo.depred_dispersa else None
+
+        pedazo = símismo._gen_dic_matr_predic(
+            n_parc=n_parc, n_rep_estoc=n_rep_estoc, n_rep_parám=n_rep_parám, n_etps=n_etps, n_pasos=n_pasos,
+            n_cohs=len(símismo.índices_cohortes), n_grupos_coh=símismo.n_grupos_coh, detalles=detalles,
+            n_aristas=n_aristas, precisión=símismo.precisión, resumir=símismo.resumir, registros=símismo.info_registros
+        )
+        símismo._gen_matrs_trabajo(dic_predic=pedazo)
+        pedazo['Matrices']['exp'] = predics['Matrices']['exp']
+
+        # Copiar los valores iniciales del pedazo
+        for egr, matr in pedazo.items():
+            if isinstance(matr, np.ndarray):
+                matr[:] = predics[egr][:, :, rep_parám]
+        for egr, matr in pedazo['Cohortes'].items():
+            matr[:] = predics['Cohortes'][egr][:, :, :, rep_parám]
+
+        return pedazo
+
+    def _guardar_predics_pedazo(símismo, predics, res_pedazo, rep_parám):
+        """
+        Ver la documentación de `Simulable`.
+        """
+
+        for egr, matr in res_pedazo.items():
+            if isinstance(matr, np.ndarray):
+                predics[egr][:, :, rep_parám] = matr
+        for egr, matr in res_pedazo['Cohortes'].items():
+            predics['Cohortes'][egr][:, :, :, rep_parám] = matr
+
+        # Las estadísticas resumidas de cada pedazo se combinan
+        if 'Resumen' in res_pedazo:
+            predics['Resumen'].combinar(res_pedazo['Resumen'])
+
+    def _estado_control(símismo, i):
+        """
+        Ver la documentación de `Simulable`. El estado comprende las poblaciones y los egresos detallados registrados
+        (ver `info_registros`) de todos los pasos hasta `i`, así que las predicciones de una simulación reanudada quedan
+        completas, y las poblaciones y edades de los cohortes.
+        """
+
+        predics = símismo.predics
+
+        return {
+            'Pobs': np.moveaxis(predics['Pobs'][..., :i + 1], 2, 0).copy(),
+            'Registros': {egr: np.moveaxis(predics[egr][..., :i // reg['cada'] + 1], 2, 0).copy()
+                          for egr, reg in símismo.info_registros.items()},
+            'Cohortes': {ll: np.moveaxis(matr, 3, 0).copy() for ll, matr in predics['Cohortes'].items()}
         }
 
+    def _restaurar_estado_control(símismo, estado, i):
+        """
+        Ver la documentación de `Simulable`.
+        """
+
+        predics = símismo.predics
+
+        # Los egresos detallados registrados deben ser los mismos que los del punto de control
+        regs_estado = estado.get('Registros', {})
+        if regs_estado.keys() != símismo.info_registros.keys():
+            raise ValueError('El punto de control registró los egresos detallados {}, y no {}. Hay que reanudar la '
+                             'simulación con las mismas opciones de `detalles` y `registros`.'
+                             .format(sorted(regs_estado), sorted(símismo.info_registros)))
+
+        # Los ejes de repeticiones paramétricas se ponen primero, tal como en el estado
+        matrs = {'Pobs': np.moveaxis(predics['Pobs'], 2, 0)[..., :i + 1]}
+        matrs.update({'Registro ' + egr: np.moveaxis(predics[egr], 2, 0)[..., :i // reg['cada'] + 1]
+                      for egr, reg in símismo.info_registros.items()})
+        matrs.update({'Cohortes ' + ll: np.moveaxis(matr, 3, 0) for ll, matr in predics['Cohortes'].items()})
+        matrs_estado = {'Pobs': estado['Pobs']}
+        matrs_estado.update({'Registro ' + egr: matr for egr, matr in regs_estado.items()})
+        matrs_estado.update({'Cohortes ' + ll: matr for ll, matr in estado.get('Cohortes', {}).items()})
+
+        if matrs.keys() != matrs_estado.keys():
+            raise ValueError('El punto de control no corresponde a esta Red (no tiene las mismas etapas con cohortes).')
+
+        for ll, matr in matrs.items():
+            if matr.shape != matrs_estado[ll].shape:
+                raise ValueError('El punto de control no corresponde a esta simulación: sus matrices de "{}" tienen la '
+                                 'forma {}, y no {}.'.format(ll, matrs_estado[ll].shape, matr.shape))
+            matr[:] = matrs_estado[ll]
+
     def _gen_dics_valid(símismo, exper, paso, n_pasos, n_rep_estoc, n_rep_parám):
 
         # Simplificar el código
@@ -2095,8 +3013,9 @@ class Red(Simulable):
         d_valid = símismo.dic_simul['matrs_valid']  # El diciconario de matrices de la validación
         d_preds_v = {}  # El diccionario de matrices de simulación que vinculados con observaciones
         d_días_obs = {}
+        d_pasos_obs = símismo.dic_simul['d_pasos_obs_valid']  # Los pasos de las observaciones (simulaciones resumidas)
 
-        # Diccionario temporario para organizar los índices
+        # Diccionario temporario para organizar los operadores de observación
         d_índs = {}
 
         for exp in exper:
@@ -2110,11 +3029,11 @@ class Red(Simulable):
             for egr in símismo.l_egresos:
                 # Para cada egreso posible...
 
-                if egr in símismo.info_exps['egrs'][exp]:
-                    # Si el egreso ha sido observado en el Experimento...
+                if egr in símismo.info_exps['egrs'][exp] and símismo._registro_completo(egr):
+                    # Si el egreso ha sido observado en el Experimento (y registrado para cada etapa y cada paso)...
 
                     # Asegurarse que el nombre del experimento existe en los diccionarios necesarios
-                    for d in [d_obs, d_días_obs, d_valid, d_preds_v, d_índs]:
+                    for d in [d_obs, d_días_obs, d_valid, d_preds_v, d_índs, d_pasos_obs]:
                         if exp not in d:
                             d[exp] = {}
 
@@ -2135,13 +3054,22 @@ class Red(Simulable):
                     etps = list(símismo.info_exps['etps_interés'][exp][egr].keys())  # Los índices de las etapas en RAE
                     etps_bd = list(símismo.info_exps['etps_interés'][exp][egr].values())  # Los índices de etps en Exper
                     vals = datos['datos'][:, etps_bd, :]  # Los valores. Eje 0 = parc, 1 = etp, 2 = día
-                    matr_obs[parc, etps, :] = vals  # Llenar los valores. eje 2 = día. Excluimos días sin datos obs.
+                    matr_obs[np.ix_(parc, etps)] = vals  # Llenar los valores. eje 2 = día.
 
                     # Combinar datos de etapas en las observaciones, si necesario.
                     for e, l_c in símismo.info_exps['combin_etps_obs'][exp][egr].items():
                         vals = datos['datos'][:, l_c, :]
                         matr_obs[:, e, :] += np.sum(vals, axis=1)
 
+                    if símismo.resumir:
+                        # En simulaciones resumidas, se valida directamente con el `Resumen` de las poblaciones, así
+                        # que no hay matrices de validación. Únicamente se guardan los pasos (posiblemente
+                        # fraccionales) de las observaciones.
+                        if egr == 'Pobs':
+                            d_preds_v[exp][egr] = símismo.dic_simul['d_predics_exps'][exp]['Resumen']
+                            d_pasos_obs[exp][egr] = np.divide(días, paso)
+                        continue
+
                     # Guardar el diccionario correspondiente de las predicciones en el diccionario de predicciones
                     # con vículos a la validación.
                     d_preds_v[exp][egr] = símismo.dic_simul['d_predics_exps'][exp][egr]
@@ -2149,25 +3077,18 @@ class Red(Simulable):
                     # Crear la matriz vacía para los datos de validación
                     d_valid[exp][egr] = np.empty((n_parc, n_rep_estoc, n_rep_parám, n_etps, n_días))
 
-                    # Los índices para convertir de matriz de predicción a matriz de validación
-                    días_ex = [d for d in días if d % paso == 0]
-                    días_inter = [d for d in días if d % paso != 0]
-
-                    í_p_ex = [d // paso for d in días_ex]  # Índices exactos (en la matriz pred)
-                    í_v_ex = [np.where(días == d)[0][0] for d in días_ex]  # Índices exactos (en la matriz valid)
-                    í_v_ínt = [i for i in range(n_días) if i not in í_v_ex]  # Índices para interpolar (matriz valid)
-                    í_p_ínt_0 = [mat.floor(d / paso) for d in días_inter]  # Índices interpol inferiores (matr pred)
-                    í_p_ínt_1 = [mat.ceil(d / paso) for d in días_inter]  # Índices interpol superiores (matr pred)
-                    pesos = [(d % paso) / paso for d in días_inter]  # La distancia de la interpolación
-
-                    índs = {'exactos': (í_v_ex, í_p_ex),
-                            'interpol': (í_v_ínt, í_p_ínt_0, í_p_ínt_1, pesos)}
-                    d_índs[exp][egr] = índs
+                    # El operador de observación para convertir de matriz de predicción a matriz de validación
+                    # (del tipo de las matrices de cálculo, porque los registros de conteos enteros se convierten
+                    # a este tipo antes de la validación)
+                    predic = símismo.dic_simul['d_predics_exps'][exp]
+                    d_índs[exp][egr] = gen_oper_obs(
+                        días, paso, n_pasos=predic[egr].shape[-1], tipo=predic['Pobs'].dtype
+                    )
 
         # Linearizar los diccionarios de validación y de predicciones vinculadas.
         símismo.dic_simul['d_l_m_valid'] = {'Normal': dic_a_lista(d_valid)}
         símismo.dic_simul['d_l_m_predics_v'] = {'Normal': dic_a_lista(d_preds_v)}
-        símismo.dic_simul['d_l_í_valid'] = {'Normal': dic_a_lista(d_índs, ll_f='exactos')}
+        símismo.dic_simul['d_l_í_valid'] = {'Normal': dic_a_lista(d_índs)}
 
         # Crear la lista completa de matrices de observaciones, para gráficos y análisis de sensibilidad
         l_m_preds_v = dic_a_lista(d_preds_v)
@@ -2263,8 +3184,9 @@ class Red(Simulable):
         # El número de etapas en la Red
         n_etapas = len(símismo.etapas)
 
-        # Vaciar los coeficientes existentes.
+        # Vaciar los coeficientes existentes (y el registro de parámetros, que se regenerará con los nuevos).
         símismo.coefs_act.clear()
+        símismo.registro_paráms = None
 
         # Para cada categoría de ecuación posible...
         for categ, dic_categ in Ec.ecs_orgs.items():
@@ -2455,9 +3377,58 @@ class Red(Simulable):
         # reproducciones. Si no me equivoco, accelerará de manera importante la ejecución del programa.
         símismo._prep_dists()
 
+        # Vincular el plan de cálculo con los coeficientes de esta simulación
+        símismo._vincular_plan()
+
         # Ahora, iniciar las poblaciones de organismos con poblaciones fijas
         símismo._inic_pobs_const()
 
+    def _prep_forzantes(símismo, extrn):
+        """
+        Calcula las ecuaciones que dependen únicamente del clima (edad por días grados, Brière, etc.; crecimiento y
+        muertes en función de la temperatura) para todos los pasos de la simulación a la vez, así que `_calc_edad()`,
+        `_calc_crec()` y `_calc_muertes()` solamente tienen que consultar el paso actual. Se debe llamar después de
+        `_vincular_plan()`.
+
+        :param extrn: El diccionario de datos externos de la simulación, con las temperaturas de cada parcela para cada
+        paso (de forma (parcela, paso)).
+        :type extrn: dict | None
+        """
+
+        planes = {'Edad': (símismo.plan['Edad']['Ecuación'], Nc.núcleos_edad_clima),
+                  'Crecimiento': (símismo.plan['Crecimiento']['Modif'], Nc.núcleos_crec_modif_clima),
+                  'Muertes': (símismo.plan['Muertes']['Ecuación'], Nc.núcleos_muertes_clima)}
+
+        símismo.tablas_clima = {categ: [None] * len(plan) for categ, (plan, _) in planes.items()}
+
+        ecs_clima = [(categ, tp_ec) for categ, (plan, núcleos) in planes.items()
+                     for tp_ec, núcleo, *_ in plan if núcleo in núcleos]
+        if not ecs_clima:
+            return
+
+        mnsj = 'Las ecuaciones {} necesitan datos de clima (ver `Experimento.agregar_clima()`).'.format(
+            ', '.join('"{}" ({})'.format(tp_ec, categ) for categ, tp_ec in ecs_clima))
+
+        if not extrn or 'temp_máx' not in extrn:
+            raise ValueError(mnsj)
+
+        # Los datos de clima se ponen de forma (paso, parcela, 1, 1, 1), así que los núcleos generan matrices de forma
+        # (paso, parcela, 1, repetición paramétrica, etapa), al difundirse con los coeficientes.
+        vars_clima = ['temp_máx', 'temp_mín', 'temp_prom', 'humedad']
+        clima = {ll: extrn[ll].T[..., np.newaxis, np.newaxis, np.newaxis] for ll in vars_clima if ll in extrn}
+
+        tipo = símismo.precisiones[símismo.precisión][0]
+        for categ, (plan, núcleos) in planes.items():
+            for n, (tp_ec, núcleo, í_etps, cf, _) in enumerate(plan):
+                if núcleo in núcleos:
+                    try:
+                        tabla = núcleo(cf, clima)
+                    except KeyError as e:
+                        if e.args[0] in vars_clima:
+                            raise ValueError(mnsj)
+                        raise
+                    símismo.tablas_clima[categ][n] = tabla.astype(tipo, copy=False)
+
     def _sacar_coefs_no_espec(símismo):
         """
         Una Red no tiene coeficientes.
@@ -2481,7 +3452,7 @@ class Red(Simulable):
             # Para cada tipo de distribución...
             for tp_dist, í_etps in símismo.ecs[categ]['Prob'].items():
 
-                if tp_dist not in ['Nada', 'Constante']:
+                if tp_dist in Nc.dists_cohortes:
                     # Si el tipo de distribución merece una distribución de SciPy...
 
                     # Los parámetros, numerizados, de la distribución
@@ -2501,10 +3472,17 @@ class Red(Simulable):
                     else:
                         raise ValueError('La distribución "{}" no tiene definición.'.format(tp_dist))
 
-                    # Guardar la distribución multidimensional en el diccionario de distribuciones.
-                    símismo.dists[corto][tp_dist] = Ds.dists[tp_dist]['scipy'](**paráms)
+                    # Guardar la distribución multidimensional en el diccionario de distribuciones, tabulada si así se
+                    # especificó.
+                    dist = Ds.dists[tp_dist]['scipy'](**paráms)
+                    if símismo.tol_fda is None:
+                        dist = Ds.FDAExacta(dist)
+                    else:
+                        dist = Ds.FDATabulada(dist, tol=símismo.tol_fda)
+                    símismo.dists[corto][tp_dist] = dist
 
-    def _trans_cohortes(símismo, cambio_edad, etps, dists, matr_egr, quitar=True):
+    @medir('Cohortes (transiciones)')
+    def _trans_cohortes(símismo, cambio_edad, etps, dists, matr_egr, quitar=True, í_etps_coh=None):
         """
         Esta funcion maneja transiciones (basadas en edades) desde cohortes.
 
@@ -2516,8 +3494,8 @@ class Red(Simulable):
         :param etps: Los índices de las etapas (en la lista de etapas de la Red) que estamos transicionando ahora.
         :type etps: list
 
-        :param dists: Una distribución con parámetros en forma de matrices.
-        :type dists: estad._distn_infrastructure.rv_frozen.
+        :param dists: La FDA de una distribución con parámetros en forma de matrices (exacta o tabulada).
+        :type dists: Ds.FDAExacta | Ds.FDATabulada
 
         :param matr_egr: Una matriz en la cual guardar los resultados.
         :type matr_egr: np.ndarray
@@ -2525,37 +3503,56 @@ class Red(Simulable):
         :param quitar: Si hay que quitar las etapas que transicionaron (útil para cálculos de reproducción).
         :type quitar: bool
 
+        :param í_etps_coh: Los índices de las etapas en la matriz de cohortes, si ya se calcularon (por ejemplo, en el
+        plan de cálculo de la Red).
+        :type í_etps_coh: np.ndarray
+
         """
 
         # Los índices (en la matriz de cohortes) de las etapas que transicionan.
-        í_etps_coh = [símismo.índices_cohortes.index(x) for x in etps]
+        if í_etps_coh is None:
+            í_etps_coh = [símismo.índices_cohortes.index(x) for x in etps]
+
+        # Las matrices de trabajo, para las etapas que transicionan
+        matrs = símismo.predics['Matrices']
+        cohortes = símismo.predics['Cohortes']
+        tmñ = cohortes['Pobs'].shape[:-1] + (len(í_etps_coh),)
+        edades, pobs, dens_cum_eds, probs, temp = (vista_trabajo(m, tmñ) for m in matrs['trab_cohs'])
+        másc = vista_trabajo(matrs['másc_cohs'], tmñ)
+        if isinstance(dists, Ds.FDATabulada):
+            trabajo_fda = (vista_trabajo(matrs['í_cohs'], tmñ), temp)
+        else:
+            trabajo_fda = (temp, másc)
 
         # Las edades y las poblaciones actuales de estas etapas.
-        edades = símismo.predics['Cohortes']['Edades'][..., í_etps_coh]
-        pobs = símismo.predics['Cohortes']['Pobs'][..., í_etps_coh]
+        np.take(cohortes['Edades'], í_etps_coh, axis=4, out=edades, mode='clip')
+        np.take(cohortes['Pobs'], í_etps_coh, axis=4, out=pobs, mode='clip')
 
-        # Calcualar la probabilidad de transición.
-        dens_cum_eds = dists.cdf(edades)
-        probs = np.divide(np.subtract(dists.cdf(edades + cambio_edad),
-                                      dens_cum_eds),
-                          np.subtract(1, dens_cum_eds)
-                          )
+        # Calcualar la probabilidad de transición. Las FDA se calculan directamente en las matrices de trabajo.
+        dists.cdf(edades, out=dens_cum_eds, trabajo=trabajo_fda)
 
-        probs[np.isnan(probs)] = 1
+        # Aplicar el cambio de edad.
+        edades += cambio_edad
+        cohortes['Edades'][..., í_etps_coh] = edades
 
-        # Calcular el número que transicionan.
-        n_cambian = np.floor(np.multiply(pobs, probs))
+        dists.cdf(edades, out=probs, trabajo=trabajo_fda)
+        np.subtract(probs, dens_cum_eds, out=probs)
+        np.divide(probs, np.subtract(1, dens_cum_eds, out=dens_cum_eds), out=probs)
 
-        # Aplicar el cambio de edad.
-        símismo.predics['Cohortes']['Edades'][..., í_etps_coh] += cambio_edad
+        np.copyto(probs, 1, where=np.isnan(probs, out=másc))
+
+        # Calcular el número que transicionan.
+        n_cambian = np.floor(np.multiply(pobs, probs, out=probs), out=probs)
 
         # Si hay que quitar las etapas que transicionario, hacerlo aquí.
         if quitar:
-            símismo.predics['Cohortes']['Pobs'][..., í_etps_coh] -= n_cambian
+            pobs -= n_cambian
+            cohortes['Pobs'][..., í_etps_coh] = pobs
 
         # Agregar las transiciones a la matriz de egresos.
         np.sum(n_cambian, axis=0, out=matr_egr)
 
+    @medir('Cohortes (añadir)')
     def _añadir_a_cohortes(símismo, nuevos, edad=0, dic_predic=None):
         """
         Esta función agrega nuevos miembros a un cohorte existente.
@@ -2590,39 +3587,46 @@ class Red(Simulable):
         # Para simplificar el código.
         matr_pobs = cohortes['Pobs']
         matr_eds = cohortes['Edades']
+        matrs = dic_predic['Matrices']
 
         # Limpiar edades de cohortes
-        matr_eds[matr_pobs == 0] = 0
+        másc = matrs['másc_cohs']
+        np.equal(matr_pobs, 0, out=másc)
+        np.copyto(matr_eds, 0, where=másc)
 
-        # Los índices de los días (eje 0) cuyos cohortes tienen la edad mínima. Si hay más que un día (cohorte) con la
-        # edad mínima, tomará el primero.
-        i_cohs = np.argmin(matr_eds, axis=0).ravel()
+        # Los índices (en las matrices de cohortes aplanadas) de los cohortes que tienen la edad mínima. Si hay más que
+        # un día (cohorte) con la edad mínima, tomará el primero.
+        í_mín = índs_cohorte_mín(matr_eds, out=matrs['mín_cohs'], base=matrs['base_cohs'], ejes=matrs['ejes_cohs'],
+                                 trabajo=(matrs['eds_mín_cohs'], másc, matrs['másc_cohs_2'], matrs['í_cohs']))
 
-        í_parc, í_estoc, í_parám, í_etps = dic_predic['Matrices']['í_ejes_cohs']
         # Las edades de los cohortes con las edades mínimas.
-        tmñ = dic_predic['Matrices']['tmñ_para_cohs']  # El tamaño de los cohortes, sin el eje de día
-        eds_mín = matr_eds[i_cohs, í_parc, í_estoc, í_parám, í_etps].reshape(tmñ)
+        eds_mín = np.take(matr_eds, í_mín, out=matrs['eds_mín_cohs'], mode='clip')
 
         # Las poblaciones que corresponden a estas edades mínimas.
-        pobs_coresp_í = matr_pobs[i_cohs, í_parc, í_estoc, í_parám, í_etps].reshape(tmñ)
+        pobs_coresp_í = np.take(matr_pobs, í_mín, out=matrs['pobs_mín_cohs'], mode='clip')
 
         # Dónde no hay población existente, reinicializamos la edad.
-        eds_mín = np.where(pobs_coresp_í == 0, [0], eds_mín)
+        np.copyto(eds_mín, 0, where=np.equal(pobs_coresp_í, 0, out=másc[0]))
 
         # Calcular el peso de las edades existentes, según sus poblaciones existentes (para combinar con el nuevo
         # cohorte si hay que combinarla con un cohorte existente).
-        peso_ed_ya = np.divide(pobs_coresp_í, np.add(nuevos, pobs_coresp_í))
-        peso_ed_ya[np.isnan(peso_ed_ya)] = 0
+        peso_ed_ya = np.add(nuevos, pobs_coresp_í, out=matrs['peso_cohs'])
+        np.divide(pobs_coresp_í, peso_ed_ya, out=peso_ed_ya)
+        np.copyto(peso_ed_ya, 0, where=np.isnan(peso_ed_ya, out=másc[0]))
 
-        # Los edades promedios. Si no había necesidad de combinar cohortes, será la población del nuevo cohorte.
-        eds_prom = np.add(np.multiply(eds_mín, peso_ed_ya), np.multiply(edad, np.subtract(1, peso_ed_ya)))
+        # Los edades promedios (eds_mín * peso_ed_ya + edad * (1 - peso_ed_ya)). Si no había necesidad de combinar
+        # cohortes, será la población del nuevo cohorte.
+        eds_prom = np.multiply(eds_mín, peso_ed_ya, out=eds_mín)
+        eds_prom += np.multiply(edad, np.subtract(1, peso_ed_ya, out=peso_ed_ya), out=peso_ed_ya)
 
         # Guardar las edades actualizadas en los índices apropiados
-        matr_eds[i_cohs, í_parc, í_estoc, í_parám, í_etps] = eds_prom.ravel()
+        np.put(matr_eds, í_mín, eds_prom)
 
         # Guardar las poblaciones actualizadas en los índices apropiados
-        matr_pobs[i_cohs, í_parc, í_estoc, í_parám, í_etps] += nuevos.ravel()
+        pobs_coresp_í += nuevos
+        np.put(matr_pobs, í_mín, pobs_coresp_í)
 
+    @medir('Cohortes (quitar)')
     def _quitar_de_cohortes(símismo, muertes, í_don=None, í_recip=None):
         """
         Esta funciôn quita individuos de los cohortes de la Red.
@@ -2643,24 +3647,47 @@ class Red(Simulable):
             # Para simplificar el código
             pobs = símismo.predics['Cohortes']['Pobs']
             edades = símismo.predics['Cohortes']['Edades']
+            matrs = símismo.predics['Matrices']
+            másc = matrs['másc_cohs']
 
-            muertes = muertes.copy()  # Para no afectar el parámetro que se pasó a la función
+            # Una copia, para no afectar el parámetro que se pasó a la función
+            np.copyto(matrs['muertes_cohs'], muertes)
+            muertes = matrs['muertes_cohs']
 
-            totales_pobs = np.sum(pobs, axis=0)
-            quitar = np.floor(np.divide(muertes, totales_pobs) * pobs)
-            quitar[np.isnan(quitar)] = 0
+            totales_pobs = np.sum(pobs, axis=0, out=matrs['tot_cohs'])
+            quitar = np.divide(muertes, totales_pobs, out=matrs['quitar_cohs'])
+            np.multiply(quitar, pobs, out=quitar)
+            np.floor(quitar, out=quitar)
+            np.isnan(quitar, out=másc)
+            np.copyto(quitar, 0, where=másc)
 
             np.subtract(pobs, quitar, out=pobs)
 
-            np.subtract(muertes, quitar.sum(axis=0), out=muertes)
+            np.subtract(muertes, np.sum(quitar, axis=0, out=totales_pobs), out=muertes)
+
+            presente = np.greater(pobs, 0, out=másc)
+            # La suma cumulativa se hace en una matriz de números, porque `cumsum()` copiaría la matriz booleana.
+            cum_presente = matrs['cum_cohs']
+            np.copyto(cum_presente, presente)
+            np.cumsum(cum_presente, axis=0, out=cum_presente)
+            quitar_2 = np.less_equal(cum_presente, muertes, out=matrs['másc_cohs_2'])
+            np.logical_and(presente, quitar_2, out=quitar_2)
 
-            cum_presente = np.cumsum(np.greater(pobs, 0), axis=0)
-            quitar_2 = np.where(np.logical_and(np.greater(pobs, 0), np.less_equal(cum_presente, muertes)), 1, 0)
+            # Los compartimientos de etapas con retraso distribuido pueden tener fracciones de individuos
+            quitar_2 = np.minimum(pobs, quitar_2, out=matrs['cum_cohs'])
 
             np.subtract(pobs, quitar_2, out=pobs)
 
             np.add(quitar_2, quitar, out=quitar)
 
+            if símismo.cohortes_retraso:
+                # Con fracciones, puede quedar un resto, que se quita en orden de compartimiento.
+                resto = np.subtract(muertes, np.sum(quitar_2, axis=0, out=totales_pobs), out=muertes)
+                antes = np.subtract(np.cumsum(pobs, axis=0, out=quitar_2), pobs, out=quitar_2)
+                quitar_3 = np.clip(np.subtract(resto, antes, out=antes), 0, pobs, out=antes)
+                np.subtract(pobs, quitar_3, out=pobs)
+                np.add(quitar_3, quitar, out=quitar)
+
             # Si transiciona a otro cohorte (de otra etapa), implementarlo aquí
             if í_recip is not None:
 
@@ -2672,15 +3699,105 @@ class Red(Simulable):
 
                 í_don_coh = [símismo.índices_cohortes.index(x) for x in í_don]
 
-                # Para cada cohorte...
-                for n_día in range(pobs.shape[0]):
-                    # Las edades de las etapas que se quitaron
-                    eds = edades[n_día, ...]
+                símismo._transferir_cohortes(quitar=quitar, í_don_coh=í_don_coh, í_recip_coh=í_recip_coh)
+
+    @medir('Cohortes (transferir)')
+    def _transferir_cohortes(símismo, quitar, í_don_coh, í_recip_coh):
+        """
+        Esta función transfiere los individuos quitados de los cohortes de unas etapas donantes a los cohortes de
+        etapas recipientes. Tal como con `_añadir_a_cohortes()`, los individuos quitados de cada cohorte se agregan,
+        en orden de cohorte, al cohorte más joven de la etapa recipiente, con la edad del cohorte del mismo índice de
+        la etapa recipiente.
+
+        Cada adición puede cambiar cuál cohorte es el más joven, así que las adiciones a una misma etapa y repetición
+        se hacen en orden. Pero cada vuelta hace, a la vez para todas las etapas recipientes, parcelas y repeticiones,
+        la próxima adición que les falta (buscada en todos los cohortes a la vez), así que el número de vueltas es el
+        número máximo de cohortes donantes con individuos quitados en una misma etapa y repetición (casi siempre
+        uno), y no el número de cohortes. Las operaciones no tocan las otras etapas.
+
+        :param quitar: Los individuos quitados de cada cohorte. Eje 0: Cohorte, Eje 1: Parcela, Eje 2: Repetición
+        estocástica, Eje 3: Repetición paramétrica, Eje 4: Etapa (en la matriz de cohortes).
+        :type quitar: np.ndarray
 
-                    # Cambiar el orden de las etapas para los cohortes recipientes
-                    nuevos = np.zeros_like(quitar[n_día])
-                    nuevos[..., í_recip_coh] = quitar[n_día][..., í_don_coh]
-                    símismo._añadir_a_cohortes(nuevos=nuevos, edad=eds)
+        :param í_don_coh: Los índices (en la matriz de cohortes) de las etapas donantes.
+        :type í_don_coh: list[int]
+
+        :param í_recip_coh: Los índices (en la matriz de cohortes) de las etapas recipientes, en el mismo orden que
+        `í_don_coh`.
+        :type í_recip_coh: list[int]
+
+        """
+
+        matrs = símismo.predics['Matrices']
+        cohortes = símismo.predics['Cohortes']
+
+        # Las matrices de trabajo, para las etapas recipientes
+        tmñ = quitar.shape[:-1] + (len(í_recip_coh),)
+        másc, másc_2 = (vista_trabajo(matrs[ll], tmñ) for ll in ['másc_cohs', 'másc_cohs_2'])
+        índs = vista_trabajo(matrs['í_cohs'], tmñ)
+        nuevos, edad, eds_mín, pobs_coresp_í, peso_ed_ya, í_mín, í_trans, base = (
+            vista_trabajo(matrs[ll], tmñ[1:]) for ll in
+            ['nuevos_cohs', 'edad_cohs', 'eds_mín_cohs', 'pobs_mín_cohs', 'peso_cohs', 'mín_cohs', 'trans_cohs',
+             'base_cohs']
+        )
+        activos = vista_trabajo(matrs['activos_cohs'], tmñ[1:])
+        ejes = matrs['ejes_cohs']
+        n_cohs = tmñ[0]
+
+        # Los individuos quitados de las etapas donantes, en el orden de las etapas recipientes. Se vuelven 0 a
+        # medida que se agregan.
+        trans = np.take(quitar, í_don_coh, axis=4, out=vista_trabajo(matrs['trab_cohs'][2], tmñ), mode='clip')
+
+        # Las poblaciones y las edades de las etapas recipientes
+        pobs = np.take(cohortes['Pobs'], í_recip_coh, axis=4, out=vista_trabajo(matrs['trab_cohs'][0], tmñ),
+                       mode='clip')
+        edades = np.take(cohortes['Edades'], í_recip_coh, axis=4, out=vista_trabajo(matrs['trab_cohs'][1], tmñ),
+                         mode='clip')
+
+        cambió = False
+        while True:
+            # El primer cohorte donante que todavía tiene individuos para agregar, para cada etapa y repetición (o
+            # `n_cohs` si ya no queda ninguno).
+            índs[:] = n_cohs
+            np.copyto(índs, ejes, where=np.greater(trans, 0, out=másc))
+            np.min(índs, axis=0, out=í_trans)
+            if not np.any(np.less(í_trans, n_cohs, out=activos)):
+                break
+            cambió = True
+
+            # Su índice en las matrices aplanadas. Donde ya no queda nada, se toma el último cohorte (donde `trans` es
+            # 0, así que no se agrega nada).
+            np.minimum(í_trans, n_cohs - 1, out=í_trans)
+            í_trans *= í_trans.size
+            í_trans += base
+            np.take(trans, í_trans, out=nuevos, mode='clip')
+            np.put(trans, í_trans, 0)
+
+            # Limpiar edades de cohortes vacíos
+            np.copyto(edades, 0, where=np.equal(pobs, 0, out=másc))
+
+            # La edad de los nuevos individuos es la del cohorte del mismo índice de la etapa recipiente
+            np.take(edades, í_trans, out=edad, mode='clip')
+
+            # El cohorte más joven (el primero, si hay más que uno), y su población y edad
+            índs_cohorte_mín(edades, out=í_mín, base=base, ejes=ejes, trabajo=(eds_mín, másc, másc_2, índs))
+            np.take(edades, í_mín, out=eds_mín, mode='clip')
+            np.take(pobs, í_mín, out=pobs_coresp_í, mode='clip')
+
+            # Combinar las edades, ponderadas por sus poblaciones
+            np.add(nuevos, pobs_coresp_í, out=peso_ed_ya)
+            np.divide(pobs_coresp_í, peso_ed_ya, out=peso_ed_ya)
+            np.copyto(peso_ed_ya, 0, where=np.isnan(peso_ed_ya, out=activos))
+            np.multiply(eds_mín, peso_ed_ya, out=eds_mín)
+            eds_mín += np.multiply(edad, np.subtract(1, peso_ed_ya, out=peso_ed_ya), out=peso_ed_ya)
+
+            np.put(edades, í_mín, eds_mín)
+            pobs_coresp_í += nuevos
+            np.put(pobs, í_mín, pobs_coresp_í)
+
+        if cambió:
+            cohortes['Pobs'][..., í_recip_coh] = pobs
+            cohortes['Edades'][..., í_recip_coh] = edades
 
     def _ajustar_cohortes(símismo, cambio):
         """
@@ -2692,9 +3809,11 @@ class Red(Simulable):
 
         """
 
+        matrs = símismo.predics['Matrices']
+
         # Detectar dónde el cambio es positivo y dónde es negativo
-        positivos = np.where(cambio > 0, cambio, [0])
-        negativos = np.where(cambio < 0, -cambio, [0])
+        positivos = np.maximum(cambio, 0, out=matrs['pos_cohs'])
+        negativos = np.negative(np.minimum(cambio, 0, out=matrs['neg_cohs']), out=matrs['neg_cohs'])
 
         # Agregar los positivos...
         símismo._añadir_a_cohortes(nuevos=positivos)
@@ -2703,7 +3822,8 @@ class Red(Simulable):
         símismo._quitar_de_cohortes(muertes=negativos)
 
     @staticmethod
-    def _gen_dic_matr_predic(n_parc, n_rep_estoc, n_rep_parám, n_etps, n_pasos, n_cohs, detalles, n_grupos_coh=10):
+    def _gen_dic_matr_predic(n_parc, n_rep_estoc, n_rep_parám, n_etps, n_pasos, n_cohs, detalles, n_grupos_coh=10,
+                             n_aristas=None, precisión='doble', resumir=False, directorio=None, registros=None):
         """
         Esta función genera un diccionario con matrices del tamaño apropiado para guardar las predicciones del modelo.
         Por usar una función auxiliar, se facilita la generación de matrices para simulaciones de muchos experimentos.
@@ -2729,39 +3849,83 @@ class Red(Simulable):
         :param n_grupos_coh: El número de categorías de edad distintas en cada cohorte.
         :type n_grupos_coh: int
 
+        :param n_aristas: El número de aristas (interacciones depredador-presa) de la red trófica, si se representa
+        la depredación por aristas. Si es `None`, la matriz de depredación tendrá un eje para el depredador y otro
+        para la presa.
+        :type n_aristas: int
+
+        :param precisión: La precisión numérica de las matrices (ver `Simulable.precisiones`).
+        :type precisión: str
+
+        :param resumir: Si la simulación guarda únicamente estadísticas resumidas de las poblaciones. En este caso, la
+        matriz de poblaciones tiene únicamente los dos últimos pasos, y las estadísticas se guardan en un `Resumen`.
+        :type resumir: bool
+
+        :param directorio: El directorio donde guardar las matrices con eje de tiempo (en archivos `.npy`, con
+        `np.memmap`), si hay. Si es `None`, todas las matrices se guardan en la memoria.
+        :type directorio: str
+
+        :param registros: Los egresos que se registran a cada paso, con los índices de su eje 3 (etapa, depredador o
+        arista) que se registran (`None` para todos) y el número de pasos entre registros (ver `_prep_registros()`).
+        Si es `None`, se registran todos los egresos completos si `detalles` es `True`, y ninguno si no.
+        :type registros: dict[str, dict]
+
         :return: Un diccionario del formato de símismo.predics según las especificaciones en los argumentos de la
         función.
         :rtype: dict
         """
 
+        if registros is None:
+            registros = {egr: {'índs': None, 'cada': 1} for egr in Red.egresos_registros} if detalles else {}
+
+        # El tipo de las matrices de cálculo y de los registros de conteos
+        tipo, tipo_conteos = Simulable.precisiones[precisión]
+
+        # Los ejes de la depredación (depredador y presa, o aristas)
+        ejes_depr = (n_etps, n_etps) if n_aristas is None else (n_aristas,)
+
         # Tamaño estándardes para matrices de resultados (algunos resultados tienen unas dimensiones adicionales).
-        if detalles:
-            tamaño_normal = (n_parc, n_rep_estoc, n_rep_parám, n_etps, n_pasos)
-            tamaño_pobs = tamaño_normal
-            tamaño_depr = (n_parc, n_rep_estoc, n_rep_parám, n_etps, n_etps, n_pasos)
-        else:
-            tamaño_normal = (n_parc, n_rep_estoc, n_rep_parám, n_etps)
-            tamaño_pobs = (n_parc, n_rep_estoc, n_rep_parám, n_etps, n_pasos)
-            tamaño_depr = (n_parc, n_rep_estoc, n_rep_parám, n_etps, n_etps)
+        tamaño_normal = (n_parc, n_rep_estoc, n_rep_parám, n_etps)
+        tamaño_depr = (n_parc, n_rep_estoc, n_rep_parám) + ejes_depr
+        tamaño_pobs = tamaño_normal + (2 if resumir else n_pasos,)
+        tamaño_edades = tamaño_normal
+
+        if directorio is not None and not os.path.isdir(directorio):
+            os.makedirs(directorio)
+
+        def gen_matr(egr, forma, tipo_matr):
+            # Los egresos que no se registran tienen únicamente la matriz de un paso. Los registrados tienen las
+            # etapas registradas y un eje de tiempo con los pasos registrados, y se pueden guardar en disco.
+            if egr not in registros:
+                return np.zeros(shape=forma, dtype=tipo)
 
-        tamaño_edades = (n_parc, n_rep_estoc, n_rep_parám, n_etps)
+            reg = registros[egr]
+            if reg['índs'] is not None:
+                forma = forma[:3] + (len(reg['índs']),) + forma[4:]
+            forma += ((n_pasos - 1) // reg['cada'] + 1,)
+
+            archivo = os.path.join(directorio, egr + '.npy') if directorio is not None else None
+            return gen_matr_predic(forma=forma, tipo=tipo_matr, archivo=archivo)
 
         # El diccionario en formato símismo.predics
-        dic = {'Pobs': np.zeros(shape=tamaño_pobs),
-               'Depredación': np.zeros(shape=tamaño_depr),
-               'Crecimiento': np.zeros(shape=tamaño_normal),
-               'Edades': np.zeros(shape=tamaño_edades),
-               'Reproducción': np.zeros(shape=tamaño_normal),
-               'Muertes': np.zeros(shape=tamaño_normal),
-               'Transiciones': np.zeros(shape=tamaño_normal),
-               'Movimiento': np.zeros(shape=tamaño_normal),
+        dic = {'Pobs': gen_matr_predic(
+                   forma=tamaño_pobs, tipo=tipo,
+                   archivo=os.path.join(directorio, 'Pobs.npy') if directorio is not None else None
+               ),
+               'Depredación': gen_matr('Depredación', tamaño_depr, tipo_conteos),
+               'Crecimiento': gen_matr('Crecimiento', tamaño_normal, tipo),
+               'Edades': np.zeros(shape=tamaño_edades, dtype=tipo),
+               'Reproducción': gen_matr('Reproducción', tamaño_normal, tipo_conteos),
+               'Muertes': gen_matr('Muertes', tamaño_normal, tipo_conteos),
+               'Transiciones': gen_matr('Transiciones', tamaño_normal, tipo_conteos),
+               'Movimiento': gen_matr('Movimiento', tamaño_normal, tipo),
                'Cohortes': {},
-               'Matrices': {
-                   'í_ejes_cohs': (),  # Para la función de agregar a cohortes.
-                   'tmñ_para_cohs': (n_parc, n_rep_estoc, n_rep_parám, n_cohs)  # Para la función de agregar a cohortes.
-               }  # Para guardar matrices para cálculos internos
+               'Matrices': {}  # Para guardar matrices para cálculos internos
                }
 
+        if resumir:
+            dic['Resumen'] = Resumen(forma=(n_parc, n_etps, n_pasos), n_valores=n_rep_estoc * n_rep_parám)
+
         # Agregar cohortes. Todas las matrices de cohortes tienen el mismo orden de eje:
         #   Eje 0: Cohorte
         #   Eje 1: Parcela
@@ -2775,18 +3939,11 @@ class Red(Simulable):
             cohortes = dic['Cohortes']
 
             # Generar la matriz de poblaciones para todas las etapas con cohortes
-            cohortes['Pobs'] = np.zeros(shape=(n_grupos_coh, n_parc, n_rep_estoc, n_rep_parám, n_cohs))
+            cohortes['Pobs'] = np.zeros(shape=(n_grupos_coh, n_parc, n_rep_estoc, n_rep_parám, n_cohs), dtype=tipo)
 
             # ...y generar la matriz de edades
-            cohortes['Edades'] = np.zeros(shape=(n_grupos_coh, n_parc, n_rep_estoc, n_rep_parám, n_cohs))
-
-            í_ejes_cohs = (np.repeat(range(n_parc), n_rep_estoc * n_rep_parám * n_cohs),
-                           np.tile(np.repeat(range(n_rep_estoc), n_rep_parám * n_cohs), [n_parc]),
-                           np.tile(np.repeat(range(n_rep_parám), n_cohs), [n_parc * n_rep_estoc]),
-                           np.tile(range(n_cohs), [n_parc * n_rep_estoc * n_rep_parám])
-                           )
-
-            dic['Matrices']['í_ejes_cohs'] = í_ejes_cohs
+            cohortes['Edades'] = np.zeros(shape=(n_grupos_coh, n_parc, n_rep_estoc, n_rep_parám, n_cohs),
+                                          dtype=tipo)
 
         # Ahora agregamos matrices para cálculos
 
@@ -2817,129 +3974,112 @@ class Red(Simulable):
 
 
 # Funciones auxiliares
-def días_grados(mín, máx, umbrales, método='Triangular', corte='Horizontal'):
+def vista_trabajo(matr, forma):
     """
-    Esta función calcula los días grados basados en vectores de temperaturas mínimas y máximas diarias.
-    Información sobre los métodos utilizados aquí se puede encontrar en:
-    http://www.ipm.ucdavis.edu/WEATHER/ddconcepts.html
-
-    :param mín:
-    :type mín: float
-    :param máx:
-    :type máx: float
-    :param umbrales:
-    :type umbrales: tuple
-    :param método:
-    :type método: str
-    :param corte:
-    :type corte: str
-    :return: número de días grados (número entero)
-    :rtype: int
+    Devuelve una vista contigua, de la forma dada, del principio de una matriz de trabajo (contigua) más grande. Así,
+    una misma matriz de trabajo sirve para cálculos con números diferentes de etapas.
+
+    :param matr: La matriz de trabajo.
+    :type matr: np.ndarray
+
+    :param forma: La forma de la vista. No puede tener más elementos que `matr`.
+    :type forma: tuple
+
+    :return: La vista.
+    :rtype: np.ndarray
     """
 
-    if método == 'Triangular':
-        # Método triangular único
-        sup_arriba = max(12 * (máx - umbrales[1]) ** 2 / (máx - mín), 0) / 24
-        sup_centro = max(12 * (umbrales[1] - umbrales[0]) ** 2 / (umbrales[1] - mín), 0) / 24
-        sup_lados = max(24 * (máx - umbrales[1]) * (umbrales[1 - umbrales[0]]) / (máx - mín), 0) / 24
-
-    elif método == 'Sinusoidal':
-        # Método sinusoidal único
-        # NOTA: Probablemente lleno de bogues
-        amp = (máx - mín) / 2
-        prom = (máx + mín) / 2
-        if umbrales[1] >= máx:
-            intersect_máx = 0
-            sup_arriba = 0
-        else:
-            intersect_máx = 24 * mat.acos((umbrales[1] - prom) / amp)
-            sup_arriba = 2 * (intersect_máx * (prom - máx) + 2 * mat.pi / 24 * mat.sin(2 * mat.pi / 24 * intersect_máx))
+    return matr.reshape(-1)[:int(np.prod(forma))].reshape(forma)
 
-        if umbrales[0] <= mín:
-            intersect_mín = intersect_máx
-        else:
-            intersect_mín = 24 * mat.acos((umbrales[0] - prom) / amp)
 
-        sup_centro = 2 * intersect_máx * (máx - mín)
-        sup_lados = 2 * (2 * mat.pi / 24 * mat.sin(2 * mat.pi / 24 * intersect_mín) -
-                         2 * mat.pi / 24 * mat.sin(2 * mat.pi / 24 * intersect_máx) +
-                         (intersect_mín - intersect_máx) * (umbrales[0] - prom)
-                         )
+def hash_contenido(d):
+    """
+    Genera un hash barato del contenido de un diccionario (por ejemplo, la estructura de la receta de un organismo),
+    para notar cambios que no pasaron por `Organismo.actualizar()`.
 
-    else:
-        raise ValueError
+    :param d: El diccionario.
+    :type d: dict
 
-    if corte == 'Horizontal':
-        días_grd = sup_centro + sup_lados
-    elif corte == 'Intermediario':
-        días_grd = sup_centro + sup_lados - sup_arriba
-    elif corte == 'Vertical':
-        días_grd = sup_lados
-    elif corte == 'Ninguno':
-        días_grd = sup_lados + sup_centro + sup_arriba
-    else:
-        raise ValueError
+    :return: El hash.
+    :rtype: int
+    """
 
-    return días_grd
+    return hash(json.dumps(d, sort_keys=True, ensure_ascii=False, default=str))
 
 
-def probs_conj(matr, eje, pesos=1, máx=1):
+def índs_cohorte_mín(edades, out, base, ejes, trabajo):
     """
-    Esta función utiliza las reglas de probabilidades conjuntas para ajustar depredación con presas o depredadores
-    múltiples cuya suma podría sumar más que el total de presas o la capacidad del depredador.
+    Calcula, para cada etapa y repetición, el índice del cohorte (eje 0) de edad mínima, como índice en la matriz de
+    edades aplanada (para usar con `np.take()` y `np.put()`). Si hay más que un cohorte con la edad mínima, toma el
+    primero, tal como `np.argmin()` (que no usamos porque copia toda la matriz para calcular en el eje 0).
 
-    :param matr: Una matriz con los valores para ajustar.
-    :type matr: np.ndarray
+    :param edades: La matriz (contigua) de edades de los cohortes.
+    :type edades: np.ndarray
 
-    :param eje: El eje según cual hay que hacer los ajustes
-    :type eje: int
+    :param out: La matriz de enteros (`np.intp`) para los índices, de la forma de `edades` sin el eje 0.
+    :type out: np.ndarray
 
-    :param pesos: Un peso inverso opcional para aplicar a la matriz ántes de hacer los cálculos.
-    :type pesos: float | int | np.ndarray
+    :param base: Los índices de los elementos de `out` en `out` aplanada (`np.arange(out.size)`, con la forma de
+    `out`).
+    :type base: np.ndarray
 
-    :param máx: Una matriz o número con los valores máximos para la matriz para ajustar. Si es matriz, debe ser de
-    tamaño compatible con matr.
-    :type máx: float | int | np.ndarray
+    :param ejes: Los índices de los cohortes (`np.arange(edades.shape[0])`), con ejes de tamaño 1 para los otros ejes
+    de `edades`.
+    :type ejes: np.ndarray
 
+    :param trabajo: Matrices de trabajo: una de la forma de `out`, dos booleanas y una de enteros (`np.intp`) de la
+    forma de `edades`.
+    :type trabajo: (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+
+    :return: Los índices, en `out`.
+    :rtype: np.ndarray
     """
 
-    if not isinstance(máx, np.ndarray):
-        tamaño = list(matr.shape)
-        tamaño.pop(eje)
-        máx = np.full(tuple(tamaño), máx)
+    mín, másc, másc_2, índs = trabajo
+    np.min(edades, axis=0, out=mín)
 
-    ajustados = np.divide(matr, pesos)
+    # Los cohortes con la edad mínima. Tal como `np.argmin()`, se toma el primer NaN si hay (y entonces `mín` es NaN).
+    np.equal(edades, mín, out=másc)
+    másc |= np.isnan(edades, out=másc_2)
 
-    ratio = np.divide(ajustados, np.expand_dims(máx, eje))
+    # El primero de estos cohortes
+    índs[:] = edades.shape[0]
+    np.copyto(índs, ejes, where=másc)
+    np.min(índs, axis=0, out=out)
 
-    np.multiply(
-        np.expand_dims(
-            np.divide(
-                np.subtract(
-                    1,
-                    np.product(
-                        np.subtract(1,
-                                    np.where(np.isnan(ratio), [0], ratio)
-                                    ), axis=eje
-                    )
-                ),
-                np.nansum(ratio, axis=eje)
-            ),
-            axis=eje),
-        ajustados,
-        out=ajustados)
+    out *= out.size
+    out += base
+    return out
 
-    ajustados[np.isnan(ajustados)] = 0
 
-    suma = np.sum(ajustados, axis=eje)
-    extra = np.where(suma > máx, suma - máx, [0])
+# No necesario ahora. Pero es un código muy bonito y elegante así que me da pena borrarlo y lo dejo por el momento.
+def vista_apilada(apilada, matr, parcs, eje):
+    """
+    Copia una matriz en su lugar en una matriz apilada (de varios experimentos) y devuelve la vista correspondiente.
 
-    np.multiply(ajustados, np.expand_dims(np.subtract(1, np.divide(extra, suma)), axis=eje), out=ajustados)
+    :param apilada: La matriz apilada.
+    :type apilada: np.ndarray
 
-    np.multiply(ajustados, pesos, out=matr)
+    :param matr: La matriz de un experimento. Salvo en el eje de parcelas, no puede ser más grande que la apilada.
+    :type matr: np.ndarray
+
+    :param parcs: Las parcelas del experimento en la matriz apilada.
+    :type parcs: slice
+
+    :param eje: El eje de las parcelas.
+    :type eje: int
+
+    :return: La vista de la matriz apilada.
+    :rtype: np.ndarray
+    """
+
+    índs = tuple(parcs if j == eje else slice(n) for j, n in enumerate(matr.shape))
+    vista = apilada[índs]
+    vista[:] = matr
+
+    return vista
 
 
-# No necesario ahora. Pero es un código muy bonito y elegante así que me da pena borrarlo y lo dejo por el momento.
 def copiar_dic_refs(d, c=None):
     """
     Esta función copia un diccionario pero deja las referencias a matrices y variables PyMC intactos. Esto permite
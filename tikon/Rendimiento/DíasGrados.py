@@ -0,0 +1,85 @@
+"""
+Compara el cálculo de días grados (`Núcleos.días_grados()`) a cada paso de la simulación con su cálculo para toda la
+simulación de una vez (tal como en `Red._prep_forzantes()`), para cada método y tipo de corte. Con la tabla de toda la
+simulación, cada paso solamente tiene que copiar los días grados del paso actual en la matriz de edades (consulta).
+
+    python -m tikon.Rendimiento.DíasGrados
+"""
+
+import time
+
+import numpy as np
+
+import tikon.RAE.Núcleos as Nc
+
+# El número de pasos (días) y de parcelas, y la forma de los umbrales (repetición paramétrica, etapa)
+n_pasos = 365
+n_parc = 5
+forma_umbrales = (100, 10)
+
+# El número de veces que se repite cada medida (se guarda la más rápida)
+n_medidas = 5
+
+
+def medir(f, n_med=n_medidas):
+    """
+    Mide el tiempo de una función.
+
+    :param f: La función.
+    :type f: callable
+
+    :param n_med: El número de medidas.
+    :type n_med: int
+
+    :return: El tiempo más rápido, en segundos.
+    :rtype: float
+    """
+
+    tiempos = []
+    for _ in range(n_med):
+        inic = time.perf_counter()
+        f()
+        tiempos.append(time.perf_counter() - inic)
+    return min(tiempos)
+
+
+if __name__ == '__main__':
+    gen = np.random.default_rng(0)
+
+    # Temperaturas de forma (parcela, paso), como en los datos externos de una simulación
+    temp_mín = gen.uniform(10, 20, size=(n_parc, n_pasos))
+    temp_máx = temp_mín + gen.uniform(0, 15, size=(n_parc, n_pasos))
+    umbrales = (gen.uniform(8, 12, size=forma_umbrales), gen.uniform(28, 32, size=forma_umbrales))
+
+    # Para toda la simulación, las temperaturas se ponen de forma (paso, parcela, 1, 1, 1)
+    mín_temporada = temp_mín.T[..., np.newaxis, np.newaxis, np.newaxis]
+    máx_temporada = temp_máx.T[..., np.newaxis, np.newaxis, np.newaxis]
+
+    print('Días grados, {} pasos, {} parcelas, umbrales {}\n'.format(n_pasos, n_parc, forma_umbrales))
+    print('\t{:<12}{:<16}{:>14}{:>14}{:>14}'.format('Método', 'Corte', 'Por paso', 'Tabla', 'Consulta'))
+
+    # La matriz de edades de la simulación (parcela, repetición estocástica, repetición paramétrica, etapa)
+    edades = np.empty((n_parc, 1) + forma_umbrales)
+
+    for método in ['Triangular', 'Sinusoidal']:
+        for corte in ['Horizontal', 'Intermediario', 'Vertical', 'Ninguno']:
+            def por_paso():
+                for i in range(n_pasos):
+                    Nc.días_grados(temp_mín[:, i, np.newaxis, np.newaxis, np.newaxis],
+                                   temp_máx[:, i, np.newaxis, np.newaxis, np.newaxis],
+                                   umbrales=umbrales, método=método, corte=corte)
+
+            def temporada():
+                return Nc.días_grados(mín_temporada, máx_temporada, umbrales=umbrales, método=método, corte=corte)
+
+            tabla = temporada()
+
+            def consulta():
+                for i in range(n_pasos):
+                    edades[:] = tabla[i]
+
+            t_paso = medir(por_paso)
+            t_tabla = medir(temporada)
+            t_consulta = medir(consulta)
+            print('\t{:<12}{:<16}{:>12.1f}ms{:>12.1f}ms{:>12.1f}ms'.format(
+                método, corte, t_paso * 1000, t_tabla * 1000, t_consulta * 1000))
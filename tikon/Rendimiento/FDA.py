@@ -0,0 +1,118 @@
+"""
+Compara las funciones de distribución acumulada (FDA) tabuladas (`Distribuciones.FDATabulada`) con las de SciPy, para
+cada familia de distribuciones de las transiciones y reproducciones por cohortes (`Núcleos.dists_cohortes`), y para
+distribuciones Gamma y LogNormal estrechas (desviación estándar pequeña en comparación con su escala o su promedio),
+cuyas tablas deben concentrar sus puntos en una pequeña parte de su malla. Para cada caso y cada tolerancia, se
+reporta el error absoluto máximo, el número de intervalos de las tablas, la memoria de las tablas, el tiempo para
+construirlas y el tiempo de una evaluación de la FDA en una matriz del tamaño de la matriz de cohortes de una
+simulación típica.
+
+    python -m tikon.Rendimiento.FDA
+"""
+
+import time
+
+import numpy as np
+
+import tikon.Matemáticas.Distribuciones as Ds
+import tikon.RAE.Núcleos as Nc
+
+# La forma de los parámetros (repetición paramétrica, etapa) y de las edades (cohorte, parcela, repetición
+# estocástica, repetición paramétrica, etapa)
+forma_paráms = (100, 10)
+forma_edades = (10, 1, 100) + forma_paráms
+
+# Los casos para comparar (nombre, familia de distribuciones)
+casos = [(tp, tp) for tp in Nc.dists_cohortes] + [('Gamma estrecha', 'Gamma'), ('LogNormal estrecha', 'LogNormal')]
+
+# Las tolerancias para comparar
+tolerancias = [1e-3, 1e-4, 1e-5]
+
+# El número de veces que se repite cada medida (se guarda la más rápida)
+n_medidas = 5
+
+
+def gen_paráms(caso, generador):
+    """
+    Genera parámetros aleatorios para un caso de distribuciones, en el formato de SciPy.
+
+    :param caso: El caso (una familia de distribuciones, o una familia con distribuciones estrechas).
+    :type caso: str
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: Los parámetros.
+    :rtype: dict
+    """
+
+    def unif(mín, máx):
+        return generador.uniform(mín, máx, size=forma_paráms)
+
+    if caso == 'Normal':
+        return dict(loc=unif(5, 20), scale=unif(1, 5))
+    elif caso == 'Triang':
+        return dict(loc=unif(0, 5), scale=unif(5, 20), c=unif(0, 1))
+    elif caso == 'Cauchy':
+        return dict(loc=unif(5, 20), scale=unif(1, 5))
+    elif caso == 'Gamma':
+        return dict(loc=unif(0, 5), scale=unif(1, 5), a=unif(1, 10))
+    elif caso == 'T':
+        return dict(loc=unif(5, 20), scale=unif(1, 5), df=unif(1, 30))
+    elif caso == 'Gamma estrecha':
+        # Promedios de 10 a 30 con desviaciones estándares de 0.5 a 2 (parámetros de forma de 25 a 3600)
+        prom = unif(10, 30)
+        de = unif(0.5, 2)
+        return dict(loc=np.zeros(forma_paráms), scale=de ** 2 / prom, a=(prom / de) ** 2)
+    elif caso == 'LogNormal estrecha':
+        return dict(loc=np.zeros(forma_paráms), scale=unif(10, 30), s=unif(0.01, 0.1))
+    else:
+        raise ValueError('El caso "{}" no tiene definición.'.format(caso))
+
+
+def medir(f, n_med=n_medidas):
+    """
+    Mide el tiempo de una función.
+
+    :param f: La función.
+    :type f: callable
+
+    :param n_med: El número de medidas.
+    :type n_med: int
+
+    :return: El tiempo más rápido, en segundos.
+    :rtype: float
+    """
+
+    tiempos = []
+    for _ in range(n_med):
+        inic = time.perf_counter()
+        f()
+        tiempos.append(time.perf_counter() - inic)
+    return min(tiempos)
+
+
+if __name__ == '__main__':
+    gen = np.random.default_rng(0)
+    edades = gen.uniform(0, 40, size=forma_edades)
+
+    print('FDA tabuladas, parámetros {}, edades {}\n'.format(forma_paráms, forma_edades))
+    print('\t{:<20}{:>10}{:>12}{:>14}{:>12}{:>12}{:>12}{:>10}'.format(
+        'Dist', 'Tol', 'Error', 'Intervalos', 'Memoria', 'Constr.', 'Eval.', 'Acel.'))
+
+    for nombre, tp in casos:
+        dist = Ds.dists[tp]['scipy'](**gen_paráms(nombre, gen))
+        exacta = dist.cdf(edades)
+        t_scipy = medir(lambda: dist.cdf(edades))
+        print('\t{:<20}{:>10}{:>12}{:>14}{:>12}{:>12}{:>10.1f}ms{:>10}'.format(
+            nombre, 'SciPy', '', '', '', '', t_scipy * 1000, ''))
+
+        for tol in tolerancias:
+            t_constr = medir(lambda: Ds.FDATabulada(dist, tol=tol), n_med=1)
+            tabla = Ds.FDATabulada(dist, tol=tol)
+            error = np.max(np.abs(tabla.cdf(edades) - exacta))
+            t_tabla = medir(lambda: tabla.cdf(edades))
+            print('\t{:<20}{:>10.0e}{:>12.2e}{:>7d}-{:<6d}{:>10.1f}Mb{:>10.1f}ms{:>10.1f}ms{:>10.1f}'.format(
+                '', tol, error, tabla.n_intrv.min(), tabla.n_intrv.max(),
+                (tabla.tabla.nbytes + tabla.pendientes.nbytes) / 1e6, t_constr * 1000, t_tabla * 1000,
+                t_scipy / t_tabla))
@@ -0,0 +1,119 @@
+"""
+Mide el tiempo que toma cada paso de simulación de la red de Opisina arenosella (con sus dos parasitoides y sus etapas
+fantasmas). Con pocas repeticiones, el tiempo de cada paso se debe casi únicamente al costo de Python (escoger las
+ecuaciones, llamar las funciones, etc.) y no a los cálculos de NumPy; con muchas repeticiones, se mide el costo de los
+cálculos sí mismos.
+
+Para comparar dos versiones de Tiko'n, correr este módulo con cada versión:
+    python -m tikon.Rendimiento.Pasos
+
+Tiempos medidos (milisegundos por paso, un procesador), antes y después del plan de ecuaciones precompilado de
+`Red.incrementar()`:
+
+    Repeticiones (estoc. x parám.)    Antes    Con el plan
+                1 x 1                 1.967       1.040
+               10 x 10                8.542       5.800
+               50 x 50              256.270     251.026
+
+Con pocas repeticiones, el plan quita la mayor parte del costo de escoger las ecuaciones a cada paso (1.5 a 1.9 veces
+más rápido). Con 50 x 50 repeticiones, los cálculos de NumPy dominan y el plan sólo cambia el tiempo en un 2%.
+"""
+
+import os
+import time
+
+from tikon.Matemáticas.Experimentos import Experimento
+from tikon.Proyectos.Opisina_arenosella.Red_Opisina import gen_red
+
+# Las combinaciones de repeticiones (estocásticas, paramétricas) para medir
+repeticiones = [(1, 1), (10, 10), (50, 50)]
+
+# El número de días para simular
+tiempo_final = 100
+
+# El número de veces que se repite cada medida (se guarda la más rápida)
+n_medidas = 5
+
+dir_datos = os.path.join(os.path.split(__file__)[0], '..', 'Proyectos', 'Opisina_arenosella')
+
+
+def gen_red_opisina():
+    """
+    Genera la red de Opisina arenosella, conectada con los datos del Sitio A.
+
+    :return: La Red y el Experimento.
+    :rtype: (tikon.RAE.RedAE.Red, Experimento)
+    """
+
+    red = gen_red(nombre='Red coco rendimiento')
+    red.organismos['Coco'].estimar_densidad(rango=(38, 42), certidumbre=0.95)
+
+    exper = Experimento(nombre='Sitio A', proyecto=red.proyecto)
+    exper.agregar_pobs(archivo=os.path.join(dir_datos, 'Oarenosella_A.csv'), col_tiempo='Día',
+                       factor=655757.1429 / 500)
+    red.añadir_exp(exper, corresp={'O. arenosella': {'juvenil_1': ['Estado 1'],
+                                                     'juvenil_2': ['Estado 2'],
+                                                     'juvenil_3': ['Estado 3'],
+                                                     'juvenil_4': ['Estado 4'],
+                                                     'juvenil_5': ['Estado 5'],
+                                                     'pupa': ['Pupa']},
+                                   'Parasitoide larvas': {'juvenil': ['Para_larva_abs']},
+                                   'Parasitoide pupas': {'juvenil': ['Para_pupa_abs']}})
+
+    return red, exper
+
+
+def medir_pasos(red, exper, n_rep_estoc, n_rep_parám, t_final=tiempo_final, n_med=n_medidas):
+    """
+    Mide el tiempo promedio de un paso de simulación.
+
+    :param red: La Red para simular.
+    :type red: tikon.RAE.RedAE.Red
+
+    :param exper: El Experimento para simular.
+    :type exper: Experimento
+
+    :param n_rep_estoc: El número de repeticiones estocásticas.
+    :type n_rep_estoc: int
+
+    :param n_rep_parám: El número de repeticiones paramétricas.
+    :type n_rep_parám: int
+
+    :param t_final: El número de días para simular.
+    :type t_final: int
+
+    :param n_med: El número de veces que se repite la medida.
+    :type n_med: int
+
+    :return: El tiempo (en segundos) del paso promedio de la medida más rápida.
+    :rtype: float
+    """
+
+    # Una simulación completa para preparar las matrices de predicciones y los coeficientes de la Red.
+    red.simular(exper=exper, nombre='Rendimiento pasos', n_rep_parám=n_rep_parám, n_rep_estoc=n_rep_estoc,
+                tiempo_final=t_final, usar_especificadas=True, detalles=False, dibujar=False, dib_dists=False)
+
+    extrn = red._prep_args_simul_exps(exper=[exper.nombre], paso=1, tiempo_final={exper.nombre: t_final})['extrn']
+    n_pasos = red.predics['Pobs'].shape[-1]
+
+    mejor = None
+    for _ in range(n_med):
+        antes = time.perf_counter()
+        for i in range(1, n_pasos):
+            red.incrementar(paso=1, i=i, detalles=False, extrn=extrn[exper.nombre])
+        t = (time.perf_counter() - antes) / (n_pasos - 1)
+
+        if mejor is None or t < mejor:
+            mejor = t
+
+    return mejor
+
+
+if __name__ == '__main__':
+    Red_coco, Exper = gen_red_opisina()
+
+    print('Tiempo por paso de simulación, red de O. arenosella ({} etapas)\n'.format(len(Red_coco.etapas)))
+    print('\t{:>8}{:>8}{:>16}'.format('Estoc', 'Parám', 'ms / paso'))
+    for n_estoc, n_parám in repeticiones:
+        t_paso = medir_pasos(red=Red_coco, exper=Exper, n_rep_estoc=n_estoc, n_rep_parám=n_parám)
+        print('\t{:>8}{:>8}{:>16.3f}'.format(n_estoc, n_parám, t_paso * 1000))
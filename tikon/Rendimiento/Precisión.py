@@ -0,0 +1,125 @@
+"""
+Compara los resultados de simulaciones de la red de Opisina arenosella con las distintas precisiones numéricas de las
+matrices de predicciones (ver `Simulable.precisiones`). Para cada precisión, se simula con la misma semilla aleatoria
+y se comparan estadísticas resumidas de las poblaciones de cada etapa (promedio, desviación estándar y percentiles
+entre repeticiones) con las de la precisión doble, tanto como la memoria usada por las matrices de predicciones.
+
+Con precisiones reducidas, las diferencias de redondeo cambian los resultados de los tiros aleatorios, así que las
+repeticiones individuales no son idénticas; lo que importa es que las estadísticas resumidas sean comparables.
+
+    python -m tikon.Rendimiento.Precisión
+"""
+
+import numpy as np
+
+from tikon.Coso import Simulable
+from tikon.Rendimiento.Pasos import gen_red_opisina
+
+# El número de repeticiones (estocásticas y paramétricas)
+n_rep = 30
+
+# El número de días para simular
+tiempo_final = 100
+
+# La semilla aleatoria, para que todas las precisiones usen los mismos valores de parámetros
+semilla = 0
+
+# Los percentiles para comparar
+percentiles = [5, 50, 95]
+
+
+def memoria_predics(d):
+    """
+    Calcula la memoria usada por las matrices de un diccionario de predicciones.
+
+    :param d: El diccionario de predicciones.
+    :type d: dict
+
+    :return: El número de bytes.
+    :rtype: int
+    """
+
+    tot = 0
+    for v in d.values():
+        if isinstance(v, dict):
+            tot += memoria_predics(v)
+        elif isinstance(v, np.ndarray):
+            tot += v.nbytes
+
+    return tot
+
+
+def simular_precisión(red, exper, precisión, detalles=True):
+    """
+    Simula la red con una precisión dada.
+
+    :param red: La Red.
+    :type red: tikon.RAE.RedAE.Red
+
+    :param exper: El Experimento.
+    :type exper: tikon.Matemáticas.Experimentos.Experimento
+
+    :param precisión: La precisión (ver `Simulable.precisiones`).
+    :type precisión: str
+
+    :param detalles: Si hay que guardar los egresos detallados de cada paso.
+    :type detalles: bool
+
+    :return: Las estadísticas resumidas de las poblaciones (cada una con eje 0 = etapa, eje 1 = tiempo), y la memoria
+    usada por las matrices de predicciones.
+    :rtype: (dict[str, np.ndarray], int)
+    """
+
+    np.random.seed(semilla)
+    red.simular(exper=exper, nombre='Rendimiento precisión', n_rep_parám=n_rep, n_rep_estoc=n_rep,
+                tiempo_final=tiempo_final, usar_especificadas=True, detalles=detalles, dibujar=False,
+                dib_dists=False, precisión=precisión)
+
+    # Eje 0: parcela, 1: rep estoc, 2: rep parám, 3: etapa, 4: día. Se calculan las estadísticas en doble precisión.
+    pobs = red.predics['Pobs'].astype(np.float64)
+    pobs = pobs.reshape((-1, *pobs.shape[3:]))
+
+    stats = {'Promedio': pobs.mean(axis=0), 'Desv. est.': pobs.std(axis=0)}
+    for p, v in zip(percentiles, np.percentile(pobs, percentiles, axis=0)):
+        stats['Percentil {}'.format(p)] = v
+
+    return stats, memoria_predics(red.predics)
+
+
+def comparar_stats(ref, otras):
+    """
+    Calcula la diferencia relativa entre dos conjuntos de estadísticas, ponderada por la magnitud de las poblaciones
+    de referencia (para que etapas casi vacías no dominen los resultados).
+
+    :param ref: Las estadísticas de referencia.
+    :type ref: dict[str, np.ndarray]
+
+    :param otras: Las estadísticas para comparar.
+    :type otras: dict[str, np.ndarray]
+
+    :return: La diferencia relativa, por estadística.
+    :rtype: dict[str, float]
+    """
+
+    return {st: np.sum(np.abs(otras[st] - v)) / np.sum(np.abs(v)) if np.sum(np.abs(v)) else 0.
+            for st, v in ref.items()}
+
+
+if __name__ == '__main__':
+    Red_coco, Exper = gen_red_opisina()
+
+    res = {prec: simular_precisión(Red_coco, Exper, precisión=prec) for prec in Simulable.precisiones}
+    stats_ref, mem_ref = res['doble']
+
+    print('Precisiones de simulación, red de O. arenosella ({} etapas, {} x {} repeticiones)\n'
+          .format(len(Red_coco.etapas), n_rep, n_rep))
+
+    print('\t{:<10}{:>12}{:>10}'.format('Precisión', 'Memoria', 'Relativa'))
+    for prec, (_, mem) in res.items():
+        print('\t{:<10}{:>10.1f}Mb{:>10.2f}'.format(prec, mem / 1e6, mem / mem_ref))
+
+    print('\nDiferencia relativa con la precisión doble\n')
+    print('\t{:<16}'.format('Estadística') + ''.join('{:>12}'.format(prec) for prec in res))
+    difs = {prec: comparar_stats(stats_ref, stats) for prec, (stats, _) in res.items()}
+    for st in stats_ref:
+        print('\t{:<16}'.format(st) + ''.join('{:>12.4f}'.format(difs[prec][st]) for prec in res))
@@ -0,0 +1,121 @@
+"""
+Mide el tiempo y la memoria temporaria de una llamada al ajuste por probabilidades conjuntas (`Núcleos.probs_conj()` y
+`Núcleos.probs_conj_aristas()`), con matrices de depredación del tamaño de las de una simulación, con y sin matrices de
+trabajo. La memoria se mide con `tracemalloc` (que también registra las matrices de NumPy).
+
+Para comparar dos versiones de Tiko'n, correr este módulo con cada versión:
+    python -m tikon.Rendimiento.ProbsConj
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+import tikon.RAE.Núcleos as Nc
+
+# Las combinaciones de (número de etapas, repeticiones estocásticas y paramétricas) para medir
+tamaños = [(20, 10), (20, 50), (100, 10)]
+
+# La fracción de pares de etapas que interactúan
+densidad = 0.1
+
+# El número de veces que se repite cada medida (se guarda la más rápida)
+n_medidas = 10
+
+
+def gen_depred(n_etps, n_rep, generador):
+    """
+    Genera una matriz densa de depredación aleatoria y las poblaciones correspondientes.
+
+    :param n_etps: El número de etapas.
+    :type n_etps: int
+
+    :param n_rep: El número de repeticiones estocásticas y paramétricas.
+    :type n_rep: int
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: La matriz de depredación (eje 3: depredador, eje 4: presa), las poblaciones, y las presas y depredadores
+    de cada arista.
+    :rtype: (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+    """
+
+    pobs = generador.integers(0, 1000, size=(1, n_rep, n_rep, n_etps)).astype(float)
+    presa, depred = np.nonzero(generador.uniform(size=(n_etps, n_etps)) < densidad)
+    matr = np.zeros((1, n_rep, n_rep, n_etps, n_etps))
+    matr[..., depred, presa] = generador.uniform(0, 1, size=(1, n_rep, n_rep, len(presa))) * pobs[..., presa]
+
+    return matr, pobs, presa, depred
+
+
+def medir(f, matr, n_med=n_medidas):
+    """
+    Mide el tiempo y la memoria temporaria de una función que ajusta una matriz.
+
+    :param f: La función, que recibe la matriz para ajustar.
+    :type f: callable
+
+    :param matr: La matriz. No se modifica.
+    :type matr: np.ndarray
+
+    :param n_med: El número de medidas.
+    :type n_med: int
+
+    :return: El tiempo más rápido, en segundos, y la memoria máxima, en bytes.
+    :rtype: (float, int)
+    """
+
+    copia = matr.copy()
+    tiempos = []
+    for _ in range(n_med):
+        np.copyto(copia, matr)
+        inic = time.perf_counter()
+        f(copia)
+        tiempos.append(time.perf_counter() - inic)
+
+    np.copyto(copia, matr)
+    tracemalloc.start()
+    f(copia)
+    _, máx = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(tiempos), máx
+
+
+if __name__ == '__main__':
+    gen = np.random.default_rng(0)
+
+    print('Probabilidades conjuntas (densidad de interacciones {})\n'.format(densidad))
+    print('\t{:<8}{:>8}{:>10}{:<24}{:>12}{:>14}'.format('Etapas', 'Reps', 'Aristas', '  Versión', 'Tiempo', 'Memoria'))
+
+    for n_etps, n_rep in tamaños:
+        depred, pobs, presa, depred_arst = gen_depred(n_etps, n_rep, gen)
+        aristas = depred[..., depred_arst, presa]
+        grupos = Nc.gen_grupos_aristas(presa)
+        máx_arst = pobs[..., presa]
+
+        # Las matrices de trabajo, tal como en `Red._gen_matrs_trabajo()`
+        trabajo = np.empty_like(depred)
+        trabajo_eje = np.empty((2,) + depred.shape[:3] + (1, n_etps))
+        trabajo_arst = np.empty((2,) + aristas.shape)
+        trabajo_grupos = np.empty((2,) + aristas.shape[:-1] + (len(grupos[1]),))
+
+        versiones = {
+            'densa': (lambda m: Nc.probs_conj(m, eje=3, máx=pobs), depred),
+            'densa, con trabajo': (
+                lambda m: Nc.probs_conj(m, eje=3, máx=pobs, trabajo=trabajo, trabajo_eje=trabajo_eje), depred
+            ),
+            'aristas': (lambda m: Nc.probs_conj_aristas(m, grupos=grupos, máx=máx_arst), aristas),
+            'aristas, con trabajo': (
+                lambda m: Nc.probs_conj_aristas(m, grupos=grupos, máx=máx_arst, trabajo=trabajo_arst,
+                                                trabajo_grupos=trabajo_grupos),
+                aristas
+            )
+        }
+
+        for versión, (f, matr) in versiones.items():
+            t, mem = medir(f, matr)
+            print('\t{:<8}{:>8}{:>10}  {:<22}{:>10.2f}ms{:>12.2f}Mb'.format(
+                n_etps, n_rep, len(presa), versión, t * 1000, mem / 1e6))
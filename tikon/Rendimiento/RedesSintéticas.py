@@ -0,0 +1,398 @@
+"""
+Genera redes agroecológicas sintéticas (y sus datos de experimentos) para estudiar cómo el costo de Tiko'n crece con
+el tamaño de la red. Las redes se construyen con las subclases de `Insecto` (`Sencillo`, `MetamCompleta`,
+`Parasitoide` y `Esfécido`) según un modelo de cascada: los insectos se ordenan al azar y cada uno solamente puede
+comer, parasitar o capturar a las plantas o a los insectos que lo preceden, así que la red no tiene ciclos tróficos.
+
+    red = gen_red_sintética(n_orgs=50, frac_parasitoides=0.3, ecs=ecs_variadas, semilla=1)
+    exper = gen_exper(red, directorio='Datos sintéticos', n_parc=5, n_días=365)
+    red.simular(exper=exper, nombre='Prueba', n_rep_parám=10, n_rep_estoc=10)
+
+`tikon.Rendimiento.Suite` usa estas redes (con los nombres "Sintética <n_orgs>") para medir el tiempo, la memoria y el
+costo de calibración en función del tamaño de la red.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+import tikon.RAE.Insecto as Ins
+import tikon.RAE.Planta as Plt
+from tikon.Matemáticas import Ecuaciones as Ec
+from tikon.Matemáticas.Experimentos import Experimento
+from tikon.RAE.RedAE import Red
+
+# Tipos de ecuaciones para redes heterogéneas. Para cada etapa cuya ecuación de la categoría no es 'Nada', se escoge
+# una de estas opciones al azar.
+ecs_variadas = {
+    'Depredación': {'Ecuación': ['Kovai', 'Tipo II_Dependiente presa', 'Tipo II_Dependiente ratio',
+                                 'Beddington-DeAngelis', 'Tipo II_Hassell-Varley']},
+    'Edad': {'Ecuación': ['Días', 'Días grados']},
+    'Transiciones': {'Prob': ['Normal', 'Gamma', 'Triang']}
+}
+
+# El rango de la densidad de las plantas
+densidad_plantas = (0.95e6, 1.05e6)
+
+
+def gen_red_sintética(n_orgs=10, n_plantas=1, juveniles=(1, 3), n_presas=2, frac_parasitoides=0.2,
+                      frac_esfécidos=0.0, frac_sencillos=0.2, ecs=None, semilla=0, nombre=None,
+                      proyecto='Sintético'):
+    """
+    Genera una red sintética. Los insectos que no son parasitoides ni esfécidos son de tipo `MetamCompleta`, con un
+    número de etapas juveniles al azar. El primer insecto siempre es de vida libre (`MetamCompleta`, si hay) y se come
+    únicamente a las plantas. Cada parasitoide tiene un solo huésped de tipo `MetamCompleta` (la Red no maneja
+    parasitoides con varios huéspedes, ni huéspedes sin ecuación de edad), pero un huésped puede tener varios
+    parasitoides.
+
+    :param n_orgs: El número de insectos.
+    :type n_orgs: int
+
+    :param n_plantas: El número de plantas.
+    :type n_plantas: int
+
+    :param juveniles: El número mínimo y máximo de etapas juveniles de los insectos `MetamCompleta`.
+    :type juveniles: tuple[int, int]
+
+    :param n_presas: El número promedio de presas de cada insecto (o de cada esfécido).
+    :type n_presas: float
+
+    :param frac_parasitoides: La fracción de los insectos que son parasitoides.
+    :type frac_parasitoides: float
+
+    :param frac_esfécidos: La fracción de los insectos que son esfécidos.
+    :type frac_esfécidos: float
+
+    :param frac_sencillos: La fracción de los insectos que son de tipo `Sencillo`.
+    :type frac_sencillos: float
+
+    :param ecs: Las opciones de tipos de ecuaciones, con el formato {categoría: {subcategoría: [opción, ...]}} (ver
+      `ecs_variadas`). Si es `None`, se guardan las ecuaciones por defecto de cada tipo de insecto.
+    :type ecs: dict
+
+    :param semilla: La semilla del generador aleatorio.
+    :type semilla: int
+
+    :param nombre: El nombre de la Red.
+    :type nombre: str
+
+    :param proyecto: El proyecto de la Red y de sus organismos.
+    :type proyecto: str
+
+    :return: La Red.
+    :rtype: Red
+    """
+
+    n_parás = int(round(frac_parasitoides * n_orgs))
+    n_esféc = int(round(frac_esfécidos * n_orgs))
+    n_senc = int(round(frac_sencillos * n_orgs))
+    n_metam = n_orgs - n_parás - n_esféc - n_senc
+
+    if n_plantas < 1:
+        raise ValueError('Se necesita por lo menos una planta.')
+    if n_presas < 1:
+        raise ValueError('El número promedio de presas debe ser por lo menos 1.')
+    if not 1 <= juveniles[0] <= juveniles[1]:
+        raise ValueError('Los números de etapas juveniles {} no son válidos.'.format(juveniles))
+    if n_metam < 0:
+        raise ValueError('La suma de las fracciones de tipos de insectos no puede ser más que 1.')
+    if n_orgs and not n_metam + n_senc:
+        raise ValueError('Se necesita por lo menos un insecto de vida libre (Sencillo o MetamCompleta).')
+    if n_parás and not n_metam:
+        raise ValueError('Los parasitoides necesitan por lo menos un huésped de tipo MetamCompleta.')
+
+    if ecs is not None:
+        for categ, dic_categ in ecs.items():
+            for sub_categ, opciones in dic_categ.items():
+                for opción in opciones:
+                    if opción not in Ec.ecs_orgs[categ][sub_categ]:
+                        raise ValueError('El tipo de ecuación "{}" para {} en {} no está definido en Tiko\'n.'
+                                         .format(opción, sub_categ, categ))
+
+    generador = np.random.default_rng(semilla)
+
+    # Ordenar los tipos de insectos al azar, con un insecto de vida libre primero
+    tipos = np.array(['Sencillo'] * n_senc + ['MetamCompleta'] * n_metam + ['Parasitoide'] * n_parás +
+                     ['Esfécido'] * n_esféc)
+    generador.shuffle(tipos)
+    if n_orgs:
+        prim = np.flatnonzero(tipos == ('MetamCompleta' if n_metam else 'Sencillo'))[0]
+        tipos[[0, prim]] = tipos[[prim, 0]]
+
+    plantas = []
+    for i in range(n_plantas):
+        planta = Plt.Hojas('Planta {}'.format(i + 1), proyecto=proyecto)
+        planta.estimar_densidad(rango=densidad_plantas, certidumbre=0.95)
+        plantas.append(planta)
+
+    insectos = []
+    for i, tipo in enumerate(tipos):
+        nombre_ins = '{} {}'.format(tipo, i + 1)
+        libres = [x for x in insectos if type(x) in (Ins.Sencillo, Ins.MetamCompleta)]
+
+        if tipo == 'Parasitoide':
+            insecto = Ins.Parasitoide(nombre_ins, proyecto=proyecto, pupa=bool(generador.random() < 0.5))
+            huéspedes = [x for x in libres if isinstance(x, Ins.MetamCompleta)]
+            huésped = huéspedes[generador.integers(len(huéspedes))]
+            insecto.parasita(huésped, *_etps_huésped(huésped, generador))
+
+        elif tipo == 'Esfécido':
+            insecto = Ins.Esfécido(nombre_ins, proyecto=proyecto)
+            for presa in _escoger(libres, n_presas, generador):
+                insecto.captura(presa, etps_víc=_etps_presa(presa, generador))
+
+        else:
+            if tipo == 'Sencillo':
+                insecto = Ins.Sencillo(nombre_ins, proyecto=proyecto)
+                etps_depred = None
+            else:
+                njuvenil = int(generador.integers(juveniles[0], juveniles[1] + 1))
+                insecto = Ins.MetamCompleta(nombre_ins, proyecto=proyecto, njuvenil=njuvenil)
+                etps_depred = 'juvenil'
+
+            # El primer insecto solamente se come a las plantas
+            for presa in _escoger(plantas + insectos, n_presas, generador) if insectos else plantas:
+                etps_presa = None if isinstance(presa, Plt.Planta) else _etps_presa(presa, generador)
+                insecto.secome(presa, etps_presa=etps_presa, etps_depred=etps_depred)
+
+        if ecs is not None:
+            for etp in insecto.etapas:
+                for categ, dic_categ in ecs.items():
+                    for sub_categ, opciones in dic_categ.items():
+                        if etp['ecs'][categ][sub_categ] != 'Nada':
+                            insecto.aplicar_ecuación(
+                                etapa=etp['nombre'], tipo_ec={categ: {sub_categ: str(generador.choice(opciones))}}
+                            )
+
+        insectos.append(insecto)
+
+    if nombre is None:
+        nombre = 'Red sintética {}'.format(n_orgs)
+
+    return Red(nombre=nombre, proyecto=proyecto, organismos=plantas + insectos)
+
+
+def _escoger(organismos, n_presas, generador):
+    """
+    Escoge al azar las presas de un insecto. El número de presas sigue una distribución de Poisson
+    (más 1) con promedio `n_presas`.
+
+    :param organismos: Las presas posibles.
+    :type organismos: list[tikon.RAE.Organismo.Organismo]
+
+    :param n_presas: El número promedio de presas.
+    :type n_presas: float
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: Las presas escogidas.
+    :rtype: list[tikon.RAE.Organismo.Organismo]
+    """
+
+    n = min(len(organismos), 1 + generador.poisson(n_presas - 1))
+    return [organismos[i] for i in generador.choice(len(organismos), size=n, replace=False)]
+
+
+def _etps_presa(presa, generador):
+    """
+    Escoge al azar las etapas de una presa que se pueden comer. De los parasitoides, únicamente se pueden comer los
+    adultos (las otras etapas viven adentro de sus huéspedes).
+
+    :param presa: La presa.
+    :type presa: Ins.Insecto
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: Los nombres de las etapas.
+    :rtype: list[str]
+    """
+
+    if isinstance(presa, Ins.Parasitoide):
+        return ['adulto']
+
+    etps = [e['nombre'] for e in presa.etapas]
+    n = generador.integers(1, len(etps) + 1)
+    return [etps[i] for i in sorted(generador.choice(len(etps), size=n, replace=False))]
+
+
+def _etps_huésped(huésped, generador):
+    """
+    Escoge al azar las etapas de un huésped que un parasitoide infecta (etapas juveniles consecutivas) y la etapa de
+    la cual sale el parasitoide (la última etapa infectada o una de las que le siguen, hasta la pupa).
+
+    :param huésped: El huésped.
+    :type huésped: Ins.MetamCompleta
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: Las etapas infectadas y la etapa de la cual sale el parasitoide.
+    :rtype: (list[str], str)
+    """
+
+    juvs = [e['nombre'] for e in huésped.etapas if 'juvenil' in e['nombre']]
+    n = generador.integers(1, len(juvs) + 1)
+    inic = generador.integers(0, len(juvs) - n + 1)
+    etps_sale = juvs[inic + n - 1:] + ['pupa']
+    return juvs[inic:inic + n], str(generador.choice(etps_sale))
+
+
+def tamaño_red(red):
+    """
+    Calcula las medidas del tamaño de una Red: su número de organismos, de etapas, de vínculos tróficos (entre
+    etapas de depredadores, parasitoides o esfécidos y etapas de sus víctimas) y de parámetros para calibrar.
+
+    :param red: La Red.
+    :type red: Red
+
+    :return: Las medidas.
+    :rtype: dict
+    """
+
+    orgs = list(red.organismos.values())
+    n_vínculos = 0
+    for org in orgs:
+        for dic_etp in org.config.values():
+            n_vínculos += sum(len(etps) for etps in dic_etp['presa'].values())
+            n_vínculos += sum(len(dic_h['entra']) for dic_h in dic_etp['huésped'].values())
+
+    red.actualizar()
+    return {
+        'n_orgs': len(orgs),
+        'n_etapas': sum(len(org.etapas) for org in orgs),
+        'n_vínculos': n_vínculos,
+        'n_paráms': len(red._gen_lista_coefs_interés_todos()[0])
+    }
+
+
+def gen_obs(red, n_parc, n_días, directorio, generador, intervalo=7):
+    """
+    Genera una base de datos (en formato CSV) de observaciones sintéticas de todas las etapas de los insectos de una
+    Red (menos las etapas de parasitoides que viven adentro de sus huéspedes), para cada parcela. Cada organismo tiene
+    una densidad de base al azar (entre 100 y 10000) que sigue una caminata aleatoria log-normal en el tiempo.
+
+    :param red: La Red.
+    :type red: Red
+
+    :param n_parc: El número de parcelas.
+    :type n_parc: int
+
+    :param n_días: El último día.
+    :type n_días: int
+
+    :param directorio: El directorio donde guardar la base de datos.
+    :type directorio: str
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :param intervalo: El número de días entre observaciones.
+    :type intervalo: int
+
+    :return: El archivo de la base de datos y la correspondencia entre sus columnas y las etapas de la Red (para
+      `Red.añadir_exp()`).
+    :rtype: (str, dict)
+    """
+
+    corresp = {}
+    base = []
+    for org in red.organismos.values():
+        if isinstance(org, Plt.Planta):
+            continue
+        escala = 10 ** generador.uniform(2, 4)
+        for etp in org.etapas:
+            if isinstance(org, Ins.Parasitoide) and etp['nombre'] != 'adulto':
+                continue
+            col = '{} {}'.format(org.nombre, etp['nombre'])
+            corresp.setdefault(org.nombre, {})[etp['nombre']] = [col]
+            base.append(escala * generador.uniform(0.5, 1.5))
+
+    cols = [c for dic_org in corresp.values() for l_cols in dic_org.values() for c in l_cols]
+    días = np.arange(0, n_días + 1, intervalo)
+
+    archivo = os.path.join(directorio, 'Observaciones.csv')
+    with open(archivo, 'w', newline='') as d:
+        escritor = csv.writer(d)
+        escritor.writerow(['Parcela', 'Día'] + cols)
+        for p in range(n_parc):
+            caminata = np.cumsum(generador.normal(0, 0.2, size=(días.size, len(cols))), axis=0)
+            obs = np.round(np.array(base) * generador.uniform(0.8, 1.2) * np.exp(caminata))
+            for día, fila in zip(días, obs):
+                escritor.writerow(['Parcela {:03d}'.format(p), día] + [int(x) for x in fila])
+
+    return archivo, corresp
+
+
+def gen_clima(n_días, directorio, generador):
+    """
+    Genera una base de datos de clima (temperaturas máximas y mínimas diarias, con un ciclo anual) para todas las
+    parcelas.
+
+    :param n_días: El último día.
+    :type n_días: int
+
+    :param directorio: El directorio donde guardar la base de datos.
+    :type directorio: str
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: El archivo de la base de datos.
+    :rtype: str
+    """
+
+    días = np.arange(n_días + 1)
+    temp_mín = 17 + 3 * np.sin(2 * np.pi * días / 365) + generador.normal(0, 1, size=días.size)
+    temp_máx = temp_mín + generador.uniform(8, 15, size=días.size)
+
+    archivo = os.path.join(directorio, 'Clima.csv')
+    with open(archivo, 'w', newline='') as d:
+        escritor = csv.writer(d)
+        escritor.writerow(['Día', 'Temp máx', 'Temp mín'])
+        escritor.writerows(zip(días, temp_máx, temp_mín))
+
+    return archivo
+
+
+def gen_exper(red, directorio, n_parc=1, n_días=100, semilla=0, nombre='Sintético'):
+    """
+    Genera un Experimento sintético (observaciones y clima) para una Red, y lo conecta con la Red.
+
+    :param red: La Red.
+    :type red: Red
+
+    :param directorio: El directorio donde guardar las bases de datos del Experimento.
+    :type directorio: str
+
+    :param n_parc: El número de parcelas.
+    :type n_parc: int
+
+    :param n_días: El último día.
+    :type n_días: int
+
+    :param semilla: La semilla del generador aleatorio.
+    :type semilla: int
+
+    :param nombre: El nombre del Experimento.
+    :type nombre: str
+
+    :return: El Experimento.
+    :rtype: Experimento
+    """
+
+    if not os.path.isdir(directorio):
+        os.makedirs(directorio)
+
+    generador = np.random.default_rng(semilla)
+    archivo_obs, corresp = gen_obs(red, n_parc=n_parc, n_días=n_días, directorio=directorio, generador=generador)
+    archivo_clima = gen_clima(n_días, directorio=directorio, generador=generador)
+
+    exper = Experimento(nombre=nombre, proyecto=red.proyecto)
+    exper.agregar_pobs(archivo=archivo_obs, col_tiempo='Día', col_parc='Parcela')
+    exper.agregar_clima(archivo=archivo_clima, col_tiempo='Día', col_temp_máx='Temp máx', col_temp_mín='Temp mín')
+    red.añadir_exp(exper, corresp=corresp)
+
+    return exper
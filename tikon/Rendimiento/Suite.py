@@ -0,0 +1,701 @@
+"""
+Conjunto de pruebas de rendimiento de las operaciones principales de Tiko'n con las redes de los proyectos incluidos:
+simulación (`Red.simular()`), validación (`Red.validar()`), una iteración de calibración (la función que llama el
+modelo de calibración de `Red.calibrar()` a cada iteración), análisis de sensibilidad (`Red.sensibilidad()`), lectura
+de observaciones de experimentos en formato CSV (`Experimento.agregar_pobs()`) y guardar y cargar recetas
+(`Coso.guardar()` y `Coso.cargar()`).
+
+Cada carga de trabajo se mide para cada configuración de red, número de repeticiones (estocásticas y paramétricas),
+número de parcelas y número de días. Las observaciones (y el clima, para las redes que lo necesitan) de cada
+configuración se generan repitiendo las observaciones del proyecto de la red para cada parcela y hasta el último día.
+Para cada medida se guarda el tiempo más rápido de `n_medidas` corridas y la memoria máxima (con `tracemalloc`, en una
+corrida aparte, porque frena los cálculos).
+
+Además de las redes de los proyectos, se pueden medir redes sintéticas de cualquier tamaño (ver `RedesSintéticas`), con
+los nombres "Sintética <número de insectos>". Cada resultado guarda el tamaño de su red (organismos, etapas, vínculos
+tróficos y parámetros), para poder graficar el tiempo por día de simulación, la memoria y el costo de una iteración de
+calibración en función del tamaño de la red:
+
+    python -m tikon.Rendimiento.Suite --cargas simular calibrar --tamaños 10 20 40 80 --gráfico Escala.png
+
+Los resultados se guardan en un archivo JSON en `Resultados/` con el nombre de la versión de git actual, para poder
+comparar las versiones después:
+
+    python -m tikon.Rendimiento.Suite
+    python -m tikon.Rendimiento.Suite --cargas simular validar --redes Opisina --reps 5 20 --parcelas 1 --días 100
+    python -m tikon.Rendimiento.Suite --comparar Resultados/a1b2c3d.json Resultados/e4f5g6h.json
+    python -m tikon.Rendimiento.Suite --gráfico Escala.png --resultados Resultados/a1b2c3d.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from datetime import datetime as ft
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg as TelaFigura
+from matplotlib.figure import Figure as Figura
+
+import tikon
+import tikon.RAE.Insecto as Ins
+import tikon.RAE.Planta as Plt
+from tikon.Instrumentación import Instrumentación
+from tikon.Matemáticas import Incert
+from tikon.Matemáticas.Experimentos import Experimento
+from tikon.Proyectos.Opisina_arenosella.Red_Opisina import gen_red
+from tikon.RAE.RedAE import Red
+from tikon.Rendimiento import RedesSintéticas as RS
+
+# Las configuraciones que se miden automáticamente
+configuraciones = [
+    {'red': 'Opisina', 'n_rep': 5, 'n_parc': 1, 'n_días': 100},
+    {'red': 'Opisina', 'n_rep': 20, 'n_parc': 1, 'n_días': 100},
+    {'red': 'Opisina', 'n_rep': 5, 'n_parc': 5, 'n_días': 100},
+    {'red': 'Opisina', 'n_rep': 5, 'n_parc': 1, 'n_días': 365},
+    {'red': 'Opisina araña', 'n_rep': 5, 'n_parc': 1, 'n_días': 100},
+    {'red': 'Café', 'n_rep': 5, 'n_parc': 1, 'n_días': 365},
+    {'red': 'Sintética 10', 'n_rep': 5, 'n_parc': 1, 'n_días': 100},
+    {'red': 'Sintética 40', 'n_rep': 5, 'n_parc': 1, 'n_días': 100},
+]
+
+# El número de veces que se repite cada medida de tiempo (se guarda la más rápida)
+n_medidas = 3
+
+# El método y el número de muestras de los análisis de sensibilidad
+método_sensib = 'Morris'
+n_sensib = 2
+
+# El cambio relativo de tiempo o de memoria a partir del cual una comparación se marca como regresión
+umbral = 0.1
+
+# El prefijo de los nombres de las redes sintéticas
+prefijo_sintética = 'Sintética '
+
+dir_proyectos = os.path.join(os.path.split(__file__)[0], '..', 'Proyectos')
+dir_resultados = os.path.join(os.path.split(__file__)[0], 'Resultados')
+
+
+def gen_red_opisina(araña=False):
+    """
+    Genera la red de Opisina arenosella (con sus dos parasitoides y, opcionalmente, una araña).
+
+    :param araña: Si hay que incluir la araña.
+    :type araña: bool
+
+    :return: La Red.
+    :rtype: Red
+    """
+
+    red = gen_red(nombre='Red coco rendimiento', araña=araña)
+    red.organismos['Coco'].estimar_densidad(rango=(38, 42), certidumbre=0.95)
+    return red
+
+
+def gen_red_café():
+    """
+    Genera la red de Leucoptera coffeella (con su parasitoide), con edades por días grados.
+
+    :return: La Red.
+    :rtype: Red
+    """
+
+    proyecto = os.path.join('Café', 'Leucoptera_coffeella')
+
+    café = Plt.Hojas('Café', proyecto=proyecto)
+    café.estimar_densidad(rango=(38000e6, 42000e6), certidumbre=0.95)
+
+    l_coffeella = Ins.MetamCompleta('L. coffeella', proyecto=proyecto, njuvenil=1)
+    l_coffeella.secome(café, etps_depred='juvenil')
+
+    parasitoide = Ins.Parasitoide('Parasitoide larvas', proyecto=proyecto)
+    parasitoide.parasita(l_coffeella, etps_infec=['juvenil'], etp_sale='juvenil')
+
+    for org in [l_coffeella, parasitoide]:
+        for etp in org.etapas:
+            org.aplicar_ecuación(etapa=etp['nombre'], tipo_ec={'Edad': {'Ecuación': 'Días grados'}})
+
+    return Red(nombre='Café rendimiento', organismos=[l_coffeella, parasitoide, café], proyecto=proyecto)
+
+
+# Las redes disponibles, con su función de generación, las observaciones de su proyecto (archivo, factor y
+# correspondencia con las etapas de la red) y si necesitan datos de clima
+redes = {
+    'Opisina': {
+        'gen': gen_red_opisina,
+        'datos': os.path.join(dir_proyectos, 'Opisina_arenosella', 'Oarenosella_A.csv'),
+        'factor': 655757.1429 / 500,
+        'corresp': {'O. arenosella': {'juvenil_1': ['Estado 1'],
+                                      'juvenil_2': ['Estado 2'],
+                                      'juvenil_3': ['Estado 3'],
+                                      'juvenil_4': ['Estado 4'],
+                                      'juvenil_5': ['Estado 5'],
+                                      'pupa': ['Pupa']},
+                    'Parasitoide larvas': {'juvenil': ['Para_larva_abs']},
+                    'Parasitoide pupas': {'juvenil': ['Para_pupa_abs']}},
+        'clima': False
+    },
+    'Opisina araña': {
+        'gen': lambda: gen_red_opisina(araña=True),
+        'datos': os.path.join(dir_proyectos, 'Opisina_arenosella', 'Oarenosella_A.csv'),
+        'factor': 655757.1429 / 500,
+        'corresp': {'O. arenosella': {'juvenil_1': ['Estado 1'],
+                                      'juvenil_2': ['Estado 2'],
+                                      'juvenil_3': ['Estado 3'],
+                                      'juvenil_4': ['Estado 4'],
+                                      'juvenil_5': ['Estado 5'],
+                                      'pupa': ['Pupa']},
+                    'Parasitoide larvas': {'juvenil': ['Para_larva_abs']},
+                    'Parasitoide pupas': {'juvenil': ['Para_pupa_abs']}},
+        'clima': False
+    },
+    'Café': {
+        'gen': gen_red_café,
+        'datos': os.path.join(dir_proyectos, 'Café', 'Leucoptera_coffeella', 'Suconusco_Chiapas.csv'),
+        'factor': 900 * 1000,
+        'corresp': {'L. coffeella': {'juvenil': ['Juvenil']},
+                    'Parasitoide larvas': {'juvenil': ['Para_larva']}},
+        'clima': True
+    }
+}
+
+
+def obt_info_red(nombre):
+    """
+    Devuelve la información de una red: de `redes`, o de una red sintética si el nombre es "Sintética <n>". Las
+    redes sintéticas tienen ecuaciones variadas, una semilla fija (la misma red para cada versión de Tiko'n) y
+    generan sus propias observaciones (con `RedesSintéticas.gen_obs()`), así que no tienen archivo de datos ni
+    correspondencia.
+
+    :param nombre: El nombre de la red.
+    :type nombre: str
+
+    :return: La información de la red.
+    :rtype: dict
+    """
+
+    if nombre in redes:
+        return redes[nombre]
+
+    n_orgs = nombre[len(prefijo_sintética):]
+    if not nombre.startswith(prefijo_sintética) or not n_orgs.isdigit():
+        raise ValueError('Red "{}" no reconocida. Debe ser una de: {}, o "{}<n>".'.format(
+            nombre, ', '.join(redes), prefijo_sintética))
+
+    return {
+        'gen': lambda: RS.gen_red_sintética(n_orgs=int(n_orgs), ecs=RS.ecs_variadas, semilla=0, nombre=nombre),
+        'datos': None,
+        'factor': 1,
+        'corresp': None,
+        'clima': True
+    }
+
+
+def gen_datos(archivo, n_parc, n_días, directorio, generador):
+    """
+    Genera una base de datos de observaciones (en formato CSV) de varias parcelas a partir de la base de datos de una
+    parcela de un proyecto. Las observaciones se repiten en el tiempo hasta el último día, y se multiplican por un
+    factor aleatorio (entre 0.8 y 1.2) para cada parcela.
+
+    :param archivo: La base de datos del proyecto. La primera columna debe ser el día.
+    :type archivo: str
+
+    :param n_parc: El número de parcelas.
+    :type n_parc: int
+
+    :param n_días: El último día.
+    :type n_días: int
+
+    :param directorio: El directorio donde guardar la nueva base de datos.
+    :type directorio: str
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :return: El archivo de la nueva base de datos.
+    :rtype: str
+    """
+
+    # Los nombres de columnas de los proyectos no siempre están en UTF-8, pero únicamente necesitamos las columnas
+    # de observaciones (y no la de días).
+    with open(archivo, 'rb') as d:
+        cols = d.readline().decode('utf8', errors='replace').strip().split(',')[1:]
+    datos = np.genfromtxt(archivo, delimiter=',', skip_header=1, encoding='latin-1')
+    días = datos[:, 0]
+    período = días[-1] + (días[-1] - días[-2])
+
+    n_períodos = int(np.ceil((n_días + 1) / período))
+    días_todos = np.concatenate([días + k * período for k in range(n_períodos)])
+    obs_todas = np.concatenate([datos[:, 1:]] * n_períodos)
+    guardar = días_todos <= n_días
+
+    archivo_sal = os.path.join(directorio, 'Observaciones.csv')
+    with open(archivo_sal, 'w', newline='') as d:
+        escritor = csv.writer(d)
+        escritor.writerow(['Parcela', 'Día'] + cols)
+        for p in range(n_parc):
+            obs_parc = obs_todas * generador.uniform(0.8, 1.2)
+            for día, fila in zip(días_todos[guardar], obs_parc[guardar]):
+                escritor.writerow(['Parcela {:03d}'.format(p), int(día)] + ['' if np.isnan(x) else x for x in fila])
+
+    return archivo_sal
+
+
+def leer_exper(config, ctx, nombre='Rendimiento'):
+    """
+    Crea un Experimento con las observaciones (y el clima, si aplica) generadas para una configuración.
+
+    :param config: La configuración.
+    :type config: dict
+
+    :param ctx: El contexto de la configuración (ver `preparar()`).
+    :type ctx: dict
+
+    :param nombre: El nombre del experimento.
+    :type nombre: str
+
+    :return: El Experimento.
+    :rtype: Experimento
+    """
+
+    info_red = obt_info_red(config['red'])
+    exper = Experimento(nombre=nombre, proyecto=ctx['red'].proyecto)
+    exper.agregar_pobs(archivo=ctx['archivo_datos'], col_tiempo='Día', col_parc='Parcela', factor=info_red['factor'])
+    if info_red['clima']:
+        exper.agregar_clima(archivo=ctx['archivo_clima'], col_tiempo='Día', col_temp_máx='Temp máx',
+                            col_temp_mín='Temp mín')
+    return exper
+
+
+@contextmanager
+def preparar(config):
+    """
+    Prepara el contexto de una configuración: un directorio temporario con sus bases de datos, y la Red conectada
+    con su Experimento, con las medidas de su tamaño. La Red no imprime nada (su instrumentación no tiene
+    sumideros).
+
+    :param config: La configuración.
+    :type config: dict
+
+    :return: El contexto.
+    :rtype: dict
+    """
+
+    directorio = tempfile.mkdtemp(prefix='tikon_rendimiento_')
+    try:
+        generador = np.random.default_rng(0)
+        info_red = obt_info_red(config['red'])
+
+        ctx = {'directorio': directorio, 'red': info_red['gen']()}
+        if info_red['datos'] is None:
+            ctx['archivo_datos'], ctx['corresp'] = RS.gen_obs(
+                ctx['red'], n_parc=config['n_parc'], n_días=config['n_días'], directorio=directorio,
+                generador=generador
+            )
+        else:
+            ctx['archivo_datos'] = gen_datos(info_red['datos'], n_parc=config['n_parc'], n_días=config['n_días'],
+                                             directorio=directorio, generador=generador)
+            ctx['corresp'] = info_red['corresp']
+        ctx['archivo_clima'] = RS.gen_clima(config['n_días'], directorio=directorio, generador=generador)
+
+        ctx['red'].instrumentación = Instrumentación(sumideros=[])
+        ctx['exper'] = leer_exper(config, ctx)
+        ctx['red'].añadir_exp(ctx['exper'], corresp=ctx['corresp'])
+        ctx['tamaño'] = RS.tamaño_red(ctx['red'])
+
+        yield ctx
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+@contextmanager
+def carga_simular(ctx, config):
+    yield lambda: ctx['red'].simular(
+        exper=ctx['exper'], nombre='Rendimiento', n_rep_parám=config['n_rep'], n_rep_estoc=config['n_rep'],
+        tiempo_final=config['n_días'], usar_especificadas=True, detalles=False, dibujar=False, dib_dists=False,
+        semilla=0
+    )
+
+
+@contextmanager
+def carga_validar(ctx, config):
+    yield lambda: ctx['red'].validar(
+        exper=ctx['exper'], nombre='Rendimiento', n_rep_parám=config['n_rep'], n_rep_estoc=config['n_rep'],
+        usar_especificadas=True, guardar=False, dibujar=False, dib_dists=False, semilla=0
+    )
+
+
+@contextmanager
+def carga_calibrar(ctx, config):
+    """
+    Prepara la Red tal como `Simulable.calibrar()` (una repetición paramétrica, con coeficientes sacados de los
+    a prioris) y devuelve la función que llama el modelo de calibración a cada iteración. No mide el tiempo del
+    algoritmo de calibración sí mismo (ni necesita PyMC).
+    """
+
+    red = ctx['red']
+    nombre = 'Rendimiento calib'
+
+    red.actualizar()
+    red._sembrar(0)
+    exper = red._prep_lista_exper(exper=ctx['exper'])
+
+    # Coeficientes para una repetición paramétrica, como los que pondría el modelo de calibración
+    lista_paráms, _, ubics_paráms = red._gen_lista_coefs_interés_todos()
+    lista_calibs = red._filtrar_calibs(calibs='Todos', l_paráms=lista_paráms, usar_especificadas=True)
+    Incert.trazas_a_dists(id_simul=nombre, l_d_pm=lista_paráms, l_trazas=lista_calibs, formato='valid',
+                          comunes=False, n_rep_parám=1, generador=np.random.default_rng(0))
+    red._llenar_coefs(nombre_simul=nombre, n_rep_parám=1, ubics_paráms=ubics_paráms, dib_dists=False,
+                      calibs=lista_calibs)
+
+    dic_argums = red._prep_args_simul_exps(exper=exper, paso=1, tiempo_final=None)
+    dic_argums.update(paso=1, detalles=False, devolver_calib=True)
+    red._prep_dic_simul(exper=exper, n_rep_estoc=config['n_rep'], n_rep_paráms=1, paso=1,
+                        n_pasos=dic_argums['n_pasos'], detalles=False, tipo='calib')
+    red.pedazos = None
+
+    try:
+        yield lambda: red._simul_exps(**dic_argums)
+    finally:
+        red.borrar_calib(id_calib=nombre)
+
+
+@contextmanager
+def carga_sensibilidad(ctx, config):
+    yield lambda: ctx['red'].sensibilidad(
+        nombre='Rendimiento sensib', exper=ctx['exper'], n=n_sensib, método=método_sensib,
+        n_rep_estoc=config['n_rep'], tiempo_final=config['n_días']
+    )
+
+
+@contextmanager
+def carga_leer_csv(ctx, config):
+    yield lambda: leer_exper(config, ctx, nombre='Rendimiento CSV')
+
+
+@contextmanager
+def carga_receta(ctx, config):
+    """
+    Guarda y carga las recetas de una Red y de todos sus organismos, en el directorio temporario. Se usa otra
+    instancia de la Red, porque guardar cambia el proyecto de los objetos.
+    """
+
+    red = obt_info_red(config['red'])['gen']()
+    cosos = [red] + list(red.objetos)
+
+    def f():
+        for coso in cosos:
+            coso.guardar(proyecto=ctx['directorio'], iterativo=False)
+        for coso in cosos:
+            coso.cargar(os.path.join(ctx['directorio'], coso.nombre + coso.ext))
+
+    yield f
+
+
+# Las cargas de trabajo, en orden ('calibrar' mide una iteración de calibración)
+cargas = {
+    'simular': carga_simular,
+    'validar': carga_validar,
+    'calibrar': carga_calibrar,
+    'sensibilidad': carga_sensibilidad,
+    'csv': carga_leer_csv,
+    'receta': carga_receta,
+}
+
+# Las cargas de trabajo cuyo tiempo es proporcional al número de días simulados
+cargas_simul = ('simular', 'validar', 'calibrar', 'sensibilidad')
+
+
+def medir(f, n_med=n_medidas):
+    """
+    Mide el tiempo y la memoria máxima de una función.
+
+    :param f: La función.
+    :type f: callable
+
+    :param n_med: El número de medidas de tiempo.
+    :type n_med: int
+
+    :return: El tiempo más rápido, en segundos, y la memoria máxima, en bytes.
+    :rtype: (float, int)
+    """
+
+    tiempos = []
+    for _ in range(n_med):
+        inic = time.perf_counter()
+        f()
+        tiempos.append(time.perf_counter() - inic)
+
+    tracemalloc.start()
+    f()
+    _, máx = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(tiempos), máx
+
+
+def correr(configs=None, l_cargas=None, n_med=n_medidas):
+    """
+    Mide cada carga de trabajo para cada configuración. Si una carga no se puede correr (por ejemplo, si falta una
+    dependencia opcional), se guarda el error y se sigue con las otras.
+
+    :param configs: Las configuraciones. Si es `None`, se usan las de `configuraciones`.
+    :type configs: list[dict]
+
+    :param l_cargas: Los nombres de las cargas de trabajo. Si es `None`, se miden todas.
+    :type l_cargas: list[str]
+
+    :param n_med: El número de medidas de tiempo.
+    :type n_med: int
+
+    :return: Los resultados, uno por configuración y carga, con las medidas del tamaño de la red (ver
+      `RedesSintéticas.tamaño_red()`).
+    :rtype: list[dict]
+    """
+
+    if configs is None:
+        configs = configuraciones
+    if l_cargas is None:
+        l_cargas = list(cargas)
+    for c in l_cargas:
+        if c not in cargas:
+            raise ValueError('Carga "{}" no reconocida. Debe ser una de: {}.'.format(c, ', '.join(cargas)))
+
+    print('\t{:<16}{:<16}{:>6}{:>8}{:>8}{:>8}{:>14}{:>14}'.format(
+        'Carga', 'Red', 'Reps', 'Parc.', 'Días', 'Etapas', 'Tiempo', 'Memoria'))
+
+    def imprimir(res):
+        if 'error' in res:
+            medida = '  Error ({})'.format(res['error'])
+        else:
+            medida = '{:>12.1f}ms{:>12.1f}Mb'.format(res['tiempo'] * 1000, res['memoria'] / 1e6)
+        print('\t{:<16}{:<16}{:>6}{:>8}{:>8}{:>8}{}'.format(
+            res['carga'], res['red'], res['n_rep'], res['n_parc'], res['n_días'], res.get('n_etapas', ''), medida))
+
+    resultados = []
+    for config in configs:
+        n_antes = len(resultados)
+        try:
+            with preparar(config) as ctx:
+                for nombre in l_cargas:
+                    res = dict(carga=nombre, **config, **ctx['tamaño'])
+                    try:
+                        with cargas[nombre](ctx, config) as f:
+                            res['tiempo'], res['memoria'] = medir(f, n_med=n_med)
+                    except Exception as e:
+                        res['error'] = '{}: {}'.format(type(e).__name__, e)
+                    resultados.append(res)
+                    imprimir(res)
+        except Exception as e:
+            # Si no se pudo preparar la configuración, ninguna de sus cargas se puede medir
+            for nombre in l_cargas[len(resultados) - n_antes:]:
+                res = dict(carga=nombre, error='{}: {}'.format(type(e).__name__, e), **config)
+                resultados.append(res)
+                imprimir(res)
+
+    return resultados
+
+
+def graficar_escala(resultados, archivo):
+    """
+    Grafica el tiempo y la memoria máxima de cada carga de trabajo en función del número de etapas de la red, con una
+    línea para cada combinación de repeticiones, parcelas y días. Para las cargas que simulan (`cargas_simul`), se
+    grafica el tiempo por día de simulación (para 'calibrar', de una iteración de calibración).
+
+    :param resultados: Los resultados de `correr()`.
+    :type resultados: list[dict]
+
+    :param archivo: El archivo del gráfico.
+    :type archivo: str
+    """
+
+    válidos = [r for r in resultados if 'error' not in r and 'n_etapas' in r]
+    l_cargas = [c for c in cargas if any(r['carga'] == c for r in válidos)]
+    if not l_cargas:
+        raise ValueError('No hay resultados válidos para graficar.')
+
+    fig = Figura(figsize=(10, 4 * len(l_cargas)))
+    TelaFigura(fig)
+
+    for i, carga in enumerate(l_cargas):
+        ejes_t = fig.add_subplot(len(l_cargas), 2, 2 * i + 1)
+        ejes_m = fig.add_subplot(len(l_cargas), 2, 2 * i + 2)
+
+        res_carga = [r for r in válidos if r['carga'] == carga]
+        for ll in sorted({(r['n_rep'], r['n_parc'], r['n_días']) for r in res_carga}):
+            res_ll = sorted([r for r in res_carga if (r['n_rep'], r['n_parc'], r['n_días']) == ll],
+                            key=lambda r: r['n_etapas'])
+            x = [r['n_etapas'] for r in res_ll]
+            etiq = '{} reps, {} parc., {} días'.format(*ll)
+            div = [r['n_días'] if carga in cargas_simul else 1 for r in res_ll]
+            ejes_t.plot(x, [r['tiempo'] * 1000 / d for r, d in zip(res_ll, div)], marker='o', label=etiq)
+            ejes_m.plot(x, [r['memoria'] / 1e6 for r in res_ll], marker='o', label=etiq)
+
+        ejes_t.set_title(carga)
+        ejes_t.set_ylabel('Tiempo por día (ms)' if carga in cargas_simul else 'Tiempo (ms)')
+        ejes_m.set_ylabel('Memoria (Mb)')
+        for ejes in [ejes_t, ejes_m]:
+            ejes.set_xlabel('Etapas')
+            ejes.legend(fontsize='small')
+
+    fig.tight_layout()
+    fig.savefig(archivo)
+
+
+def versión_git():
+    """
+    Devuelve la versión de git actual de Tiko'n (con "-dirty" si hay cambios no guardados), o `None` si no se puede
+    obtener.
+
+    :rtype: str | None
+    """
+
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'], cwd=os.path.split(__file__)[0], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def guardar_resultados(resultados, archivo=None):
+    """
+    Guarda los resultados en un archivo JSON, con información sobre la versión y el sistema.
+
+    :param resultados: Los resultados de `correr()`.
+    :type resultados: list[dict]
+
+    :param archivo: El archivo. Si es `None`, se usa el nombre de la versión de git (o de Tiko'n) en `Resultados/`.
+    :type archivo: str
+
+    :return: El archivo.
+    :rtype: str
+    """
+
+    git = versión_git()
+    if archivo is None:
+        if not os.path.isdir(dir_resultados):
+            os.makedirs(dir_resultados)
+        archivo = os.path.join(dir_resultados, '{}.json'.format(git or tikon.__version__))
+
+    info = {
+        'git': git,
+        'versión': tikon.__version__,
+        'fecha': ft.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor()
+    }
+    with open(archivo, 'w', encoding='utf8') as d:
+        json.dump({'info': info, 'resultados': resultados}, d, ensure_ascii=False, indent=2)
+
+    return archivo
+
+
+def comparar(archivo_base, archivo_nuevo, umbral_reg=umbral):
+    """
+    Compara los resultados de dos archivos (por ejemplo, de dos versiones de git) e imprime la razón de los tiempos
+    y de las memorias de cada medida que tienen en común. Las razones más grandes que `1 + umbral_reg` se marcan como
+    regresiones.
+
+    :param archivo_base: Los resultados de referencia.
+    :type archivo_base: str
+
+    :param archivo_nuevo: Los resultados nuevos.
+    :type archivo_nuevo: str
+
+    :param umbral_reg: El cambio relativo a partir del cual se marca una regresión.
+    :type umbral_reg: float
+
+    :return: Las medidas con regresiones.
+    :rtype: list[dict]
+    """
+
+    def leer(archivo):
+        with open(archivo, encoding='utf8') as d:
+            dic = json.load(d)
+        return dic['info'], {
+            (r['carga'], r['red'], r['n_rep'], r['n_parc'], r['n_días']): r
+            for r in dic['resultados'] if 'error' not in r
+        }
+
+    info_base, base = leer(archivo_base)
+    info_nuevo, nuevo = leer(archivo_nuevo)
+
+    print('Base: {} ({})\nNuevo: {} ({})\n'.format(info_base['git'], info_base['fecha'], info_nuevo['git'],
+                                                    info_nuevo['fecha']))
+    print('\t{:<16}{:<16}{:>6}{:>8}{:>8}{:>12}{:>12}'.format(
+        'Carga', 'Red', 'Reps', 'Parc.', 'Días', 'Tiempo', 'Memoria'))
+
+    regresiones = []
+    for ll in base:
+        if ll not in nuevo:
+            continue
+        r_t = nuevo[ll]['tiempo'] / base[ll]['tiempo']
+        r_m = nuevo[ll]['memoria'] / base[ll]['memoria'] if base[ll]['memoria'] else 1
+        regr = r_t > 1 + umbral_reg or r_m > 1 + umbral_reg
+        if regr:
+            regresiones.append(nuevo[ll])
+        print('\t{:<16}{:<16}{:>6}{:>8}{:>8}{:>11.2f}x{:>11.2f}x{}'.format(
+            *ll, r_t, r_m, '  (regresión)' if regr else ''))
+
+    return regresiones
+
+
+if __name__ == '__main__':
+    analizador = argparse.ArgumentParser(description='Pruebas de rendimiento de Tiko\'n.')
+    analizador.add_argument('--cargas', nargs='+', choices=list(cargas), help='Las cargas de trabajo para medir.')
+    analizador.add_argument('--redes', nargs='+', help='Las redes ({}, o "{}<n>").'.format(
+        ', '.join(redes), prefijo_sintética))
+    analizador.add_argument('--tamaños', nargs='+', type=int, help='Los números de insectos de redes sintéticas.')
+    analizador.add_argument('--reps', nargs='+', type=int, help='Los números de repeticiones.')
+    analizador.add_argument('--parcelas', nargs='+', type=int, help='Los números de parcelas.')
+    analizador.add_argument('--días', nargs='+', type=int, help='Los números de días.')
+    analizador.add_argument('--medidas', type=int, default=n_medidas, help='El número de medidas de tiempo.')
+    analizador.add_argument('--archivo', help='El archivo donde guardar los resultados.')
+    analizador.add_argument('--comparar', nargs=2, metavar=('BASE', 'NUEVO'), help='Comparar dos resultados.')
+    analizador.add_argument('--umbral', type=float, default=umbral, help='El umbral de regresión.')
+    analizador.add_argument('--gráfico', help='El archivo donde graficar los resultados en función del tamaño de red.')
+    analizador.add_argument('--resultados', help='Graficar los resultados de este archivo, en vez de medirlos.')
+    args = analizador.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar, umbral_reg=args.umbral)
+    elif args.resultados:
+        with open(args.resultados, encoding='utf8') as d:
+            graficar_escala(json.load(d)['resultados'], archivo=args.gráfico or 'Escala.png')
+    else:
+        warnings.simplefilter('ignore')
+
+        l_redes = (args.redes or []) + ['{}{}'.format(prefijo_sintética, n) for n in args.tamaños or []]
+        for r in l_redes:
+            obt_info_red(r)
+
+        # Si se especificó una dimensión, se miden todas las combinaciones (con la primera configuración automática
+        # para las dimensiones no especificadas)
+        if any(x for x in [l_redes, args.reps, args.parcelas, args.días]):
+            inic = configuraciones[0]
+            configs = [
+                {'red': r, 'n_rep': n, 'n_parc': p, 'n_días': d} for r, n, p, d in itertools.product(
+                    l_redes or [inic['red']], args.reps or [inic['n_rep']], args.parcelas or [inic['n_parc']],
+                    args.días or [inic['n_días']]
+                )
+            ]
+        else:
+            configs = None
+
+        res = correr(configs=configs, l_cargas=args.cargas, n_med=args.medidas)
+        print('\nResultados guardados en "{}".'.format(guardar_resultados(res, archivo=args.archivo)))
+        if args.gráfico:
+            graficar_escala(res, archivo=args.gráfico)
+            print('Gráfico guardado en "{}".'.format(args.gráfico))
@@ -0,0 +1,217 @@
+"""
+Compara la transferencia de individuos entre cohortes de etapas (p. ej., de huéspedes infectados a sus etapas
+fantasmas) de `Red._transferir_cohortes()` con el bucle anterior, que llamaba `Red._añadir_a_cohortes()` una vez por
+cohorte. Con matrices de cohortes aleatorias (con cohortes vacíos, edades viejas en cohortes vacíos y, en la mitad
+de las pruebas, edades redondeadas para que haya empates), verifica que las poblaciones sean idénticas y que las
+edades de los cohortes no vacíos sean idénticas, y reporta el tiempo de cada versión. Si hay cualquier diferencia,
+termina con un error (`AssertionError`).
+
+    python -m tikon.Rendimiento.Transferencias
+"""
+
+import time
+
+import numpy as np
+
+from tikon.RAE.RedAE import Red
+
+# Las formas de la matriz de cohortes (cohorte, parcela, repetición estocástica, repetición paramétrica, etapa)
+formas = [(10, 1, 5, 5, 6), (10, 3, 20, 20, 10), (10, 1, 50, 50, 20)]
+
+# El número de pruebas aleatorias para cada forma
+n_pruebas = 5
+
+# El número de veces que se repite cada medida de tiempo (se guarda la más rápida)
+n_medidas = 3
+
+
+def gen_red(forma, generador, empates=False, uno=False):
+    """
+    Genera una Red sin organismos con matrices de cohortes aleatorias, y los individuos quitados de las etapas
+    donantes (la primera mitad de las etapas; las recipientes son la segunda mitad).
+
+    :param forma: La forma de la matriz de cohortes.
+    :type forma: tuple
+
+    :param generador: El generador aleatorio.
+    :type generador: np.random.Generator
+
+    :param empates: Si hay que redondear las edades, para que varios cohortes tengan la misma edad.
+    :type empates: bool
+
+    :param uno: Si únicamente un cohorte donante (al azar) debe tener individuos quitados en cada etapa y repetición,
+    como casi siempre en las simulaciones.
+    :type uno: bool
+
+    :return: La Red, los individuos quitados y los índices de las etapas donantes y recipientes.
+    :rtype: (Red, np.ndarray, list[int], list[int])
+    """
+
+    n_etps = forma[-1]
+
+    red = Red('Transferencias', proyecto=None, organismos=[])
+    red.índices_cohortes = list(range(n_etps))
+
+    pobs = generador.integers(0, 100, size=forma).astype(float)
+    pobs[generador.uniform(size=forma) < 0.3] = 0
+    edades = generador.uniform(0, 30, size=forma)
+    if empates:
+        edades = np.round(edades / 5) * 5
+
+    quitar = np.floor(generador.uniform(size=forma) * pobs)
+    quitar[generador.uniform(size=forma) < 0.2] = 0
+    quitar[generador.integers(forma[0])] = 0  # Un cohorte sin transferencias
+    if uno:
+        quitar[np.arange(forma[0]).reshape((-1, 1, 1, 1, 1)) != generador.integers(forma[0], size=forma[1:])] = 0
+
+    red.predics = {
+        'Cohortes': {'Pobs': pobs, 'Edades': edades},
+        'Matrices': Red._gen_matrs_cohortes(forma, tipo=float)
+    }
+
+    í_don_coh = list(range(n_etps // 2))
+    í_recip_coh = list(range(n_etps // 2, n_etps))
+
+    return red, quitar, í_don_coh, í_recip_coh
+
+
+def transferir_bucle(red, quitar, í_don_coh, í_recip_coh):
+    """
+    La implementación anterior de la transferencia: un llamado a `_añadir_a_cohortes()` para cada cohorte, con las
+    edades de los cohortes del mismo índice.
+
+    :param red: La Red.
+    :type red: Red
+
+    :param quitar: Los individuos quitados de cada cohorte.
+    :type quitar: np.ndarray
+
+    :param í_don_coh: Los índices (en la matriz de cohortes) de las etapas donantes.
+    :type í_don_coh: list[int]
+
+    :param í_recip_coh: Los índices (en la matriz de cohortes) de las etapas recipientes.
+    :type í_recip_coh: list[int]
+
+    """
+
+    edades = red.predics['Cohortes']['Edades']
+
+    for n_día in range(quitar.shape[0]):
+        eds = edades[n_día, ...]
+
+        nuevos = np.zeros_like(quitar[n_día])
+        nuevos[..., í_recip_coh] = quitar[n_día][..., í_don_coh]
+        red._añadir_a_cohortes(nuevos=nuevos, edad=eds)
+
+
+def copiar_red(red):
+    """
+    Copia las matrices de cohortes de una Red en otra Red.
+
+    :param red: La Red.
+    :type red: Red
+
+    :return: La copia.
+    :rtype: Red
+    """
+
+    copia = Red('Transferencias', proyecto=None, organismos=[])
+    copia.índices_cohortes = list(red.índices_cohortes)
+    copia.predics = {
+        'Cohortes': {ll: v.copy() for ll, v in red.predics['Cohortes'].items()},
+        'Matrices': {ll: v.copy() for ll, v in red.predics['Matrices'].items()}
+    }
+
+    return copia
+
+
+def medir(f, red, *args, n_med=n_medidas):
+    """
+    Mide el tiempo de una transferencia, en copias de la Red.
+
+    :param f: La función de transferencia.
+    :type f: callable
+
+    :param red: La Red.
+    :type red: Red
+
+    :param args: Los otros argumentos de la función.
+
+    :param n_med: El número de medidas.
+    :type n_med: int
+
+    :return: El tiempo más rápido, en segundos.
+    :rtype: float
+    """
+
+    tiempos = []
+    for _ in range(n_med):
+        copia = copiar_red(red)
+        inic = time.perf_counter()
+        f(copia, *args)
+        tiempos.append(time.perf_counter() - inic)
+    return min(tiempos)
+
+
+def comparar(red, quitar, í_don_coh, í_recip_coh):
+    """
+    Aplica las dos versiones de la transferencia a copias de la Red y compara los resultados.
+
+    :param red: La Red.
+    :type red: Red
+
+    :param quitar: Los individuos quitados de cada cohorte.
+    :type quitar: np.ndarray
+
+    :param í_don_coh: Los índices (en la matriz de cohortes) de las etapas donantes.
+    :type í_don_coh: list[int]
+
+    :param í_recip_coh: Los índices (en la matriz de cohortes) de las etapas recipientes.
+    :type í_recip_coh: list[int]
+
+    :return: Si las poblaciones son idénticas, y si las edades de los cohortes no vacíos son idénticas.
+    :rtype: (bool, bool)
+    """
+
+    ant = copiar_red(red)
+    transferir_bucle(ant, quitar, í_don_coh, í_recip_coh)
+
+    nueva = copiar_red(red)
+    nueva._transferir_cohortes(quitar=quitar, í_don_coh=í_don_coh, í_recip_coh=í_recip_coh)
+
+    pobs_ant = ant.predics['Cohortes']['Pobs']
+    pobs_nueva = nueva.predics['Cohortes']['Pobs']
+    no_vacíos = pobs_ant > 0
+
+    pobs_igual = np.array_equal(pobs_ant, pobs_nueva)
+    eds_igual = np.array_equal(ant.predics['Cohortes']['Edades'][no_vacíos],
+                               nueva.predics['Cohortes']['Edades'][no_vacíos])
+
+    return pobs_igual, eds_igual
+
+
+if __name__ == '__main__':
+    gen = np.random.default_rng(0)
+
+    éxito = True
+    for frm in formas:
+        for i in range(n_pruebas):
+            r, q, don, recip = gen_red(frm, gen, empates=i % 2 == 1, uno=i % 3 == 2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                igual = comparar(r, q, don, recip)
+            éxito &= all(igual)
+            if not all(igual):
+                print('Diferencia con forma {}: poblaciones {}, edades {}'.format(frm, *igual))
+
+        for u in [False, True]:
+            r, q, don, recip = gen_red(frm, gen, uno=u)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                t_ant = medir(transferir_bucle, r, q, don, recip)
+                t_nuevo = medir(lambda x, *a: x._transferir_cohortes(*a), r, q, don, recip)
+            print('{} ({}): bucle {:.2f} ms, vectorizado {:.2f} ms'.format(
+                frm, 'un cohorte donante' if u else 'todos los cohortes', t_ant * 1e3, t_nuevo * 1e3
+            ))
+
+    if not éxito:
+        raise AssertionError('La transferencia vectorizada no reproduce el bucle anterior.')
+    print('Resultados idénticos.')
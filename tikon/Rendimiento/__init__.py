@@ -0,0 +1,4 @@
+"""
+Pruebas de rendimiento de Tiko'n. Cada módulo mide el tiempo de un aspecto de las simulaciones con las redes
+incluidas en los proyectos de Tiko'n, y se puede correr directamente (p. ej., `python -m tikon.Rendimiento.Pasos`).
+"""